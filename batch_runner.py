@@ -0,0 +1,427 @@
+# batch_runner.py
+"""
+Runs NregaBot automations from a job file, without the Tk UI.
+
+    python batch_runner.py jobs.json --out results.csv --db results.sqlite
+    python batch_runner.py jobs.csv --headless --profile "C:/NregaBotProfile"
+
+By default it attaches to the Chrome that NregaBot launches (debug port 9222),
+so the portal login is reused. --headless starts its own Chrome instead; give it
+a --profile that is already logged in.
+
+Job file
+  JSON: {"jobs": [{"automation": "msr", "panchayat": "Amarpur", "items": ["100010", ...]}, ...]}
+        (or just the list). Other keys are the automation's options, see JOBS.
+  CSV:  one row per item with columns automation, panchayat, item and any options;
+        rows are grouped into jobs by (automation, panchayat), options come from
+        the first row of each group.
+
+Each job runs the tab's own automation logic on a widgetless tab object, so a
+batch behaves like the same run from the UI. What the tabs would show becomes
+events: {"type": "job_start" | "log" | "result" | "dialog" | "job_end", ...}.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import sqlite3
+import argparse
+import importlib
+import threading
+from datetime import datetime, date
+from collections import Counter, defaultdict
+
+import config
+from perf_monitor import PerfMonitor
+from session_guard import SessionGuard
+from rate_controller import RateController
+from retry_policy import RetryPolicy
+
+
+# --- Headless stand-ins for the app and the tab widgets ---
+class HeadlessResults:
+    """Takes the place of a tab's results_tree; every inserted row is kept and reported."""
+    def __init__(self, on_row=None):
+        self.rows = []
+        self._on_row = on_row
+        self._lock = threading.Lock()
+
+    def insert(self, parent, index, iid=None, values=(), tags=(), **kwargs):
+        with self._lock: self.rows.append(tuple(values))
+        if self._on_row: self._on_row(tuple(values))
+
+    def get_children(self, *args):
+        return []
+
+    def delete(self, *items): pass
+    def yview_moveto(self, fraction): pass
+
+
+class _HeadlessLabel:
+    """success_label / skipped_label: the counts stay on the tab (success_count, skipped_count)."""
+    def configure(self, **kwargs): pass
+
+
+class HeadlessDialogs:
+    """Stands in for tkinter.messagebox on a headless tab: each dialog becomes an event, nothing waits for a click."""
+    ANSWERS = {"showinfo": "ok", "showwarning": "ok", "showerror": "ok", "askyesno": False, "askokcancel": False,
+               "askretrycancel": False, "askyesnocancel": None, "askquestion": "no"}
+
+    def __init__(self, emit):
+        self.emit = emit
+
+    def __getattr__(self, kind):
+        if kind not in self.ANSWERS: raise AttributeError(kind)
+        def dialog(title=None, message=None, **kwargs):
+            self.emit({"type": "dialog", "kind": kind, "title": title, "message": message})
+            return self.ANSWERS[kind]
+        return dialog
+
+
+class _MemoryHistory:
+    """The HistoryManager calls automation code makes, kept in memory."""
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record_perf_samples(self, rows):
+        with self._lock: self.samples.extend(rows)
+
+    def get_perf_samples(self):
+        with self._lock: return list(self.samples)
+
+    def get_suggestions(self, field_key): return []
+    def save_entry(self, field_key, value): pass
+    def increment_usage(self, automation_key): pass
+    def log_activity(self, activity_type, description): pass
+
+
+class HeadlessApp:
+    """The slice of NregaBotApp that automation code calls, reported as events."""
+    license_info = {} # No signed-in key: cloud uploads are skipped with a log line
+    transfer_manager = None
+
+    def __init__(self, driver_factory=None, emit=None, downloads_path=None, browser="chrome"):
+        self.emit = emit or (lambda event: None)
+        self.dialogs = HeadlessDialogs(self.emit)
+        self.active_browser = browser
+        self.driver = None
+        self.stop_events = defaultdict(threading.Event)
+        self.history_manager = _MemoryHistory()
+        self.perf_monitor = PerfMonitor(self)
+        self.session_guard = SessionGuard(self)
+        self.rate_controller = RateController(self)
+        self.retry_policy = RetryPolicy(self)
+        self._driver_factory = driver_factory
+        self._downloads_path = downloads_path or os.path.join(os.path.expanduser("~"), "Downloads")
+
+    def get_driver(self):
+        if self.driver is None and self._driver_factory:
+            try:
+                self.driver = self.session_guard.instrument_driver(self.perf_monitor.instrument_driver(self._driver_factory()))
+            except Exception as e:
+                self.emit({"type": "log", "level": "error", "message": f"Could not start/attach browser: {e}"})
+        return self.driver
+
+    def log_message(self, log_widget, message, level="info"):
+        self.emit({"type": "log", "level": level, "message": str(message).strip()})
+
+    def after(self, ms, func, *args):
+        # No Tk loop: callbacks run straight away; ones that need real widgets are skipped
+        try: func(*args)
+        except Exception as e: self.emit({"type": "log", "level": "debug", "message": f"UI callback skipped: {e}"})
+
+    def get_user_downloads_path(self):
+        return self._downloads_path
+
+    def run_work_allocation_from_demand(self, panchayat, work_key):
+        self.emit({"type": "log", "level": "warning", "message": "Auto-allocation is not available in batch mode; add a separate job."})
+
+    def set_status(self, *args, **kwargs): pass
+    def clear_log(self, *args): pass
+    def update_history(self, *args): pass
+    def play_sound(self, *args): pass
+    def show_toast(self, *args, **kwargs): pass
+    def open_folder(self, *args): pass
+    def send_wagelist_data_and_switch_tab(self, *args): pass
+
+
+_UI_ONLY_METHODS = ("set_ui_state", "update_status", "_clear_processed_selection", "_show_completion_dialog")
+
+
+def make_headless_tab(tab_class, app, automation_key, on_row=None):
+    """
+    A tab object without widgets (__init__, which builds them, is not run). The run logic
+    gets only the stand-ins below; any other widget it touches raises AttributeError.
+    """
+    tab = tab_class.__new__(tab_class)
+    tab.app, tab.automation_key, tab.dialogs = app, automation_key, app.dialogs
+    tab.log_display = None # app.log_message turns log lines into events
+    tab.success_label, tab.skipped_label = _HeadlessLabel(), _HeadlessLabel()
+    tab.results_tree = HeadlessResults(on_row)
+    for name in _UI_ONLY_METHODS:
+        setattr(tab, name, lambda *args, **kwargs: None)
+    tab._instrument_items() # Same per-item timing, retries and session guard as BaseAutomationTab.__init__
+    return tab
+
+
+# --- Jobs: plain inputs -> the tab's run logic ---
+def _flag(value, default=False):
+    if value is None or value == "": return default
+    if isinstance(value, bool): return value
+    return str(value).strip().lower() in ("1", "y", "yes", "true", "on")
+
+
+def _items(job):
+    items = job.get("items") or []
+    if isinstance(items, str): items = items.splitlines()
+    return [str(i).strip() for i in items if str(i).strip()]
+
+
+def _run_muster(tab, job):
+    items = _items(job)
+    tab.success_count = tab.skipped_count = 0
+    tab.current_session_files = []
+    tab.run_automation_logic({
+        'panchayat': job['panchayat'], 'start_date': job['start_date'], 'end_date': job['end_date'],
+        'designation': job['designation'], 'staff': job['staff'],
+        'orientation': job.get('orientation', 'Landscape'), 'scale': float(job.get('scale', 80)),
+        'output_action': job.get('output_action') or "Save as PDF", 'save_to_cloud': _flag(job.get('save_to_cloud')),
+        'work_codes': items, 'auto_mode': not items,
+    })
+
+
+def _run_msr(tab, job):
+    tab.run_automation_logic(job.get('panchayat', ''), float(job.get('verify_amount', 282)), _items(job))
+
+
+def _run_wagelist_gen(tab, job):
+    tab.run_automation_logic(job['panchayat'], _flag(job.get('save_pdf')), _flag(job.get('send_to_sender')))
+
+
+def _run_wagelist_send(tab, job):
+    tab.run_automation_logic(job['fin_year'], job.get('start_wagelist', ''), job.get('end_wagelist', ''), int(job.get('parallel_tabs') or 0) or None)
+
+
+def _run_mb_entry(tab, job):
+    cfg = dict(config.MB_ENTRY_CONFIG["defaults"])
+    cfg.update({k: str(v).strip() for k, v in job.items() if k in cfg or k == "panchayat_name"})
+    cfg["panchayat_name"] = cfg.get("panchayat_name") or job['panchayat']
+    cfg["auto_mb_no"] = _flag(job.get("auto_mb_no"), default=True)
+    tab.run_automation_logic(cfg, _items(job))
+
+
+def _run_demand(tab, job):
+    from tabs.demand_tab import read_applicants_csv, group_by_village
+    state = job.get('state', 'Jharkhand')
+    state_cfg = config.STATE_DEMAND_CONFIG[state]
+    demand_date = datetime.strptime(job['demand_date'], '%d/%m/%Y').date()
+    if demand_date < date.today(): raise ValueError("demand_date cannot be in the past.")
+    days = int(job['days'])
+    if days <= 0: raise ValueError("days must be a positive number.")
+
+    applicants = read_applicants_csv(job['applicants_csv'])
+    wanted = set(_items(job)) # Job card numbers; empty = every applicant in the CSV
+    selected = [a for a in applicants if not wanted or a['Job card number'] in wanted]
+    grouped, skipped = group_by_village(selected, state_cfg["village_code_logic"])
+    if skipped: tab.app.log_message(None, f"Skipped {skipped} malformed job cards.", "warning")
+
+    work_start = demand_date.strftime('%d/%m/%Y')
+    tab._process_demand(state, job['panchayat'], days, work_start, work_start, grouped,
+                        state_cfg["base_url"], "", job.get('demand_to_date', ''))
+
+
+class JobSpec:
+    def __init__(self, module, class_name, row_fields, run, required=()):
+        self.module, self.class_name, self.run, self.required = module, class_name, run, required
+        self.item_col, self.status_col, self.details_col = row_fields # results_tree value positions
+
+
+JOBS = {
+    "muster": JobSpec("tabs.musterroll_gen_tab", "MusterrollGenTab", (1, 2, 3), _run_muster,
+                      ("panchayat", "start_date", "end_date", "designation", "staff")),
+    "msr": JobSpec("tabs.msr_tab", "MsrTab", (0, 1, 2), _run_msr, ("items",)),
+    "gen": JobSpec("tabs.wagelist_gen_tab", "WagelistGenTab", (1, 2, 3), _run_wagelist_gen, ("panchayat",)),
+    "send": JobSpec("tabs.wagelist_send_tab", "WagelistSendTab", (0, 1, 3), _run_wagelist_send, ("fin_year",)),
+    "mb_entry": JobSpec("tabs.mb_entry_tab", "MbEntryTab", (1, 5, 6), _run_mb_entry,
+                        ("panchayat", "items", "page_no", "mate_name")),
+    "demand": JobSpec("tabs.demand_tab", "DemandTab", (1, 3, 2), _run_demand,
+                      ("panchayat", "days", "demand_date", "applicants_csv")),
+}
+
+
+def load_jobs(path):
+    """Reads a JSON or CSV job file into a list of job dicts."""
+    if path.lower().endswith(".csv"):
+        jobs, index = [], {}
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                row = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+                key = (row.get("automation", ""), row.get("panchayat", ""))
+                if key not in index:
+                    index[key] = {k: v for k, v in row.items() if k != "item" and v}
+                    index[key]["items"] = []
+                    jobs.append(index[key])
+                if row.get("item"): index[key]["items"].append(row["item"])
+    else:
+        with open(path, encoding='utf-8') as f: data = json.load(f)
+        jobs = data.get("jobs", []) if isinstance(data, dict) else data
+
+    for n, job in enumerate(jobs, 1):
+        spec = JOBS.get(job.get("automation"))
+        if not spec: raise ValueError(f"Job {n}: unknown automation '{job.get('automation')}' (use one of {', '.join(JOBS)}).")
+        missing = [k for k in spec.required if not job.get(k)]
+        if missing: raise ValueError(f"Job {n} ({job['automation']}): missing {', '.join(missing)}.")
+    return jobs
+
+
+def run_job(app, number, job):
+    """Runs one job on the app's browser. Returns the job_end event."""
+    spec = JOBS[job["automation"]]
+    key = job["automation"]
+    counts = Counter()
+
+    def on_row(values):
+        pick = lambda col: str(values[col]) if col is not None and col < len(values) else ""
+        counts[pick(spec.status_col) or "-"] += 1
+        app.emit({"type": "result", "job": number, "automation": key, "panchayat": job.get("panchayat", ""),
+                  "item": pick(spec.item_col), "status": pick(spec.status_col), "details": pick(spec.details_col)})
+
+    tab_class = getattr(importlib.import_module(spec.module), spec.class_name)
+    tab = make_headless_tab(tab_class, app, key, on_row)
+    app.stop_events[key].clear()
+    app.emit({"type": "job_start", "job": number, "automation": key, "panchayat": job.get("panchayat", "")})
+    start, error = time.perf_counter(), None
+    try:
+        spec.run(tab, job)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        app.emit({"type": "log", "level": "error", "message": f"Job {number} failed: {error}"})
+    end = {"type": "job_end", "job": number, "automation": key, "panchayat": job.get("panchayat", ""),
+           "results": dict(counts), "seconds": round(time.perf_counter() - start, 1), "error": error}
+    app.emit(end)
+    return end
+
+
+class ResultSink:
+    """Appends result events to a CSV file and/or a SQLite table (batch_results)."""
+    FIELDS = ["run_id", "job", "automation", "panchayat", "item", "status", "details", "recorded_at"]
+
+    def __init__(self, csv_path=None, db_path=None, run_id=None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._lock = threading.Lock()
+        self._csv = self._writer = self._db = None
+        if csv_path:
+            is_new = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+            self._csv = open(csv_path, "a", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._csv, fieldnames=self.FIELDS)
+            if is_new: self._writer.writeheader()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS batch_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT, job INTEGER, automation TEXT, panchayat TEXT,
+                    item TEXT, status TEXT, details TEXT, recorded_at TEXT
+                )
+            ''')
+            self._db.commit()
+
+    def __call__(self, event):
+        if event.get("type") != "result": return
+        row = {k: event.get(k, "") for k in self.FIELDS}
+        row.update(run_id=self.run_id, recorded_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with self._lock:
+            if self._writer:
+                self._writer.writerow(row); self._csv.flush()
+            if self._db:
+                self._db.execute("INSERT INTO batch_results (run_id, job, automation, panchayat, item, status, details, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [row[k] for k in self.FIELDS])
+                self._db.commit()
+
+    def close(self):
+        if self._csv: self._csv.close()
+        if self._db: self._db.close()
+
+
+def chrome_factory(attach_port=None, headless=False, profile=None):
+    def factory():
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        opts = ChromeOptions()
+        if attach_port:
+            opts.add_experimental_option("debuggerAddress", f"127.0.0.1:{attach_port}")
+        else:
+            if headless: opts.add_argument("--headless=new")
+            if profile: opts.add_argument(f"--user-data-dir={profile}")
+            opts.add_argument("--window-size=1366,900")
+        return webdriver.Chrome(options=opts)
+    return factory
+
+
+def _console(quiet):
+    def show(event):
+        kind = event["type"]
+        if kind == "log" and not quiet and event["level"] != "debug":
+            print(f"  {event['level'].upper():<7} {event['message']}")
+        elif kind == "dialog" and not quiet:
+            print(f"  DIALOG  {event['title']}: {event['message']}")
+        elif kind == "job_start":
+            print(f"\n== Job {event['job']}: {event['automation']} {event['panchayat']}")
+        elif kind == "job_end":
+            summary = ", ".join(f"{k} {v}" for k, v in sorted(event["results"].items())) or "no results"
+            print(f"== Job {event['job']} done in {event['seconds']}s: {summary}{' (ERROR: ' + event['error'] + ')' if event['error'] else ''}")
+    return show
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run NregaBot automations from a job file (no UI)")
+    parser.add_argument("job_file", help="JSON or CSV job file")
+    parser.add_argument("--out", help="Append results to this CSV file")
+    parser.add_argument("--db", help="Append results to this SQLite file (table batch_results)")
+    parser.add_argument("--events", help="Write every event as a JSON line to this file")
+    parser.add_argument("--attach", type=int, default=9222, help="Chrome debug port to attach to (default 9222)")
+    parser.add_argument("--headless", action="store_true", help="Start a headless Chrome instead of attaching")
+    parser.add_argument("--profile", help="Chrome user-data-dir for --headless (should be logged in)")
+    parser.add_argument("--downloads", help="Folder used instead of ~/Downloads for PDFs")
+    parser.add_argument("--quiet", action="store_true", help="Only print job summaries")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.job_file)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    sink = ResultSink(args.out, args.db)
+    events_file = open(args.events, "a", encoding="utf-8") if args.events else None
+    listeners = [_console(args.quiet), sink]
+    if events_file:
+        listeners.append(lambda event: (events_file.write(json.dumps(dict(event, run_id=sink.run_id), default=str) + "\n"), events_file.flush()))
+
+    lock = threading.Lock()
+    def emit(event):
+        with lock:
+            for listener in listeners: listener(event)
+
+    factory = chrome_factory(None if args.headless else args.attach, args.headless, args.profile)
+    app = HeadlessApp(factory, emit, args.downloads)
+
+    failed = 0
+    try:
+        for number, job in enumerate(jobs, 1):
+            if run_job(app, number, job)["error"]: failed += 1
+    except KeyboardInterrupt:
+        for event in app.stop_events.values(): event.set()
+        print("\nStopped.")
+    finally:
+        if app.driver and args.headless:
+            try: app.driver.quit()
+            except Exception: pass
+        sink.close()
+        if events_file: events_file.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+# benchmarks/fake_portal.py
+"""
+Local stand-in for the NREGA portal pages the Selenium automations drive.
+
+Serves the same element ids, __doPostBack cascades, grids, on-page labels and
+JS alerts the tabs look for, with seeded data so runs are repeatable:
+
+    msrpayment.aspx   - MSR Payment      (MsrTab)
+    musteraszero.aspx - Zero MR          (ZeroMrTab)
+    sendforpay.aspx   - Wagelist Send    (WagelistSendTab)
+    preprintmsr.aspx  - MR Generation    (MusterrollGenTab)
+
+Every request can be slowed down (latency + jitter) and a share of them can
+fail with an ASP.NET "Server Error" page, to reproduce slow-server behaviour.
+
+    python -m benchmarks.fake_portal --port 8765 --latency 0.5 --error-rate 0.05
+
+portal_harness.py runs the real tab logic against it in headless Chrome.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import config
+
+PANCHAYATS = ["Amarpur", "Baghmara", "Chandankiyari", "Dumri", "Etkhori"]
+FIN_YEARS = ["2024-2025", "2025-2026"]
+DESIGNATIONS = ["Junior Engineer--BP", "Assistant Engineer--BP", "Technical Assistant--BP",
+                "Acrited Engineer(AE)--GP", "Junior Engineer--GP", "Technical Assistant--GP"]
+STAFF = ["Ramesh Kumar", "Sunita Devi", "Anil Mahto"]
+WORK_TYPES = ["IF", "LD", "WC", "RC", "FP"]
+WAGE_RATE = 282
+
+_MASTER_PREFIX = "ctl00_ContentPlaceHolder1_"
+_WL = _MASTER_PREFIX  # sendforpay.aspx sits inside the master page
+
+_POSTBACK_JS = """<script type="text/javascript">
+function __doPostBack(eventTarget, eventArgument) {
+    var theForm = document.forms['aspnetForm'];
+    theForm.__EVENTTARGET.value = eventTarget;
+    theForm.__EVENTARGUMENT.value = eventArgument;
+    theForm.submit();
+}
+</script>"""
+
+_SERVER_ERROR = ("<html><head><title>Runtime Error</title></head><body>"
+                 "<h1>Server Error in '/Netnrega' Application.</h1><h2><i>Runtime Error</i></h2>"
+                 "</body></html>")
+
+
+# --- HTML helpers (ids as the portal renders them, names as ASP.NET posts them) ---
+def _name(element_id):
+    if element_id.startswith(_MASTER_PREFIX):
+        return "ctl00$ContentPlaceHolder1$" + element_id[len(_MASTER_PREFIX):]
+    return element_id
+
+
+def _select(element_id, options, selected="", postback=True):
+    """options: [(value, text)]"""
+    onchange = f' onchange="__doPostBack(\'{_name(element_id)}\',\'\')"' if postback else ""
+    items = "".join(f'<option{" selected" if value == selected else ""} value="{escape(value)}">{escape(text)}</option>'
+                    for value, text in options)
+    return f'<select name="{_name(element_id)}" id="{element_id}"{onchange}>{items}</select>'
+
+
+def _text_input(element_id, value="", postback=False):
+    onchange = f' onchange="__doPostBack(\'{_name(element_id)}\',\'\')"' if postback else ""
+    return f'<input type="text" name="{_name(element_id)}" id="{element_id}" value="{escape(value)}"{onchange} />'
+
+
+def _button(element_id, label, confirm=None):
+    onclick = f' onclick="return confirm({escape(json.dumps(confirm))});"' if confirm else ""
+    return f'<input type="submit" name="{_name(element_id)}" id="{element_id}" value="{escape(label)}"{onclick} />'
+
+
+def _label(element_id, text, color="red"):
+    style = "" if text else ' style="display:none"'
+    return f'<span id="{element_id}"{style}><font color="{color}">{escape(text)}</font></span>'
+
+
+class _Postback:
+    """Posted form fields, read by element id."""
+    def __init__(self, fields):
+        self.fields = fields
+        self.target = fields.get("__EVENTTARGET", "")
+
+    def value(self, element_id, default=""):
+        return self.fields.get(_name(element_id), default)
+
+    def clicked(self, element_id):
+        return _name(element_id) in self.fields
+
+    def changed(self, element_id):
+        return self.target == _name(element_id)
+
+
+class FakePortal:
+    """
+    Threaded HTTP server with the portal's pages and a little server-side
+    state (paid MSRs, zeroed MRs, sent wagelists, issued MRs) so re-running an
+    item behaves like the real site. Use as a context manager or start()/stop().
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 seed=7, works=40, wagelists=30, viewstate_kb=16):
+        self.host, self.port = host, port
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self.stats = {"requests": 0, "postbacks": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._viewstate = ("/wEPDwUKMTY3" * (viewstate_kb * 1024 // 12 + 1))[:viewstate_kb * 1024]
+
+        data_rng = random.Random(seed)
+        self.works = {name: self._build_works(data_rng, p, works) for p, name in enumerate(PANCHAYATS)}
+        self._by_code = {w["code"]: w for rows in self.works.values() for w in rows}
+        self.wagelists = {fin: [f"3406004WL{(i + 1) * 37 + y * 5000:06d}" for i in range(wagelists)]
+                          for y, fin in enumerate(FIN_YEARS)}
+        self.wagelist_rows = {wl: data_rng.randint(3, 16) for rows in self.wagelists.values() for wl in rows}
+        self.paid, self.zeroed, self.sent, self.issued = set(), set(), set(), set()
+
+    @staticmethod
+    def _build_works(rng, p, count):
+        rows = []
+        for w in range(count):
+            serial = 7080900000000 + (p + 1) * 100000 + w
+            roll = rng.random()
+            rows.append({
+                "code": f"34060040{p + 1:02d}/{rng.choice(WORK_TYPES)}/{serial}",
+                "key": str(serial)[-6:],
+                "msr_no": str(20000 + p * 1000 + w),
+                "workers": rng.randint(4, 18),
+                "filled": roll >= 0.05,                       # MR attendance entered
+                "attendance": rng.random() < 0.08,           # blocks Zero MR
+                "wage": 0 if roll < 0.12 else (300 if roll < 0.17 else WAGE_RATE),
+                "payment": "exceeds" if 0.17 <= roll < 0.20 else ("attendance" if roll < 0.24 else "saved"),
+                "mr_issue": ("No Worker Available for this work." if 0.24 <= roll < 0.30 else
+                             "Geotag is not received for this work." if 0.30 <= roll < 0.33 else None),
+            })
+        return rows
+
+    # --- Lifecycle ---
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _PortalHandler)
+        self._server.daemon_threads = True
+        self._server.portal = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="fake_portal").start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, page):
+        return f"{self.base_url}/Netnrega/{page}"
+
+    # --- Inputs for the harness ---
+    def work_keys(self, panchayat):
+        return [w["key"] for w in self.works[panchayat]]
+
+    def muster_rolls(self, panchayat):
+        return [(w["key"], w["msr_no"]) for w in self.works[panchayat]]
+
+    def pending_wagelists(self, fin_year):
+        with self._lock:
+            return [wl for wl in self.wagelists.get(fin_year, []) if wl not in self.sent]
+
+    # --- Server side ---
+    def _delay_and_maybe_fail(self):
+        """Returns True if this request should fail with a server error."""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            self.stats["requests"] += 1
+            if fail: self.stats["errors"] += 1
+        if delay: time.sleep(delay)
+        return fail
+
+    def _find_works(self, panchayat, search):
+        if panchayat not in self.works: return []
+        return [w for w in self.works[panchayat] if search in w["code"]]
+
+    def _render(self, title, body, alert=None):
+        script = f"<script type=\"text/javascript\">alert({json.dumps(alert)});</script>" if alert else ""
+        return (f"<!DOCTYPE html><html><head><title>{escape(title)}</title>{_POSTBACK_JS}</head><body>"
+                f'<form method="post" action="" id="aspnetForm">'
+                f'<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />'
+                f'<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />'
+                f'<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{self._viewstate}" />'
+                f"<h3>{escape(title)}</h3>{body}</form>{script}</body></html>")
+
+    # --- Pages ---
+    def msr_payment(self, form):
+        panchayat = form.value("ddlPanchayat")
+        search = form.value("txtSearch").strip()
+        searched = form.clicked("ImgbtnSearch")
+        works = self._find_works(panchayat, search) if panchayat and search else []
+        error, alert, notice = "", None, ""
+
+        if searched and not panchayat: error = "Please select Panchayat."
+        elif searched and not works: error = "No Work Found."
+
+        work = self._by_code.get(form.value("ddlWorkCode")) if not searched else None
+        if work not in works: work = None
+        with self._lock:
+            msr_open = bool(work and work["filled"] and work["code"] not in self.paid)
+        msr_no = form.value("ddlMsrNo") if msr_open and not form.changed("ddlWorkCode") else ""
+        if work and msr_no != work["msr_no"]: msr_no = ""
+
+        if form.clicked("btnSave") and work and msr_no:
+            if work["payment"] == "exceeds":
+                notice = "Expenditure on unskilled labours exceeds sanction amount."
+            else:
+                with self._lock: self.paid.add(work["code"])
+                alert = ("Muster Roll Payment has been saved." if work["payment"] == "saved" else
+                         "Attendance of some workers is not filled and hence it is not saved.")
+                search, works, work, msr_no, msr_open = "", [], None, "", False
+
+        rows = ""
+        if work and msr_no:
+            rows = "".join(f'<tr><td>Worker {i + 1}</td><td><input type="text" name="wage_per_day{i}" value="{work["wage"]}" /></td></tr>'
+                           for i in range(work["workers"]))
+        body = (f"<div>Panchayat: {_select('ddlPanchayat', [('', '--Select--')] + [(p, p) for p in PANCHAYATS], panchayat)}</div>"
+                f"<div>Work: {_text_input('txtSearch', search)} {_button('ImgbtnSearch', 'Search')} {_label('lblError', error)}</div>"
+                f"<div>{_select('ddlWorkCode', [('', '--Select--')] + [(w['code'], w['code']) for w in works], work['code'] if work else '')}</div>"
+                f"<div>{_select('ddlMsrNo', [('', '--Select--')] + ([(work['msr_no'], work['msr_no'])] if msr_open else []), msr_no)}</div>"
+                f'<table id="gvWage" border="1">{rows}</table><p><font color="red">{escape(notice)}</font></p>'
+                f"{_button('btnSave', 'Save', confirm='Are you sure you want to save the payment?')}")
+        return self._render("Muster Roll Payment", body, alert)
+
+    def zero_mr(self, form):
+        fin_year = form.value("ddlfin", FIN_YEARS[-1])
+        panchayat = form.value("ddlpanch")
+        search = form.value("txtsearch_work").strip()
+        works = self._find_works(panchayat, search) if panchayat and search else []
+        work = self._by_code.get(form.value("ddlworkcode")) if not form.changed("txtsearch_work") else None
+        if work not in works: work = None
+        with self._lock:
+            msr_open = bool(work and work["code"] not in self.zeroed)
+        msr_no = form.value("ddlmustroll") if msr_open and not form.changed("ddlworkcode") else ""
+        message, validation = "", ""
+
+        if form.clicked("btnSave"):
+            if not work: validation = "Please select Work Code."
+            elif not msr_no: validation = "Please select Muster Roll No."
+            elif work["attendance"]:
+                message = "Attendance is already filled for this Muster Roll, it can not be made zero."
+            else:
+                with self._lock: self.zeroed.add(work["code"])
+                message = f"Muster Roll {work['msr_no']} updated successfully as zero muster roll."
+            if message: search, works, work, msr_no, msr_open = "", [], None, "", False
+
+        hidden = "" if validation else ' style="display:none"'
+        msr_options = [("0", "Select")] + ([(work["msr_no"], f"{work['msr_no']} (01/04/2025~07/04/2025)")] if msr_open else [])
+        body = (f"<div>{_select('ddlfin', [(f, f) for f in FIN_YEARS], fin_year)}</div>"
+                f"<div>{_select('ddlpanch', [('', '--Select--')] + [(p, p) for p in PANCHAYATS], panchayat)}</div>"
+                f"<div>Search Work: {_text_input('txtsearch_work', search, postback=True)}</div>"
+                f"<div>{_select('ddlworkcode', [('', '--Select--')] + [(w['code'], w['code']) for w in works], work['code'] if work else '')}</div>"
+                f"<div>{_select('ddlmustroll', msr_options, msr_no, postback=False)}</div>"
+                f"{_button('btnSave', 'Save')}<div>{_label('lblmsg', message, 'green')}</div>"
+                f'<div id="ValidationSummary1"{hidden}>{escape(validation)}</div>')
+        return self._render("Muster Roll as Zero", body)
+
+    def send_for_pay(self, form):
+        fin_year = form.value(_WL + "ddlfin")
+        pending = self.pending_wagelists(fin_year) if fin_year else []
+        wagelist = form.value(_WL + "ddl_sel", "select")
+        if wagelist not in pending or form.changed(_WL + "ddlfin"): wagelist = "select"
+        alert = None
+
+        if form.clicked(_WL + "btnsubmit") and wagelist != "select":
+            with self._lock: self.sent.add(wagelist)
+            alert = f"Wage List {wagelist} has been sent for payment."
+            pending.remove(wagelist)
+            wagelist = "select"
+
+        grid = ""
+        if wagelist != "select":
+            rows = []
+            for i in range(self.wagelist_rows[wagelist]):
+                row_id, row_name = f"{_WL}GridView1_ctl{i + 2:02d}_", f"ctl00$ContentPlaceHolder1$GridView1$ctl{i + 2:02d}$"
+                radios = "".join(f'<input type="radio" id="{row_id}rdbPayment_{j}" name="{row_name}rdbPayment" value="{j}" />'
+                                 for j in range(3))
+                rows.append(f"<tr><td>{i + 1}</td><td>Worker {i + 1}</td><td>{radios}</td></tr>")
+            grid = f'<table id="{_WL}GridView1" border="1"><tr><th>S.No.</th><th>Name</th><th>Payment</th></tr>{"".join(rows)}</table>'
+
+        body = (f"<div>{_select(_WL + 'ddlfin', [('', '--Select--')] + [(f, f) for f in FIN_YEARS], fin_year)}</div>"
+                f"<div>{_select(_WL + 'ddl_sel', [('select', '--Select--')] + [(wl, wl) for wl in pending], wagelist)}</div>"
+                f"{grid}{_button(_WL + 'btnsubmit', 'Submit')}")
+        return self._render("Send Wage List For Payment", body, alert)
+
+    def preprint_msr(self, form):
+        panchayat = form.value("exe_agency")
+        search = form.value("txtWork").strip()
+        works = self._find_works(panchayat, search) if panchayat else []
+        work = self._by_code.get(form.value("ddlWorkCode"))
+        if work not in works or form.changed("exe_agency"): work = None
+        designation = form.value("ddldesg")
+        staff = form.value("ddlstaff") if designation and not form.changed("ddldesg") else ""
+        date_from, date_to = form.value("txtDateFrom"), form.value("txtDateTo")
+        alert, notice = None, ""
+
+        if form.clicked("btnProceed"):
+            if not work: alert = "Please select Work."
+            elif not (date_from and date_to): alert = "Please enter From Date and To Date."
+            elif not staff: alert = "Please select Technical Staff."
+            elif work["mr_issue"]: notice = work["mr_issue"]
+            else:
+                with self._lock:
+                    overlap = (work["code"], date_from) in self.issued
+                    self.issued.add((work["code"], date_from))
+                if overlap: notice = "Muster Roll dates overlap that period of an already issued Muster Roll."
+                else: return self._muster_roll_document(work, date_from, date_to, staff)
+
+        body = (f"<div>{_select('exe_agency', [('', '--Select--')] + [(p, config.AGENCY_PREFIX + p) for p in PANCHAYATS], panchayat)}</div>"
+                f"<div>Work: {_text_input('txtWork', search)} {_button('imgButtonSearch', 'Search')}</div>"
+                f"<div>{_select('ddlWorkCode', [('', '--Select--')] + [(w['code'], w['code']) for w in works], work['code'] if work else '', postback=False)}</div>"
+                f"<div>From {_text_input('txtDateFrom', date_from)} To {_text_input('txtDateTo', date_to)}</div>"
+                f"<div>{_select('ddldesg', [('', '--Select--')] + [(d, d) for d in DESIGNATIONS], designation)}</div>"
+                f"<div>{_select('ddlstaff', [('', '--Select--')] + ([(s, s) for s in STAFF] if designation else []), staff, postback=False)}</div>"
+                f'<p><font color="red">{escape(notice)}</font></p>{_button("btnProceed", "Proceed")}')
+        return self._render("Pre-Printed Muster Roll", body, alert)
+
+    def _muster_roll_document(self, work, date_from, date_to, staff):
+        days = "".join(f"<th>D{d}</th>" for d in range(1, 8))
+        rows = "".join(f"<tr><td>{i + 1}</td><td>Worker {i + 1}</td><td>JH-01-001-001-{i + 1:03d}/{i + 10}</td>"
+                       + "<td></td>" * 7 + "</tr>" for i in range(work["workers"]))
+        return (f"<!DOCTYPE html><html><head><title>Muster Roll</title></head><body>"
+                f"<h3>Muster Roll No. {work['msr_no']}</h3><p>Work Code: {escape(work['code'])}</p>"
+                f"<p>Period: {escape(date_from)} to {escape(date_to)} | Technical Staff: {escape(staff)}</p>"
+                f'<table border="1"><tr><th>S.No.</th><th>Name</th><th>Job Card</th>{days}</tr>{rows}</table></body></html>')
+
+
+PAGES = {
+    "msrpayment.aspx": FakePortal.msr_payment,
+    "musteraszero.aspx": FakePortal.zero_mr,
+    "sendforpay.aspx": FakePortal.send_for_pay,
+    "preprintmsr.aspx": FakePortal.preprint_msr,
+}
+
+
+class _PortalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass # Keep harness output readable
+
+    def _reply(self, status, html):
+        data = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, fields):
+        portal = self.server.portal
+        page = urlparse(self.path).path.rstrip("/").rsplit("/", 1)[-1].lower()
+        if not page:
+            links = "".join(f'<li><a href="/Netnrega/{name}">{name}</a></li>' for name in PAGES)
+            return self._reply(200, f"<html><body><h3>NregaBot fake portal</h3><ul>{links}</ul></body></html>")
+        if page not in PAGES:
+            return self._reply(404, "<html><body><h1>404 - File or directory not found.</h1></body></html>")
+        if portal._delay_and_maybe_fail():
+            return self._reply(500, _SERVER_ERROR)
+        self._reply(200, PAGES[page](portal, _Postback(fields)))
+
+    def do_GET(self):
+        self._handle({})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", errors="replace")
+        fields = {k: v[0] for k, v in parse_qs(body, keep_blank_values=True).items()}
+        with self.server.portal._lock: self.server.portal.stats["postbacks"] += 1
+        self._handle(fields)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake NREGA portal")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, 0..jitter seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500 page")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    portal = FakePortal(port=args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, seed=args.seed).start()
+    print(f"Fake portal running at {portal.base_url}/ (Ctrl+C to stop)")
+    try:
+        while True: time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        portal.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
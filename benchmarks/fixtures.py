@@ -0,0 +1,119 @@
+# benchmarks/fixtures.py
+# Synthetic, anonymized inputs shaped like NREGA portal pages/exports.
+# Everything is seeded so runs are comparable with the stored baseline.
+import os
+import csv
+import random
+from html import escape
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+WORK_TYPES = ["IF", "LD", "WC", "RC", "FP", "DP"]
+WORK_NAMES = ["Construction of Animal Shed", "Well Construction", "Construction of Farm Pond",
+              "Land Development", "Rural Connectivity Road", "Plantation Work"]
+
+
+def corpus_files(extension):
+    return sorted(os.path.join(CORPUS_DIR, f) for f in os.listdir(CORPUS_DIR) if f.endswith(extension))
+
+
+def _rng(seed):
+    return random.Random(seed)
+
+
+def work_code(rng):
+    return f"34060{rng.randint(10000, 99999)}/{rng.choice(WORK_TYPES)}/{rng.randint(10**12, 10**13 - 1)}"
+
+
+def workcode_paste_text(lines, seed=1):
+    """Text as copied from a portal table: one work code (and wagelist) per line, ~10% repeats."""
+    rng = _rng(seed)
+    codes = [work_code(rng) for _ in range(max(1, int(lines * 0.9)))]
+    out = []
+    for i in range(lines):
+        code = rng.choice(codes)
+        out.append(f"{i + 1}\t{code}\t{rng.choice(WORK_NAMES)} for Beneficiary {i}\t"
+                   f"3406004WL{rng.randint(0, 999999):06d}\t{rng.randint(1, 28):02d}-04-2025")
+    return "\n".join(out)
+
+
+def mis_report_html(rows, seed=2):
+    """MIS drill-down page with a two-row header, the junk '1 2 3..' row and a Total row."""
+    rng = _rng(seed)
+    parts = ['<html><body><table id="ContentPlaceHolder1_grdDelay" border="1">',
+             '<tr><th>S.No.</th><th>Panchayat</th><th colspan="3">Muster Rolls</th><th colspan="2">Amount (In Lakhs)</th></tr>',
+             '<tr><th>S.No.</th><th>Panchayat</th><th>Total MRs</th><th>Paid within 15 days</th><th>Delayed</th>'
+             '<th>Total Amount</th><th>Delayed Amount</th></tr>',
+             '<tr>' + ''.join(f'<td>{i}</td>' for i in range(1, 8)) + '</tr>']
+    for i in range(rows):
+        total = rng.randint(10, 400)
+        delayed = rng.randint(0, total)
+        parts.append(f"<tr><td>{i + 1}</td><td>{escape(f'PANCHAYAT {i:05d}')}</td><td>{total}</td><td>{total - delayed}</td>"
+                     f"<td>{delayed}</td><td>{rng.uniform(1, 90):.2f}</td><td>{rng.uniform(0, 9):.2f}</td></tr>")
+    parts.append('<tr><td>Total</td><td></td><td>0</td><td>0</td><td>0</td><td>0</td><td>0</td></tr></table></body></html>')
+    return "".join(parts)
+
+
+def write_demand_csv(path, applicants, seed=3):
+    rng = _rng(seed)
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["S No", "Name of Applicant", "Job card number", "Gender", "Age", "Village"])
+        for i in range(applicants):
+            jc = f"JH-01-{rng.randint(1, 20):03d}-{rng.randint(1, 60):03d}-{rng.randint(1, 999):03d}/{rng.randint(1, 300)}"
+            writer.writerow([i + 1, f"Applicant {i:06d}", jc, rng.choice("MF"), rng.randint(18, 70), f"Village {i % 40}"])
+    return path
+
+
+def pendency_rows(rows, seed=4):
+    """Results-tree rows as MrTrackingTab stores them (14 columns)."""
+    rng = _rng(seed)
+    out = []
+    for i in range(rows):
+        days = rng.randint(0, 15)
+        status = f"Pending since {days} days" if rng.random() < 0.8 else "Paid"
+        row = [i + 1, f"PANCHAYAT {rng.randint(0, 40):02d}", f"MR{rng.randint(0, rows // 3)}",
+               work_code(rng), "", "", "", status, "", "", "", "", "Signed", "Pending since 2 day"]
+        out.append(tuple(row))
+    return out
+
+
+def report_table(rows, columns=8, seed=5):
+    """Generic (headers, data) for the PDF/PNG/Excel exporters."""
+    rng = _rng(seed)
+    headers = ["S.No.", "Panchayat", "Work Code", "Work Name", "Job Card", "Status", "Days", "Amount"][:columns]
+    data = []
+    for i in range(rows):
+        row = [i + 1, f"PANCHAYAT {i % 40:02d}", work_code(rng), rng.choice(WORK_NAMES),
+               f"JH-01-{rng.randint(1, 20):03d}-{rng.randint(1, 60):03d}-{rng.randint(1, 999):03d}/{rng.randint(1, 300)}",
+               rng.choice(["Pending", "Paid", "Rejected"]), rng.randint(0, 30), f"{rng.uniform(100, 9000):.2f}"]
+        data.append(row[:columns])
+    return headers, data
+
+
+def write_mr_pdf_set(folder, count, font_path=None, seed=6):
+    """
+    Writes `count` MR-like PDFs (landscape table with an embedded TTF font, like
+    Chrome's printToPDF output) and returns their paths.
+    """
+    from fpdf import FPDF
+    rng = _rng(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(count):
+        pdf = FPDF(orientation="L")
+        if font_path and os.path.exists(font_path):
+            pdf.add_font("MR", "", font_path)
+            pdf.set_font("MR", size=9)
+        else:
+            pdf.set_font("Helvetica", size=9)
+        for _ in range(rng.randint(1, 2)):
+            pdf.add_page()
+            pdf.cell(0, 8, f"Muster Roll {i:05d} - {work_code(rng)}", new_x="LMARGIN", new_y="NEXT")
+            for r in range(25):
+                pdf.cell(0, 6, f"{r + 1}  Worker {rng.randint(0, 9999):04d}  JH-01-{rng.randint(1, 999):03d}  "
+                               f"{'P ' * rng.randint(3, 7)} {rng.randint(200, 2000)}", new_x="LMARGIN", new_y="NEXT")
+        path = os.path.join(folder, f"{i:05d}.pdf")
+        pdf.output(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,243 @@
+# benchmarks/portal_harness.py
+"""
+Runs the real per-item tab logic (_process_single_*) against fake_portal.py in
+headless Chrome and reports items/minute, outcomes and per-step p50/p95.
+
+    python -m benchmarks.portal_harness --tab msr --items 20
+    python -m benchmarks.portal_harness --tab zero_mr --latency 0.8 --jitter 0.4
+    python -m benchmarks.portal_harness --tab send --workers 3 --error-rate 0.05
+    python -m benchmarks.portal_harness --tab muster --show-browser
+
+The tabs are not built as widgets: each worker gets a headless tab (see
+batch_runner.py) and its own browser.
+Setup that normally happens in run_automation_logic (panchayat / fin year
+selection) is repeated here the same way.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+import config
+from perf_monitor import STEP_ORDER
+from batch_runner import HeadlessApp, make_headless_tab
+from pdf_pipeline import PdfSaveQueue
+from tabs.msr_tab import MsrTab
+from tabs.zero_mr_tab import ZeroMrTab
+from tabs.wagelist_send_tab import WagelistSendTab
+from tabs.musterroll_gen_tab import MusterrollGenTab
+from benchmarks.fake_portal import FakePortal, PANCHAYATS, FIN_YEARS, STAFF, WAGE_RATE
+
+
+def _printer(verbose):
+    def show(event):
+        if verbose and event["type"] == "log" and event["level"] != "debug":
+            print(f"  [{threading.current_thread().name}] {event['level'].upper():<7} {event['message']}")
+    return show
+
+
+def make_tab(tab_class, app, automation_key):
+    tab = make_headless_tab(tab_class, app, automation_key)
+    tab.success_count = tab.skipped_count = 0
+    tab.current_session_files = []
+    return tab
+
+
+def _select_and_wait(driver, wait, element_id, text=None, value=None):
+    """Selects an option that triggers a postback and waits for the new page."""
+    element = wait.until(EC.presence_of_element_located((By.ID, element_id)))
+    select = Select(element)
+    if value is not None: select.select_by_value(value)
+    else: select.select_by_visible_text(text)
+    wait.until(EC.staleness_of(element))
+    wait.until(EC.presence_of_element_located((By.ID, element_id)))
+
+
+# --- Scenarios: items(portal, count), setup(tab, driver, wait, context), run(tab, driver, wait, item, context), finish(tab, context) ---
+class Scenario:
+    def __init__(self, tab_class, key, status_column, items, setup, run, finish=None):
+        self.tab_class, self.key, self.status_column = tab_class, key, status_column
+        self.items, self.setup, self.run, self.finish = items, setup, run, finish
+
+
+PANCHAYAT = PANCHAYATS[0]
+FIN_YEAR = FIN_YEARS[-1]
+
+
+def _msr_setup(tab, driver, wait, context):
+    driver.get(config.MSR_CONFIG["url"])
+    _select_and_wait(driver, wait, "ddlPanchayat", PANCHAYAT)
+
+def _msr_run(tab, driver, wait, item, context):
+    tab._process_single_work_code(driver, wait, item, float(WAGE_RATE))
+
+
+def _zero_mr_setup(tab, driver, wait, context):
+    driver.get(config.ZERO_MR_CONFIG["url"])
+    if Select(wait.until(EC.presence_of_element_located((By.ID, "ddlfin")))).first_selected_option.text != FIN_YEAR:
+        _select_and_wait(driver, wait, "ddlfin", FIN_YEAR)
+    _select_and_wait(driver, wait, "ddlpanch", PANCHAYAT)
+
+def _zero_mr_run(tab, driver, wait, item, context):
+    tab._process_single_item(driver, wait, *item)
+
+
+def _send_setup(tab, driver, wait, context):
+    driver.get(config.WAGELIST_SEND_CONFIG["url"])
+    _select_and_wait(driver, wait, "ctl00_ContentPlaceHolder1_ddlfin", value=FIN_YEAR)
+
+def _send_run(tab, driver, wait, item, context):
+    # WagelistSendTab logs the row in its run loop, not in the per-item function
+    success = tab._process_single_wagelist(driver, wait, item, FIN_YEAR)
+    tab.results_tree.insert("", "end", values=(item, "Success" if success else "Failed", ""))
+
+
+def _muster_setup(tab, driver, wait, context):
+    tab.pdf_queue, tab.pending_saves = PdfSaveQueue(), []
+    context["skip"] = set()
+
+def _muster_run(tab, driver, wait, item, context):
+    inputs = {"panchayat": PANCHAYAT, "start_date": "01/04/2025", "end_date": "07/04/2025",
+              "designation": "Junior Engineer--GP", "staff": STAFF[0], "auto_mode": False,
+              "orientation": "Landscape", "scale": 80, "output_action": "Save as PDF", "save_to_cloud": False}
+    tab._process_single_item(driver, wait, inputs, item, context["output_dir"], context["skip"])
+
+def _muster_finish(tab, context):
+    tab.pdf_queue.close()
+
+
+SCENARIOS = {
+    "msr": Scenario(MsrTab, "msr", 1,
+                    lambda portal, n: portal.work_keys(PANCHAYAT)[:n], _msr_setup, _msr_run),
+    "zero_mr": Scenario(ZeroMrTab, "zero_mr", 2,
+                        lambda portal, n: portal.muster_rolls(PANCHAYAT)[:n], _zero_mr_setup, _zero_mr_run),
+    "send": Scenario(WagelistSendTab, "send", 1,
+                     lambda portal, n: portal.pending_wagelists(FIN_YEAR)[:n], _send_setup, _send_run),
+    "muster": Scenario(MusterrollGenTab, "muster", 2,
+                       lambda portal, n: portal.work_keys(PANCHAYAT)[:n], _muster_setup, _muster_run, _muster_finish),
+}
+
+
+def point_config_at(portal, no_pacing=False):
+    config.MSR_CONFIG["url"] = portal.url("msrpayment.aspx")
+    config.ZERO_MR_CONFIG["url"] = portal.url("musteraszero.aspx")
+    config.WAGELIST_SEND_CONFIG["url"] = portal.url("sendforpay.aspx")
+    config.MUSTER_ROLL_CONFIG["base_url"] = portal.url("preprintmsr.aspx")
+    if no_pacing:
+        config.RATE_CONFIG.update(floors={}, default_floor=0.0, max_delay=0.0)
+
+
+def new_driver(show_browser=False):
+    opts = ChromeOptions()
+    if not show_browser: opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--window-size=1366,900")
+    return webdriver.Chrome(options=opts)
+
+
+def _worker(scenario, app, items, args, context, tabs, errors):
+    driver = None
+    try:
+        driver = app.perf_monitor.instrument_driver(new_driver(args.show_browser))
+        wait = WebDriverWait(driver, 20)
+        tab = make_tab(scenario.tab_class, app, scenario.key)
+        tabs.append(tab)
+        scenario.setup(tab, driver, wait, context)
+        for item in items:
+            if app.stop_events[scenario.key].is_set(): break
+            scenario.run(tab, driver, wait, item, context)
+        if scenario.finish: scenario.finish(tab, context)
+    except Exception as e:
+        errors.append(f"{threading.current_thread().name}: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+    finally:
+        if driver:
+            try: driver.quit()
+            except Exception: pass
+
+
+def run_scenario(scenario, portal, args):
+    app = HeadlessApp(emit=_printer(args.verbose))
+    items = scenario.items(portal, args.items)
+    work_dir = tempfile.mkdtemp(prefix="nregabot_portal_")
+    tabs, errors, threads = [], [], []
+    start = time.perf_counter()
+    try:
+        for w in range(args.workers):
+            context = {"output_dir": work_dir}
+            share = items[w::args.workers]
+            t = threading.Thread(target=_worker, args=(scenario, app, share, args, context, tabs, errors), name=f"worker{w + 1}")
+            t.start(); threads.append(t)
+        try:
+            for t in threads: t.join()
+        except KeyboardInterrupt:
+            app.stop_events[scenario.key].set()
+            for t in threads: t.join()
+    finally:
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    rows = [row for tab in tabs for row in tab.results_tree.rows]
+    outcomes = Counter(str(row[scenario.status_column]).title() for row in rows)
+    return {"items": len(rows), "planned": len(items), "seconds": elapsed, "outcomes": outcomes,
+            "errors": errors, "summary": app.perf_monitor.summarize().get(scenario.key)}
+
+
+def report(name, result, portal, args):
+    minutes = result["seconds"] / 60.0
+    print(f"\n== {name}: {result['items']}/{result['planned']} items, {args.workers} worker(s), "
+          f"latency {args.latency}s +{args.jitter}s, error rate {args.error_rate:.0%}")
+    print(f"   wall {result['seconds']:.1f}s  ->  {result['items'] / minutes if minutes else 0:.1f} items/min")
+    print(f"   outcomes: {', '.join(f'{k} {v}' for k, v in sorted(result['outcomes'].items())) or '-'}")
+    print(f"   server: {portal.stats['requests']} requests, {portal.stats['postbacks']} postbacks, {portal.stats['errors']} injected errors")
+    for error in result["errors"]: print(f"   ! {error}")
+
+    summary = result["summary"]
+    if not summary: return
+    print(f"   commands/item {summary['commands_per_item']:.1f}")
+    print(f"   {'Step':<10}{'n':>6}{'p50 (s)':>10}{'p95 (s)':>10}")
+    steps = summary["steps"]
+    for step in [s for s in STEP_ORDER if s in steps] + sorted(s for s in steps if s not in STEP_ORDER):
+        n, p50, p95 = steps[step]
+        print(f"   {step:<10}{n:>6}{p50:>10.2f}{p95:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive NregaBot tabs against the local fake portal")
+    parser.add_argument("--tab", choices=sorted(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--items", type=int, default=10, help="Items per tab")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel browsers (items are split between them)")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-pacing", action="store_true", help="Drop the pauses between items (rate controller floors and back-off)")
+    parser.add_argument("--show-browser", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Print the tabs' log lines")
+    args = parser.parse_args(argv)
+
+    names = sorted(SCENARIOS) if args.tab == "all" else [args.tab]
+    for name in names:
+        # A fresh portal per tab so server state and request counts start clean
+        with FakePortal(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed) as portal:
+            point_config_at(portal, args.no_pacing)
+            report(name, run_scenario(SCENARIOS[name], portal, args), portal, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+# benchmarks/run.py
+"""
+Offline benchmarks for NregaBot's parsing and export hot paths.
+
+Runs without network or a browser: every case works on the recorded pages in
+benchmarks/corpus or on seeded synthetic inputs from fixtures.py.
+
+    python -m benchmarks.run                   # run all, compare with baseline.json
+    python -m benchmarks.run --only mis        # cases whose name contains "mis"
+    python -m benchmarks.run --scale 0.1       # smaller inputs for a quick check
+    python -m benchmarks.run --save-baseline   # record current numbers as the baseline
+
+Exit code is 1 when a case is slower (or uses more peak memory) than the
+baseline by more than --tolerance.
+"""
+import os
+import sys
+import gc
+import io
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from benchmarks import fixtures
+from tabs.base_tab import BaseAutomationTab
+from tabs.workcode_extractor_tab import extract_codes
+from tabs.mis_reports_tab import read_report_table, format_report_sheet
+from tabs.demand_tab import read_applicants_csv
+from tabs.mr_tracking_tab import MrTrackingTab, summarize_pendency
+from utils import resource_path
+import pdf_merge
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class _ExportHost:
+    """Stand-in for a tab: the shared exporters only need _wrap_text (and app for error dialogs)."""
+    app = None
+    _wrap_text = BaseAutomationTab._wrap_text
+    generate_report_pdf = BaseAutomationTab.generate_report_pdf
+    generate_report_image = BaseAutomationTab.generate_report_image
+    save_to_excel = MrTrackingTab._save_to_excel
+
+
+# --- Cases: name -> (setup(work_dir, scale) -> args, run(*args)) ---
+def _n(base, scale):
+    return max(1, int(base * scale))
+
+
+def _setup_workcodes(work_dir, scale):
+    return (fixtures.workcode_paste_text(_n(10000, scale)),)
+
+def _run_workcodes(text):
+    extract_codes(text)
+    extract_codes(text, full_code=True, remove_duplicates=False)
+    extract_codes(text, wagelists=True, date_filter="05-04-2025")
+
+
+def _setup_corpus_pages(work_dir, scale):
+    pages = []
+    for path in fixtures.corpus_files(".html"):
+        with open(path, encoding="utf-8") as f: pages.append(f.read())
+    with open(fixtures.corpus_files(".txt")[0], encoding="utf-8") as f: paste = f.read()
+    return pages, paste
+
+def _run_corpus_pages(pages, paste):
+    for page in pages:
+        df, _ = read_report_table(page)
+        assert not df.empty
+    assert extract_codes(paste)
+
+
+def _setup_mis_html(work_dir, scale):
+    return (fixtures.mis_report_html(_n(10000, scale)),)
+
+def _run_mis_html(html):
+    df, notes = read_report_table(html)
+    assert len(df.columns) == 7 and notes
+
+
+def _setup_mis_excel(work_dir, scale):
+    df, _ = read_report_table(fixtures.mis_report_html(_n(10000, scale)))
+    return (df,)
+
+def _run_mis_excel(df):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name="Report", index=False, startrow=1)
+        format_report_sheet(writer.sheets["Report"], "Delay in Payments", df)
+
+
+def _setup_demand_csv(work_dir, scale):
+    return (fixtures.write_demand_csv(os.path.join(work_dir, "demand.csv"), _n(20000, scale)),)
+
+def _run_demand_csv(path):
+    assert read_applicants_csv(path)
+
+
+def _setup_pendency(work_dir, scale):
+    return (fixtures.pendency_rows(_n(50000, scale)),)
+
+def _run_pendency(rows):
+    summarize_pendency(rows)
+
+
+def _setup_export_excel(work_dir, scale):
+    headers, data = fixtures.report_table(_n(10000, scale))
+    return headers, data, os.path.join(work_dir, "report.xlsx")
+
+def _run_export_excel(headers, data, path):
+    assert _ExportHost().save_to_excel(data, headers, "MR Tracking Report", path)
+
+
+def _setup_export_pdf(work_dir, scale):
+    headers, data = fixtures.report_table(_n(2000, scale))
+    return headers, data, [12, 30, 60, 60, 45, 20, 12, 20], os.path.join(work_dir, "report.pdf")
+
+def _run_export_pdf(headers, data, col_widths, path):
+    assert _ExportHost().generate_report_pdf(data, headers, col_widths, "MR Tracking Report", "01-04-2025", path)
+
+
+def _setup_export_png(work_dir, scale):
+    headers, data = fixtures.report_table(_n(1000, scale))
+    return headers, data, os.path.join(work_dir, "report.png")
+
+def _run_export_png(headers, data, path):
+    assert _ExportHost().generate_report_image(data, headers, "MR Tracking Report", "01-04-2025", path)
+
+
+def _setup_pdf_merge(work_dir, scale):
+    font = resource_path("assets/fonts/DejaVuSans.ttf")
+    files = fixtures.write_mr_pdf_set(os.path.join(work_dir, "mr_pdfs"), _n(500, scale), font)
+    return files, os.path.join(work_dir, "merged.pdf")
+
+def _run_pdf_merge(files, output_path):
+    for path in pdf_merge.merge_pdfs(files, output_path): os.remove(path)
+
+
+CASES = [
+    ("corpus_recorded_pages", _setup_corpus_pages, _run_corpus_pages),
+    ("workcode_extract_10k_lines", _setup_workcodes, _run_workcodes),
+    ("mis_read_html_10k_rows", _setup_mis_html, _run_mis_html),
+    ("mis_excel_format_10k_rows", _setup_mis_excel, _run_mis_excel),
+    ("demand_csv_20k_applicants", _setup_demand_csv, _run_demand_csv),
+    ("mr_pendency_50k_rows", _setup_pendency, _run_pendency),
+    ("export_excel_10k_rows", _setup_export_excel, _run_export_excel),
+    ("export_pdf_2k_rows", _setup_export_pdf, _run_export_pdf),
+    ("export_png_1k_rows", _setup_export_png, _run_export_png),
+    ("pdf_merge_500_files", _setup_pdf_merge, _run_pdf_merge),
+]
+
+
+def measure(run, args, repeat):
+    """Best-of-N wall time, then one extra run under tracemalloc for peak Python memory."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / (1024 * 1024)
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_FILE): return {}
+    with open(BASELINE_FILE, encoding="utf-8") as f:
+        return json.load(f).get("cases", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline NregaBot benchmarks")
+    parser.add_argument("--only", help="Run only cases whose name contains this text")
+    parser.add_argument("--scale", type=float, default=1.0, help="Input size multiplier (baselines assume 1.0)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.30, help="Allowed slowdown/memory growth vs baseline (0.30 = 30%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    if args.save_baseline and args.scale != 1.0:
+        parser.error("--save-baseline needs the default --scale 1.0")
+
+    cases = [c for c in CASES if not args.only or args.only in c[0]]
+    baseline = load_baseline() if args.scale == 1.0 else {}
+    results, regressions = {}, []
+
+    print(f"{'Case':<30}{'Time (s)':>10}{'Peak (MB)':>11}{'vs baseline':>14}")
+    work_dir = tempfile.mkdtemp(prefix="nregabot_bench_")
+    try:
+        for name, setup, run in cases:
+            seconds, peak_mb = measure(run, setup(work_dir, args.scale), args.repeat)
+            results[name] = {"seconds": round(seconds, 4), "peak_mb": round(peak_mb, 2)}
+
+            note = ""
+            if name in baseline:
+                base = baseline[name]
+                time_ratio = seconds / base["seconds"] if base["seconds"] else 1.0
+                mem_ratio = peak_mb / base["peak_mb"] if base["peak_mb"] else 1.0
+                note = f"{time_ratio:>6.2f}x/{mem_ratio:.2f}x"
+                if time_ratio > 1 + args.tolerance or mem_ratio > 1 + args.tolerance:
+                    regressions.append(name)
+                    note += " !"
+            print(f"{name:<30}{seconds:>10.3f}{peak_mb:>11.1f}{note:>14}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        stored = load_baseline()
+        stored.update(results)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "cases": stored}, f, indent=2)
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+
+    if regressions:
+        print(f"\nRegressions (> {args.tolerance:.0%} over baseline): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
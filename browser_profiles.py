@@ -0,0 +1,190 @@
+# browser_profiles.py
+"""
+Named browser profiles, each with its own NREGA login (e.g. one per block / GP),
+so automations for different logins can run at the same time.
+
+- "Chrome" (port 9222) and "Edge" (port 9223) are the browsers NregaBot always
+  launched. They keep their fixed ports and profile folders, so existing setups work as before.
+- An added profile gets its own user-data-dir and is launched with
+  --remote-debugging-port=0. The browser picks a free port and writes it to
+  DevToolsActivePort in the profile folder, and the port is read from there.
+- A profile is busy while an automation (tab run, queued job, pipeline) holds it.
+  acquire() takes a named profile, or the next idle one that is running.
+"""
+import os
+import re
+import json
+import socket
+import threading
+import subprocess
+
+import config
+from utils import get_data_path
+
+PROFILES_FILE = "browser_profiles.json"
+PROFILES_ROOT = os.path.join(os.path.expanduser("~"), "NregaBotProfiles")
+
+DEFAULT_PROFILES = [
+    {"name": "Chrome", "browser": "chrome", "port": 9222, "dir": os.path.join(os.path.expanduser("~"), "ChromeProfileForNREGABot")},
+    {"name": "Edge", "browser": "edge", "port": 9223, "dir": os.path.join(os.path.expanduser("~"), "EdgeProfileForNREGABot")},
+]
+
+BROWSER_PATHS = {
+    "chrome": {
+        "Darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+        "Windows": [r"C:\Program Files\Google\Chrome\Application\chrome.exe", r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"]
+    },
+    "edge": {
+        "Darwin": ["/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"],
+        "Windows": [r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe", r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"]
+    },
+}
+BROWSER_NAMES = {"chrome": "Google Chrome", "edge": "Microsoft Edge"}
+
+# Background tabs keep running at full speed while an automation works in another window
+_COMMON_FLAGS = ["--disable-backgrounding-occluded-windows", "--disable-renderer-backgrounding", "--disable-background-timer-throttling"]
+_EXTRA_FLAGS = {"chrome": ["--disable-gpu", "--disable-software-rasterizer", "--log-level=3", "--silent"], "edge": []}
+
+
+class BrowserProfile:
+    def __init__(self, name, browser="chrome", port=0, dir=None, note=""):
+        self.name, self.browser, self.note = name, browser, note
+        self.port = int(port or 0) # 0 = dynamic, read from DevToolsActivePort
+        self.dir = dir or os.path.join(PROFILES_ROOT, re.sub(r"[^\w-]+", "_", name).strip("_") or "profile")
+
+    @property
+    def is_default(self):
+        return any(p["name"] == self.name for p in DEFAULT_PROFILES)
+
+    def debug_port(self):
+        """The port the running browser listens on, or None if unknown."""
+        if self.port: return self.port
+        try:
+            with open(os.path.join(self.dir, "DevToolsActivePort"), "r") as f:
+                return int(f.readline().strip())
+        except (OSError, ValueError): return None
+
+    def is_running(self):
+        port = self.debug_port()
+        if not port: return False
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2): return True
+        except OSError: return False
+
+    def to_dict(self):
+        return {"name": self.name, "browser": self.browser, "port": self.port, "dir": self.dir, "note": self.note}
+
+
+def find_browser(browser):
+    return next((p for p in BROWSER_PATHS.get(browser, {}).get(config.OS_SYSTEM, []) if os.path.exists(p)), None)
+
+
+def launch(profile, urls):
+    """Starts the profile's browser detached from NregaBot. Raises FileNotFoundError if it isn't installed."""
+    b_path = find_browser(profile.browser)
+    if not b_path: raise FileNotFoundError(f"{BROWSER_NAMES.get(profile.browser, profile.browser)} not found.")
+    os.makedirs(profile.dir, exist_ok=True)
+    if not profile.port: # Stale port from the last run must not be mistaken for this one
+        try: os.remove(os.path.join(profile.dir, "DevToolsActivePort"))
+        except OSError: pass
+    cmd = [b_path, f"--remote-debugging-port={profile.port}", f"--user-data-dir={profile.dir}"] + _COMMON_FLAGS + _EXTRA_FLAGS.get(profile.browser, []) + list(urls)
+    flags = 0x00000008 if config.OS_SYSTEM == "Windows" else 0
+    subprocess.Popen(cmd, creationflags=flags, start_new_session=(config.OS_SYSTEM != "Windows"),
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def attach_driver(browser, port):
+    """WebDriver attached to a running Chrome / Edge on the given debug port."""
+    from selenium import webdriver
+    if browser == "edge":
+        from selenium.webdriver.edge.options import Options as EdgeOptions
+        opts = EdgeOptions()
+        opts.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+        return webdriver.Edge(options=opts)
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    opts = ChromeOptions()
+    opts.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+    return webdriver.Chrome(options=opts)
+
+
+class ProfileManager:
+    def __init__(self, path=None):
+        self.path = path or get_data_path(PROFILES_FILE)
+        self._lock = threading.Lock()
+        self._busy = {} # Profile name -> who holds it ("Job #3", "Pipeline", ...)
+        self.profiles = {}
+        self.load()
+
+    def load(self):
+        saved = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f: saved = json.load(f)
+            except (json.JSONDecodeError, IOError): saved = []
+        with self._lock:
+            self.profiles = {p["name"]: BrowserProfile(**p) for p in DEFAULT_PROFILES}
+            for p in saved:
+                if p.get("name") and p["name"] not in self.profiles:
+                    self.profiles[p["name"]] = BrowserProfile(p["name"], p.get("browser", "chrome"), 0, p.get("dir"), p.get("note", ""))
+
+    def save(self):
+        with self._lock: added = [p.to_dict() for p in self.profiles.values() if not p.is_default]
+        try:
+            with open(self.path, 'w') as f: json.dump(added, f, indent=4)
+        except IOError as e: print(f"Error saving browser profiles: {e}")
+
+    # --- Profiles ---
+    def add(self, name, browser="chrome", note=""):
+        name = name.strip()
+        if not name: raise ValueError("Profile name is required.")
+        if browser not in BROWSER_PATHS: raise ValueError(f"Unknown browser '{browser}'.")
+        with self._lock:
+            if name.lower() in (n.lower() for n in self.profiles): raise ValueError(f"Profile '{name}' already exists.")
+            profile = self.profiles[name] = BrowserProfile(name, browser, 0, None, note.strip())
+        self.save()
+        return profile
+
+    def remove(self, name):
+        """Forgets the profile; its folder (and login) stays on disk."""
+        with self._lock:
+            profile = self.profiles.get(name)
+            if not profile or profile.is_default: return False
+            if name in self._busy: raise ValueError(f"'{name}' is in use by {self._busy[name]}.")
+            del self.profiles[name]
+        self.save()
+        return True
+
+    def get(self, name):
+        with self._lock: return self.profiles.get(name)
+
+    def running(self):
+        with self._lock: profiles = list(self.profiles.values())
+        return [p for p in profiles if p.is_running()]
+
+    # --- Busy / idle ---
+    def acquire(self, owner, name=None):
+        """Marks a running profile busy for `owner` (again is fine). name=None takes the next idle one. None if nothing fits."""
+        for profile in self.running():
+            if name and profile.name != name: continue
+            with self._lock:
+                if self._busy.get(profile.name, owner) != owner: continue
+                self._busy[profile.name] = owner
+                return profile
+        return None
+
+    def release(self, name, owner=None):
+        with self._lock:
+            if name in self._busy and (owner is None or self._busy[name] == owner): del self._busy[name]
+
+    def busy_owner(self, name):
+        with self._lock: return self._busy.get(name)
+
+    def status(self):
+        """Rows for the profiles window."""
+        with self._lock: profiles, busy = list(self.profiles.values()), dict(self._busy)
+        rows = []
+        for p in profiles:
+            running = p.is_running()
+            state = f"Busy ({busy[p.name]})" if p.name in busy else "Idle" if running else "Stopped"
+            rows.append({"name": p.name, "browser": p.browser, "port": p.debug_port() if running else "", "note": p.note, "status": state})
+        return rows
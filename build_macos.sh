@@ -75,6 +75,20 @@ pyinstaller --noconfirm --clean --windowed --name "${APP_NAME}" \
 --hidden-import=browser_manager \
 --hidden-import=icon_manager \
 --hidden-import=sound_manager \
+--hidden-import=transfer_manager \
+--hidden-import=pdf_merge \
+--hidden-import=pdf_pipeline \
+--hidden-import=perf_monitor \
+--hidden-import=batch_runner \
+--hidden-import=job_scheduler \
+--hidden-import=stage_pipeline \
+--hidden-import=session_guard \
+--hidden-import=browser_profiles \
+--hidden-import=rate_controller \
+--hidden-import=retry_policy \
+--hidden-import=command_channel \
+--hidden-import=dropdowns \
+--hidden-import=ui_governor \
 $HIDDEN_IMPORTS \
 loader.py
 
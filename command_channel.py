@@ -0,0 +1,231 @@
+# command_channel.py
+"""
+Local command channel of a running NregaBot (the single-instance socket, 127.0.0.1:60123),
+so scripts and spreadsheets can queue work without touching the UI.
+
+Protocol: the client sends one JSON object per line and gets one JSON object per
+line back. Every reply has "ok"; failures carry "error". The old bare b'focus'
+from a second launch still works.
+
+Every command except "focus" carries "token": the contents of command_token.txt in the
+app data folder (written on first start). Only someone who can read the user's files
+can queue or cancel work; other local programs get {"ok": false}.
+
+    {"cmd": "focus"}
+    {"cmd": "automations"}                         -> {"automations": {key: [required inputs]}}
+    {"cmd": "enqueue", "jobs": [{...}], "priority": "High"}   -> {"jobs": [ids]}
+        (jobs have the job-file shape, see batch_runner.py; "file": path queues a JSON/CSV job file)
+    {"cmd": "status"}  /  {"cmd": "status", "job": 3}          -> {"jobs": [...]} / {"job": {...}}
+    {"cmd": "results", "job": 3, "from": 0, "follow": true}
+        -> one {"row": {...}} line per result (with follow: until the job ends), then {"ok": true, "job": {...}}
+    {"cmd": "cancel", "job": 3}
+
+Client:
+
+    python command_channel.py enqueue jobs.csv --priority High --wait
+    python command_channel.py enqueue - < jobs.json
+    python command_channel.py status [JOB]
+    python command_channel.py results JOB [--follow]
+    python command_channel.py cancel JOB
+"""
+import os
+import sys
+import json
+import time
+import socket
+import hmac
+import secrets
+import argparse
+import threading
+
+from utils import get_data_path
+
+HOST, PORT = "127.0.0.1", 60123
+FOLLOW_POLL = 0.5 # Seconds between checks for new result rows
+TOKEN_FILE = "command_token.txt"
+
+
+def load_token(create=False):
+    """The channel's shared secret from the app data folder ('' if missing). create=True writes a new one when missing."""
+    path = get_data_path(TOKEN_FILE)
+    try:
+        with open(path, encoding="utf-8") as f: token = f.read().strip()
+    except OSError: token = ""
+    if token or not create: return token
+    token = secrets.token_hex(16)
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f: f.write(token)
+    return token
+
+
+# --- Server (inside NregaBotApp) ---
+class CommandServer:
+    def __init__(self, app, sock):
+        self.app, self.sock = app, sock
+        self.token = load_token(create=True)
+
+    def start(self):
+        threading.Thread(target=self._serve, daemon=True, name="command-channel").start()
+
+    def _serve(self):
+        self.sock.listen(5)
+        while True:
+            try: conn, _ = self.sock.accept()
+            except (OSError, ValueError): break
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            reader = conn.makefile("rb")
+            send = lambda obj: conn.sendall((json.dumps(obj, default=str) + "\n").encode("utf-8"))
+            try:
+                for line in reader:
+                    line = line.strip()
+                    if not line: continue
+                    if line == b'focus': self._focus(); continue # Second launch (old format)
+                    try: request = json.loads(line.decode("utf-8"))
+                    except ValueError: send({"ok": False, "error": "Request must be one JSON object per line."}); continue
+                    if not isinstance(request, dict): send({"ok": False, "error": "Request must be one JSON object per line."}); continue
+                    if request.get("cmd") != "focus" and not hmac.compare_digest(str(request.get("token", "")), self.token):
+                        send({"ok": False, "error": f"Missing or wrong token (see {TOKEN_FILE} in the NregaBot data folder)."}); continue
+                    try: self._dispatch(request, send)
+                    except (ValueError, KeyError, TypeError, OSError) as e: send({"ok": False, "error": str(e)})
+                    except Exception as e: send({"ok": False, "error": f"{type(e).__name__}: {e}"}) # Never leave the client without a reply
+            except OSError: pass # Client went away
+
+    def _focus(self):
+        self.app.after(0, self.app.bring_to_front)
+
+    def _job_id(self, request):
+        try: return int(request["job"])
+        except (KeyError, TypeError, ValueError): raise ValueError("'job' must be a job number.")
+
+    def _dispatch(self, request, send):
+        from batch_runner import JOBS
+        from job_scheduler import parse_priority
+        scheduler = self.app.job_scheduler
+        cmd = request.get("cmd")
+        if cmd == "focus":
+            self._focus(); send({"ok": True})
+        elif cmd == "automations":
+            send({"ok": True, "automations": {key: list(spec.required) for key, spec in JOBS.items()}})
+        elif cmd == "enqueue":
+            priority = parse_priority(request.get("priority"))
+            if request.get("file"):
+                jobs = scheduler.add_job_file(request["file"], priority)
+            else:
+                specs = request.get("jobs") or ([request["job"]] if isinstance(request.get("job"), dict) else [])
+                if not specs: raise ValueError("Nothing to enqueue: give 'jobs' or 'file'.")
+                if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+                    raise ValueError("'jobs' must be a list of JSON objects.")
+                jobs = [scheduler.add_job(spec, parse_priority(spec.get("priority"), priority), "command") for spec in specs]
+            self.app.after(0, self.app.show_toast, f"{len(jobs)} job(s) queued from outside", "info")
+            send({"ok": True, "jobs": [job.id for job in jobs]})
+        elif cmd == "status":
+            if "job" not in request:
+                send({"ok": True, "jobs": [scheduler.job_info(row["id"]) for row in scheduler.snapshot()]}); return
+            info = scheduler.job_info(self._job_id(request))
+            send({"ok": True, "job": info} if info else {"ok": False, "error": "Unknown job."})
+        elif cmd == "results":
+            self._stream_results(self._job_id(request), int(request.get("from", 0)), bool(request.get("follow")), send)
+        elif cmd == "cancel":
+            job_id = self._job_id(request)
+            if not scheduler.job_info(job_id): send({"ok": False, "error": "Unknown job."}); return
+            scheduler.cancel(job_id)
+            send({"ok": True, "job": scheduler.job_info(job_id)})
+        else:
+            send({"ok": False, "error": f"Unknown command '{cmd}'."})
+
+    def _stream_results(self, job_id, start, follow, send):
+        scheduler = self.app.job_scheduler
+        while True:
+            info = scheduler.job_info(job_id, rows_from=start)
+            if not info: send({"ok": False, "error": "Unknown job."}); return
+            for row in info.pop("rows"): send({"row": row})
+            start = info["done"]
+            if not follow or not info["open"]:
+                send({"ok": True, "job": info}); return
+            time.sleep(FOLLOW_POLL)
+
+
+# --- Client ---
+def request(obj, on_line=None, timeout=None):
+    """Sends one command (with the token); returns the final reply. Streamed lines before it go to on_line."""
+    token = load_token()
+    if not token: raise ValueError(f"No {TOKEN_FILE} in {get_data_path()}: start NregaBot once first.")
+    with socket.create_connection((HOST, PORT), timeout=5) as conn:
+        conn.settimeout(timeout)
+        conn.sendall((json.dumps(dict(obj, token=token)) + "\n").encode("utf-8"))
+        for line in conn.makefile("rb"):
+            reply = json.loads(line.decode("utf-8"))
+            if "row" in reply and on_line: on_line(reply)
+            elif "ok" in reply: return reply
+    raise ConnectionError("NregaBot closed the connection without a reply.")
+
+
+def _print_job(job):
+    results = ", ".join(f"{k} {v}" for k, v in sorted(job["results"].items())) or "-"
+    error = f"  ERROR: {job['error']}" if job.get("error") else ""
+    print(f"#{job['id']:<4} {job['status']:<10} {job['automation']:<10} {job['panchayat'] or '-':<18} {job['done']}/{job['items']} items  {results}{error}")
+
+
+def _print_row(reply):
+    row = reply["row"]
+    print(f"  {row['item']}\t{row['status']}\t{row['details']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Queue work in a running NregaBot and follow it.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enqueue = sub.add_parser("enqueue", help="Queue a JSON/CSV job file (or '-' for JSON on stdin)")
+    enqueue.add_argument("file")
+    enqueue.add_argument("--priority", default="Normal", help="High, Normal or Low")
+    enqueue.add_argument("--wait", action="store_true", help="Print results until the queued jobs finish")
+    status = sub.add_parser("status", help="Show all jobs or one job")
+    status.add_argument("job", nargs="?", type=int)
+    results = sub.add_parser("results", help="Print a job's result rows")
+    results.add_argument("job", type=int)
+    results.add_argument("--follow", action="store_true", help="Keep printing until the job ends")
+    cancel = sub.add_parser("cancel", help="Cancel a queued or running job")
+    cancel.add_argument("job", type=int)
+    sub.add_parser("automations", help="List automations and their required inputs")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "enqueue":
+            if args.file == "-":
+                data = json.load(sys.stdin)
+                reply = request({"cmd": "enqueue", "jobs": data.get("jobs", []) if isinstance(data, dict) else data, "priority": args.priority})
+            else:
+                reply = request({"cmd": "enqueue", "file": os.path.abspath(args.file), "priority": args.priority})
+            if not reply["ok"]: raise ValueError(reply["error"])
+            print(f"Queued job(s): {', '.join(f'#{j}' for j in reply['jobs'])}")
+            failed = False
+            for job_id in reply["jobs"] if args.wait else []:
+                final = request({"cmd": "results", "job": job_id, "follow": True}, _print_row)
+                _print_job(final["job"])
+                failed = failed or final["job"]["status"] != "Done"
+            return 1 if failed else 0
+        if args.command == "status":
+            reply = request({"cmd": "status"} if args.job is None else {"cmd": "status", "job": args.job})
+            if not reply["ok"]: raise ValueError(reply["error"])
+            for job in reply.get("jobs") or [reply["job"]]: _print_job(job)
+        elif args.command == "results":
+            reply = request({"cmd": "results", "job": args.job, "follow": args.follow}, _print_row)
+            if not reply["ok"]: raise ValueError(reply["error"])
+            _print_job(reply["job"])
+        elif args.command == "cancel":
+            reply = request({"cmd": "cancel", "job": args.job})
+            if not reply["ok"]: raise ValueError(reply["error"])
+            _print_job(reply["job"])
+        elif args.command == "automations":
+            reply = request({"cmd": "automations"})
+            for key, required in reply["automations"].items(): print(f"{key:<12} {', '.join(required)}")
+    except (ConnectionRefusedError, socket.timeout):
+        print("NregaBot is not running (nothing on 127.0.0.1:60123).", file=sys.stderr); return 2
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr); return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,17 +48,25 @@ MUSTER_ROLL_CONFIG = {
     }
 }
 
+# Merged PDFs are built in chunks of this many input files (bounds merge memory)
+PDF_MERGE_CONFIG = {
+    "chunk_size": 50,
+    "mr_volume_pages": 500, # MR Gen / Duplicate MR merges with "Split" ticked: pages per volume (caps the merge process' memory)
+}
+
 MSR_CONFIG = {
     "url": "https://nregade4.nic.in/Netnrega/msrpayment.aspx",
-    "work_code_index": 1, "muster_roll_index": 1, "min_delay": 2, "max_delay": 6
+    "work_code_index": 1, "muster_roll_index": 1
 }
 
 WAGELIST_GEN_CONFIG = {
     "base_url": 'https://nregade4.nic.in/Netnrega/SendMSRtoPO.aspx',
+    "batch_size": 5, # Muster rolls ticked per Generate click (falls back to 1 if the portal refuses)
 }
 
 WAGELIST_SEND_CONFIG = {
     "url": "https://nregade4.nic.in/Netnrega/sendforpay.aspx",
+    "parallel_tabs": 1, # Browser tabs sending at once (each takes the next wagelist of the range)
     "defaults": {
         "start_row": "3",
         "end_row": "19"
@@ -108,7 +116,9 @@ WC_GEN_CONFIG = {
 FTO_GEN_CONFIG = {
     "login_url": "https://mnregaweb3.nic.in/Netnrega/FTO/Login.aspx?&level=HomeACGP&state_code=34",
     "aadhaar_fto_url": "https://mnregaweb3.nic.in/netnrega/FTO/ftoverify_aadhar.aspx",
-    "top_up_fto_url": "https://mnregaweb3.nic.in/netnrega/FTO/ftoverify_aadhar.aspx?wg_topup=S"
+    "top_up_fto_url": "https://mnregaweb3.nic.in/netnrega/FTO/ftoverify_aadhar.aspx?wg_topup=S",
+    "parallel_tabs": 2, # Verification pages worked at the same time (Chrome / Edge launched from NregaBot)
+    "max_rounds": 10 # A page is re-checked after each FTO (more rows may be pending); at most this many FTOs per page per run
 }
 
 JOBCARD_VERIFY_CONFIG = {
@@ -193,6 +203,62 @@ WORK_ALLOCATION_CONFIG = {
     "url": "https://nregade4.nic.in/Netnrega/workalloc.aspx"
 }
 
+# Pipeline mode (MR Fill -> MR Payment -> eMB Entry): items waiting between two stages
+# before the faster stage pauses, and the browser profile the stages attach to ("" = next free one)
+PIPELINE_CONFIG = {
+    "queue_size": 5,
+    "profile": "",
+}
+
+# Adaptive pause between items (rate_controller.py). Floors are the minimum pause in
+# seconds per automation key; above it the pause follows the portal's health
+RATE_CONFIG = {
+    "floors": {"msr": 0.0, "send": 1.0},
+    "default_floor": 0.0,
+    "backoff_start": 2.0,
+    "max_delay": 30.0,
+    "slow_ms": 4000,
+    "slow_factor": 3.0,
+    "max_error_rate": 0.3,
+}
+
+# In-run retry (retry_policy.py): attempts per item and backoff in seconds. Texts are
+# matched (lower-case) against exceptions and _log_result rows; permanent wins,
+# anything matching neither is permanent
+RETRY_CONFIG = {
+    "max_attempts": 3,
+    "base_backoff": 1.5,
+    "max_backoff": 20.0,
+    "retryable_patterns": ["timeout", "timed out", "stale element", "staleelement", "server busy", "server is busy", "server too busy",
+                           "object reference not set", "service unavailable", "bad gateway", "runtime error",
+                           "connection reset", "connection aborted", "try again", "click intercepted"],
+    "permanent_patterns": ["invalid", "not matched", "already", "required", "pending for", "not filled",
+                           "no final confirmation", "session expired", "sessionexpired", "no such window", "invalid session",
+                           "manual mode", "after save"],
+}
+
+# Session guard: signs that the portal has logged us out mid-run (URL / alert text),
+# how often a failed element lookup may trigger a URL check, and how long to wait for re-login
+SESSION_GUARD_CONFIG = {
+    "login_url": "https://nregade4.nic.in/netnrega/Login.aspx?&level=HomePO&state_code=34",
+    "login_url_markers": ["login.aspx", "sessionexpired", "logout.aspx"],
+    "alert_markers": ["session", "expire", "login again", "re-login"],
+    "check_interval": 2,
+    "relogin_timeout": 600,
+}
+
+# UI activity governor (ui_governor.py): animations slow down by busy_factor during automations,
+# background checks run every interval seconds (up to max_interval after failures), hidden_factor x less often while minimized
+UI_GOVERNOR_CONFIG = {
+    "busy_factor": 3,
+    "hidden_factor": 4,
+    "unfocused_factor": 1.5, # On screen but another app has the focus: animate and poll a little slower
+    "ping_interval": 20,
+    "ping_max_interval": 300,
+    "app_config_interval": 120,
+    "app_config_max_interval": 900,
+}
+
 import os
 import json
 from utils import get_data_path
@@ -0,0 +1,132 @@
+# dropdowns.py
+"""
+<select> helpers that read or pick options in one script call.
+
+Going through Select(...).options costs one WebDriver round trip per option
+(plus one more for every opt.text / get_attribute("value")). On work-code dropdowns
+with hundreds of options that is most of a tab's time. Here the whole list comes
+back at once as Option(value, text, selected), and matching is done locally.
+
+`select` is the <select> WebElement or its element id.
+
+    opts = read_options(driver, "ddlWorkCode")                 # [Option(value, text, selected), ...]
+    real = [o.text for o in opts if o.value]                     # e.g. skip the "--Select--" entry
+    pick = find_option(opts, "Palojori", match="contains")
+    select_option(driver, "ddlPanchayat", text="Palojori")     # picks it and fires the page's change handler
+"""
+import re
+import difflib
+from collections import namedtuple
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.ui import WebDriverWait
+
+Option = namedtuple("Option", "value text selected")
+
+_EL = "var s = typeof arguments[0] === 'string' ? document.getElementById(arguments[0]) : arguments[0];"
+
+_READ_JS = _EL + """
+if (!s || !s.options) return null;
+return Array.prototype.map.call(s.options, function (o) { return [o.value, o.text, o.selected]; });
+"""
+# Same events as a user's pick, so ASP.NET AutoPostBack / jQuery handlers run
+_SELECT_JS = _EL + """
+s.selectedIndex = arguments[1];
+s.dispatchEvent(new Event('input', {bubbles: true}));
+s.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+_COUNT_JS = _EL + "return s && s.options ? s.options.length : 0;"
+# [value, text] of the chosen option of each given dropdown (null if missing / nothing chosen)
+_SELECTED_MANY_JS = """
+return arguments[0].map(function (x) {
+    var s = typeof x === 'string' ? document.getElementById(x) : x, o = s && s.options && s.options[s.selectedIndex];
+    return o ? [o.value, o.text] : null;
+});
+"""
+
+
+def normalize(text):
+    """Case- and whitespace-insensitive form used for text matching."""
+    return re.sub(r"\s+", " ", str(text or "")).strip().casefold()
+
+
+def read_options(driver, select):
+    """All options as Option(value, text, selected); [] if the dropdown isn't there."""
+    rows = driver.execute_script(_READ_JS, select)
+    return [Option(value, text, bool(selected)) for value, text, selected in rows or []]
+
+
+def option_texts(driver, select, skip_placeholders=True):
+    """Option texts; placeholders ("--Select--", empty / "0" / "00" values) left out unless asked for."""
+    return [o.text for o in read_options(driver, select) if not (skip_placeholders and is_placeholder(o))]
+
+
+def is_placeholder(option):
+    text = normalize(option.text)
+    return option.value in ("", "0", "00", "select") or text == "select" or text.startswith(("--select", "-- select"))
+
+
+def selected_option(driver, select):
+    return next((o for o in read_options(driver, select) if o.selected), None)
+
+
+def selected_options(driver, selects):
+    """Chosen Option of each dropdown in one call; None where it is missing or nothing is chosen."""
+    return [Option(row[0], row[1], True) if row else None for row in driver.execute_script(_SELECTED_MANY_JS, list(selects)) or []]
+
+
+def selected_texts(driver, selects):
+    """Chosen text of each dropdown; "" where it is missing or still on a placeholder."""
+    return [o.text if o and not is_placeholder(o) else "" for o in selected_options(driver, selects)]
+
+
+def option_count(driver, select):
+    return driver.execute_script(_COUNT_JS, select) or 0
+
+
+def wait_for_options(driver, select, min_count=2, timeout=20):
+    """Waits until the dropdown has at least min_count options; returns them."""
+    WebDriverWait(driver, timeout).until(lambda d: option_count(d, select) >= min_count)
+    return read_options(driver, select)
+
+
+def find_option(options, query, match="exact", by="text", cutoff=0.8):
+    """
+    Local lookup in read_options() output. match: "exact" (normalized), "contains",
+    "prefix" or "fuzzy" (closest text above cutoff). by: "text" or "value". None if nothing fits.
+    """
+    q = normalize(query)
+    if not q: return None
+    key = (lambda o: normalize(o.value)) if by == "value" else (lambda o: normalize(o.text))
+    if match == "exact": return next((o for o in options if key(o) == q), None)
+    if match == "contains": return next((o for o in options if q in key(o)), None)
+    if match == "prefix": return next((o for o in options if key(o).startswith(q)), None)
+    if match == "fuzzy":
+        exact = next((o for o in options if key(o) == q), None)
+        if exact: return exact
+        keys = [key(o) for o in options]
+        close = difflib.get_close_matches(q, keys, n=1, cutoff=cutoff)
+        return options[keys.index(close[0])] if close else None
+    raise ValueError(f"Unknown match mode '{match}'.")
+
+
+def select_option(driver, select, value=None, text=None, match="exact", index=None, options=None, force=False):
+    """
+    Selects by value, by text (with find_option's match modes) or by index, in one call
+    (plus one read, unless `options` from read_options is passed). Returns the chosen Option.
+    force=True fires the change handler even if the option is already chosen.
+    Raises NoSuchElementException like Select.select_by_* when nothing matches.
+    """
+    options = options if options is not None else read_options(driver, select)
+    if index is not None:
+        if not 0 <= index < len(options): raise NoSuchElementException(f"Could not locate option index {index}")
+        target = options[index]
+    elif value is not None:
+        target = next((o for o in options if o.value == value), None)
+    else:
+        target = find_option(options, text, match)
+    if target is None:
+        raise NoSuchElementException(f"Could not locate option: {value if value is not None else text}")
+    if force or not target.selected:
+        driver.execute_script(_SELECT_JS, select, options.index(target))
+    return target
@@ -27,6 +27,8 @@ def load_icons():
     _add("whatsapp", "assets/icons/whatsapp.png")
     _add("feedback", "assets/icons/feedback.png")
     _add("history", "assets/icons/history.png")
+    _add("job_queue", "assets/icons/emojis/thunder.png")
+    _add("browser_profiles", "assets/icons/emojis/login_automation.png")
     
     # --- TOOLS ---
     _add("extractor_icon", "assets/icons/extractor.png", size=(20, 20))
@@ -0,0 +1,297 @@
+# job_scheduler.py
+"""
+Central queue for automation jobs, so several automations can run back to back
+(e.g. MR Gen -> eMB Entry -> MSR for 10 panchayats) without babysitting.
+
+- Jobs have the same shape as batch_runner.py job files ({"automation": ..., inputs}).
+  They come from a tab's "+ Queue" button or from a job file.
+- Each running browser profile (see browser_profiles.py) is a session. A session runs
+  one job at a time; different sessions run in parallel. A job with a "profile" only
+  runs on that profile. A profile an interactive tab is using, or one held by a
+  pipeline, is left alone until that run finishes.
+- Jobs run the tab's own logic on a widgetless tab (see batch_runner.py), so the
+  open tabs are not touched. Dialogs from a job thread become log lines.
+- Lower priority number runs first; pause holds new jobs (running ones finish).
+"""
+import os
+import time
+import heapq
+import itertools
+import threading
+from collections import Counter, deque
+from tkinter import messagebox
+
+from batch_runner import HeadlessApp, JOBS, load_jobs, run_job
+from browser_profiles import attach_driver
+
+PRIORITIES = {"High": 0, "Normal": 1, "Low": 2}
+PRIORITY_NAMES = {v: k for k, v in PRIORITIES.items()}
+
+
+def parse_priority(value, default=1):
+    """'high' / 'Normal' / 0..2 -> priority number."""
+    if value is None or value == "": return default
+    if isinstance(value, str) and value.strip().title() in PRIORITIES: return PRIORITIES[value.strip().title()]
+    try: return max(0, min(2, int(value)))
+    except (TypeError, ValueError): return default
+
+
+# --- Tab start_automation args -> job inputs (one per queueable tab) ---
+def _muster_job(inputs):
+    job = {k: inputs[k] for k in ("panchayat", "start_date", "end_date", "designation", "staff", "orientation", "scale", "output_action", "save_to_cloud")}
+    job["items"] = inputs["work_codes"]
+    return job
+
+FROM_TAB_ARGS = {
+    "muster": _muster_job,
+    "msr": lambda panchayat, verify_amount, work_keys: {"panchayat": panchayat, "verify_amount": verify_amount, "items": work_keys},
+    "gen": lambda agency, save_pdf=False, send_to_sender=False: {"panchayat": agency, "save_pdf": save_pdf, "send_to_sender": send_to_sender},
+    "send": lambda fin_year, start_wl, end_wl, parallel_tabs=None: {"fin_year": fin_year, "start_wagelist": start_wl, "end_wagelist": end_wl, "parallel_tabs": parallel_tabs},
+    "mb_entry": lambda cfg, work_codes: dict(cfg, panchayat=cfg["panchayat_name"], items=work_codes),
+}
+
+
+class Job:
+    def __init__(self, job_id, inputs, priority=1, source=""):
+        self.id, self.inputs, self.priority, self.source = job_id, inputs, priority, source
+        self.automation = inputs["automation"]
+        self.profile = inputs.get("profile") or None # Browser profile this job must run on (None = next free)
+        self.status = "Queued" # Queued -> Running (-> Cancelling) -> Done / Failed / Cancelled
+        self.session = ""
+        self.results = Counter()
+        self.rows = [] # (item, status, details) per result, in order (streamed by command_channel.py)
+        self.error = None
+        self.started = self.finished = None
+        self.log = deque(maxlen=300)
+
+    @property
+    def label(self):
+        return f"{self.automation} {self.inputs.get('panchayat', '')}".strip()
+
+    @property
+    def item_count(self):
+        items = self.inputs.get("items") or []
+        return len(items.splitlines()) if isinstance(items, str) else len(items)
+
+    @property
+    def is_open(self):
+        return self.status in ("Queued", "Running", "Cancelling")
+
+
+class SessionApp(HeadlessApp):
+    """One attached browser profile. History and perf samples go to the main app's DB."""
+    def __init__(self, app, profile, emit):
+        # The port is read on attach: a dynamic-port profile gets a new one each launch
+        super().__init__(lambda: attach_driver(profile.browser, profile.debug_port()), emit, app.get_user_downloads_path(), profile.browser)
+        self.name, self.profile, self.main_app = profile.name, profile, app
+        self.history_manager, self.perf_monitor = app.history_manager, app.perf_monitor
+        self.rate_controller = app.rate_controller # Pacing is per host, shared with the app's own runs
+        self.job = None
+
+    # Cloud upload (MR Gen) uses the signed-in app's key and transfer engine
+    @property
+    def license_info(self): return self.main_app.license_info
+
+    @property
+    def transfer_manager(self): return self.main_app.transfer_manager
+
+    def send_wagelist_data_and_switch_tab(self, start, end):
+        # Same hand-off as the Wagelist Gen tab's own run: fill the Send tab
+        self.main_app.after(0, self.main_app.send_wagelist_data_and_switch_tab, start, end)
+
+    def is_reachable(self):
+        return self.profile.is_running()
+
+    def drop_dead_driver(self):
+        if not self.driver: return
+        try: _ = self.driver.window_handles
+        except Exception: self.driver = None
+
+
+class JobScheduler:
+    def __init__(self, app):
+        self.app = app
+        self.jobs = [] # Every job in submit order (queue view)
+        self._heap = [] # (priority, id, job); stale entries are skipped on pop
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._sessions = {}
+        self._dispatcher = None
+        self._pending_capture = set()
+        self.paused = False
+
+    # --- Adding jobs ---
+    def add_job(self, inputs, priority=1, source=""):
+        spec = JOBS.get(inputs.get("automation"))
+        if not spec: raise ValueError(f"Unknown automation '{inputs.get('automation')}'.")
+        missing = [k for k in spec.required if not inputs.get(k)]
+        if missing: raise ValueError(f"{inputs['automation']}: missing {', '.join(missing)}.")
+        if inputs.get("profile") and not self.app.profile_manager.get(inputs["profile"]):
+            raise ValueError(f"{inputs['automation']}: unknown browser profile '{inputs['profile']}'.")
+        with self._cond:
+            job = Job(next(self._ids), dict(inputs), priority, source)
+            self.jobs.append(job)
+            heapq.heappush(self._heap, (job.priority, job.id, job))
+            self._cond.notify_all()
+        self._ensure_dispatcher()
+        return job
+
+    def add_job_file(self, path, priority=1):
+        return [self.add_job(job, parse_priority(job.get("priority"), priority), os.path.basename(path)) for job in load_jobs(path)]
+
+    def queue_from_tab(self, tab, priority=1):
+        """Runs the tab's own input checks; start_automation_thread then hands the args to capture()."""
+        key = tab.automation_key
+        self._pending_capture.add((key, priority))
+        try: tab.start_automation()
+        finally: self._pending_capture.discard((key, priority))
+
+    def capture(self, key, args):
+        """Called by start_automation_thread. True if the start was turned into a queued job."""
+        pending = next((p for k, p in self._pending_capture if k == key), None)
+        if pending is None or key not in FROM_TAB_ARGS: return False
+        self._pending_capture.discard((key, pending))
+        try: job = self.add_job(dict(FROM_TAB_ARGS[key](*args), automation=key), pending, "tab")
+        except ValueError as e:
+            messagebox.showwarning("Cannot Queue", str(e))
+            return True
+        self.app.play_sound("select")
+        self.app.show_toast(f"Queued job #{job.id}: {job.label}", "info")
+        return True
+
+    # --- Queue control ---
+    def pause(self):
+        with self._cond: self.paused = True
+
+    def resume(self):
+        with self._cond:
+            self.paused = False
+            self._cond.notify_all()
+
+    def cancel(self, job_id):
+        with self._cond:
+            job = next((j for j in self.jobs if j.id == job_id), None)
+            if not job or not job.is_open: return
+            if job.status == "Queued": job.status = "Cancelled"
+            else:
+                job.status = "Cancelling"
+                session = next((s for s in self._sessions.values() if s.job is job), None)
+                if session: session.stop_events[job.automation].set()
+
+    def set_priority(self, job_id, priority):
+        with self._cond:
+            job = next((j for j in self.jobs if j.id == job_id and j.status == "Queued"), None)
+            if not job or job.priority == priority: return
+            job.priority = priority
+            heapq.heappush(self._heap, (priority, job.id, job))
+            self._cond.notify_all()
+
+    def clear_finished(self):
+        with self._cond: self.jobs = [j for j in self.jobs if j.is_open]
+
+    def running_browsers(self):
+        """Names of the browser profiles running jobs."""
+        with self._cond: return {s.name for s in self._sessions.values() if s.job}
+
+    def open_jobs(self):
+        with self._cond: return sum(1 for j in self.jobs if j.is_open)
+
+    def job_info(self, job_id, rows_from=None):
+        """One job as plain data (None if unknown). rows_from includes its result rows from that index on."""
+        with self._cond:
+            job = next((j for j in self.jobs if j.id == job_id), None)
+            if not job: return None
+            info = {"id": job.id, "automation": job.automation, "panchayat": job.inputs.get("panchayat", ""),
+                    "priority": PRIORITY_NAMES.get(job.priority, job.priority), "profile": job.profile, "session": job.session,
+                    "status": job.status, "open": job.is_open, "items": job.item_count, "done": len(job.rows),
+                    "results": dict(job.results), "error": job.error}
+            if rows_from is not None:
+                info["rows"] = [{"item": i, "status": s, "details": d} for i, s, d in job.rows[rows_from:]]
+            return info
+
+    def snapshot(self):
+        """Copies of the job rows for the queue view."""
+        with self._cond:
+            return [{"id": j.id, "priority": PRIORITY_NAMES.get(j.priority, j.priority), "automation": j.automation,
+                     "panchayat": j.inputs.get("panchayat", ""), "items": j.item_count, "session": j.session,
+                     "status": j.status, "results": ", ".join(f"{k} {v}" for k, v in sorted(j.results.items())),
+                     "error": j.error, "log": list(j.log)} for j in self.jobs]
+
+    # --- Dispatching ---
+    def _ensure_dispatcher(self):
+        if self._dispatcher and self._dispatcher.is_alive(): return
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True, name="job-dispatcher")
+        self._dispatcher.start()
+
+    def _free_sessions(self):
+        profiles = self.app.profile_manager
+        free = []
+        for profile in profiles.running():
+            session = self._sessions.get(profile.name)
+            if session is None:
+                session = self._sessions[profile.name] = SessionApp(self.app, profile, lambda event, n=profile.name: self._on_event(n, event))
+            if session.job is None and not profiles.busy_owner(profile.name): free.append(session)
+        return free
+
+    def _pop_next(self, session_name):
+        """Highest-priority queued job that may run on this session (stale heap entries are dropped)."""
+        self._heap = [e for e in self._heap if e[2].status == "Queued" and e[0] == e[2].priority]
+        heapq.heapify(self._heap)
+        for entry in sorted(self._heap):
+            if entry[2].profile in (None, session_name):
+                self._heap.remove(entry); heapq.heapify(self._heap)
+                return entry[2]
+        return None
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while self.paused or not any(j.status == "Queued" for j in self.jobs): self._cond.wait()
+            for session in self._free_sessions():
+                with self._cond:
+                    job = None if self.paused else self._pop_next(session.name)
+                    if not job: continue
+                    if not self.app.profile_manager.acquire(f"Job #{job.id}", session.name):
+                        heapq.heappush(self._heap, (job.priority, job.id, job)); continue # Taken meanwhile
+                    job.status, job.session, session.job = "Running", session.name, job
+                threading.Thread(target=self._run, args=(session, job), daemon=True, name=f"job-{job.id}").start()
+            with self._cond: self._cond.wait(2.0) # Re-check sessions (browser launched / tab run finished)
+
+    def _run(self, session, job):
+        job.started = time.time()
+        self.app.after(0, self.app.prevent_sleep)
+        try:
+            end = run_job(session, job.id, job.inputs)
+        except Exception as e:
+            end = {"error": f"{type(e).__name__}: {e}"}
+        session.drop_dead_driver()
+        with self._cond:
+            job.finished = time.time()
+            job.error = job.error or end.get("error")
+            job.status = "Cancelled" if job.status == "Cancelling" else "Failed" if job.error else "Done"
+            session.job = None
+            self.app.profile_manager.release(session.name, f"Job #{job.id}")
+            idle = not any(j.is_open for j in self.jobs)
+            self._cond.notify_all()
+
+        summary = ", ".join(f"{k} {v}" for k, v in sorted(job.results.items())) or "no results"
+        self.app.history_manager.log_activity("ERROR" if job.status == "Failed" else "SUCCESS",
+                                              f"[Job Queue] #{job.id} {job.label}: {job.status} ({summary})")
+        if idle:
+            self.app.after(0, self.app.play_sound, "success")
+            self.app.after(0, self.app.show_toast, "Job queue finished", "success")
+            if not self.app.active_automations: self.app.after(0, self.app.allow_sleep)
+
+    def _on_event(self, name, event):
+        job = self._sessions[name].job
+        if not job: return
+        kind = event["type"]
+        if kind == "result":
+            job.results[event["status"] or "-"] += 1
+            job.rows.append((event["item"], event["status"], event["details"]))
+            job.log.append(f"{event['item']}: {event['status']} {event['details']}".rstrip())
+        elif kind == "log" and event["level"] != "debug":
+            job.log.append(f"[{event['level'].upper()}] {event['message']}")
+        elif kind == "dialog": # The job's tab gets HeadlessDialogs: nothing pops up over the UI
+            job.log.append(f"[{event['kind']}] {event['title']}: {event['message']}")
+            if event["kind"] == "showerror" and not job.error: job.error = f"{event['title']}: {event['message']}"
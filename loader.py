@@ -6,6 +6,7 @@ import zipfile
 import json
 import shutil
 import threading
+import multiprocessing
 import subprocess
 import traceback
 from appdirs import user_data_dir
@@ -275,6 +276,8 @@ class ModernSplashScreen(ctk.CTk):
         
 # --- Entry Point ---
 if __name__ == "__main__":
+    # PDF merges run in a child process; the frozen exe must hand it off here
+    multiprocessing.freeze_support()
     if HAS_UI_LIBS:
         app = ModernSplashScreen()
         try:
@@ -6,6 +6,7 @@
 
 # --- Standard Library ---
 import threading
+import multiprocessing
 import time
 import subprocess
 import os
@@ -44,6 +45,15 @@ from tab_config import get_tabs_definition
 from icon_manager import load_icons
 from sound_manager import SoundManager
 from workflow_manager import WorkflowManager
+from transfer_manager import TransferManager
+from perf_monitor import PerfMonitor, STEP_ORDER
+from job_scheduler import JobScheduler, PRIORITIES
+from session_guard import SessionGuard
+from rate_controller import RateController
+from retry_policy import RetryPolicy
+from ui_governor import UIGovernor
+from command_channel import CommandServer
+from browser_profiles import ProfileManager, BROWSER_NAMES
 from location_data import STATE_DISTRICT_MAP
 from tabs.history_manager import HistoryManager
 from utils import (
@@ -99,10 +109,18 @@ class NregaBotApp(ctk.CTk):
 
         # --- Service Managers ---
         self.history_manager = HistoryManager(self.get_data_path)
+        self.profile_manager = ProfileManager(self.get_data_path('browser_profiles.json'))
         self.browser_manager = BrowserManager(self)
         self.services = ServiceManager(self)
         self.sound_manager = SoundManager(self)
         self.workflows = WorkflowManager(self)
+        self.transfer_manager = TransferManager(self)
+        self.perf_monitor = PerfMonitor(self)
+        self.session_guard = SessionGuard(self)
+        self.rate_controller = RateController(self)
+        self.retry_policy = RetryPolicy(self)
+        self.ui_governor = UIGovernor(self)
+        self.job_scheduler = JobScheduler(self)
         
         # --- State Variables ---
         self.machine_id = self.services.machine_id
@@ -113,6 +131,8 @@ class NregaBotApp(ctk.CTk):
         
         self.driver = None
         self.active_browser = None
+        self.active_profile = None
+        self._interactive_lease = None # Profile held for the tabs' own runs (see _lease_active_profile)
         self.open_on_about_tab = False
         self.sleep_prevention_process = None
         self.is_validating_license = False
@@ -214,6 +234,8 @@ class NregaBotApp(ctk.CTk):
         """Called on main thread after background loading is done."""
         self.bind("<Button-1>", self._on_global_click, add="+")
         self.bind("<FocusIn>", self._on_window_focus)
+        self.ui_governor.attach()
+        self.after(2000, lambda: threading.Thread(target=self.sound_manager.preload, daemon=True).start()) # Decode sounds at idle, not on first play
 
         self.style_treeview()
         
@@ -358,7 +380,9 @@ class NregaBotApp(ctk.CTk):
 
     def on_closing(self, force=False):
         """Handles application shutdown."""
-        if force or messagebox.askokcancel("Quit", "Quit application?", parent=self):
+        open_jobs = 0 if force else self.job_scheduler.open_jobs()
+        question = f"{open_jobs} queued/running job(s) will be cancelled.\nQuit application?" if open_jobs else "Quit application?"
+        if force or messagebox.askokcancel("Quit", question, parent=self):
             try:
                 self.play_sound("shutdown")
                 self.attributes("-alpha", 0.0) # Hide window immediately
@@ -761,12 +785,13 @@ class NregaBotApp(ctk.CTk):
             self.launch_chrome_btn.configure(state="disabled")
             self.launch_edge_btn.configure(state="disabled")
             self.launch_firefox_btn.configure(state="disabled")
+            self.profiles_btn.configure(state="disabled")
             self.theme_combo.configure(state="disabled")
             if hasattr(self, 'sound_switch'): self.sound_switch.configure(state="disabled")
 
     def _unlock_app(self):
         for btn in self.nav_buttons.values(): btn.configure(state="normal")
-        self.launch_chrome_btn.configure(state="normal"); self.launch_edge_btn.configure(state="normal"); self.launch_firefox_btn.configure(state="normal")
+        self.launch_chrome_btn.configure(state="normal"); self.launch_edge_btn.configure(state="normal"); self.launch_firefox_btn.configure(state="normal"); self.profiles_btn.configure(state="normal")
         self.theme_combo.configure(state="normal")
         if hasattr(self, 'sound_switch'): self.sound_switch.configure(state="normal")
     
@@ -833,7 +858,8 @@ class NregaBotApp(ctk.CTk):
         self.announcement_label = MarqueeLabel(announcement_frame, text="Connecting to server...", width=300)
         self.announcement_label.pack(fill="both", expand=True, pady=5)
         
-        self.after(1000, self._fetch_app_config)
+        cfg = config.UI_GOVERNOR_CONFIG
+        self.ui_governor.add_poller("app-config", self._fetch_app_config, cfg["app_config_interval"], cfg["app_config_max_interval"], delay=1)
 
         # --- RIGHT: Toolbar ---
         controls_frame = ctk.CTkFrame(header, fg_color="transparent")
@@ -893,6 +919,15 @@ class NregaBotApp(ctk.CTk):
         self.launch_firefox_btn.pack(side="left", padx=2)
         add_status_hover(self.launch_firefox_btn, "Launch Mozilla Firefox")
 
+        self.profiles_btn = ctk.CTkButton(
+            browser_group, text="", image=self.icon_images.get("browser_profiles"), 
+            width=35, height=35, corner_radius=8,
+            fg_color="transparent", hover_color=("gray90", "gray30"),
+            command=self.show_profiles_window
+        )
+        self.profiles_btn.pack(side="left", padx=2)
+        add_status_hover(self.profiles_btn, "Browser Profiles (one login per block / GP)")
+
         # Separator
         ctk.CTkFrame(controls_frame, width=2, height=20, fg_color=("gray90", "gray30")).pack(side="left", padx=(0, 10))
 
@@ -1120,6 +1155,7 @@ class NregaBotApp(ctk.CTk):
             return btn
 
         create_icon_btn(dock_frame, "history", self.show_history_window, "View Activity Log")
+        create_icon_btn(dock_frame, "job_queue", self.show_job_queue_window, "Job Queue")
         create_icon_btn(dock_frame, "emoji_file_manager", self.open_web_file_manager, "Open Cloud Files")
         create_icon_btn(dock_frame, "whatsapp", lambda: webbrowser.open("https://chat.whatsapp.com/Bup3hDCH3wn2shbUryv8wn"), "Join Community")
         create_icon_btn(dock_frame, "feedback", lambda: self.show_frame("Feedback"), "Contact Support")
@@ -1256,14 +1292,14 @@ class NregaBotApp(ctk.CTk):
         self.nav_scroll_frame.update_idletasks()
 
     def show_history_window(self):
-        """Displays the recent activity log in a popup."""
+        """Displays the recent activity log and automation performance in a popup."""
         win = ctk.CTkToplevel(self)
         win.title("Activity Log - Recent Tasks")
-        win.geometry("700x500")
+        win.geometry("760x540")
         
         win.update_idletasks()
-        x = self.winfo_x() + (self.winfo_width() // 2) - (700 // 2)
-        y = self.winfo_y() + (self.winfo_height() // 2) - (500 // 2)
+        x = self.winfo_x() + (self.winfo_width() // 2) - (760 // 2)
+        y = self.winfo_y() + (self.winfo_height() // 2) - (540 // 2)
         win.geometry(f"+{x}+{y}")
 
         win.grid_columnconfigure(0, weight=1)
@@ -1271,13 +1307,18 @@ class NregaBotApp(ctk.CTk):
 
         # Header
         header = ctk.CTkFrame(win, fg_color="transparent")
-        header.grid(row=0, column=0, sticky="ew", padx=20, pady=15)
-        ctk.CTkLabel(header, text="Recent Activity Log (Last 50 Items)", font=ctk.CTkFont(size=18, weight="bold")).pack(side="left")
+        header.grid(row=0, column=0, sticky="ew", padx=20, pady=(15, 0))
+        ctk.CTkLabel(header, text="Recent Activity & Performance", font=ctk.CTkFont(size=18, weight="bold")).pack(side="left")
         ctk.CTkButton(header, text="Refresh", width=80, height=25, command=lambda: [win.destroy(), self.show_history_window()]).pack(side="right")
 
-        # Text Area
-        log_box = ctk.CTkTextbox(win, font=("Consolas", 12))
-        log_box.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        tabs = ctk.CTkTabview(win)
+        tabs.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        activity_tab = tabs.add("Activity (Last 50)")
+        perf_tab = tabs.add("Performance")
+
+        # --- Activity ---
+        log_box = ctk.CTkTextbox(activity_tab, font=("Consolas", 12))
+        log_box.pack(expand=True, fill="both")
         
         logs = self.history_manager.get_recent_activity(50)
         
@@ -1292,6 +1333,195 @@ class NregaBotApp(ctk.CTk):
         
         log_box.configure(state="disabled")
 
+        # --- Performance (p50/p95 per step, from perf_monitor samples) ---
+        perf_box = ctk.CTkTextbox(perf_tab, font=("Consolas", 12))
+        perf_box.pack(expand=True, fill="both")
+        ctk.CTkButton(perf_tab, text="Clear Performance Data", width=160, height=25, fg_color="gray",
+                      command=lambda: [self.history_manager.clear_perf_samples(), win.destroy(), self.show_history_window()]).pack(anchor="e", pady=(8, 0))
+
+        summary = self.perf_monitor.summarize()
+        if not summary:
+            perf_box.insert("0.0", "No timing data yet. Run an automation to collect per-step timings.")
+        else:
+            for key, data in sorted(summary.items(), key=lambda kv: -kv[1]["items"]):
+                perf_box.insert("end", f"{key}  |  {data['items']} items  |  {data['items_per_min']:.1f} items/min  |  {data['commands_per_item']:.0f} driver cmds/item\n")
+                perf_box.insert("end", f"  {'Step':<10}{'Samples':>9}{'p50 (s)':>10}{'p95 (s)':>10}\n")
+                steps = data["steps"]
+                for step in sorted(steps, key=lambda s: STEP_ORDER.index(s) if s in STEP_ORDER else len(STEP_ORDER)):
+                    count, p50, p95 = steps[step]
+                    perf_box.insert("end", f"  {step:<10}{count:>9}{p50:>10.2f}{p95:>10.2f}\n")
+                perf_box.insert("end", "-"*80 + "\n")
+        perf_box.configure(state="disabled")
+
+    def show_job_queue_window(self):
+        """Queued automation jobs: load job files, pause/resume, cancel, change priority."""
+        if getattr(self, "_job_queue_win", None) and self._job_queue_win.winfo_exists():
+            self._job_queue_win.lift(); return
+        scheduler = self.job_scheduler
+        win = self._job_queue_win = ctk.CTkToplevel(self)
+        win.title("Job Queue")
+        win.geometry("860x560")
+        win.update_idletasks()
+        x = self.winfo_x() + (self.winfo_width() // 2) - (860 // 2)
+        y = self.winfo_y() + (self.winfo_height() // 2) - (560 // 2)
+        win.geometry(f"+{x}+{y}")
+        win.grid_columnconfigure(0, weight=1)
+        win.grid_rowconfigure(1, weight=1)
+
+        # Header + controls
+        header = ctk.CTkFrame(win, fg_color="transparent")
+        header.grid(row=0, column=0, sticky="ew", padx=20, pady=(15, 5))
+        ctk.CTkLabel(header, text="Job Queue", font=ctk.CTkFont(size=18, weight="bold")).pack(side="left")
+        state_label = ctk.CTkLabel(header, text="", text_color="gray60")
+        state_label.pack(side="left", padx=10)
+
+        def selected_ids():
+            return [int(iid) for iid in tree.selection()]
+
+        def load_file():
+            path = filedialog.askopenfilename(parent=win, title="Select Job File", filetypes=[("Job files", "*.json *.csv")])
+            if not path: return
+            try: jobs = scheduler.add_job_file(path)
+            except (OSError, ValueError, KeyError) as e: messagebox.showerror("Job File Error", str(e), parent=win); return
+            self.show_toast(f"{len(jobs)} job(s) queued", "success")
+
+        def toggle_pause():
+            scheduler.resume() if scheduler.paused else scheduler.pause()
+
+        def set_priority(name):
+            for job_id in selected_ids(): scheduler.set_priority(job_id, PRIORITIES[name])
+
+        def cancel_selected():
+            for job_id in selected_ids(): scheduler.cancel(job_id)
+
+        pause_btn = ctk.CTkButton(header, text="Pause", width=80, height=25, command=toggle_pause)
+        for text, command in [("Clear Finished", scheduler.clear_finished), ("Cancel", cancel_selected)]:
+            ctk.CTkButton(header, text=text, width=90, height=25, fg_color="gray", command=command).pack(side="right", padx=(5, 0))
+        priority_menu = ctk.CTkOptionMenu(header, values=list(PRIORITIES), width=100, height=25, command=set_priority)
+        priority_menu.set("Priority")
+        priority_menu.pack(side="right", padx=(5, 0))
+        pause_btn.pack(side="right", padx=(5, 0))
+        ctk.CTkButton(header, text="Load Job File...", width=110, height=25, command=load_file).pack(side="right")
+
+        # Jobs table
+        table_frame = ctk.CTkFrame(win, fg_color="transparent")
+        table_frame.grid(row=1, column=0, sticky="nsew", padx=20)
+        cols = ("#", "Priority", "Automation", "Panchayat", "Items", "Session", "Status", "Results")
+        tree = ttk.Treeview(table_frame, columns=cols, show="headings", selectmode="extended")
+        for col, width in zip(cols, (40, 70, 90, 130, 50, 100, 90, 220)):
+            tree.heading(col, text=col); tree.column(col, width=width, anchor="w")
+        tree.pack(side="left", expand=True, fill="both")
+        scrollbar = ctk.CTkScrollbar(table_frame, command=tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        tree.configure(yscrollcommand=scrollbar.set)
+        self.style_treeview(tree)
+
+        ctk.CTkLabel(win, text="Selected job log").grid(row=2, column=0, sticky="w", padx=20, pady=(8, 0))
+        log_box = ctk.CTkTextbox(win, height=140, font=("Consolas", 11))
+        log_box.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 20))
+
+        def refresh():
+            if not win.winfo_exists(): return
+            rows = scheduler.snapshot()
+            shown = set(tree.get_children())
+            for row in rows:
+                iid = str(row["id"])
+                values = (row["id"], row["priority"], row["automation"], row["panchayat"], row["items"],
+                          row["session"], row["status"], row["error"] or row["results"])
+                if iid in shown: tree.item(iid, values=values); shown.discard(iid)
+                else: tree.insert("", "end", iid=iid, values=values)
+            if shown: tree.delete(*shown)
+
+            running = sum(1 for r in rows if r["status"] in ("Running", "Cancelling"))
+            queued = sum(1 for r in rows if r["status"] == "Queued")
+            state_label.configure(text=f"{'PAUSED  ' if scheduler.paused else ''}{running} running, {queued} queued")
+            pause_btn.configure(text="Resume" if scheduler.paused else "Pause")
+
+            selected = tree.selection()
+            job = next((r for r in rows if str(r["id"]) == (selected[0] if selected else "")), None)
+            text = "\n".join(job["log"]) if job else "Select a job to see its log."
+            if log_box.get("1.0", "end-1c") != text:
+                log_box.configure(state="normal"); log_box.delete("1.0", "end"); log_box.insert("1.0", text)
+                log_box.see("end"); log_box.configure(state="disabled")
+            win.after(1000, refresh)
+        refresh()
+
+    def show_profiles_window(self):
+        """Browser profiles: add one per block / GP login, launch them, see which are busy."""
+        if getattr(self, "_profiles_win", None) and self._profiles_win.winfo_exists():
+            self._profiles_win.lift(); return
+        manager = self.profile_manager
+        win = self._profiles_win = ctk.CTkToplevel(self)
+        win.title("Browser Profiles")
+        win.geometry("700x440")
+        win.update_idletasks()
+        x = self.winfo_x() + (self.winfo_width() // 2) - (700 // 2)
+        y = self.winfo_y() + (self.winfo_height() // 2) - (440 // 2)
+        win.geometry(f"+{x}+{y}")
+        win.grid_columnconfigure(0, weight=1)
+        win.grid_rowconfigure(1, weight=1)
+
+        # Header + controls
+        header = ctk.CTkFrame(win, fg_color="transparent")
+        header.grid(row=0, column=0, sticky="ew", padx=20, pady=(15, 5))
+        ctk.CTkLabel(header, text="Browser Profiles", font=ctk.CTkFont(size=18, weight="bold")).pack(side="left")
+
+        def selected_names():
+            return list(tree.selection())
+
+        def launch_selected():
+            for name in selected_names():
+                if not manager.get(name).is_running(): self.browser_manager.launch_profile(name)
+
+        def remove_selected():
+            for name in selected_names():
+                try: manager.remove(name)
+                except ValueError as e: messagebox.showwarning("Profile In Use", str(e), parent=win)
+
+        ctk.CTkButton(header, text="Remove", width=80, height=25, fg_color="gray", command=remove_selected).pack(side="right", padx=(5, 0))
+        ctk.CTkButton(header, text="Launch", width=80, height=25, command=launch_selected).pack(side="right")
+
+        # Profiles table
+        table_frame = ctk.CTkFrame(win, fg_color="transparent")
+        table_frame.grid(row=1, column=0, sticky="nsew", padx=20)
+        cols = ("Profile", "Browser", "Block / GP", "Port", "Status")
+        tree = ttk.Treeview(table_frame, columns=cols, show="headings", selectmode="extended")
+        for col, width in zip(cols, (130, 110, 170, 60, 150)):
+            tree.heading(col, text=col); tree.column(col, width=width, anchor="w")
+        tree.pack(side="left", expand=True, fill="both")
+        self.style_treeview(tree)
+
+        # Add profile
+        add_frame = ctk.CTkFrame(win, fg_color="transparent")
+        add_frame.grid(row=2, column=0, sticky="ew", padx=20, pady=(10, 20))
+        name_entry = ctk.CTkEntry(add_frame, width=150, placeholder_text="Profile name")
+        name_entry.pack(side="left")
+        note_entry = ctk.CTkEntry(add_frame, width=200, placeholder_text="Block / GP (optional)")
+        note_entry.pack(side="left", padx=5)
+        browser_menu = ctk.CTkOptionMenu(add_frame, values=list(BROWSER_NAMES.values()), width=140)
+        browser_menu.pack(side="left")
+
+        def add_profile():
+            browser = next(k for k, v in BROWSER_NAMES.items() if v == browser_menu.get())
+            try: manager.add(name_entry.get(), browser, note_entry.get())
+            except ValueError as e: messagebox.showwarning("Cannot Add Profile", str(e), parent=win); return
+            name_entry.delete(0, "end"); note_entry.delete(0, "end")
+            self.play_sound("select")
+
+        ctk.CTkButton(add_frame, text="+ Add Profile", width=100, command=add_profile).pack(side="left", padx=(5, 0))
+
+        def refresh():
+            if not win.winfo_exists(): return
+            rows = manager.status()
+            shown = set(tree.get_children())
+            for row in rows:
+                values = (row["name"], BROWSER_NAMES.get(row["browser"], row["browser"]), row["note"], row["port"], row["status"])
+                if row["name"] in shown: tree.item(row["name"], values=values); shown.discard(row["name"])
+                else: tree.insert("", "end", iid=row["name"], values=values)
+            if shown: tree.delete(*shown)
+            win.after(2000, refresh)
+        refresh()
+
     # ============================================================================
     # 5. DATA HANDOFF METHODS (INTER-TAB COMMUNICATION)
     # ============================================================================
@@ -1317,6 +1547,9 @@ class NregaBotApp(ctk.CTk):
     def switch_to_duplicate_mr_with_data(self, wc, p_name):
         self.workflows.switch_to_duplicate_mr_with_data(wc, p_name)
 
+    def start_pipeline(self, wc, p_name):
+        self.workflows.start_pipeline(wc, p_name)
+
     def switch_to_zero_mr_tab_with_data(self, data_list):
         self.workflows.switch_to_zero_mr_tab_with_data(data_list)
 
@@ -1330,9 +1563,24 @@ class NregaBotApp(ctk.CTk):
     def get_driver(self):
         driver = self.browser_manager.get_driver()
         if driver:
+            self.perf_monitor.instrument_driver(driver)
+            self.session_guard.instrument_driver(driver)
             self.driver = self.browser_manager.driver
             self.active_browser = self.browser_manager.active_browser
+            self.active_profile = self.browser_manager.active_profile
+            self._lease_active_profile()
         return driver
+
+    def _lease_active_profile(self):
+        """Interactive runs hold their profile like jobs and the pipeline do, so neither starts on it meanwhile."""
+        name = self.active_profile if self.active_automations else None
+        if name == self._interactive_lease: return
+        self._release_interactive_lease()
+        if name and self.profile_manager.acquire("Interactive run", name): self._interactive_lease = name
+
+    def _release_interactive_lease(self):
+        if self._interactive_lease: self.profile_manager.release(self._interactive_lease, "Interactive run")
+        self._interactive_lease = None
     
     def launch_chrome_detached(self, target_urls=None):
         self.browser_manager.launch_chrome_detached(target_urls)
@@ -1348,16 +1596,24 @@ class NregaBotApp(ctk.CTk):
         Runs an automation task in a background thread with sleep prevention.
         Handles window minimization on start.
         """
+        # "+ Queue" button: same input checks, but the args become a queued job
+        if self.job_scheduler.capture(key, args): return
+
         if self.automation_threads.get(key) and self.automation_threads[key].is_alive():
             self.play_sound("error")
             messagebox.showwarning("Busy", "Task running")
             return
+        if self.job_scheduler.running_browsers() and not messagebox.askyesno(
+                "Job Queue Running", f"Queued jobs are running in {', '.join(sorted(self.job_scheduler.running_browsers()))}. "
+                "Using the same browser profile now can disturb them.\n\nStart anyway?"):
+            return
         
         self.play_sound("start")
         self.history_manager.increment_usage(key)
         self.prevent_sleep()
         self.active_automations.add(key)
         self.stop_events[key] = threading.Event()
+        self._lease_active_profile() # Browser already chosen; a first run leases it in get_driver()
 
         # Auto Minimize
         if self.minimize_var.get() and self.driver:
@@ -1389,23 +1645,19 @@ class NregaBotApp(ctk.CTk):
 
     def on_automation_finished(self, key):
         if key in self.active_automations: self.active_automations.remove(key)
+        if not self.active_automations: self._release_interactive_lease()
         self.set_status("Finished")
         self.after(5000, lambda: self.set_status("Ready"))
-        if not self.active_automations: self.allow_sleep()
+        if not self.active_automations and not self.job_scheduler.open_jobs(): self.allow_sleep()
 
     def _quick_login_automation(self):
         """Auto Login Logic: Checks browser state and credentials."""
         def _runner():
             # 1. Check Browser
-            chrome_running = False
-            try:
-                with socket.create_connection(("127.0.0.1", 9222), timeout=0.2):
-                    chrome_running = True
-            except:
-                pass
+            chrome_running = self.profile_manager.get("Chrome").is_running()
 
             if not chrome_running:
-                login_url = "https://nregade4.nic.in/netnrega/Login.aspx?&level=HomePO&state_code=34"
+                login_url = config.SESSION_GUARD_CONFIG["login_url"]
                 self.after(0, lambda: self.launch_chrome_detached(target_urls=[login_url]))
                 time.sleep(4)
 
@@ -1440,56 +1692,44 @@ class NregaBotApp(ctk.CTk):
     # ============================================================================
 
     def _ping_server_in_background(self):
-        """Periodically checks connectivity to license server."""
-        def ping_loop():
-            while True: 
-                is_connected = False
-                try:
-                    requests.get(config.LICENSE_SERVER_URL, timeout=5)
-                    is_connected = True
-                except requests.exceptions.RequestException:
-                    is_connected = False
-                
-                try:
-                    if self.winfo_exists():
-                        self.after(0, self.set_server_status, is_connected)
-                    else:
-                        break 
-                except:
-                    break
-                time.sleep(20)
+        """Periodically checks connectivity to license server (on the UI governor's poller thread)."""
+        cfg = config.UI_GOVERNOR_CONFIG
+        self.ui_governor.add_poller("server-ping", self._ping_server, cfg["ping_interval"], cfg["ping_max_interval"])
 
-        threading.Thread(target=ping_loop, daemon=True).start()
+    def _ping_server(self):
+        try:
+            requests.get(config.LICENSE_SERVER_URL, timeout=5)
+            is_connected = True
+        except requests.exceptions.RequestException:
+            is_connected = False
+        self.after(0, self.set_server_status, is_connected)
+        return is_connected
 
     def _fetch_app_config(self):
-        """Fetches global configuration (Announcement + Features) from server."""
-        def _worker():
-            try:
-                url = f"{config.LICENSE_SERVER_URL}/api/app-config"
-                resp = requests.get(url, timeout=20)
+        """Fetches global configuration (Announcement + Features) from server. Runs on the UI governor's poller thread."""
+        try:
+            url = f"{config.LICENSE_SERVER_URL}/api/app-config"
+            resp = requests.get(url, timeout=20)
+            
+            if resp.status_code != 200: return False
+            data = resp.json()
+            
+            msg = data.get("global_announcement", "")
+            if msg:
+                self.after(0, lambda: self.announcement_label.update_text(msg))
+            
+            self.global_disabled_features = data.get("disabled_features", [])
+            
+            if (self.license_info.get('key_type') or '').lower() == 'trial':
+                self.trial_restricted_features = data.get("trial_restricted_features", [])
+            else:
+                self.trial_restricted_features = []
                 
-                if resp.status_code == 200:
-                    data = resp.json()
-                    
-                    msg = data.get("global_announcement", "")
-                    if msg:
-                        self.after(0, lambda: self.announcement_label.update_text(msg))
-                    
-                    self.global_disabled_features = data.get("disabled_features", [])
-                    
-                    if (self.license_info.get('key_type') or '').lower() == 'trial':
-                        self.trial_restricted_features = data.get("trial_restricted_features", [])
-                    else:
-                        self.trial_restricted_features = []
-                        
-                    self.after(0, self._apply_feature_flags)
-                    
-            except Exception as e:
-                print(f"Config Fetch Error: {e}")
-            finally:
-                self.after(120000, self._fetch_app_config)
-        
-        threading.Thread(target=_worker, daemon=True).start()
+            self.after(0, self._apply_feature_flags)
+            return True
+        except Exception as e:
+            print(f"Config Fetch Error: {e}")
+            return False
 
     def _apply_feature_flags(self):
         """Applies visual locks or maintenance modes with redundancy check."""
@@ -1845,7 +2085,9 @@ del "%~f0" & exit
             return
         frames = ["⣾", "⣽", "⣻", "⢿", "⡿", "⣟", "⣯", "⣷"]
         if self.loading_animation_label: self.loading_animation_label.configure(text=frames[frame_index])
-        self.after(80, self._animate_loading_icon, (frame_index + 1) % len(frames))
+        delay = self.ui_governor.frame(80)
+        if delay is None: self.ui_governor.on_resume(self._animate_loading_icon, (frame_index + 1) % len(frames)); return
+        self.after(delay, self._animate_loading_icon, (frame_index + 1) % len(frames))
 
     def set_server_status(self, is_connected: bool):
         if self.server_status_indicator: self.server_status_indicator.configure(fg_color="green" if is_connected else "red")
@@ -2034,19 +2276,8 @@ def run_application():
     try:
         app = NregaBotApp()
         
-        # Socket Listener Thread
-        def listen():
-            s.listen(1)
-            while True:
-                try:
-                    c, a = s.accept()
-                    d = c.recv(1024)
-                    if d == b'focus': 
-                        app.after(0, app.bring_to_front)
-                    c.close()
-                except (OSError, ValueError):
-                    break
-        threading.Thread(target=listen, daemon=True).start()
+        # Socket Listener Thread: focus from a second launch + JSON commands (command_channel.py)
+        CommandServer(app, s).start()
         
         # Start App
         app.mainloop()
@@ -2057,4 +2288,5 @@ def run_application():
         s.close()
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     run_application()
\ No newline at end of file
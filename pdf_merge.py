@@ -0,0 +1,210 @@
+# pdf_merge.py
+# Memory-bounded PDF merge engine (PDF Merger, MR Gen and Duplicate MR tabs).
+import os
+import queue
+import shutil
+import tempfile
+import multiprocessing
+
+from pypdf import PdfReader, PdfWriter
+
+import config
+
+
+class MergeCancelled(Exception):
+    pass
+
+
+class _CountingWriter:
+    """File wrapper that reports bytes written, so the final write shows progress."""
+    def __init__(self, f, callback, step=512 * 1024):
+        self._f = f
+        self._callback = callback
+        self._step = step
+        self._written = 0
+        self._last = 0
+
+    def write(self, data):
+        n = self._f.write(data)
+        self._written += len(data)
+        if self._written - self._last >= self._step:
+            self._last = self._written
+            self._callback(self._written)
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def _write_writer(writer, path, on_bytes=None):
+    # Chrome's printToPDF embeds the same fonts/images in every MR; fold those copies into one.
+    if hasattr(writer, "compress_identical_objects"):
+        writer.compress_identical_objects()
+    with open(path, "wb") as f:
+        writer.write(_CountingWriter(f, on_bytes) if on_bytes else f)
+    writer.close()
+
+
+def _volume_path(output_path, index):
+    base, ext = os.path.splitext(output_path)
+    return f"{base}_Part{index}{ext}"
+
+
+def _free_path(path, taken=()):
+    """'name.pdf', else 'name (1).pdf', ... so a file from an earlier run is never overwritten."""
+    base, ext = os.path.splitext(path)
+    candidate, counter = path, 1
+    while os.path.exists(candidate) or candidate in taken:
+        candidate = f"{base} ({counter}){ext}"
+        counter += 1
+    return candidate
+
+
+def merge_pdfs(file_list, output_path, max_pages=0, max_mb=0, chunk_size=None,
+               report=None, should_stop=None, work_dir=None):
+    """
+    Merges file_list into output_path and returns the list of files written.
+
+    Inputs are merged in chunks of `chunk_size` into temporary part files, so only
+    one chunk of source PDFs is ever parsed at a time. With max_pages / max_mb the
+    output is split into "<name>_Part<n>.pdf" volumes; a single input is never split.
+    A page cap already bounds the writer, so those volumes skip the chunk files and
+    every page is parsed once. Each volume is held in one writer while it is written,
+    so only max_pages / max_mb bound peak memory; an unsplit merge holds the whole output.
+    Existing files are never overwritten: a taken name gets a " (n)" suffix.
+
+    report(stage, done, total, text) is called with stage "merge" (files),
+    "write" (bytes of the volume being written) and "volume" (a finished file);
+    should_stop() is polled between files.
+    """
+    chunk_size = chunk_size or config.PDF_MERGE_CONFIG["chunk_size"]
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb else 0
+    report = report or (lambda *a: None)
+    should_stop = should_stop or (lambda: False)
+    splitting = bool(max_pages or max_bytes)
+
+    # Kept next to the output so finished volumes are moved in with os.replace
+    work_dir = work_dir or tempfile.mkdtemp(prefix=".nregabot_merge_", dir=os.path.dirname(output_path) or None)
+    outputs = []
+    state = {"parts": [], "writer": None, "files_in_chunk": 0, "pages": 0, "bytes": 0}
+
+    def flush_chunk():
+        if not state["writer"]: return
+        part_path = os.path.join(work_dir, f"chunk_{len(outputs)}_{len(state['parts'])}.pdf")
+        _write_writer(state["writer"], part_path)
+        state["parts"].append(part_path)
+        state["writer"], state["files_in_chunk"] = None, 0
+
+    def finish_volume():
+        flush_chunk()
+        parts = state["parts"]
+        if not parts: return
+        target = _free_path(_volume_path(output_path, len(outputs) + 1) if splitting else output_path, outputs)
+        temp_target = os.path.join(work_dir, f"volume_{len(outputs)}.pdf")
+
+        if len(parts) == 1:
+            os.replace(parts[0], temp_target)
+        else:
+            estimate = sum(os.path.getsize(p) for p in parts)
+            name = os.path.basename(target)
+            writer = PdfWriter()
+            for part in parts:
+                if should_stop(): raise MergeCancelled()
+                writer.append(part)
+            report("write", 0, estimate, f"Writing {name}")
+            _write_writer(writer, temp_target, lambda n: report("write", min(n, estimate), estimate, f"Writing {name}"))
+            for part in parts: os.remove(part)
+
+        os.replace(temp_target, target)
+        outputs.append(target)
+        report("volume", len(outputs), 0, target)
+        state["parts"], state["pages"], state["bytes"] = [], 0, 0
+
+    try:
+        for i, pdf_path in enumerate(file_list):
+            if should_stop(): raise MergeCancelled()
+            reader = PdfReader(pdf_path)
+            pages, size = len(reader.pages), os.path.getsize(pdf_path)
+
+            if splitting and state["pages"] and (
+                    (max_pages and state["pages"] + pages > max_pages) or
+                    (max_bytes and state["bytes"] + size > max_bytes)):
+                finish_volume()
+
+            if state["writer"] is None: state["writer"] = PdfWriter()
+            state["writer"].append(reader)
+            state["files_in_chunk"] += 1
+            state["pages"] += pages
+            state["bytes"] += size
+            del reader
+            report("merge", i + 1, len(file_list), os.path.basename(pdf_path))
+
+            if not max_pages and state["files_in_chunk"] >= chunk_size: flush_chunk()
+
+        finish_volume()
+        if splitting and len(outputs) == 1:
+            single = _free_path(output_path)
+            os.replace(outputs[0], single)
+            outputs[0] = single
+        return outputs
+    except BaseException:
+        for path in outputs:
+            try: os.remove(path)
+            except OSError: pass
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _merge_worker(messages, file_list, output_path, options):
+    """Entry point of the merge process; every result goes back through the queue."""
+    try:
+        outputs = merge_pdfs(file_list, output_path,
+                             report=lambda *args: messages.put(("progress",) + args), **options)
+        messages.put(("done", outputs))
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def run_merge_process(file_list, output_path, stop_event=None, on_progress=None, **options):
+    """
+    Runs merge_pdfs in a separate process so the big PdfWriter never lives in the
+    UI process (its memory is returned to the OS when the process exits).
+    Blocks the calling worker thread; on_progress gets (stage, done, total, text).
+    Returns the output paths, or None if stop_event was set.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    messages = ctx.Queue()
+    work_dir = tempfile.mkdtemp(prefix=".nregabot_merge_", dir=os.path.dirname(output_path) or None)
+    written = []
+    process = ctx.Process(target=_merge_worker, args=(messages, list(file_list), output_path, dict(options, work_dir=work_dir)), daemon=True)
+    process.start()
+    try:
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                process.terminate()
+                return None
+            try:
+                message = messages.get(timeout=0.2)
+            except queue.Empty:
+                if not process.is_alive() and messages.empty():
+                    raise RuntimeError(f"Merge process exited unexpectedly (code {process.exitcode}).")
+                continue
+
+            kind = message[0]
+            if kind == "progress":
+                if message[1] == "volume": written.append(message[4])
+                elif on_progress: on_progress(*message[1:])
+            elif kind == "done":
+                return message[1]
+            elif kind == "error":
+                raise RuntimeError(message[1])
+    finally:
+        process.join(timeout=5)
+        if process.is_alive(): process.kill()
+        if stop_event is not None and stop_event.is_set():
+            # A terminated worker can't clean up after itself
+            for path in written:
+                try: os.remove(path)
+                except OSError: pass
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,98 @@
+# pdf_pipeline.py
+# Hands browser print output off to a background pool that decodes, names, writes
+# (and optionally uploads) the PDF, so the automation thread can move straight on.
+import os
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+STREAM_CHUNK = 512 * 1024
+
+
+def capture_pdf(driver, browser, cdp_options=None, print_options=None):
+    """
+    Prints the current page and returns the raw payload as a list of
+    (data, is_base64) chunks, or None if the browser can't print.
+    On Chrome the PDF is streamed with IO.read, so there is never one huge
+    base64 string for the whole document.
+    Must run on the automation thread (WebDriver is not thread-safe).
+    """
+    if browser == 'chrome':
+        result = driver.execute_cdp_cmd("Page.printToPDF", dict(cdp_options or {}, transferMode="ReturnAsStream"))
+        handle = result.get('stream')
+        if not handle:
+            # Older Chrome ignores transferMode and returns the data inline
+            return [(result['data'], True)] if result.get('data') else None
+
+        chunks = []
+        try:
+            while True:
+                part = driver.execute_cdp_cmd("IO.read", {"handle": handle, "size": STREAM_CHUNK})
+                if part.get('data'):
+                    chunks.append((part['data'], part.get('base64Encoded', False)))
+                if part.get('eof'): break
+        finally:
+            try: driver.execute_cdp_cmd("IO.close", {"handle": handle})
+            except Exception: pass
+        return chunks or None
+
+    if browser == 'firefox':
+        data = driver.print_page(print_options) if print_options else driver.print_page()
+        return [(data, True)] if data else None
+
+    return None
+
+
+class PdfSaveQueue:
+    """
+    Small worker pool for PDF persistence. submit() returns a Future of the saved
+    path (None on failure) immediately; the callback runs on a pool thread with
+    (path, after_save_result) on success or (None, error_message) on failure.
+    Call close() before reporting completion.
+    """
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf_save")
+        self._reserved = set()
+        self._lock = threading.Lock()
+
+    def _reserve_path(self, output_dir, base_filename, extension, unique):
+        """Picks 'name.pdf', 'name (1).pdf', ... skipping files on disk and names still being written."""
+        with self._lock:
+            path = os.path.join(output_dir, f"{base_filename}{extension}")
+            counter = 1
+            while unique and (os.path.exists(path) or path in self._reserved):
+                path = os.path.join(output_dir, f"{base_filename} ({counter}){extension}")
+                counter += 1
+            self._reserved.add(path)
+            return path
+
+    def _write(self, chunks, output_dir, base_filename, extension, unique, after_save, callback):
+        path = None
+        try:
+            path = self._reserve_path(output_dir, base_filename, extension, unique)
+            part_path = path + ".part"
+            with open(part_path, 'wb') as f:
+                for data, is_base64 in chunks:
+                    f.write(base64.b64decode(data) if is_base64 else data.encode('latin-1'))
+            os.replace(part_path, path)
+            extra = after_save(path) if after_save else None
+            if callback: callback(path, extra)
+            return path
+        except Exception as e:
+            if callback: callback(None, str(e))
+            return None
+        finally:
+            with self._lock: self._reserved.discard(path)
+
+    def submit(self, chunks, output_dir, base_filename, callback=None, after_save=None,
+               extension=".pdf", unique=True):
+        """
+        Queues one PDF. after_save(path) (e.g. a cloud upload) runs on the pool
+        thread once the file is on disk; its return value is passed to callback
+        as the second argument.
+        """
+        return self._pool.submit(self._write, chunks, output_dir, base_filename, extension, unique, after_save, callback)
+
+    def close(self):
+        """Waits for every queued PDF to finish."""
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,147 @@
+# perf_monitor.py
+# Per-item step timings and WebDriver command counts for automations.
+import math
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Selenium command name -> step it is charged to
+_COMMAND_STEPS = {
+    "get": "navigate", "refresh": "navigate", "goBack": "navigate", "goForward": "navigate",
+    "sendKeysToElement": "fill", "clearElement": "fill", "elementClick": "fill",
+    "findElement": "scrape", "findElements": "scrape", "findChildElement": "scrape", "findChildElements": "scrape",
+    "getElementText": "scrape", "getElementAttribute": "scrape", "getElementProperty": "scrape",
+    "getElementTagName": "scrape", "isElementSelected": "scrape", "isElementEnabled": "scrape",
+    "isElementDisplayed": "scrape", "getPageSource": "scrape", "getTitle": "scrape", "getCurrentUrl": "scrape",
+    "w3cExecuteScript": "script", "w3cExecuteScriptAsync": "script",
+    "executeScript": "script", "executeAsyncScript": "script",
+    "printPage": "print",
+}
+_PRINT_CDP = ("Page.printToPDF", "IO.read", "IO.close")
+
+# Display order in the Performance panel; "wait" is item time not spent in a
+# driver command (postback waits, WebDriverWait polling, sleeps).
+STEP_ORDER = ["item", "navigate", "wait", "scrape", "fill", "script", "print", "upload", "other"]
+
+
+def _classify(command, params):
+    if command == "executeCdpCommand":
+        return "print" if (params or {}).get("cmd") in _PRINT_CDP else "script"
+    return _COMMAND_STEPS.get(command, "other")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values: return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _ItemTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = defaultdict(float)
+        self.commands = 0
+        self.in_span = 0
+
+
+class PerfMonitor:
+    """
+    Records how long each automation item takes and where the time goes.
+    - The shared WebDriver is instrumented once: every command issued from a
+      thread that is inside an item is timed and charged to a step.
+    - Tabs' per-item functions are wrapped with track_item() (see BaseAutomationTab).
+    - span() times work that isn't a driver command (e.g. cloud uploads).
+    Samples are stored in the local DB; summarize() builds the p50/p95 table.
+    """
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    @property
+    def _item(self):
+        return getattr(self._local, "item", None)
+
+    def instrument_driver(self, driver):
+        if driver is None or getattr(driver, "_perf_instrumented", False):
+            return driver
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            item = self._item
+            if item is None:
+                return original_execute(driver_command, params)
+            start = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                item.commands += 1
+                if not item.in_span:
+                    item.steps[_classify(driver_command, params)] += time.perf_counter() - start
+
+        driver.execute = execute
+        driver._perf_instrumented = True
+        return driver
+
+    def track_item(self, automation_key, func):
+        """Wraps a per-item function so each call is recorded as one item."""
+        def wrapper(*args, **kwargs):
+            if self._item is not None:
+                return func(*args, **kwargs) # Nested per-item call: count it as part of the outer one
+            item = _ItemTimer()
+            self._local.item = item
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.item = None
+                self._record_item(automation_key, item)
+        wrapper.__name__ = getattr(func, "__name__", "wrapper")
+        wrapper.__doc__ = getattr(func, "__doc__", None)
+        return wrapper
+
+    @contextmanager
+    def span(self, step, automation_key=None):
+        """Times a block as `step`. Outside an item it is stored on its own under automation_key."""
+        item = self._item
+        if item is not None: item.in_span += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if item is not None:
+                item.in_span -= 1
+                item.steps[step] += elapsed
+            elif automation_key:
+                self.app.history_manager.record_perf_samples([(automation_key, step, elapsed, None)])
+
+    def _record_item(self, automation_key, item):
+        total = time.perf_counter() - item.started
+        item.steps["wait"] += max(0.0, total - sum(item.steps.values()))
+        rows = [(automation_key, "item", total, item.commands)]
+        rows += [(automation_key, step, seconds, None) for step, seconds in item.steps.items() if seconds > 0]
+        self.app.history_manager.record_perf_samples(rows)
+
+    def summarize(self):
+        """
+        Returns {automation_key: {"items", "items_per_min", "commands_per_item",
+        "steps": {step: (samples, p50, p95)}}} from the stored samples.
+        """
+        grouped, commands = defaultdict(lambda: defaultdict(list)), defaultdict(list)
+        for key, step, duration, command_count in self.app.history_manager.get_perf_samples():
+            grouped[key][step].append(duration)
+            if step == "item" and command_count is not None:
+                commands[key].append(command_count)
+
+        summary = {}
+        for key, steps in grouped.items():
+            items = steps.get("item", [])
+            mean_item = sum(items) / len(items) if items else 0
+            summary[key] = {
+                "items": len(items),
+                "items_per_min": 60.0 / mean_item if mean_item else 0.0,
+                "commands_per_item": sum(commands[key]) / len(commands[key]) if commands[key] else 0.0,
+                "steps": {step: (len(v), percentile(sorted(v), 50), percentile(sorted(v), 95)) for step, v in steps.items()},
+            }
+        return summary
@@ -0,0 +1,89 @@
+# rate_controller.py
+"""
+Adaptive pause between items, shared by all automations and browser sessions.
+
+After each item, pace() reads how long the portal took to answer the last page
+load (Navigation Timing: requestStart -> responseStart) and whether the item ran
+into a server-side problem (timeout, unknown alert, crash). It keeps a running picture per host:
+
+- healthy (answers near the host's usual time, no errors): the pause halves after every item, down to zero
+- slow (answer above slow_ms or slow_factor x usual) or errors: the pause doubles,
+  starting at backoff_start, up to max_delay
+- the pause is never below the automation's floor in RATE_CONFIG["floors"]
+"""
+import time
+import threading
+from collections import deque
+
+import config
+
+# One navigation = one timeOrigin; the same page read twice must not count twice
+_TIMING_JS = """
+var n = performance.getEntriesByType('navigation')[0];
+return [location.host, performance.timeOrigin, n ? n.responseStart - n.requestStart : -1];
+"""
+
+
+class HostPace:
+    def __init__(self):
+        self.ewma_ms = None # Smoothed answer time
+        self.baseline_ms = None # Usual answer time when healthy (slowly follows the best times)
+        self.delay = 0.0
+        self.outcomes = deque(maxlen=20) # True = item went through without a server problem
+        self.last_origin = None
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+
+class RateController:
+    def __init__(self, app):
+        self.app = app
+        self.cfg = config.RATE_CONFIG
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def floor(self, automation_key):
+        return self.cfg["floors"].get(automation_key, self.cfg["default_floor"])
+
+    def _read_timing(self, driver):
+        try:
+            host, origin, ttfb = driver.execute_script(_TIMING_JS)
+            return host, origin, (ttfb if ttfb is not None and ttfb >= 0 else None)
+        except Exception: return "", None, None
+
+    def record(self, driver, ok=True):
+        """Updates the host's picture after one item. Returns (host, delay)."""
+        host, origin, ttfb = self._read_timing(driver)
+        cfg = self.cfg
+        with self._lock:
+            state = self.hosts.setdefault(host, HostPace())
+            state.outcomes.append(ok)
+            slow = False
+            if ttfb is not None and origin != state.last_origin:
+                state.last_origin = origin
+                state.ewma_ms = ttfb if state.ewma_ms is None else 0.7 * state.ewma_ms + 0.3 * ttfb
+                if state.baseline_ms is None or ttfb < state.baseline_ms: state.baseline_ms = ttfb
+                else: state.baseline_ms += 0.05 * (ttfb - state.baseline_ms)
+                slow = state.ewma_ms > max(cfg["slow_ms"], cfg["slow_factor"] * state.baseline_ms)
+            if not ok or slow or state.error_rate > cfg["max_error_rate"]:
+                state.delay = min(cfg["max_delay"], max(cfg["backoff_start"], state.delay * 2))
+            else:
+                state.delay = state.delay / 2 if state.delay >= 0.1 else 0.0
+            return host, state.delay
+
+    def pace(self, automation_key, driver, ok=True, stop_event=None, on_wait=None):
+        """Records the item and waits the adaptive pause (cut short by stop_event). Returns the pause."""
+        _, delay = self.record(driver, ok)
+        delay = max(delay, self.floor(automation_key))
+        if delay > 0:
+            if on_wait: on_wait(delay)
+            if stop_event: stop_event.wait(delay)
+            else: time.sleep(delay)
+        return delay
+
+    def snapshot(self):
+        with self._lock:
+            return {host: {"answer_ms": round(s.ewma_ms or 0), "usual_ms": round(s.baseline_ms or 0),
+                           "error_rate": round(s.error_rate, 2), "delay": round(s.delay, 2)} for host, s in self.hosts.items()}
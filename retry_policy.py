@@ -0,0 +1,100 @@
+# retry_policy.py
+"""
+In-run retry for items that fail because of the portal, not the data.
+
+An item (a _process_single_* call) fails either by raising or, more often, by
+logging a non-success row through the tab's _log_result. While an item runs, its
+_log_result rows are held back. If the failure is retryable, the held rows are
+dropped and the item runs again after a backoff of
+base_backoff * 2^(attempt-1) seconds (capped at max_backoff, with +/-50% jitter).
+If it succeeds, or the failure is permanent, or no attempts are left, the rows
+are logged as usual. Only failures that are still there after retrying reach the results table.
+
+Classification (RETRY_CONFIG): permanent_patterns win over retryable_patterns,
+and anything matching neither is permanent. A save that may already have gone
+through counts as permanent, so it is never submitted twice.
+"""
+import random
+import threading
+
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, ElementClickInterceptedException
+
+import config
+
+_RETRYABLE_EXCEPTIONS = (TimeoutException, StaleElementReferenceException, ElementClickInterceptedException)
+
+
+class RetryPolicy:
+    def __init__(self, app):
+        self.app = app
+        self.cfg = config.RETRY_CONFIG
+        self._local = threading.local()
+
+    # --- Classification ---
+    def is_retryable_text(self, text):
+        text = (text or "").lower()
+        if any(p in text for p in self.cfg["permanent_patterns"]): return False
+        return any(p in text for p in self.cfg["retryable_patterns"])
+
+    def is_retryable(self, error):
+        if isinstance(error, _RETRYABLE_EXCEPTIONS): return True
+        return self.is_retryable_text(f"{type(error).__name__}: {error}")
+
+    def _rows_retryable(self, rows):
+        """Held _log_result rows: retry only if none is a success and one names a transient problem."""
+        texts = [" ".join(str(a) for a in args) + " " + " ".join(str(v) for v in kwargs.values()) for args, kwargs in rows]
+        if not texts or any("success" in t.lower() for t in texts): return False
+        return any(self.is_retryable_text(t) for t in texts)
+
+    def backoff(self, attempt):
+        delay = min(self.cfg["max_backoff"], self.cfg["base_backoff"] * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.5)
+
+    # --- Wrapping ---
+    def wrap_log_result(self, log_result):
+        """The tab's _log_result: rows logged inside an item are held until the item is settled."""
+        def wrapper(*args, **kwargs):
+            held = getattr(self._local, "held", None)
+            if held is None: return log_result(*args, **kwargs)
+            held.append((args, kwargs))
+        wrapper.__name__ = getattr(log_result, "__name__", "wrapper")
+        return wrapper
+
+    def track_item(self, automation_key, func, log_result=None, on_retry=None):
+        """Wraps a per-item function with classified retries. log_result is the tab's unwrapped _log_result."""
+        def wrapper(*args, **kwargs):
+            local = self._local
+            if getattr(local, "held", None) is not None:
+                return func(*args, **kwargs) # Nested per-item call: part of the outer attempt
+            stop = self.app.stop_events.get(automation_key) or threading.Event()
+            attempts = max(1, self.cfg["max_attempts"])
+            for attempt in range(1, attempts + 1):
+                local.held, result, error = [], None, None
+                try: result = func(*args, **kwargs)
+                except Exception as e: error = e
+                finally: rows, local.held = local.held, None
+
+                retryable = self.is_retryable(error) if error is not None else self._rows_retryable(rows)
+                if retryable and attempt < attempts and not stop.is_set():
+                    delay = self.backoff(attempt)
+                    reason = f"{type(error).__name__}: {error}" if error is not None else " ".join(str(a) for a in rows[-1][0])
+                    if on_retry: on_retry(f"Retrying ({attempt + 1}/{attempts}) in {delay:.1f}s - {reason.splitlines()[0][:120]}")
+                    if not stop.wait(delay): continue
+                if log_result:
+                    for row_args, row_kwargs in rows: log_result(*row_args, **row_kwargs)
+                if error is not None: raise error
+                return result
+        wrapper.__name__ = getattr(func, "__name__", "wrapper")
+        wrapper.__doc__ = getattr(func, "__doc__", None)
+        return wrapper
+
+    def call(self, func, *args, attempts=None, stop_event=None, **kwargs):
+        """Runs func, retrying retryable exceptions with the same backoff. The last error is raised."""
+        attempts = attempts or self.cfg["max_attempts"]
+        for attempt in range(1, attempts + 1):
+            try: return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == attempts or not self.is_retryable(e) or (stop_event and stop_event.is_set()): raise
+                delay = self.backoff(attempt)
+                if stop_event: stop_event.wait(delay)
+                else: threading.Event().wait(delay)
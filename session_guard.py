@@ -0,0 +1,195 @@
+# session_guard.py
+"""
+Notices when the NREGA portal logs us out in the middle of a run and gets the
+session back, instead of letting every remaining item wait out its timeouts.
+
+- Only commands issued inside a per-item function (_process_single_*) are watched.
+- After each navigation the page URL is checked for the login page. When an element
+  lookup fails the URL is checked too (at most every check_interval seconds), and
+  alert texts like "Session expired" are caught.
+- On expiry the run pauses: the login page is opened with the saved Login Automation
+  location (Financial Year / District / Block), the user is asked once to sign in,
+  and the guard waits until the browser leaves the login page.
+- A navigation that landed on the login page is then repeated, so the item carries on.
+  An expiry noticed half way through an item runs that item once more from the start.
+- If nobody signs in within relogin_timeout, the run is stopped.
+"""
+import time
+import threading
+from tkinter import messagebox
+
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import WebDriverException, NoSuchElementException, UnexpectedAlertPresentException
+
+import config
+from utils import get_data_path
+
+_relogin_lock = threading.Lock() # One sign-in prompt at a time, across all runs
+_restored_at = {} # Browser profile (debug address) -> time of the last completed sign-in (cookies are per profile)
+
+
+class SessionExpiredError(WebDriverException):
+    """The portal session expired while an item was running."""
+
+
+class SessionGuard:
+    def __init__(self, app):
+        self.app = app
+        self.cfg = config.SESSION_GUARD_CONFIG
+        self._local = threading.local()
+
+    @property
+    def _key(self):
+        return getattr(self._local, "key", None)
+
+    # --- Detection ---
+    def is_login_url(self, url):
+        url = (url or "").lower()
+        return any(marker in url for marker in self.cfg["login_url_markers"])
+
+    def is_expiry_text(self, text):
+        text = (text or "").lower()
+        return any(marker in text for marker in self.cfg["alert_markers"])
+
+    def _on_login_page(self, driver):
+        try: return self.is_login_url(driver.current_url)
+        except WebDriverException: return False
+
+    def _check_due(self):
+        now = time.time()
+        if now - getattr(self._local, "last_check", 0) < self.cfg["check_interval"]: return False
+        self._local.last_check = now
+        return True
+
+    def instrument_driver(self, driver):
+        if driver is None or getattr(driver, "_session_guarded", False):
+            return driver
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            local = self._local
+            if self._key is None or getattr(local, "busy", False):
+                return original_execute(driver_command, params)
+            detected_at = time.time()
+            try:
+                response = original_execute(driver_command, params)
+            except UnexpectedAlertPresentException as e:
+                if self.is_expiry_text(e.alert_text or e.msg): self._expired(driver, detected_at, mid_item=True)
+                raise
+            except NoSuchElementException:
+                if self._check_due() and self._on_login_page(driver): self._expired(driver, detected_at, mid_item=True)
+                raise
+
+            if driver_command == Command.GET:
+                url = (params or {}).get("url")
+                if not self.is_login_url(url) and self._on_login_page(driver):
+                    self._expired(driver, detected_at)
+                    return original_execute(driver_command, params) # Same navigation, now signed in
+                local.last_url = url
+            elif driver_command == Command.W3C_GET_ALERT_TEXT:
+                local.alert_expired = self.is_expiry_text((response or {}).get("value"))
+            elif driver_command in (Command.W3C_ACCEPT_ALERT, Command.W3C_DISMISS_ALERT) and getattr(local, "alert_expired", False):
+                local.alert_expired = False
+                self._expired(driver, detected_at, mid_item=True)
+            return response
+
+        driver.execute = execute
+        driver._session_guarded = True
+        return driver
+
+    def track_item(self, automation_key, func):
+        """Wraps a per-item function: the guard is active inside it, and an item cut short by expiry runs once more."""
+        def wrapper(*args, **kwargs):
+            local = self._local
+            if self._key is not None:
+                return func(*args, **kwargs)
+            local.key, local.restart = automation_key, False
+            try:
+                try:
+                    result = func(*args, **kwargs)
+                except SessionExpiredError:
+                    if not local.restart: raise
+                    result = None
+                if local.restart and not self._stop_event(automation_key).is_set():
+                    local.restart = False
+                    result = func(*args, **kwargs)
+                return result
+            finally:
+                local.key = None
+        wrapper.__name__ = getattr(func, "__name__", "wrapper")
+        wrapper.__doc__ = getattr(func, "__doc__", None)
+        return wrapper
+
+    # --- Recovery ---
+    def _expired(self, driver, detected_at, mid_item=False):
+        """Waits for a new sign-in. Mid-item: goes back to the item's page and raises so the item restarts."""
+        local, key = self._local, self._key
+        local.busy = True
+        try:
+            signed_in = self._relogin(driver, key, detected_at)
+            if signed_in and mid_item and getattr(local, "last_url", None):
+                try: driver.get(local.last_url)
+                except WebDriverException: pass
+        finally:
+            local.busy = False
+        if not signed_in:
+            self._stop_event(key).set()
+            raise SessionExpiredError("Session expired and login was not completed. Run stopped.")
+        if mid_item:
+            local.restart = True
+            raise SessionExpiredError("Session expired during this item. Logged in again, retrying the item.")
+
+    def _relogin(self, driver, key, detected_at):
+        browser = self._browser_key(driver)
+        with _relogin_lock:
+            # Another run already signed this browser profile in while we were waiting for the lock
+            if _restored_at.get(browser, 0) > detected_at: return True
+
+            self.app.history_manager.log_activity("WARNING", f"[{key}] Session expired. Waiting for login...")
+            self.app.after(0, self.app.set_status, "Session expired - please log in")
+            self.app.after(0, self.app.play_sound, "error")
+            self._open_login(driver)
+            dialogs = getattr(self.app, "dialogs", messagebox) # Headless runs report it as an event
+            self.app.after(0, lambda: dialogs.showwarning("Session Expired",
+                "NREGA session expired during the run.\n\nPlease enter User ID & Password in the browser and log in. "
+                "The automation will continue on its own after login."))
+
+            deadline = time.time() + self.cfg["relogin_timeout"]
+            stop = self._stop_event(key)
+            while time.time() < deadline and not stop.wait(3):
+                try:
+                    if not self.is_login_url(driver.current_url): break
+                except WebDriverException: pass
+            else:
+                self.app.history_manager.log_activity("ERROR", f"[{key}] Session expired and login was not completed.")
+                return False
+
+            _restored_at[browser] = time.time()
+            self.app.history_manager.log_activity("SUCCESS", f"[{key}] Logged in again, resuming run.")
+            self.app.after(0, self.app.set_status, "Logged in again - resuming")
+            return True
+
+    def _open_login(self, driver):
+        """Login page with the saved location already selected (same as the Login Automation tab)."""
+        from tabs.login_automation_tab import load_location_prefs, open_login_page # Lazy: tabs import batch_runner
+        prefs = load_location_prefs(get_data_path('user_location_pref.json'))
+        try:
+            driver.switch_to.window(driver.current_window_handle) # Bring this tab to the front
+            if prefs.get("district") and prefs.get("block"):
+                open_login_page(driver, prefs.get("fin_year", ""), prefs["district"], prefs["block"])
+            elif not self._on_login_page(driver):
+                driver.get(self.cfg["login_url"])
+        except Exception: pass # The user can still pick the location by hand
+
+    def _stop_event(self, key):
+        return self.app.stop_events.get(key) or threading.Event()
+
+    @staticmethod
+    def _browser_key(driver):
+        """The profile this driver is attached to: its debugger address (one per profile), else the browser name."""
+        try: caps = driver.capabilities
+        except Exception: return ""
+        for options in ("goog:chromeOptions", "ms:edgeOptions"):
+            address = (caps.get(options) or {}).get("debuggerAddress")
+            if address: return address
+        return caps.get("browserName", "")
@@ -1,12 +1,50 @@
 import os
 import sys
+import time
+import threading
 import subprocess
 import config
 from utils import resource_path
 
+POOL_SIZE = 4 # Mixer channels used for UI sounds
+REPEAT_GAP = 0.3 # Seconds; the same sound again within this is dropped (bursts from worker callbacks)
+
+# macOS: one osascript process keeps every sound loaded (NSSound) and plays the names it reads from stdin
+_MAC_PLAYER_JS = """
+ObjC.import('AppKit');
+function run(argv) {
+    var dir = argv[0], sounds = {};
+    var files = $.NSFileManager.defaultManager.contentsOfDirectoryAtPathError(dir, null).js;
+    files.forEach(function (f) {
+        f = f.js;
+        if (f.slice(-4) === '.wav') sounds[f.slice(0, -4)] = $.NSSound.alloc.initWithContentsOfFileByReference(dir + '/' + f, false);
+    });
+    var stdin = $.NSFileHandle.fileHandleWithStandardInput, pending = '';
+    while (true) {
+        var data = stdin.availableData;
+        if (data.length === 0) return; // App closed the pipe
+        pending += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        var lines = pending.split('\\n'); pending = lines.pop();
+        lines.forEach(function (name) {
+            var s = sounds[name];
+            if (!s) return;
+            if (s.isPlaying) s.stop;
+            s.play;
+        });
+    }
+}
+"""
+
 class SoundManager:
     def __init__(self, app):
         self.app = app
+        self.sounds_dir = resource_path("assets/sounds")
+        self._lock = threading.Lock()
+        self._sounds = None # name -> decoded pygame Sound (or file path on macOS); filled once by preload()
+        self._channels = []
+        self._next_channel = 0
+        self._last_played = {}
+        self._mac_player = None
         self._initialize_audio()
 
     def _initialize_audio(self):
@@ -18,27 +56,69 @@ class SoundManager:
             except Exception as e:
                 print(f"Warning: Audio mixer init failed: {e}")
 
+    def preload(self):
+        """Decodes every sound under assets/sounds once (first play, or at idle after startup)."""
+        with self._lock:
+            if self._sounds is not None: return
+            sounds = {}
+            try: names = [f[:-4] for f in os.listdir(self.sounds_dir) if f.endswith(".wav")]
+            except OSError: names = []
+            if config.OS_SYSTEM == "Darwin":
+                sounds = {name: os.path.join(self.sounds_dir, f"{name}.wav") for name in names}
+                self._start_mac_player()
+            else:
+                try:
+                    import pygame
+                    for name in names: sounds[name] = pygame.mixer.Sound(os.path.join(self.sounds_dir, f"{name}.wav"))
+                    self._channels = [pygame.mixer.Channel(i) for i in range(min(POOL_SIZE, pygame.mixer.get_num_channels()))]
+                except Exception as e:
+                    print(f"Warning: Could not load sounds: {e}")
+            self._sounds = sounds
+
+    def _start_mac_player(self):
+        try:
+            self._mac_player = subprocess.Popen(
+                ["osascript", "-l", "JavaScript", "-e", _MAC_PLAYER_JS, self.sounds_dir],
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f"Warning: Sound player could not start, using afplay: {e}")
+            self._mac_player = None
+
+    def _play_mac(self, sound_name):
+        player = self._mac_player
+        if player and player.poll() is None:
+            try:
+                player.stdin.write(f"{sound_name}\n".encode("utf-8")); player.stdin.flush()
+                return
+            except OSError: self._mac_player = None
+        # Player gone: fall back to a one-off afplay
+        subprocess.Popen(["afplay", self._sounds[sound_name]], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _play_pygame(self, sound):
+        # Idle channel from the pool, else the next one in turn (its sound is cut short)
+        channel = next((c for c in self._channels if not c.get_busy()), None)
+        if channel is None:
+            channel = self._channels[self._next_channel % len(self._channels)]
+            self._next_channel += 1
+        channel.play(sound)
+
     def play(self, sound_name: str):
-        """Plays a sound file based on OS."""
+        """Plays a preloaded sound from the channel pool (macOS: the shared player process)."""
         # Check from App Config variable directly
         if hasattr(self.app, 'sound_switch_var') and not self.app.sound_switch_var.get():
             return
-        
-        sound_file = resource_path(f"assets/sounds/{sound_name}.wav")
-        if not os.path.exists(sound_file):
-            return
+        if self._sounds is None: self.preload()
 
-        try:
-            if config.OS_SYSTEM == "Darwin":
-                # macOS: Native afplay (No lag)
-                subprocess.Popen(
-                    ["afplay", sound_file], 
-                    stdout=subprocess.DEVNULL, 
-                    stderr=subprocess.DEVNULL
-                )
-            else:
-                # Windows: Pygame
-                import pygame
-                pygame.mixer.Sound(sound_file).play()
-        except Exception as e:
-            print(f"Error playing sound '{sound_name}': {e}")
\ No newline at end of file
+        with self._lock:
+            sound = self._sounds.get(sound_name)
+            if sound is None: return
+            now = time.monotonic()
+            if now - self._last_played.get(sound_name, -REPEAT_GAP) < REPEAT_GAP: return
+            self._last_played[sound_name] = now
+            try:
+                if config.OS_SYSTEM == "Darwin": self._play_mac(sound_name)
+                elif self._channels: self._play_pygame(sound)
+                else: sound.play()
+            except Exception as e:
+                print(f"Error playing sound '{sound_name}': {e}")
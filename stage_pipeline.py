@@ -0,0 +1,273 @@
+# stage_pipeline.py
+"""
+Pipeline mode for the MR Fill -> MR Payment -> eMB Entry chain.
+
+Each stage runs on its own browser tab (its own WebDriver session attached to
+NregaBot's Chrome) and takes work keys from a small queue. A key that succeeds in
+one stage goes on the next stage's queue straight away, so the stages work at the
+same time and the chain takes about as long as its slowest stage.
+Queues hold PIPELINE_CONFIG["queue_size"] items; a faster stage waits there
+instead of running far ahead of a slow one.
+
+All stages share one browser profile (one login), held for the whole run.
+Wagelist generation works on the whole panchayat, not per item, so the optional
+wagelist step (generate, then send the new range) runs once after the last stage drains.
+"""
+import os
+import json
+import time
+import queue
+import importlib
+import threading
+from datetime import datetime
+from collections import Counter, deque
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchWindowException, InvalidSessionIdException
+
+import config
+import dropdowns
+from batch_runner import make_headless_tab
+from job_scheduler import SessionApp
+from session_guard import SessionExpiredError
+
+PIPELINE_KEY = "pipeline"
+_DONE = object()
+# The stage's browser tab or login is gone; every later item would fail the same way
+_STAGE_FATAL = (NoSuchWindowException, InvalidSessionIdException, SessionExpiredError)
+
+
+def _open_with_panchayat(driver, url, locator, panchayat):
+    """Opens the page and, on a Block login, selects the Panchayat (same as the tabs' run logic)."""
+    driver.get(url)
+    try: element = WebDriverWait(driver, 3).until(EC.presence_of_element_located(locator))
+    except TimeoutException: return # GP login
+    match = dropdowns.find_option(dropdowns.read_options(driver, element), panchayat, match="contains")
+    if not match: raise ValueError(f"Panchayat '{panchayat}' not found.")
+    dropdowns.select_option(driver, element, value=match.value)
+    time.sleep(2)
+
+
+# --- Stages: setup(tab, driver, params) once per browser tab, process(tab, driver, item, params) per item ---
+class Stage:
+    def __init__(self, key, name, tab_path, item_col, status_col, details_col, setup, process):
+        self.key, self.name, self.tab_path = key, name, tab_path
+        self.item_col, self.status_col, self.details_col = item_col, status_col, details_col # results_tree value positions
+        self.setup, self.process = setup, process
+
+    def tab_class(self):
+        module, class_name = self.tab_path
+        return getattr(importlib.import_module(module), class_name)
+
+
+def _mr_fill_setup(tab, driver, params):
+    _open_with_panchayat(driver, config.MR_FILL_CONFIG["url"], (By.ID, "ddlPanchayat"), params["panchayat"])
+
+def _mr_fill_process(tab, driver, item, params):
+    tab._process_single_work_code(driver, WebDriverWait(driver, 15), item, params["holiday_cols"], False)
+
+
+def _msr_setup(tab, driver, params):
+    _open_with_panchayat(driver, config.MSR_CONFIG["url"], (By.NAME, "ddlPanchayat"), params["panchayat"])
+
+def _msr_process(tab, driver, item, params):
+    tab._process_single_work_code(driver, WebDriverWait(driver, 15), item, params["verify_amount"])
+
+
+def _mb_entry_setup(tab, driver, params):
+    driver.get(config.MB_ENTRY_CONFIG["url"])
+
+def _mb_entry_process(tab, driver, item, params):
+    tab._process_single_work_code(driver, item, params["mb_cfg"], params["mates"])
+
+
+STAGES = [
+    Stage("mr_fill", "MR Fill", ("tabs.mr_fill_tab", "MrFillTab"), 0, 2, 3, _mr_fill_setup, _mr_fill_process),
+    Stage("msr", "MR Payment", ("tabs.msr_tab", "MsrTab"), 0, 1, 2, _msr_setup, _msr_process),
+    Stage("mb_entry", "eMB Entry", ("tabs.mb_entry_tab", "MbEntryTab"), 1, 5, 6, _mb_entry_setup, _mb_entry_process),
+]
+
+
+def _load_json(app, filename):
+    path = app.get_data_path(filename)
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, 'r') as f: return json.load(f)
+    except (json.JSONDecodeError, IOError): return {}
+
+
+def build_params(app, stage_keys, panchayat, verify_amount):
+    """Stage inputs from what the MR Fill / eMB Entry tabs last saved. Raises ValueError if something is missing."""
+    try: params = {"panchayat": panchayat, "verify_amount": float(verify_amount)}
+    except ValueError: raise ValueError("Verify Amount must be a valid number.")
+    if "mr_fill" in stage_keys:
+        saved = _load_json(app, "mr_fill_inputs.json")
+        params["holiday_cols"] = [c.strip() for c in saved.get("holiday_cols", "").split(',') if c.strip().isdigit()]
+    if "mb_entry" in stage_keys:
+        cfg = dict(config.MB_ENTRY_CONFIG["defaults"])
+        cfg.update(_load_json(app, "mb_entry_inputs.json"))
+        mates = _load_json(app, "mb_panchayat_mate_map.json").get(panchayat.strip().lower()) or cfg.get("mate_name", "")
+        cfg["panchayat_name"] = panchayat
+        cfg["auto_mb_no"] = cfg.get("measurement_book_no", "") in ("", "Auto from Workcode")
+        missing = [label for key, label in (("page_no", "Page No."), ("unit_cost", "Unit Cost"), ("default_pit_count", "Pit Count")) if not str(cfg.get(key, "")).strip()]
+        if not mates.strip(): missing.append("Mate Name")
+        if missing: raise ValueError(f"eMB Entry needs {', '.join(missing)}. Fill them once in the eMB Entry tab and run it (or start it) to save.")
+        params["mb_cfg"], params["mates"] = cfg, [m.strip() for m in mates.split(',') if m.strip()]
+    return params
+
+
+def current_fin_year():
+    now = datetime.now()
+    return f"{now.year}-{now.year + 1}" if now.month >= 4 else f"{now.year - 1}-{now.year}"
+
+
+class StagePipeline:
+    def __init__(self, app, stage_keys, items, params, with_wagelist=False, profile=None):
+        self.app = app
+        self.profile_name = profile or config.PIPELINE_CONFIG["profile"] or None
+        self.profile = None
+        self.stages = [s for s in STAGES if s.key in stage_keys]
+        self.items, self.params, self.with_wagelist = list(items), params, with_wagelist
+        self.results = {s.name: Counter() for s in self.stages}
+        if with_wagelist: self.results.update({"Wagelist Gen": Counter(), "Wagelist Send": Counter()})
+        self.rows = [] # (time, stage, item, status, details)
+        self.log = deque(maxlen=500)
+        self.queues = []
+        self.finished = False
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    # --- State for the pipeline window ---
+    def snapshot(self):
+        with self._lock:
+            waiting = {s.name: q.qsize() for s, q in zip(self.stages, self.queues)}
+            return {"results": {k: dict(v) for k, v in self.results.items()}, "waiting": waiting,
+                    "rows": list(self.rows), "log": list(self.log), "finished": self.finished}
+
+    def stop(self):
+        self.app.stop_events[PIPELINE_KEY].set()
+        for session in list(self._sessions):
+            for event in session.stop_events.values(): event.set()
+
+    def _stopped(self):
+        return self.app.stop_events[PIPELINE_KEY].is_set()
+
+    def _emit(self, stage_name):
+        def emit(event):
+            if event["type"] == "log" and event["level"] != "debug":
+                with self._lock: self.log.append(f"[{stage_name}] {event['message']}")
+            elif event["type"] == "dialog":
+                with self._lock: self.log.append(f"[{stage_name}] {event['title']}: {event['message']}")
+        return emit
+
+    def _record(self, stage_name, item, status, details):
+        with self._lock:
+            self.results[stage_name][status] += 1
+            self.rows.append((datetime.now().strftime("%H:%M:%S"), stage_name, item, status, details))
+
+    def _put(self, q, item):
+        """Blocks while the next stage is full (back-pressure). False if the pipeline was stopped."""
+        while not self._stopped():
+            try: q.put(item, timeout=0.5); return True
+            except queue.Full: continue
+        return False
+
+    def _new_session(self, name):
+        session = SessionApp(self.app, self.profile, self._emit(name))
+        with self._lock: self._sessions.append(session)
+        return session
+
+    # --- Running ---
+    def run(self):
+        """Runs on the automation thread started by WorkflowManager."""
+        self.queues = [queue.Queue(maxsize=config.PIPELINE_CONFIG["queue_size"]) for _ in self.stages]
+        self.profile = self.app.profile_manager.acquire("Pipeline", self.profile_name)
+        if not self.profile:
+            with self._lock:
+                self.log.append(f"No free browser profile{f' named {self.profile_name}' if self.profile_name else ''} is running. Launch one first.")
+                self.finished = True
+            self.app.after(0, self.app.play_sound, "error")
+            return
+        try: self._run_stages()
+        finally: self.app.profile_manager.release(self.profile.name, "Pipeline")
+
+    def _run_stages(self):
+        workers = []
+        for i, stage in enumerate(self.stages):
+            outbox = self.queues[i + 1] if i + 1 < len(self.stages) else None
+            t = threading.Thread(target=self._stage_worker, args=(stage, self.queues[i], outbox), daemon=True, name=f"pipeline-{stage.key}")
+            t.start(); workers.append(t)
+
+        self.app.after(0, self.app.set_status, f"Pipeline running ({len(self.items)} items)...")
+        for item in self.items:
+            if not self._put(self.queues[0], item): break
+        self._put(self.queues[0], _DONE)
+        for t in workers: t.join()
+
+        last = self.stages[-1].name
+        if self.with_wagelist and not self._stopped() and self.results[last].get("Success"): self._run_wagelist()
+
+        with self._lock: self.finished = True
+        summary = "; ".join(f"{name}: {dict(c).get('Success', 0)} ok" for name, c in self.results.items())
+        self.app.history_manager.log_activity("SUCCESS", f"[Pipeline] {self.params['panchayat']} - {summary}")
+        self.app.after(0, self.app.play_sound, "success" if not self._stopped() else "error")
+
+    def _stage_worker(self, stage, inbox, outbox):
+        session = self._new_session(stage.name)
+        rows = []
+        tab = make_headless_tab(stage.tab_class(), session, stage.key, rows.append)
+        driver, error, item = None, None, None
+        try:
+            driver = session.get_driver()
+            if not driver: raise RuntimeError("Could not attach to Chrome. Launch Chrome from NregaBot first.")
+            driver.switch_to.new_window("tab")
+            stage.setup(tab, driver, self.params)
+            while not self._stopped():
+                try: item = inbox.get(timeout=0.5)
+                except queue.Empty: continue
+                if item is _DONE: break
+                rows.clear()
+                try: stage.process(tab, driver, item, self.params)
+                except _STAGE_FATAL: raise
+                except Exception as e:
+                    self._record(stage.name, item, "Failed", f"{type(e).__name__}: {e}")
+                    item = None; continue
+                row = rows[-1] if rows else ()
+                pick = lambda col: str(row[col]) if col < len(row) else ""
+                status = pick(stage.status_col).title() or "Failed"
+                self._record(stage.name, item, status, pick(stage.details_col) or "No result logged")
+                if status == "Success" and outbox is not None and not self._put(outbox, item): break
+                item = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            with self._lock: self.log.append(f"[{stage.name}] Stage stopped: {error}")
+            if item is not None and item is not _DONE: self._record(stage.name, item, "Failed", error)
+            # Keep taking items so the stage before this one isn't stuck on a full queue
+            while not self._stopped():
+                try: item = inbox.get(timeout=0.5)
+                except queue.Empty: continue
+                if item is _DONE: break
+                self._record(stage.name, item, "Not Run", f"{stage.name} stage stopped: {error}")
+        finally:
+            if outbox is not None: self._put(outbox, _DONE)
+            if driver:
+                try: driver.close(); driver.switch_to.window(driver.window_handles[0])
+                except Exception: pass
+
+    def _run_wagelist(self):
+        """Generates wagelists for the panchayat, then sends the generated range."""
+        from tabs.wagelist_gen_tab import WagelistGenTab
+        from tabs.wagelist_send_tab import WagelistSendTab
+        session = self._new_session("Wagelist")
+        generated = []
+        session.send_wagelist_data_and_switch_tab = lambda start, end: generated.append((start, end))
+        gen_tab = make_headless_tab(WagelistGenTab, session, "gen",
+                                    lambda v: self._record("Wagelist Gen", str(v[1]), str(v[2]).title(), str(v[3])))
+        gen_tab.run_automation_logic(self.params["panchayat"], False, True)
+        if not generated or self._stopped(): return
+        start, end = generated[-1]
+        send_tab = make_headless_tab(WagelistSendTab, session, "send",
+                                     lambda v: self._record("Wagelist Send", str(v[0]), str(v[1]).title(), str(v[3])))
+        send_tab.run_automation_logic(current_fin_year(), start, end)
@@ -10,9 +10,36 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
+# Pending grid rows as [row index, Show UID button id, job card (td 2), applicant (td 4)]
+_PENDING_ROWS_JS = """
+var t = document.querySelector("table[id*='gvData']");
+if (!t) return [];
+var out = [];
+for (var i = 1; i < t.rows.length; i++) {
+    var r = t.rows[i], btn = r.querySelector("input[id*='btn_showuid']");
+    if (btn && btn.id && r.cells.length >= 4) out.push([i, btn.id, r.cells[1].innerText, r.cells[3].innerText]);
+}
+return out;
+"""
+# The Show UID button, only if its row still holds the same job card
+_ROW_BUTTON_JS = """
+var btn = document.getElementById(arguments[0]);
+var r = btn && btn.closest('tr');
+return r && r.cells[1].innerText === arguments[1] ? btn : null;
+"""
+# [status text] of the row (found by control prefix, else by index), or null while the row isn't back yet
+_ROW_STATUS_JS = """
+var el = document.querySelector("[id^='" + arguments[0] + "']"), r = el && el.closest('tr');
+if (!r) { var t = document.querySelector("table[id*='gvData']"); r = t && t.rows[arguments[1]]; }
+if (!r || !r.cells[1] || r.cells[1].innerText !== arguments[2]) return null;
+var span = r.cells[8] && r.cells[8].querySelector('span');
+return [span ? span.innerText : ''];
+"""
+
 class AbpsVerifyTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="abps_verify")
@@ -140,10 +167,10 @@ class AbpsVerifyTab(BaseAutomationTab):
 
             # --- 2. Handle Village Dropdown ---
             village_css = "select[id*='DDL_Village']"
-            wait.until(lambda d: len(Select(d.find_element(By.CSS_SELECTOR, village_css)).options) > 1)
+            wait.until(lambda d: dropdowns.option_count(d, d.find_element(By.CSS_SELECTOR, village_css)) > 1)
             
             village_select_elem = driver.find_element(By.CSS_SELECTOR, village_css)
-            all_villages = [opt.text for opt in Select(village_select_elem).options if opt.get_attribute("value") != "00"]
+            all_villages = [opt.text for opt in dropdowns.read_options(driver, village_select_elem) if opt.value != "00"]
             
             villages_to_process = [village] if village else all_villages
             if village and village not in all_villages:
@@ -171,65 +198,30 @@ class AbpsVerifyTab(BaseAutomationTab):
                         self.app.log_message(self.log_display, f"Scanning page {page_number}...")
                         
                         page_processed_count = 0
-                        while True:
+                        # One script reads all pending rows of the page; rows are then worked in order by control ID
+                        pending = self._snapshot_rows(driver, session_processed_jobcards)
+                        page_total, moves = len(pending), 0
+                        while pending:
                             if self.app.stop_events[self.automation_key].is_set(): break
-
-                            unprocessed_rows_xpath = f"//table[contains(@id, 'gvData')]/tbody/tr[position()>1 and .//input[contains(@id, 'btn_showuid')]]"
-                            potential_rows = driver.find_elements(By.XPATH, unprocessed_rows_xpath)
-                            
-                            row_to_process = None
-                            job_card, app_name = "N/A", "N/A"
-                            unique_key = None
-                            
-                            # Row finding (No interaction here, so standard logic is fine)
-                            for row in potential_rows:
-                                try:
-                                    # Use innerText for background reading
-                                    jc_num = row.find_element(By.XPATH, ".//td[2]").get_attribute("innerText")
-                                    ap_name = row.find_element(By.XPATH, ".//td[4]").get_attribute("innerText")
-                                    key = (jc_num, ap_name) 
-
-                                    if key not in session_processed_jobcards:
-                                        row_to_process = row
-                                        job_card = jc_num
-                                        app_name = ap_name
-                                        unique_key = key
-                                        break
-                                except StaleElementReferenceException: continue
-                            
-                            if row_to_process is None:
-                                self.app.log_message(self.log_display, "No new unprocessed records found on this page view.")
-                                break
-
-                            try:
-                                self.app.after(0, self.update_status, f"Processing: {app_name}", 0.5)
-
-                                # --- FIX: JS Click for Show UID ---
-                                show_btn = row_to_process.find_element(By.XPATH, ".//input[contains(@id, 'btn_showuid')]")
-                                driver.execute_script("arguments[0].click();", show_btn)
-                                
-                                wait.until(EC.staleness_of(row_to_process))
-
-                                # Wait for row refresh
-                                refreshed_row = wait.until(EC.presence_of_element_located((By.XPATH, f"//tr[contains(., '{job_card}') and contains(., '{app_name}')]")))
-                                
-                                # --- FIX: JS Click for Verify UID ---
-                                check_npci_btn = refreshed_row.find_element(By.XPATH, ".//input[contains(@id, 'btn_verifyuid')]")
-                                driver.execute_script("arguments[0].click();", check_npci_btn)
-                                
-                                wait.until(EC.staleness_of(refreshed_row))
-
-                                # Read Status
-                                final_row = wait.until(EC.presence_of_element_located((By.XPATH, f"//tr[contains(., '{job_card}') and contains(., '{app_name}')]")))
-                                status_msg = final_row.find_element(By.XPATH, ".//td[9]/span").get_attribute("innerText")
-                                self._log_result(job_card, app_name, status_msg or "Checked")
-                                
-                            except (TimeoutException, StaleElementReferenceException, NoSuchElementException) as e:
-                                self._log_result(job_card, app_name, f"Error: {type(e).__name__}")
-                            finally:
-                                if unique_key:
-                                    session_processed_jobcards.add(unique_key)
-                                    page_processed_count += 1
+                            row = pending.pop(0)
+                            unique_key = (row["job_card"], row["name"])
+                            if unique_key in session_processed_jobcards: continue
+
+                            self.app.after(0, self.update_status, f"Processing: {row['name']}", (page_processed_count + 1) / max(page_total, 1))
+                            if self._process_single_row(driver, wait, row) == "moved":
+                                moves += 1
+                                if moves <= 2:
+                                    # Grid changed under us (rows added/removed by a postback): read it again
+                                    pending = self._snapshot_rows(driver, session_processed_jobcards)
+                                    page_total = page_processed_count + len(pending)
+                                    continue
+                                self._log_result(row["job_card"], row["name"], "Error: Row not found")
+                            moves = 0
+                            session_processed_jobcards.add(unique_key)
+                            page_processed_count += 1
+
+                        if not pending and page_processed_count == 0:
+                            self.app.log_message(self.log_display, "No new unprocessed records found on this page view.")
                         
                         if self.app.stop_events[self.automation_key].is_set(): break
                         
@@ -270,6 +262,34 @@ class AbpsVerifyTab(BaseAutomationTab):
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.app.set_status, "Automation Finished")
 
+    def _snapshot_rows(self, driver, processed):
+        """Pending rows (with a Show UID button) of the grid, minus ones already done this run."""
+        rows = driver.execute_script(_PENDING_ROWS_JS) or []
+        return [{"index": i, "show_id": btn_id, "job_card": jc, "name": name} for i, btn_id, jc, name in rows if (jc, name) not in processed]
+
+    def _process_single_row(self, driver, wait, row):
+        """Show UID -> Verify UID -> read status for one snapshot row. Returns 'moved' if the row is no longer where it was."""
+        job_card, app_name = row["job_card"], row["name"]
+        prefix = row["show_id"][:row["show_id"].index("btn_showuid")] # Row's control prefix, e.g. ..._gvData_ctl05_
+        try:
+            show_btn = driver.execute_script(_ROW_BUTTON_JS, row["show_id"], job_card)
+            if not show_btn: return "moved"
+
+            # --- FIX: JS Click for Show UID ---
+            driver.execute_script("arguments[0].click();", show_btn)
+            wait.until(EC.staleness_of(show_btn))
+
+            # --- FIX: JS Click for Verify UID (same row, by control ID) ---
+            check_npci_btn = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, f"input[id^='{prefix}'][id*='btn_verifyuid']")))
+            driver.execute_script("arguments[0].click();", check_npci_btn)
+            wait.until(EC.staleness_of(check_npci_btn))
+
+            # Read Status
+            status_msg = wait.until(lambda d: d.execute_script(_ROW_STATUS_JS, prefix, row["index"], job_card))[0]
+            self._log_result(job_card, app_name, status_msg or "Checked")
+        except (TimeoutException, StaleElementReferenceException, NoSuchElementException) as e:
+            self._log_result(job_card, app_name, f"Error: {type(e).__name__}")
+
     def _log_result(self, job_card, app_name, status):
         timestamp = datetime.now().strftime("%H:%M:%S")
         
@@ -11,6 +11,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, UnexpectedAlertPresentException, StaleElementReferenceException
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 
 class AddActivityTab(BaseAutomationTab):
@@ -194,8 +195,7 @@ class AddActivityTab(BaseAutomationTab):
             # 2. Select work from dropdown (Presence Check)
             work_name_dd_id = 'ctl00_ContentPlaceHolder1_ddlworkName'
             wait.until(EC.presence_of_element_located((By.ID, work_name_dd_id)))
-            wait.until(lambda d: len(Select(d.find_element(By.ID, work_name_dd_id)).options) > 1)
-            Select(driver.find_element(By.ID, work_name_dd_id)).select_by_index(1)
+            dropdowns.select_option(driver, work_name_dd_id, index=1, options=dropdowns.wait_for_options(driver, work_name_dd_id))
             self.app.log_message(self.log_display, "Work selected. Loading details...")
             
             # Check for existing activity (Use innerText)
@@ -13,6 +13,9 @@ from fpdf import FPDF
 from selenium.common.exceptions import NoSuchWindowException, WebDriverException
 
 from utils import resource_path
+import pdf_merge
+from job_scheduler import FROM_TAB_ARGS
+from browser_profiles import attach_driver
 
 # --- REUSABLE DATE PICKER CLASS ---
 class DatePickerPopup(ctk.CTkToplevel):
@@ -172,11 +175,33 @@ class ProfessionalPDF(FPDF):
         self.cell(0, 10, f'Page {self.page_no()}/{{nb}} - Generated by NregaBot.com', 0, 0, 'C')
 
 class BaseAutomationTab(ctk.CTkFrame):
+    dialogs = messagebox # Message boxes of this tab; headless runs put batch_runner.HeadlessDialogs here
+
     def __init__(self, parent, app_instance, automation_key):
         super().__init__(parent, fg_color="transparent")
         self.app = app_instance
         self.automation_key = automation_key
         self.retry_btn = None # Placeholder for retry button
+        self._instrument_items()
+
+    def _instrument_items(self):
+        """
+        Per-item functions (_process_single_*) are timed for the History > Performance panel,
+        retried on transient portal failures (retry_policy.py) and run under the session guard
+        (re-login on session expiry, see session_guard.py).
+        """
+        perf = getattr(self.app, "perf_monitor", None)
+        retry = getattr(self.app, "retry_policy", None)
+        guard = getattr(self.app, "session_guard", None)
+        log_result = getattr(self, "_log_result", None)
+        if retry and log_result: self._log_result = retry.wrap_log_result(log_result)
+        for name in dir(type(self)):
+            if name.startswith("_process_single_") and callable(getattr(type(self), name, None)):
+                func = getattr(self, name)
+                if perf: func = perf.track_item(self.automation_key, func)
+                if retry: func = retry.track_item(self.automation_key, func, log_result, lambda msg: self.app.log_message(self.log_display, msg, "warning"))
+                if guard: func = guard.track_item(self.automation_key, func)
+                setattr(self, name, func)
         
     def open_date_picker(self, callback):
         """Opens the reusable DatePickerPopup."""
@@ -187,13 +212,13 @@ class BaseAutomationTab(ctk.CTkFrame):
         error_msg = str(e).lower()
         if "no such window" in error_msg or "target window already closed" in error_msg or "web view not found" in error_msg:
             self.app.log_message(self.log_display, "Automation Stopped: Browser tab/window was closed.", "error")
-            messagebox.showwarning("Browser Closed", "Automation stopped because the browser window was closed.")
+            self.dialogs.showwarning("Browser Closed", "Automation stopped because the browser window was closed.")
         elif "invalid session id" in error_msg:
             self.app.log_message(self.log_display, "Error: Browser session lost.", "error")
-            messagebox.showwarning("Connection Lost", "Browser session was lost. Please restart the browser.")
+            self.dialogs.showwarning("Connection Lost", "Browser session was lost. Please restart the browser.")
         else:
             self.app.log_message(self.log_display, f"Error: {e}", "error")
-            messagebox.showerror("Automation Error", f"An error occurred:\n\n{e}")
+            self.dialogs.showerror("Automation Error", f"An error occurred:\n\n{e}")
 
     def _get_wkhtml_path(self):
         os_type = platform.system()
@@ -369,7 +394,7 @@ class BaseAutomationTab(ctk.CTkFrame):
             final_img.save(output_path, "PNG", dpi=(300, 300))
             return True
         except Exception as e:
-            messagebox.showerror("PNG Export Error", f"Could not generate PNG report.\nError: {e}", parent=self.app)
+            self.dialogs.showerror("PNG Export Error", f"Could not generate PNG report.\nError: {e}", parent=self.app)
             return False
 
     def _wrap_text(self, text, font, max_width):
@@ -483,7 +508,7 @@ class BaseAutomationTab(ctk.CTkFrame):
             
         except Exception as e:
             print(f"PDF Gen Error: {e}")
-            messagebox.showerror("PDF Export Error", f"Could not generate PDF.\nError: {e}", parent=self.app)
+            self.dialogs.showerror("PDF Export Error", f"Could not generate PDF.\nError: {e}", parent=self.app)
             return False
 
     def _create_action_buttons(self, parent_frame):
@@ -503,6 +528,11 @@ class BaseAutomationTab(ctk.CTkFrame):
         self.retry_btn.pack(side="left", padx=(0, 8))
         self.retry_btn.configure(state="disabled") # Initially disabled
 
+        # Tabs the Job Queue can run: same input checks as Start, then the job waits its turn
+        if self.automation_key in FROM_TAB_ARGS and hasattr(self.app, "job_scheduler"):
+            self.queue_button = ctk.CTkButton(inner_container, text="+ Queue", command=lambda: self.app.job_scheduler.queue_from_tab(self), width=90, height=32, corner_radius=8, fg_color="#2563EB", hover_color="#1D4ED8", font=ctk.CTkFont(size=13, weight="bold"))
+            self.queue_button.pack(side="left", padx=(0, 8))
+
         self.reset_button = ctk.CTkButton(inner_container, text="↺ Reset", command=self.reset_ui, width=90, height=32, corner_radius=8, fg_color=("gray70", "#4A4A4A"), hover_color=("gray60", "#3A3A3A"), text_color="white", font=ctk.CTkFont(size=13))
         self.reset_button.pack(side="left")
         
@@ -520,9 +550,9 @@ class BaseAutomationTab(ctk.CTkFrame):
             logs = self.log_display.get("1.0", tkinter.END)
             if logs.strip():
                 self.app.clipboard_clear(); self.app.clipboard_append(logs)
-                messagebox.showinfo("Copied", "Logs copied to clipboard.", parent=self.app)
+                self.dialogs.showinfo("Copied", "Logs copied to clipboard.", parent=self.app)
             else:
-                messagebox.showwarning("Empty", "There are no logs to copy.", parent=self.app)
+                self.dialogs.showwarning("Empty", "There are no logs to copy.", parent=self.app)
 
         copy_button = ctk.CTkButton(log_actions_frame, text="Copy Logs", width=100, command=copy_logs_to_clipboard)
         copy_button.pack(side="right")
@@ -566,6 +596,41 @@ class BaseAutomationTab(ctk.CTkFrame):
         if hasattr(self.app, 'set_status'):
             self.app.set_status(message)
 
+    def run_pdf_merge(self, file_list, output_path, stop_key=None, **options):
+        """
+        Merges PDFs in a separate process (see pdf_merge.py) and mirrors its
+        progress in this tab's status bar. Call from the automation thread.
+        Returns the list of written files, or None if the user pressed Stop.
+        """
+        stop_event = self.app.stop_events.get(stop_key or self.automation_key)
+
+        def on_progress(stage, done, total, text):
+            if stage == "merge": message = f"Merging {done}/{total}: {text}"
+            else: message = f"{text} ({done // 1024} / {total // 1024} KB)"
+            self.app.after(0, self.update_status, message, done / total if total else 1.0)
+
+        return pdf_merge.run_merge_process(file_list, output_path, stop_event, on_progress, **options)
+
+    def _attach_extra_tab(self):
+        """New WebDriver on the browser the run uses (for parallel tabs); None for Firefox or an unknown profile."""
+        profile = getattr(self.app, "profile", None) # SessionApp (queued jobs, pipeline)
+        if not profile:
+            manager, name = getattr(self.app, "profile_manager", None), getattr(self.app, "active_profile", None)
+            profile = manager.get(name) if manager and name else None
+        if not profile or not profile.debug_port():
+            self.app.log_message(self.log_display, "Parallel tabs need Chrome / Edge launched from NregaBot. Using one tab.", "warning")
+            return None
+        driver = attach_driver(profile.browser, profile.debug_port())
+        for service in ("perf_monitor", "session_guard"):
+            if getattr(self.app, service, None): driver = getattr(self.app, service).instrument_driver(driver)
+        return driver
+
+    @staticmethod
+    def _after_save(details, save_clicked):
+        """Failure text for an item whose Save was clicked: says so, and retry_policy never submits it again."""
+        if not save_clicked or "after save" in details.lower(): return details
+        return f"{details} (after Save, it may have saved)"
+
     def retry_logic_handler(self):
         """Override this in child tabs if specific logic is needed, otherwise uses default."""
         # Child tab should define 'self.input_text_widget' (the textbox with codes/jobcards)
@@ -574,7 +639,7 @@ class BaseAutomationTab(ctk.CTkFrame):
         elif hasattr(self, 'jobcards_text'): # For Demand Tab support
             self.retry_failed_automation(self.jobcards_text)
         else:
-            messagebox.showinfo("Info", "Retry logic not configured for this tab.")
+            self.dialogs.showinfo("Info", "Retry logic not configured for this tab.")
 
     def retry_failed_automation(self, input_widget):
         """
@@ -588,7 +653,7 @@ class BaseAutomationTab(ctk.CTkFrame):
         all_items = self.results_tree.get_children()
         
         if not all_items:
-            messagebox.showinfo("Retry", "No results found to retry.")
+            self.dialogs.showinfo("Retry", "No results found to retry.")
             return
 
         for item_id in all_items:
@@ -601,11 +666,11 @@ class BaseAutomationTab(ctk.CTkFrame):
                 failed_items.append(code)
         
         if not failed_items:
-            messagebox.showinfo("Great!", "No failed items found.")
+            self.dialogs.showinfo("Great!", "No failed items found.")
             return
 
         # Confirm before action
-        if not messagebox.askyesno("Retry Failed", f"Found {len(failed_items)} failed items.\nDo you want to retry them now?"):
+        if not self.dialogs.askyesno("Retry Failed", f"Found {len(failed_items)} failed items.\nDo you want to retry them now?"):
             return
 
         # 1. Update Input Widget
@@ -715,9 +780,9 @@ class BaseAutomationTab(ctk.CTkFrame):
                 writer = csv.writer(f)
                 writer.writerow(tree["columns"])
                 for item_id in tree.get_children(): writer.writerow(tree.item(item_id)['values'])
-            messagebox.showinfo("Success", f"Report successfully exported to\n{file_path}", parent=self)
+            self.dialogs.showinfo("Success", f"Report successfully exported to\n{file_path}", parent=self)
         except Exception as e:
-            messagebox.showerror("Export Failed", f"An error occurred while saving the CSV file:\n{e}", parent=self)
+            self.dialogs.showerror("Export Failed", f"An error occurred while saving the CSV file:\n{e}", parent=self)
 
     def _extract_and_update_workcodes(self, textbox_widget):
         try:
@@ -745,12 +810,12 @@ class BaseAutomationTab(ctk.CTkFrame):
                 textbox_widget.configure(state="normal")
                 textbox_widget.delete("1.0", tkinter.END)
                 textbox_widget.insert("1.0", "\n".join(final_results))
-                messagebox.showinfo("Extraction Complete", f"Found and extracted {len(final_results)} items.", parent=self)
+                self.dialogs.showinfo("Extraction Complete", f"Found and extracted {len(final_results)} items.", parent=self)
             else:
-                messagebox.showinfo("No Codes Found", "Could not find any matching work codes or wagelist IDs in the text.", parent=self)
+                self.dialogs.showinfo("No Codes Found", "Could not find any matching work codes or wagelist IDs in the text.", parent=self)
         
         except Exception as e:
-            messagebox.showerror("Extraction Error", f"An error occurred during extraction: {e}", parent=self)
+            self.dialogs.showerror("Extraction Error", f"An error occurred during extraction: {e}", parent=self)
 
     def _apply_appearance_mode(self, theme_color_tuple):
         if isinstance(theme_color_tuple, (tuple, list)):
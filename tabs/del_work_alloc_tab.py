@@ -6,7 +6,7 @@ import time
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException, 
@@ -16,6 +16,7 @@ from selenium.common.exceptions import (
 )
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -255,24 +256,19 @@ class DelWorkAllocTab(BaseAutomationTab):
             try:
                 # Ensure the dropdown is actually visible and interactive
                 panchayat_dropdown_elem = wait.until(EC.visibility_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlpanchayat_code")))
-                panchayat_dropdown = Select(panchayat_dropdown_elem)
+                panchayat_options = dropdowns.read_options(driver, panchayat_dropdown_elem)
                 
                 # --- Fuzzy Matching Logic ---
-                target_p = panchayat.strip().lower()
-                found_option_text = None
+                found_option = dropdowns.find_option(panchayat_options, panchayat)
                 
-                for opt in panchayat_dropdown.options:
-                    if opt.text.strip().lower() == target_p:
-                        found_option_text = opt.text
-                        break
-                
-                if found_option_text:
+                if found_option:
+                    found_option_text = found_option.text
                     self.app.log_message(self.log_display, f"Selecting Panchayat: '{found_option_text}'...")
                     
                     # Store current body element to check for staleness (Postback detection)
                     body_elem = driver.find_element(By.TAG_NAME, "body")
                     
-                    panchayat_dropdown.select_by_visible_text(found_option_text)
+                    dropdowns.select_option(driver, panchayat_dropdown_elem, value=found_option.value, options=panchayat_options)
                     
                     # --- CRITICAL: Wait for Postback ---
                     # Selection triggers __doPostBack. We MUST wait for the page to reload.
@@ -287,7 +283,7 @@ class DelWorkAllocTab(BaseAutomationTab):
                     self.app.log_message(self.log_display, "Panchayat selected successfully.", "success")
                     
                 else:
-                    available = [o.text for o in panchayat_dropdown.options[:10]]
+                    available = [o.text for o in panchayat_options[:10]]
                     raise ValueError(f"Panchayat '{panchayat}' not found. Did you mean: {available}?")
 
             except Exception as e:
@@ -298,8 +294,8 @@ class DelWorkAllocTab(BaseAutomationTab):
             if auto_mode:
                 self.app.log_message(self.log_display, "Auto Mode: Fetching all Registration IDs.")
                 # Locate dropdown again after refresh
-                reg_id_dropdown = Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlRegistration"))))
-                items_to_process = [opt.get_attribute("value") for opt in reg_id_dropdown.options if opt.get_attribute("value") and "Select" not in opt.text]
+                reg_id_dropdown = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlRegistration")))
+                items_to_process = [opt.value for opt in dropdowns.read_options(driver, reg_id_dropdown) if opt.value and "Select" not in opt.text]
                 
                 if not items_to_process:
                     self.app.log_message(self.log_display, "No Registration IDs found for this Panchayat.", "warning")
@@ -351,14 +347,14 @@ class DelWorkAllocTab(BaseAutomationTab):
                 time.sleep(1.5) 
 
             reg_id_dropdown_element = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_ddlRegistration")))
-            reg_id_dropdown = Select(reg_id_dropdown_element)
+            reg_options = dropdowns.read_options(driver, reg_id_dropdown_element)
 
             if is_auto_mode:
-                reg_id_dropdown.select_by_value(item_id)
+                dropdowns.select_option(driver, reg_id_dropdown_element, value=item_id, options=reg_options)
             else: 
                 # In manual mode, select index 1 (the result of search)
-                if len(reg_id_dropdown.options) > 1:
-                    reg_id_dropdown.select_by_index(1)
+                if len(reg_options) > 1:
+                    dropdowns.select_option(driver, reg_id_dropdown_element, index=1, options=reg_options)
                 else:
                     raise ValueError("Jobcard search returned no results.")
 
@@ -445,14 +441,10 @@ class DelWorkAllocTab(BaseAutomationTab):
                 # However, since we are inside a loop that assumes Panchayat is selected, we must re-select it.
                 
                 wait.until(EC.visibility_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlpanchayat_code")))
-                p_dropdown = Select(driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlpanchayat_code"))
-                
                 # Quick Fuzzy Match
-                target_p = panchayat.strip().lower()
-                for opt in p_dropdown.options:
-                    if opt.text.strip().lower() == target_p:
-                        p_dropdown.select_by_visible_text(opt.text)
-                        break
+                p_options = dropdowns.read_options(driver, "ctl00_ContentPlaceHolder1_ddlpanchayat_code")
+                p_match = dropdowns.find_option(p_options, panchayat)
+                if p_match: dropdowns.select_option(driver, "ctl00_ContentPlaceHolder1_ddlpanchayat_code", value=p_match.value, options=p_options)
                 
                 wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_ddlRegistration")))
 
@@ -1,6 +1,6 @@
 # tabs/demand_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog, Toplevel
+from tkinter import ttk, filedialog, Toplevel
 import customtkinter as ctk
 import os, csv, time, threading, json, re, requests
 from datetime import datetime
@@ -11,10 +11,65 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.common.keys import Keys
 
 import config
+import dropdowns
 import sys, subprocess
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
+def read_applicants_csv(path):
+    """
+    Reads a demand CSV and returns the applicant rows the Demand tab works with.
+    Raises ValueError for an empty file or missing required headers.
+    """
+    applicants = []
+    with open(path, mode='r', encoding='utf-8-sig') as csvfile:
+        reader = csv.reader(csvfile)
+        try: 
+            header = next(reader)
+        except StopIteration: 
+            raise ValueError("CSV file is empty.")
+        
+        norm_headers = [h.lower().replace(" ", "").replace("_", "") for h in header]
+        
+        try: 
+            name_idx = norm_headers.index("nameofapplicant")
+            jc_idx = norm_headers.index("jobcardnumber")
+        except ValueError: 
+            raise ValueError("CSV Headers missing 'Name of Applicant' or 'Job card number'.")
+
+        for row_num, row in enumerate(reader, 1):
+            if not row or len(row) <= max(name_idx, jc_idx): 
+                continue
+            name, job_card = row[name_idx].strip(), row[jc_idx].strip()
+            if name and job_card:
+                applicants.append({'original_index': row_num, 'Name of Applicant': name, 'Job card number': job_card, '_selected': False})
+    return applicants
+
+def village_code(job_card, state_logic_key):
+    """
+    Extracts the village code from a job card number:
+    'jh' -> 'JH-01-001-001-001/123' gives '001', 'rj' -> last 3 digits of the number part.
+    """
+    try:
+        jc = job_card.split('/')[0]
+        if state_logic_key == "rj": return jc[-3:]
+        return jc.split('-')[-1]
+    except IndexError: return None
+
+def group_by_village(applicants, state_logic_key):
+    """
+    Groups applicant rows as {village_code: {job_card: [rows]}}, the shape the
+    demand automation walks. Returns (grouped, skipped_malformed_count).
+    """
+    grouped = {}; skipped_malformed = 0
+    for app in applicants:
+        jc = app.get('Job card number', '').strip()
+        if not jc: continue
+        vc = village_code(jc, state_logic_key)
+        if not vc: skipped_malformed += 1; continue
+        grouped.setdefault(vc, {}).setdefault(jc, []).append(app)
+    return grouped, skipped_malformed
+
 # --- Cloud File Picker Toplevel Window ---
 class CloudFilePicker(ctk.CTkToplevel):
     """
@@ -404,7 +459,7 @@ class DemandTab(BaseAutomationTab):
         """
         if not self.all_applicants_data: return
         if len(self.all_applicants_data) > 400: # Limit changed to 400
-             messagebox.showinfo("Limit Exceeded", f"Cannot Select All (>400 applicants loaded: {len(self.all_applicants_data)}).")
+             self.dialogs.showinfo("Limit Exceeded", f"Cannot Select All (>400 applicants loaded: {len(self.all_applicants_data)}).")
              return
         selected_count = 0
         # Update the master data list
@@ -425,22 +480,22 @@ class DemandTab(BaseAutomationTab):
         Selects a custom number of applicants from the top of the list.
         """
         if not self.all_applicants_data:
-            messagebox.showwarning("No Data", "Please load a CSV file first.")
+            self.dialogs.showwarning("No Data", "Please load a CSV file first.")
             return
 
         try:
             num_to_select = int(self.custom_select_entry.get().strip())
         except ValueError:
-            messagebox.showwarning("Invalid Input", "Please enter a valid number of applicants to select.")
+            self.dialogs.showwarning("Invalid Input", "Please enter a valid number of applicants to select.")
             return
 
         if num_to_select <= 0:
-            messagebox.showwarning("Invalid Input", "Number must be greater than zero.")
+            self.dialogs.showwarning("Invalid Input", "Number must be greater than zero.")
             return
             
         if num_to_select > len(self.all_applicants_data):
             num_to_select = len(self.all_applicants_data)
-            messagebox.showinfo("Adjustment", f"Selecting maximum available applicants: {num_to_select}.")
+            self.dialogs.showinfo("Adjustment", f"Selecting maximum available applicants: {num_to_select}.")
 
         self._clear_selection() # Clear any existing selection first
 
@@ -537,27 +592,7 @@ class DemandTab(BaseAutomationTab):
         self.all_applicants_data = []
 
         try:
-            with open(path, mode='r', encoding='utf-8-sig') as csvfile:
-                reader = csv.reader(csvfile)
-                try: 
-                    header = next(reader)
-                except StopIteration: 
-                    raise ValueError("CSV file is empty.")
-                
-                norm_headers = [h.lower().replace(" ", "").replace("_", "") for h in header]
-                
-                try: 
-                    name_idx = norm_headers.index("nameofapplicant")
-                    jc_idx = norm_headers.index("jobcardnumber")
-                except ValueError: 
-                    raise ValueError("CSV Headers missing 'Name of Applicant' or 'Job card number'.")
-
-                for row_num, row in enumerate(reader, 1):
-                     if not row or len(row) <= max(name_idx, jc_idx): 
-                         continue
-                     name, job_card = row[name_idx].strip(), row[jc_idx].strip()
-                     if name and job_card:
-                        self.all_applicants_data.append({'original_index': row_num, 'Name of Applicant': name, 'Job card number': job_card, '_selected': False})
+            self.all_applicants_data = read_applicants_csv(path)
 
             loaded_count = len(self.all_applicants_data)
             self.app.log_message(self.log_display, f"Loaded {loaded_count} applicants from '{os.path.basename(path)}'.")
@@ -566,7 +601,7 @@ class DemandTab(BaseAutomationTab):
             self._update_applicant_display()
 
         except Exception as e:
-            messagebox.showerror("Error Reading CSV", f"Could not read CSV.\nError: {e}")
+            self.dialogs.showerror("Error Reading CSV", f"Could not read CSV.\nError: {e}")
             self.csv_path = None
             self.all_applicants_data = []
             self.file_label.configure(text="No file")
@@ -618,7 +653,7 @@ class DemandTab(BaseAutomationTab):
         """
         token = self.app.license_info.get('key')
         if not token:
-            messagebox.showerror("Error", "You must be licensed to use cloud storage.")
+            self.dialogs.showerror("Error", "You must be licensed to use cloud storage.")
             return
 
         picker = CloudFilePicker(parent=self, app_instance=self.app)
@@ -663,7 +698,7 @@ class DemandTab(BaseAutomationTab):
             return temp_path
         except Exception as e:
             self.app.log_message(self.log_display, f"Cloud download failed: {e}", "error")
-            messagebox.showerror("Download Failed", f"Could not download file: {e}")
+            self.dialogs.showerror("Download Failed", f"Could not download file: {e}")
             return None
 
     def _load_work_key_list_from_cloud(self):
@@ -672,7 +707,7 @@ class DemandTab(BaseAutomationTab):
         """
         token = self.app.license_info.get('key')
         if not token:
-            messagebox.showerror("Error", "You must be licensed to use cloud storage.")
+            self.dialogs.showerror("Error", "You must be licensed to use cloud storage.")
             return
 
         picker = CloudFilePicker(parent=self, app_instance=self.app)
@@ -710,7 +745,7 @@ class DemandTab(BaseAutomationTab):
         except Exception as e:
             # Log error
             self.app.after(0, self.app.log_message, self.log_display, f"Failed to load work keys: {e}", "error")
-            self.app.after(0, messagebox.showerror, "Error Loading Work Keys", f"An error occurred: {e}")
+            self.app.after(0, self.dialogs.showerror, "Error Loading Work Keys", f"An error occurred: {e}")
         finally:
             # Re-enable the button from the main thread
             self.app.after(0, self.load_work_key_button.configure, {"state": "normal"})
@@ -768,7 +803,7 @@ class DemandTab(BaseAutomationTab):
             self.app.after(0, update_ui_with_keys)
 
         except Exception as e:
-            self.app.after(0, messagebox.showerror, "Error Reading Work Key CSV", f"Could not read CSV.\nError: {e}")
+            self.app.after(0, self.dialogs.showerror, "Error Reading Work Key CSV", f"Could not read CSV.\nError: {e}")
             
             def clear_ui_keys():
                 self.work_key_list.clear()
@@ -930,17 +965,6 @@ class DemandTab(BaseAutomationTab):
              if isinstance(widget, ctk.CTkCheckBox) and "*" not in widget.cget("text"):
                  widget.configure(state=state)
 
-    def _get_village_code(self, job_card, state_logic_key):
-        """
-        Extracts the village code from a job card number based on state-specific logic.
-        """
-        try:
-            jc = job_card.split('/')[0]
-            if state_logic_key == "jh": return jc.split('-')[-1]
-            elif state_logic_key == "rj": return jc[-3:]
-            else: self.app.log_message(self.log_display, f"Warn: Unknown state logic '{state_logic_key}'."); return jc.split('-')[-1]
-        except IndexError: return None
-
     def start_automation(self):
         """
         Validates all user inputs and starts the main automation thread
@@ -948,9 +972,9 @@ class DemandTab(BaseAutomationTab):
         """
         # --- 1. Get and Validate Inputs ---
         state = self.state_combobox.get()
-        if not state: messagebox.showerror("Input Error", "Select state."); return
+        if not state: self.dialogs.showerror("Input Error", "Select state."); return
         try: cfg = config.STATE_DEMAND_CONFIG[state]; logic_key = cfg["village_code_logic"]; url = cfg["base_url"]
-        except KeyError: messagebox.showerror("Config Error", f"Demand config missing for: {state}"); return
+        except KeyError: self.dialogs.showerror("Config Error", f"Demand config missing for: {state}"); return
 
         selected = [r for r in self.all_applicants_data if r.get('_selected', False)]
         panchayat = self.panchayat_entry.get().strip(); days_str = self.days_entry.get().strip()
@@ -962,24 +986,24 @@ class DemandTab(BaseAutomationTab):
             demand_dt_str = self.demand_date_entry.get()
             demand_dt = datetime.strptime(demand_dt_str, '%d/%m/%Y').date() 
             work_start = demand_dt.strftime('%d/%m/%Y') 
-        except ValueError: messagebox.showerror("Invalid Date", "Use DD/MM/YYYY."); return
+        except ValueError: self.dialogs.showerror("Invalid Date", "Use DD/MM/YYYY."); return
 
         # Validate Override Date if present
         if demand_to_date_str:
             try:
                  datetime.strptime(demand_to_date_str, '%d/%m/%Y')
             except ValueError:
-                 messagebox.showerror("Invalid To Date", "Override Date must be DD/MM/YYYY."); return
+                 self.dialogs.showerror("Invalid To Date", "Override Date must be DD/MM/YYYY."); return
 
         if demand_dt < datetime.now().date():
-            messagebox.showerror("Invalid Date", "Demand/Work Date cannot be in the past. Please select today or a future date.")
+            self.dialogs.showerror("Invalid Date", "Demand/Work Date cannot be in the past. Please select today or a future date.")
             return
 
-        if not days_str: messagebox.showerror("Missing Info", "Days required."); return
-        if not self.csv_path: messagebox.showerror("Missing Info", "Load CSV."); return
-        if not selected: messagebox.showwarning("No Selection", "Select applicants."); return
+        if not days_str: self.dialogs.showerror("Missing Info", "Days required."); return
+        if not self.csv_path: self.dialogs.showerror("Missing Info", "Load CSV."); return
+        if not selected: self.dialogs.showwarning("No Selection", "Select applicants."); return
         try: days_int = int(days_str); assert days_int > 0
-        except (ValueError, AssertionError): messagebox.showerror("Invalid Input", "Days must be positive number."); return
+        except (ValueError, AssertionError): self.dialogs.showerror("Invalid Input", "Days must be positive number."); return
 
         # --- 2. Setup UI for Running State ---
         # self.stop_event.clear(); <-- Handled by app.start_automation_thread
@@ -1007,15 +1031,8 @@ class DemandTab(BaseAutomationTab):
         })
 
         # Group selected applicants by Village Code -> Job Card
-        grouped = {}; skipped_malformed = 0
-        for app in selected:
-            jc = app.get('Job card number', '').strip()
-            if not jc: continue
-            vc = self._get_village_code(jc, logic_key)
-            if not vc: skipped_malformed += 1; continue
-            if vc not in grouped: grouped[vc] = {}
-            if jc not in grouped[vc]: grouped[vc][jc] = []
-            grouped[vc][jc].append(app)
+        if logic_key not in ("jh", "rj"): self.app.log_message(self.log_display, f"Warn: Unknown state logic '{logic_key}'.")
+        grouped, skipped_malformed = group_by_village(selected, logic_key)
         if skipped_malformed: self.app.log_message(self.log_display, f"Warn: Skipped {skipped_malformed} malformed Job Cards.", "warning")
 
         # --- 4. Start Worker Thread using the App's Method ---
@@ -1034,7 +1051,7 @@ class DemandTab(BaseAutomationTab):
         """
         Resets all inputs, selections, and logs on the tab.
         """
-        if not messagebox.askokcancel("Reset?", "Clear inputs, selections, logs?"): return
+        if not self.dialogs.askokcancel("Reset?", "Clear inputs, selections, logs?"): return
         self.state_combobox.set(""); self.panchayat_entry.delete(0, 'end'); self.days_entry.delete(0, 'end'); self.search_entry.delete(0, 'end')
         self.allocation_work_key_entry.delete(0, 'end')
         
@@ -1135,10 +1152,10 @@ class DemandTab(BaseAutomationTab):
                 try:
                     self.app.after(0, self.app.set_status, f"V {proc_v}/{total_v}: Selecting Village {vc}...") # <-- STATUS UPDATE
                     self.app.after(0, self.app.log_message, self.log_display, f"--- Village {proc_v}/{total_v} (Code: {vc}) ---")
-                    v_el = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, f"#{v_ids[0]}, #{v_ids[1]}"))); v_sel = Select(v_el); found_v = False
-                    for opt in v_sel.options:
-                        if opt.get_attribute('value').endswith(vc): v_sel.select_by_value(opt.get_attribute('value')); self.app.after(0, self.app.log_message, self.log_display, f"Selected Village '{opt.text}' (...{vc})."); found_v = True; break
-                    if not found_v: raise NoSuchElementException(f"Village code {vc} not found.")
+                    v_el = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, f"#{v_ids[0]}, #{v_ids[1]}"))); v_opts = dropdowns.read_options(driver, v_el)
+                    opt = next((o for o in v_opts if o.value.endswith(vc)), None)
+                    if not opt: raise NoSuchElementException(f"Village code {vc} not found.")
+                    dropdowns.select_option(driver, v_el, value=opt.value, options=v_opts); self.app.after(0, self.app.log_message, self.log_display, f"Selected Village '{opt.text}' (...{vc}).")
 
                     self.app.after(0, self.app.set_status, f"V {proc_v}/{total_v}: Loading job cards...") # <-- STATUS UPDATE
                     self.app.after(0, self.app.log_message, self.log_display, "Waiting for job cards..."); time.sleep(0.5)
@@ -1169,7 +1186,7 @@ class DemandTab(BaseAutomationTab):
         except Exception as e:
             self.app.after(0, self.app.log_message, self.log_display, f"CRITICAL ERROR: {type(e).__name__} - {e}", "error")
             self.app.after(0, self.update_status, f"Error: {type(e).__name__}", 0.0) 
-            self.app.after(0, lambda: messagebox.showerror("Error", f"Automation stopped: {e}"))
+            self.app.after(0, lambda: self.dialogs.showerror("Error", f"Automation stopped: {e}"))
         finally:
             final_status_text = "Finished"
             final_tab_status = "Finished" # For internal tab status
@@ -1189,7 +1206,7 @@ class DemandTab(BaseAutomationTab):
                     self.app.after(0, self.app.log_message, self.log_display, f"✅ Demand finished. Triggering auto-allocation for Panchayat: {panchayat}, Work Key: {work_key_for_allocation}")
                     self.app.after(500, self.app.run_work_allocation_from_demand, panchayat, work_key_for_allocation)
                 else:
-                    self.app.after(100, lambda: messagebox.showinfo("Complete", "Demand automation finished."))
+                    self.app.after(100, lambda: self.dialogs.showinfo("Complete", "Demand automation finished."))
                 self.app.after(0, self._clear_processed_selection)
             
             # Unlock the UI
@@ -1545,7 +1562,7 @@ class DemandTab(BaseAutomationTab):
         
         if not failed_items:
             self.app.log_message(self.log_display, "No failed applicants found in results.", "info")
-            messagebox.showinfo("Retry Failed", "No failed applicants found in the results table.")
+            self.dialogs.showinfo("Retry Failed", "No failed applicants found in the results table.")
             return
 
         re_selected_count = 0
@@ -1588,14 +1605,14 @@ class DemandTab(BaseAutomationTab):
 
         self._update_selection_summary()
         self.app.log_message(self.log_display, f"Re-selected {re_selected_count} failed applicants.")
-        messagebox.showinfo("Retry Failed", f"Re-selected {re_selected_count} failed applicants.\n\n"
+        self.dialogs.showinfo("Retry Failed", f"Re-selected {re_selected_count} failed applicants.\n\n"
                                              "Please fix any issues (like un-issued job cards) and then click 'Start Automation' to retry.")
 
     def export_results(self):
         """
         Exports the contents of the results treeview to a CSV file.
         """
-        if not self.results_tree.get_children(): messagebox.showinfo("Export", "No results."); return
+        if not self.results_tree.get_children(): self.dialogs.showinfo("Export", "No results."); return
         p = self.panchayat_entry.get().strip().replace(" ", "_") or "UnknownPanchayat"; s = self.state_combobox.get() or "UnknownState"
         fname = f"Demand_Report_{s}_{p}_{datetime.now():%Y%m%d_%H%M}.csv"; self.export_treeview_to_csv(self.results_tree, fname)
 
@@ -1677,7 +1694,7 @@ class DemandTab(BaseAutomationTab):
 
         # Ensure Panchayat name is provided for the filename
         if not panchayat_name:
-            messagebox.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.")
+            self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.")
             return
 
         # CSV Logic
@@ -1703,7 +1720,7 @@ class DemandTab(BaseAutomationTab):
         """
         all_items = self.results_tree.get_children()
         if not all_items: 
-            messagebox.showinfo("No Data", "There are no results to export.")
+            self.dialogs.showinfo("No Data", "There are no results to export.")
             return None, None
             
         panchayat_name = self.panchayat_entry.get().strip()
@@ -1730,7 +1747,7 @@ class DemandTab(BaseAutomationTab):
                 data_to_export.append(row_values)
                 
         if not data_to_export: 
-            messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'.")
+            self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'.")
             return None, None
 
         safe_p = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
@@ -1769,10 +1786,10 @@ class DemandTab(BaseAutomationTab):
             success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
             
             if success:
-                if messagebox.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
+                if self.dialogs.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
                     if sys.platform == "win32":
                         os.startfile(file_path)
                     else:
                         subprocess.call(['open', file_path])
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
\ No newline at end of file
+            self.dialogs.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
\ No newline at end of file
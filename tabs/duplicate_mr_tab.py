@@ -3,12 +3,9 @@ import tkinter
 from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
 import os
-import base64
 import json
 import time
-import threading
 from datetime import datetime
-from pypdf import PdfWriter # <-- IMPORT ADD KIYA GAYA
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
@@ -17,6 +14,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException
 
 import config
+import dropdowns
+from pdf_pipeline import capture_pdf, PdfSaveQueue
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -110,6 +109,9 @@ class DuplicateMrTab(BaseAutomationTab):
         # --- MERGE BUTTON ADDED ---
         self.merge_pdfs_button = ctk.CTkButton(results_action_frame, text="Merge Saved PDFs", command=self.merge_saved_pdfs)
         self.merge_pdfs_button.pack(side='left', padx=(0, 10))
+        self.split_merge_var = tkinter.BooleanVar(value=True)
+        self.split_merge_checkbox = ctk.CTkCheckBox(results_action_frame, text=f"Split every {config.PDF_MERGE_CONFIG['mr_volume_pages']} pages", variable=self.split_merge_var)
+        self.split_merge_checkbox.pack(side='left', padx=(0, 10))
         # --- END ---
 
         self.export_csv_button = ctk.CTkButton(results_action_frame, text="Export to CSV", command=lambda: self.export_treeview_to_csv(self.results_tree, "duplicate_mr_results.csv"))
@@ -237,6 +239,7 @@ class DuplicateMrTab(BaseAutomationTab):
             self.app.after(0, self.set_ui_state, False)
             return
 
+        self.pdf_queue = PdfSaveQueue()
         try:
             for work_code in work_codes:
                 if self.app.stop_events[self.automation_key].is_set():
@@ -246,6 +249,7 @@ class DuplicateMrTab(BaseAutomationTab):
         except Exception as e:
             self.app.log_message(self.log_display, f"A critical error occurred: {str(e).splitlines()[0]}", "error")
         finally:
+            self.pdf_queue.close()
             self.app.after(0, self.set_ui_state, False)
             self.app.log_message(self.log_display, "\n--- Automation Finished ---")
             self.app.after(100, self._show_completion_dialog)
@@ -288,13 +292,9 @@ class DuplicateMrTab(BaseAutomationTab):
                 driver.execute_script("arguments[0].click();", search_btn)
                 time.sleep(2)
 
-                wait.until(lambda d: len(Select(d.find_element(By.ID, "ddlworkcode")).options) > 1)
-                Select(driver.find_element(By.ID, "ddlworkcode")).select_by_index(1)
+                dropdowns.select_option(driver, "ddlworkcode", index=1, options=dropdowns.wait_for_options(driver, "ddlworkcode", timeout=40))
                 
-                wait.until(lambda d: len(Select(d.find_element(By.ID, "ddlmsrno")).options) > 1)
-
-                current_msr_dd = Select(driver.find_element(By.ID, "ddlmsrno"))
-                current_msr_dd.select_by_value(msr_no)
+                dropdowns.select_option(driver, "ddlmsrno", value=msr_no, options=dropdowns.wait_for_options(driver, "ddlmsrno", timeout=40))
                 
                 # --- Background Safe: Click Proceed ---
                 proceed_btn = driver.find_element(By.ID, "btnproceed")
@@ -314,12 +314,10 @@ class DuplicateMrTab(BaseAutomationTab):
                 wait.until(EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, "Print")))
                 self.app.log_message(self.log_display, "   - Print page is ready.")
                 
-                pdf_path = self._save_mr_as_pdf(driver, work_code, msr_no, orientation, scale, self.output_dir)
-                
-                if pdf_path: self._log_result(work_code, msr_no, "Saved as PDF")
-                else: self._log_result(work_code, msr_no, "PDF Save Failed")
+                queued = self._save_mr_as_pdf(driver, work_code, msr_no, orientation, scale, self.output_dir)
+                if not queued: self._log_result(work_code, msr_no, "PDF Save Failed")
 
-                if "Print and Save" in action and pdf_path:
+                if "Print and Save" in action and queued:
                     driver.execute_script("window.print();")
                     time.sleep(5)
                 
@@ -347,12 +345,9 @@ class DuplicateMrTab(BaseAutomationTab):
         driver.execute_script("arguments[0].click();", search_btn)
         time.sleep(2)
         
-        wait.until(lambda d: len(Select(d.find_element(By.ID, "ddlworkcode")).options) > 1)
-        Select(driver.find_element(By.ID, "ddlworkcode")).select_by_index(1)
+        dropdowns.select_option(driver, "ddlworkcode", index=1, options=dropdowns.wait_for_options(driver, "ddlworkcode", timeout=40))
         
-        wait.until(lambda d: len(Select(d.find_element(By.ID, "ddlmsrno")).options) > 1)
-        msr_dd_element = driver.find_element(By.ID, "ddlmsrno")
-        msr_options = [opt.get_attribute('value') for opt in Select(msr_dd_element).options if '--' not in opt.text]
+        msr_options = [opt.value for opt in dropdowns.wait_for_options(driver, "ddlmsrno", timeout=40) if '--' not in opt.text]
         
         if not msr_options:
             self.app.log_message(self.log_display, "No MSR numbers found.", "warning")
@@ -364,14 +359,14 @@ class DuplicateMrTab(BaseAutomationTab):
 
     # --- FUNCTION SIGNATURE UPDATED ---
     def _save_mr_as_pdf(self, driver, work_code, msr_no, orientation, scale, output_dir):
+        """Prints the MR and hands it to the save queue. Returns False if printing failed."""
         try:
             safe_work_code = work_code.split('/')[-1][-6:]
-            filename = f"MR_{safe_work_code}_{msr_no}.pdf"
-            filepath = os.path.join(output_dir, filename)
+            base_filename = f"MR_{safe_work_code}_{msr_no}"
 
             is_landscape = (orientation == "Landscape")
             pdf_scale = scale / 100.0
-            pdf_data_base64 = None
+            pdf_chunks = None
 
             # --- CSS for Orientation ---
             if is_landscape:
@@ -403,7 +398,7 @@ class DuplicateMrTab(BaseAutomationTab):
                 driver.execute_script(footer_js)
                 
                 self.app.log_message(self.log_display, "   - Note: PDF Scale setting is not supported for Firefox and will be ignored.", "warning")
-                pdf_data_base64 = driver.print_page()
+                pdf_chunks = capture_pdf(driver, 'firefox')
             
             elif self.app.active_browser == 'chrome':
                 # Chrome: Use Native Footer Template (Best Quality)
@@ -425,19 +420,23 @@ class DuplicateMrTab(BaseAutomationTab):
                     "marginBottom": 0.5,               # <-- Increased slightly to fit footer
                     "marginLeft": 0.4, "marginRight": 0.4
                 }
-                result = driver.execute_cdp_cmd('Page.printToPDF', print_options)
-                pdf_data_base64 = result['data']
-
-            if pdf_data_base64:
-                pdf_data = base64.b64decode(pdf_data_base64)
-                with open(filepath, 'wb') as f:
-                    f.write(pdf_data)
-                return filepath
-            else:
-                return None
+                pdf_chunks = capture_pdf(driver, 'chrome', print_options)
+
+            if not pdf_chunks:
+                return False
+
+            def _on_saved(path, error):
+                if path: self._log_result(work_code, msr_no, "Saved as PDF")
+                else:
+                    self.app.log_message(self.log_display, f"Error saving PDF: {error}", "error")
+                    self._log_result(work_code, msr_no, "PDF Save Failed")
+
+            # Same MR printed again overwrites its earlier copy, as before
+            self.pdf_queue.submit(pdf_chunks, output_dir, base_filename, _on_saved, unique=False)
+            return True
         except Exception as e:
             self.app.log_message(self.log_display, f"Error saving PDF: {e}", "error")
-            return None
+            return False
 
     def set_ui_state(self, running: bool):
         self.set_common_ui_state(running)
@@ -448,6 +447,7 @@ class DuplicateMrTab(BaseAutomationTab):
         self.orientation_segmented_button.configure(state=state)
         self.scale_slider.configure(state=state)
         self.merge_pdfs_button.configure(state=state) # <-- ADDED
+        self.split_merge_checkbox.configure(state=state)
         self.export_csv_button.configure(state=state) # <-- ADDED
 
     def reset_ui(self):
@@ -521,29 +521,27 @@ class DuplicateMrTab(BaseAutomationTab):
         self.app.start_automation_thread(
             "pdf_merger_dup_mr", # Use a temporary key
             self._run_merge_logic, 
-            args=(pdf_files, output_path)
+            args=(pdf_files, output_path, config.PDF_MERGE_CONFIG["mr_volume_pages"] if self.split_merge_var.get() else 0)
         )
 
-    def _run_merge_logic(self, file_list, output_path):
+    def _run_merge_logic(self, file_list, output_path, max_pages=0):
         """The actual PDF merging logic that runs in a thread."""
         self.app.after(0, self.set_ui_state, True)
         self.app.log_message(self.log_display, f"Merging {len(file_list)} files...")
         self.app.after(0, self.app.set_status, "Merging PDFs...")
         try:
-            merger = PdfWriter()
-            for pdf_path in file_list:
-                if self.app.stop_events.get("pdf_merger_dup_mr", threading.Event()).is_set():
-                    self.app.log_message(self.log_display, "Merge cancelled.", "warning")
-                    merger.close()
-                    return
-                merger.append(pdf_path)
-            
-            with open(output_path, "wb") as f_out:
-                merger.write(f_out)
-            merger.close()
+            outputs = self.run_pdf_merge(file_list, output_path, stop_key="pdf_merger_dup_mr", max_pages=max_pages)
+            if outputs is None:
+                self.app.log_message(self.log_display, "Merge cancelled.", "warning")
+                return
             
+            for path in outputs:
+                self.app.log_message(self.log_display, f"Written: {path}")
             self.app.log_message(self.log_display, "Merge complete!", "success")
-            messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{output_path}", parent=self)
+            if len(outputs) == 1:
+                messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{outputs[0]}", parent=self)
+            else:
+                messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into {len(outputs)} parts:\n{os.path.dirname(output_path)}", parent=self)
             if messagebox.askyesno("Open Location?", "Open the Merged PDFs folder?", parent=self):
                 self.app.open_folder(os.path.dirname(output_path))
                 
@@ -17,6 +17,7 @@ from selenium.common.exceptions import NoSuchElementException, StaleElementRefer
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry 
 
@@ -200,11 +201,9 @@ class EKycReportTab(BaseAutomationTab):
                     
                     if not village_dd_elem: raise Exception("Village Dropdown not found")
 
-                    options = Select(village_dd_elem).options
-                    for opt in options:
-                        val = opt.get_attribute("value")
+                    for opt in dropdowns.read_options(driver, village_dd_elem):
                         txt = opt.text.strip()
-                        if val not in ["00", "99"] and txt != "---Select---" and txt != "--All Villages--":
+                        if opt.value not in ["00", "99"] and txt != "---Select---" and txt != "--All Villages--":
                             villages_to_process.append(txt)
                     
                     self.app.log_message(self.log_display, f"Found {len(villages_to_process)} villages to scan.", "info")
@@ -11,6 +11,7 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, UnexpectedAlertPresentException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -188,8 +189,8 @@ class EmbVerifyTab(BaseAutomationTab):
                 self.app.log_message(self.log_display, f"Processing {len(work_codes_to_process)} work codes from input.")
             else:
                 self.app.log_message(self.log_display, "No work codes provided. Fetching all from dropdown...")
-                work_code_select_element = Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_work"))))
-                work_codes_to_process = [opt.text for opt in work_code_select_element.options if opt.get_attribute('value')]
+                work_code_select_element = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_work")))
+                work_codes_to_process = [opt.text for opt in dropdowns.read_options(driver, work_code_select_element) if opt.value]
                 if not work_codes_to_process:
                     self.app.log_message(self.log_display, "No work codes found for this Panchayat.", "warning")
                     self._log_result("N/A", "Skipped", "No work codes found.")
@@ -227,16 +228,13 @@ class EmbVerifyTab(BaseAutomationTab):
         """Handles the logic for a single work code verification."""
         try:
             self.app.log_message(self.log_display, f"Selecting work code: {work_code}")
-            work_select = Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_work"))))
+            work_select = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_work")))
+            work_options = dropdowns.read_options(driver, work_select)
             
-            found = False
-            for option in work_select.options:
-                if work_code in option.text:
-                    work_select.select_by_visible_text(option.text)
-                    found = True
-                    break
+            option = next((o for o in work_options if work_code in o.text), None)
+            if option: dropdowns.select_option(driver, work_select, value=option.value, options=work_options)
             
-            if not found:
+            if not option:
                 raise NoSuchElementException(f"Work code containing '{work_code}' not found in dropdown.")
             
             self.app.log_message(self.log_display, "Work selected. Pausing for page to update...")
@@ -250,11 +248,11 @@ class EmbVerifyTab(BaseAutomationTab):
             period_dropdown_element = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_ddl_mperiod")))
             time.sleep(2) 
 
-            period_select = Select(period_dropdown_element)
-            if len(period_select.options) <= 1:
+            period_options = dropdowns.read_options(driver, period_dropdown_element)
+            if len(period_options) <= 1:
                 self._log_result(work_code, "Skipped", "No measurement period available.")
                 return
-            period_select.select_by_index(1)
+            dropdowns.select_option(driver, period_dropdown_element, index=1, options=period_options)
             
             self.app.log_message(self.log_display, "Waiting for activity table to load...")
             wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_grd_activitycomponent_ctl02_lbl_act_unitcost")))
@@ -8,7 +8,6 @@ import threading
 from datetime import datetime
 import humanize
 from pathlib import Path
-from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
 import webbrowser
 
 import config
@@ -17,7 +16,9 @@ class FileManagementTab(ctk.CTkFrame):
     def __init__(self, parent, app_instance):
         super().__init__(parent, fg_color="transparent")
         self.app = app_instance
+        self.transfers = app_instance.transfer_manager
         self.current_folder_id = None
+        self.current_path = "" # e.g. "Muster_Rolls/2025-01-01", used for the upload ledger
         self.item_map = {}
 
         self.history = []
@@ -229,7 +230,7 @@ class FileManagementTab(ctk.CTkFrame):
 
         def _fetch():
             try:
-                response = requests.get(url, headers=headers, timeout=15)
+                response = self.transfers.session.get(url, headers=headers, timeout=15)
                 if response.status_code == 200:
                     data = response.json()
                     self.app.after(0, self.update_ui_with_data, data)
@@ -312,6 +313,7 @@ class FileManagementTab(ctk.CTkFrame):
 
 
     def update_breadcrumbs(self, path):
+        self.current_path = "/".join(folder['filename'] for folder in path)
         for widget in self.breadcrumb_frame.winfo_children():
             widget.destroy()
 
@@ -346,65 +348,72 @@ class FileManagementTab(ctk.CTkFrame):
 
         self._start_upload_session(files_to_upload, is_folder=True)
 
-    def _start_upload_session(self, items, is_folder):
+    def _start_upload_session(self, items, is_folder, force=False, target=None):
         headers = self.get_auth_headers()
         if not headers: return
 
-        self.op_progress.grid()
-        self.op_progress_label.grid()
-        self.op_progress.set(0)
+        if not is_folder:
+            items = [{'local_path': path, 'relative_path': ''} for path in items]
+
+        self._show_op_progress()
+        # Retries and forced re-uploads go to the folder of the first attempt, wherever the user is now
+        parent_id, parent_path = target or (self.current_folder_id, self.current_path)
 
         def _upload_worker():
             total_items = len(items)
-            for i, item in enumerate(items):
-                local_path = item['local_path'] if is_folder else item
-                relative_path = item['relative_path'] if is_folder else ''
-
-                filename = os.path.basename(local_path)
-
-                def create_callback(encoder):
-                    total_size = encoder.len
-                    def callback(monitor):
-                        progress = (i + (monitor.bytes_read / total_size)) / total_items
-                        self.app.after(0, self.op_progress.set, progress)
-                        self.app.after(0, self.op_progress_label.configure, {"text": f"Uploading ({i+1}/{total_items}): {filename} ({int(progress*100)}%)"})
-                    return callback
-
-                success = self._perform_upload(local_path, relative_path, headers, create_callback)
-                if not success:
-                    if not messagebox.askyesno("Upload Failed", f"Failed to upload {filename}. Continue with remaining files?"):
-                        break
-
-            self.app.after(0, self.op_progress_label.configure, {"text": "Upload Complete!"})
-            self.app.after(5000, lambda: self.op_progress.grid_remove())
-            self.app.after(5000, lambda: self.op_progress_label.grid_remove())
+            failed, duplicates = self.transfers.upload_many(
+                items, parent_id, headers,
+                on_progress=lambda frac, done, total, name: self._report_op_progress("Uploading", frac, done, total, name),
+                parent_path=parent_path, force=force
+            )
+
+            if failed:
+                self.app.after(0, self._on_transfers_failed, "Upload", failed, lambda: self._start_upload_session(failed, is_folder=True, force=force, target=(parent_id, parent_path)))
+            else:
+                summary = f"Upload Complete! ({total_items - len(duplicates)} uploaded"
+                summary += f", {len(duplicates)} already in cloud)" if duplicates else ")"
+                self.app.after(0, lambda: self.op_progress_label.configure(text=summary))
+                if duplicates and not force: self.app.after(0, self._offer_forced_upload, duplicates, (parent_id, parent_path))
+                else: self.app.after(5000, self._hide_op_progress)
             self.app.after(100, lambda: self.refresh_files(self.current_folder_id, add_to_history=False))
 
         threading.Thread(target=_upload_worker, daemon=True).start()
 
-    def _perform_upload(self, filepath, relative_path, headers, create_callback):
-        try:
-            fields = {
-                'parent_id': str(self.current_folder_id or ''),
-                'relative_path': relative_path,
-                'file': (os.path.basename(filepath), open(filepath, 'rb'), 'application/octet-stream')
-            }
-            encoder = MultipartEncoder(fields=fields)
-            monitor = MultipartEncoderMonitor(encoder, create_callback(encoder))
-
-            response = requests.post(
-                f"{config.LICENSE_SERVER_URL}/files/api/upload",
-                headers={**headers, 'Content-Type': monitor.content_type},
-                data=monitor,
-                timeout=300
-            )
-            return response.status_code == 201
-        except requests.exceptions.RequestException as e:
-            print(f"Upload error: {e}")
-            return False
-        except Exception as e:
-            print(f"Generic upload error: {e}")
-            return False
+    def _show_op_progress(self):
+        self.op_progress.grid()
+        self.op_progress_label.grid()
+        self.op_progress.set(0)
+
+    def _hide_op_progress(self):
+        self.op_progress.grid_remove()
+        self.op_progress_label.grid_remove()
+
+    def _report_op_progress(self, verb, fraction, done, total, name):
+        """Called from transfer worker threads (already throttled by TransferProgress)."""
+        text = f"{verb} ({done}/{total}): {name} ({int(fraction*100)}%)" if total > 1 else f"{verb}: {name} ({int(fraction*100)}%)"
+        self.app.after(0, self.op_progress.set, fraction)
+        self.app.after(0, lambda: self.op_progress_label.configure(text=text))
+
+    def _on_transfers_failed(self, operation, failed, retry_callback):
+        """Runs on the UI thread once a batch finishes with failures, offers a single retry."""
+        names = "\n".join(os.path.basename(item.get('local_path') or item.get('path', '')) for item in failed[:10])
+        more = f"\n...and {len(failed) - 10} more" if len(failed) > 10 else ""
+        self.op_progress_label.configure(text=f"{operation} finished with {len(failed)} failed file(s).")
+        if messagebox.askyesno(f"{operation} Incomplete", f"{len(failed)} file(s) could not be transferred:\n\n{names}{more}\n\nRetry them now?"):
+            self.op_progress.set(0)
+            retry_callback()
+        else:
+            self._hide_op_progress()
+
+    def _offer_forced_upload(self, duplicates, target):
+        """Skipped files may have been deleted from the cloud elsewhere; lets the user send them anyway."""
+        names = "\n".join(os.path.basename(item['local_path']) for item in duplicates[:10])
+        more = f"\n...and {len(duplicates) - 10} more" if len(duplicates) > 10 else ""
+        if messagebox.askyesno("Already in Cloud", f"{len(duplicates)} file(s) were skipped because they were uploaded here before:\n\n{names}{more}\n\nUpload them again anyway?"):
+            self.op_progress.set(0)
+            self._start_upload_session(duplicates, is_folder=True, force=True, target=target)
+        else:
+            self._hide_op_progress()
 
     def create_new_folder(self):
         folder_name = simpledialog.askstring("New Folder", "Enter a name for the new folder:", parent=self)
@@ -419,7 +428,7 @@ class FileManagementTab(ctk.CTkFrame):
         def _create():
             try:
                 # --- FIX: Corrected the API endpoint URL ---
-                response = requests.post(f"{config.LICENSE_SERVER_URL}/files/api/create-folder", headers=headers, json=data, timeout=30)
+                response = self.transfers.session.post(f"{config.LICENSE_SERVER_URL}/files/api/create-folder", headers=headers, json=data, timeout=30)
                 if response.status_code == 201:
                     self.app.after(0, lambda: self.refresh_files(self.current_folder_id, add_to_history=False))
                 else:
@@ -453,7 +462,7 @@ class FileManagementTab(ctk.CTkFrame):
 
         def _share():
             try:
-                response = requests.post(f"{config.LICENSE_SERVER_URL}/files/api/share-folder/{item_data['id']}", headers=headers, timeout=15)
+                response = self.transfers.session.post(f"{config.LICENSE_SERVER_URL}/files/api/share-folder/{item_data['id']}", headers=headers, timeout=15)
 
                 if response.status_code == 200:
                     try:
@@ -499,30 +508,19 @@ class FileManagementTab(ctk.CTkFrame):
         headers = self.get_auth_headers()
         if not headers: return
 
-        self.op_progress.grid()
-        self.op_progress_label.grid()
+        self._show_op_progress()
 
         def _download():
-            try:
-                with requests.get(f"{config.LICENSE_SERVER_URL}/files/api/download/{item_data['id']}", headers=headers, stream=True, timeout=300) as r:
-                    r.raise_for_status()
-                    total_size = int(r.headers.get('content-length', 0))
-                    bytes_downloaded = 0
-                    with open(save_path, 'wb') as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                            bytes_downloaded += len(chunk)
-                            if total_size > 0:
-                                progress = bytes_downloaded / total_size
-                                self.app.after(0, self.op_progress.set, progress)
-                                self.app.after(0, self.op_progress_label.configure, {"text": f"Downloading: {item_data['filename']} ({int(progress*100)}%)"})
-
+            failed = self.transfers.download_many(
+                [{'id': item_data['id'], 'path': os.path.basename(save_path), 'size': item_data.get('filesize') or 0}],
+                os.path.dirname(save_path), headers,
+                on_progress=lambda frac, done, total, name: self._report_op_progress("Downloading", frac, done, total, name)
+            )
+            if failed:
+                self.app.after(0, messagebox.showerror, "Download Failed", f"Could not download '{item_data['filename']}'. Run the download again to resume it.")
+            else:
                 self.app.after(0, messagebox.showinfo, "Download Complete", f"Successfully downloaded '{item_data['filename']}'")
-            except requests.exceptions.RequestException as e:
-                self.app.after(0, messagebox.showerror, "Download Failed", str(e))
-            finally:
-                self.app.after(0, lambda: self.op_progress.grid_remove())
-                self.app.after(0, lambda: self.op_progress_label.grid_remove())
+            self.app.after(0, self._hide_op_progress)
 
         threading.Thread(target=_download, daemon=True).start()
 
@@ -534,56 +532,37 @@ class FileManagementTab(ctk.CTkFrame):
         headers = self.get_auth_headers()
         if not headers: return
 
-        self.op_progress.grid()
-        self.op_progress_label.grid()
-
-        def _download_worker():
-            files_to_download = []
+        self._show_op_progress()
+        self.op_progress_label.configure(text=f"Listing '{folder_data['filename']}'...")
 
-            def get_all_files(folder_id, current_path):
-                url = f"{config.LICENSE_SERVER_URL}/files/api/list/{folder_id}"
+        def _download_worker(files_to_download=None):
+            if files_to_download is None:
                 try:
-                    response = requests.get(url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    items = response.json().get('files', [])
-                    for item in items:
-                        new_path = os.path.join(current_path, item['filename'])
-                        if item['is_folder']:
-                            get_all_files(item['id'], new_path)
-                        else:
-                            files_to_download.append({'id': item['id'], 'path': new_path, 'size': item['filesize']})
+                    files_to_download, folders = self.transfers.walk_folder(folder_data['id'], folder_data['filename'], headers)
                 except requests.exceptions.RequestException:
                     self.app.after(0, messagebox.showerror, "Error", "Could not fetch folder contents.")
+                    self.app.after(0, self._hide_op_progress)
                     return
+                # Recreate the full tree up front so empty sub-folders are kept too
+                for folder_path in folders:
+                    os.makedirs(os.path.join(save_location, folder_path), exist_ok=True)
 
-            get_all_files(folder_data['id'], folder_data['filename'])
-
-            total_files = len(files_to_download)
-            if total_files == 0:
-                os.makedirs(os.path.join(save_location, folder_data['filename']), exist_ok=True)
+            if not files_to_download:
                 self.app.after(0, messagebox.showinfo, "Complete", "Downloaded empty folder structure.")
+                self.app.after(0, self._hide_op_progress)
                 return
 
-            for i, file_info in enumerate(files_to_download):
-                self.app.after(0, self.op_progress.set, (i / total_files))
-                self.app.after(0, self.op_progress_label.configure, {"text": f"Downloading ({i+1}/{total_files}): {os.path.basename(file_info['path'])}"})
-
-                local_path = os.path.join(save_location, file_info['path'])
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-
-                try:
-                    with requests.get(f"{config.LICENSE_SERVER_URL}/files/api/download/{file_info['id']}", headers=headers, stream=True, timeout=300) as r:
-                        r.raise_for_status()
-                        with open(local_path, 'wb') as f:
-                            for chunk in r.iter_content(chunk_size=8192): f.write(chunk)
-                except requests.exceptions.RequestException:
-                    if not messagebox.askyesno("Download Failed", f"Failed to download {os.path.basename(file_info['path'])}. Continue?"):
-                        break
+            failed = self.transfers.download_many(
+                files_to_download, save_location, headers,
+                on_progress=lambda frac, done, total, name: self._report_op_progress("Downloading", frac, done, total, name)
+            )
 
-            self.app.after(0, self.op_progress.set, 1.0)
-            self.app.after(0, messagebox.showinfo, "Download Complete", f"Finished downloading folder '{folder_data['filename']}'.")
-            self.app.after(5000, lambda: self.op_progress.grid_remove())
-            self.app.after(5000, lambda: self.op_progress_label.grid_remove())
+            if failed:
+                retry = lambda: threading.Thread(target=_download_worker, args=(failed,), daemon=True).start()
+                self.app.after(0, self._on_transfers_failed, "Download", failed, retry)
+            else:
+                self.app.after(0, messagebox.showinfo, "Download Complete", f"Finished downloading folder '{folder_data['filename']}'.")
+                self.app.after(5000, self._hide_op_progress)
 
         threading.Thread(target=_download_worker, daemon=True).start()
 
@@ -600,10 +579,14 @@ class FileManagementTab(ctk.CTkFrame):
         headers = self.get_auth_headers()
         if not headers: return
 
+        item_path = f"{self.current_path}/{item_data['filename']}" if self.current_path else item_data['filename']
+
         def _delete():
             try:
-                response = requests.delete(f"{config.LICENSE_SERVER_URL}/files/api/delete/{item_data['id']}", headers=headers, timeout=30)
+                response = self.transfers.session.delete(f"{config.LICENSE_SERVER_URL}/files/api/delete/{item_data['id']}", headers=headers, timeout=30)
                 if response.status_code == 200:
+                    # Deleted content must be uploadable again, so drop it from the upload ledger
+                    self.app.history_manager.forget_upload(remote_id=item_data['id'], remote_path_prefix=item_path)
                     self.app.after(0, lambda: self.refresh_files(self.current_folder_id, add_to_history=False))
                 else:
                     self.app.after(0, messagebox.showerror, "Deletion Failed", response.json().get('reason', 'Server error'))
@@ -2,7 +2,7 @@
 import tkinter
 from tkinter import ttk, messagebox
 import customtkinter as ctk
-import time, json, os, re
+import time, json, os, re, queue, threading
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,6 +12,9 @@ from selenium.common.exceptions import TimeoutException, NoAlertPresentException
 import config
 from .base_tab import BaseAutomationTab
 
+# Pending rows on a verification page, counted in one call
+_PENDING_COUNT_JS = "return document.querySelectorAll('input[id*=\"_auth\"]').length;"
+
 class FtoGenerationTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="fto_gen")
@@ -54,6 +57,12 @@ class FtoGenerationTab(BaseAutomationTab):
         self.results_tree.configure(yscroll=scrollbar.set)
         scrollbar.grid(row=0, column=1, sticky='ns')
         self.style_treeview(self.results_tree)
+        self._load_todays_ftos()
+
+    def _load_todays_ftos(self):
+        """FTOs already captured today (local DB), so a restart doesn't mean re-scraping the portal."""
+        for fto_no, page, generated_at in reversed(self.app.history_manager.get_fto_numbers(since=datetime.now().strftime("%Y-%m-%d"))):
+            self.results_tree.insert("", "end", values=(page, fto_no, generated_at[11:]))
 
     def set_ui_state(self, running: bool):
         self.set_common_ui_state(running)
@@ -80,57 +89,93 @@ class FtoGenerationTab(BaseAutomationTab):
         self.app.start_automation_thread(self.automation_key, self.run_automation_logic)
         
     def _log_result(self, page_name, fto_number):
+        if fto_number != "Not Found": self.app.history_manager.record_fto(fto_number, page_name)
         self.app.after(0, lambda: self.results_tree.insert("", "end", values=(page_name, fto_number, datetime.now().strftime("%H:%M:%S"))))
 
+    def _verification_pages(self):
+        cfg = config.FTO_GEN_CONFIG
+        return [("Aadhaar FTO", cfg["aadhaar_fto_url"]), ("Top-Up FTO", cfg["top_up_fto_url"])]
+
     def _process_verification_page(self, driver, wait, verification_url, page_identifier):
         """
         Processes an FTO verification page (BACKGROUND SAFE).
         Uses JS clicks and presence checks.
         """
+        log = lambda msg, level="info": self.app.log_message(self.log_display, f"[{page_identifier}] {msg}", level) # Tabs run side by side
         try:
-            self.app.log_message(self.log_display, f"Navigating to {page_identifier}...")
+            log("Opening verification page...")
             driver.get(verification_url)
             
             # Presence check instead of visibility
             wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_wage_list_verify")))
-            self.app.log_message(self.log_display, "Verification page loaded.")
 
             # Check if any records exist
-            if not driver.find_elements(By.XPATH, "//input[contains(@id, '_auth')]"):
-                self.app.log_message(self.log_display, "No records found on this page.", "warning")
+            pending = driver.execute_script(_PENDING_COUNT_JS)
+            if not pending:
+                log("No records found on this page.", "warning")
                 return "No records"
 
-            self.app.log_message(self.log_display, "Accepting all rows...")
+            log(f"Accepting all {pending} rows...")
             # JS Script to click all radio buttons (Already good)
             driver.execute_script("document.querySelectorAll('input[id*=\"_auth\"]').forEach(radio => radio.click());")
             
-            self.app.log_message(self.log_display, "Clicking 'Submit'...")
             # JS Click for Submit
             submit_btn = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ch_verified")))
             driver.execute_script("arguments[0].click();", submit_btn)
             
-            self.app.log_message(self.log_display, "Clicking 'Authorise'...")
+            log("Submitted. Authorising...")
             # JS Click for Authorise
             auth_btn = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_btn")))
             driver.execute_script("arguments[0].click();", auth_btn)
             
-            self.app.log_message(self.log_display, "Waiting for confirmation...")
+            # Alert belongs to this tab's own driver, so parallel tabs never take each other's confirmation
             alert = wait.until(EC.alert_is_present())
             
             fto_match = re.search(r'FTO No : \((.*?)\)', alert.text)
             fto_number = fto_match.group(1) if fto_match else "Not Found"
             
-            self.app.log_message(self.log_display, f"Captured FTO: {fto_number}", "success")
+            log(f"Captured FTO: {fto_number}", "success" if fto_match else "warning")
             self._log_result(page_identifier, fto_number)
             alert.accept()
-            return "Success" 
+            return "Success" if fto_match else "No FTO"
         except TimeoutException:
-            self.app.log_message(self.log_display, "Could not find verification table. Are you logged in?", "error")
+            log("Could not find verification table. Are you logged in?", "error")
             return "Login Required"
         except Exception as e:
-            self.app.log_message(self.log_display, f"An error occurred during {page_identifier} verification: {e}", "error")
+            log(f"An error occurred during verification: {e}", "error")
             return "Error"
 
+    def _verify_from_queue(self, driver, work, outcomes):
+        """Takes pages from the shared queue until it is empty. A page that gave an FTO goes back in: more rows may be pending."""
+        wait = WebDriverWait(driver, 15) # Slightly shorter wait time
+        stop = self.app.stop_events[self.automation_key]
+        while not stop.is_set():
+            try: page_identifier, url, round_no = work.get_nowait()
+            except queue.Empty: return
+            result = self._process_verification_page(driver, wait, url, page_identifier)
+            with outcomes["lock"]:
+                outcomes[page_identifier] = result
+                outcomes["ftos"] += result == "Success"
+            self.app.after(0, self.update_status, f"{page_identifier}: {result} ({outcomes['ftos']} FTO so far)", None)
+            if result == "Success" and round_no < config.FTO_GEN_CONFIG.get("max_rounds", 10):
+                work.put((page_identifier, url, round_no + 1))
+
+    def _extra_tab_worker(self, n, work, outcomes):
+        """Another tab of the same browser, with its own driver (and its own alerts), verifying from the shared queue."""
+        driver = None
+        try:
+            driver = self._attach_extra_tab()
+            if not driver: return
+            driver.switch_to.new_window("tab")
+            self.app.log_message(self.log_display, f"Tab {n}: verifying in parallel.")
+            self._verify_from_queue(driver, work, outcomes)
+        except Exception as e:
+            self.app.log_message(self.log_display, f"Tab {n} stopped ({type(e).__name__}); the other tabs carry on.", "warning")
+        finally:
+            if driver:
+                try: driver.close()
+                except Exception: pass
+
     def run_automation_logic(self):
         self.app.after(0, self.set_ui_state, True)
         self.app.clear_log(self.log_display)
@@ -142,23 +187,24 @@ class FtoGenerationTab(BaseAutomationTab):
             if not driver: return
             
             # --- REMOVED: The check for ftoindexframe.aspx is gone ---
-            self.app.log_message(self.log_display, "Starting FTO verification process...")
-            cfg = config.FTO_GEN_CONFIG
-            wait = WebDriverWait(driver, 15) # Slightly shorter wait time
+            pages = self._verification_pages()
+            self.app.log_message(self.log_display, f"Starting FTO verification of {len(pages)} pages...")
+            work = queue.Queue()
+            for page_identifier, url in pages: work.put((page_identifier, url, 1))
+            outcomes = {"lock": threading.Lock(), "ftos": 0}
+
+            # One page per browser tab; each tab keeps going until no page has pending rows
+            tabs = max(1, min(int(config.FTO_GEN_CONFIG.get("parallel_tabs", 1)), len(pages)))
+            workers = [threading.Thread(target=self._extra_tab_worker, args=(n, work, outcomes), daemon=True) for n in range(2, tabs + 1)]
+            for worker in workers: worker.start()
+            self._verify_from_queue(driver, work, outcomes)
+            for worker in workers: worker.join()
             
-            self.update_status("Processing Aadhaar FTO...", 0.25)
-            # Process the first page and check its result
-            result = self._process_verification_page(driver, wait, cfg["aadhaar_fto_url"], "Aadhaar FTO")
-            
-            # If the first page failed due to a login issue, stop here.
-            if result == "Login Required":
+            if "Login Required" in [outcomes.get(page_identifier) for page_identifier, _ in pages]:
                 messagebox.showerror("Login Required", "Could not find the FTO verification page. Please ensure you are logged in to the NREGA website.")
                 return
 
-            self.update_status("Processing Top-Up FTO...", 0.75)
-            self._process_verification_page(driver, wait, cfg["top_up_fto_url"], "Top-Up FTO")
-            
-            self.app.log_message(self.log_display, "Workflow complete.")
+            self.app.log_message(self.log_display, f"Workflow complete. {outcomes['ftos']} FTO(s) generated.")
             self.app.after(0, lambda: messagebox.showinfo("Workflow Complete", "Check the 'Results' tab for captured FTO numbers."))
 
         except Exception as e:
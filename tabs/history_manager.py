@@ -52,6 +52,39 @@ class HistoryManager:
                         description TEXT
                     )
                 ''')
+
+                # Table 4: Upload Ledger (stable item key -> cloud copy, for de-duplicated uploads)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS upload_ledger (
+                        ledger_key TEXT PRIMARY KEY,
+                        content_hash TEXT,
+                        file_size INTEGER,
+                        remote_path TEXT,
+                        remote_id TEXT,
+                        uploaded_at TEXT
+                    )
+                ''')
+
+                # Table 5: Performance samples (per-item step timings, see perf_monitor.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS perf_samples (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        automation_key TEXT,
+                        step TEXT,
+                        duration REAL,
+                        commands INTEGER,
+                        recorded_at TEXT
+                    )
+                ''')
+
+                # Table 6: FTO numbers captured by FTO Generation (no re-scraping for follow-ups)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS fto_numbers (
+                        fto_no TEXT PRIMARY KEY,
+                        page TEXT,
+                        generated_at TEXT
+                    )
+                ''')
                 
                 conn.commit()
                 conn.close()
@@ -149,4 +182,91 @@ class HistoryManager:
             rows = cursor.fetchall()
             conn.close()
             return rows
-        except: return []
\ No newline at end of file
+        except: return []
+
+    # --- Upload Ledger (Cloud de-duplication) ---
+    def get_uploaded_file(self, ledger_key: str):
+        """Returns (remote_path, remote_id) if the item with this key was uploaded before, else None."""
+        try:
+            conn = self._get_connection(); cursor = conn.cursor()
+            cursor.execute("SELECT remote_path, remote_id FROM upload_ledger WHERE ledger_key = ?", (ledger_key,))
+            row = cursor.fetchone(); conn.close()
+            return row
+        except: return None
+
+    def record_upload(self, ledger_key: str, content_hash: str, file_size: int, remote_path: str, remote_id=None):
+        with self.lock:
+            try:
+                conn = self._get_connection(); cursor = conn.cursor()
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.execute("INSERT OR REPLACE INTO upload_ledger VALUES (?, ?, ?, ?, ?, ?)",
+                               (ledger_key, content_hash, file_size, remote_path, str(remote_id) if remote_id is not None else None, now))
+                conn.commit(); conn.close()
+            except Exception as e:
+                print(f"Upload Ledger Error: {e}")
+
+    def forget_upload(self, remote_id=None, remote_path_prefix=None):
+        """Drops ledger rows for a deleted cloud file (by id) or folder (by path prefix)."""
+        with self.lock:
+            try:
+                conn = self._get_connection(); cursor = conn.cursor()
+                if remote_id is not None:
+                    cursor.execute("DELETE FROM upload_ledger WHERE remote_id = ?", (str(remote_id),))
+                if remote_path_prefix:
+                    cursor.execute("DELETE FROM upload_ledger WHERE remote_path = ? OR remote_path LIKE ?",
+                                   (remote_path_prefix, remote_path_prefix.rstrip('/') + '/%'))
+                conn.commit(); conn.close()
+            except: pass
+
+    # --- Performance Samples ---
+    def record_perf_samples(self, rows):
+        """rows: [(automation_key, step, duration_seconds, command_count_or_None), ...]"""
+        if not rows: return
+        with self.lock:
+            try:
+                conn = self._get_connection(); cursor = conn.cursor()
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.executemany("INSERT INTO perf_samples (automation_key, step, duration, commands, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                                   [(key, step, duration, commands, now) for key, step, duration, commands in rows])
+                # Sirf latest 20000 samples rakho
+                cursor.execute("DELETE FROM perf_samples WHERE id <= (SELECT MAX(id) FROM perf_samples) - 20000")
+                conn.commit(); conn.close()
+            except Exception as e:
+                print(f"Perf Log Error: {e}")
+
+    def get_perf_samples(self) -> list:
+        try:
+            conn = self._get_connection(); cursor = conn.cursor()
+            cursor.execute("SELECT automation_key, step, duration, commands FROM perf_samples")
+            rows = cursor.fetchall(); conn.close()
+            return rows
+        except: return []
+
+    def clear_perf_samples(self):
+        with self.lock:
+            try:
+                conn = self._get_connection(); cursor = conn.cursor()
+                cursor.execute("DELETE FROM perf_samples")
+                conn.commit(); conn.close()
+            except: pass
+
+    # --- FTO Numbers ---
+    def record_fto(self, fto_no: str, page: str):
+        if not fto_no: return
+        with self.lock:
+            try:
+                conn = self._get_connection(); cursor = conn.cursor()
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.execute("INSERT OR IGNORE INTO fto_numbers VALUES (?, ?, ?)", (fto_no, page, now))
+                conn.commit(); conn.close()
+            except Exception as e:
+                print(f"FTO Log Error: {e}")
+
+    def get_fto_numbers(self, since: str = None) -> list:
+        """[(fto_no, page, generated_at), ...] newest first; since = "YYYY-MM-DD" keeps that day and later."""
+        try:
+            conn = self._get_connection(); cursor = conn.cursor()
+            cursor.execute("SELECT fto_no, page, generated_at FROM fto_numbers WHERE generated_at >= ? ORDER BY generated_at DESC", (since or "",))
+            rows = cursor.fetchall(); conn.close()
+            return rows
+        except: return []
@@ -11,6 +11,7 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 
 class IfEditTab(BaseAutomationTab):
@@ -554,15 +555,13 @@ class IfEditTab(BaseAutomationTab):
                     
                     code_keyword, price, qty = act_data[0].strip(), act_data[1].strip(), act_data[2].strip()
                     
-                    act_dropdown_element = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlAct")
-                    act_select = Select(act_dropdown_element)
-                    found_option = next((opt for opt in act_select.options if code_keyword in opt.get_attribute('value')), None)
+                    found_option = next((opt for opt in dropdowns.read_options(driver, "ctl00_ContentPlaceHolder1_ddlAct") if code_keyword in opt.value), None)
                     
                     if not found_option:
                         self.app.log_message(self.log_display, f"  > Activity with keyword '{code_keyword}' not found in dropdown.", "warning")
                         continue
                     
-                    actual_code = found_option.get_attribute('value')
+                    actual_code = found_option.value
 
                     if actual_code in existing_activity_codes: 
                         self.app.log_message(self.log_display, f"  > Skipping existing activity: {actual_code}"); continue
@@ -599,8 +598,7 @@ class IfEditTab(BaseAutomationTab):
                 existing_material_names = {el.text.strip() for el in driver.find_elements(By.XPATH, "//span[contains(translate(@id, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '_lblmatname')]")}
                 self.app.log_message(self.log_display, f"Page 3: Found existing materials: {existing_material_names or 'None'}")
                 
-                mat_dropdown_element = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlMatname")
-                all_options = Select(mat_dropdown_element).options
+                all_options = dropdowns.read_options(driver, "ctl00_ContentPlaceHolder1_ddlMatname")
                 
                 # 2. Prepare a clean "to-do" list
                 materials_to_process = []
@@ -9,6 +9,7 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -17,6 +18,18 @@ def resource_path(relative_path):
     except Exception: base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# Every grid row: [control id base, job card, has account no., upload link ('F' / 'W' / ''), already verified]
+_PAGE_ROWS_JS = """
+var out = [];
+document.querySelectorAll("input[id^='ctl00_ContentPlaceHolder1_grdData_ctl'][id$='_hidd_reg']").forEach(function (h) {
+    var base = h.id.slice(0, -'_hidd_reg'.length), el = function (s) { return document.getElementById(base + s); };
+    var ac = el('_lblAc'), ver = el('_rblJCVer_0'), dt = el('_txt_DtrblJCVer');
+    var link = el('_link_img_F') ? 'F' : el('_link_img_W') ? 'W' : '';
+    out.push([base, h.value, !!(ac && ac.innerText.trim()), link, !!(ver && ver.checked && dt && dt.value.trim())]);
+});
+return out;
+"""
+
 class JobcardVerifyTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="jc_verify")
@@ -183,6 +196,7 @@ class JobcardVerifyTab(BaseAutomationTab):
         self.app.log_message(self.log_display, "🚀 Starting Jobcard Verification...")
         self.app.after(0, self.app.set_status, "Running Jobcard Verification...")
         
+        self._processed_jobcards = set() # Job cards done (or skipped) this run, across villages and pages
         try:
             driver = self.app.get_driver()
             if not driver: return
@@ -198,8 +212,8 @@ class JobcardVerifyTab(BaseAutomationTab):
 
             if inputs['process_all']:
                 self.app.log_message(self.log_display, "Finding all villages in Panchayat...")
-                village_dropdown = Select(wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_UC_panch_vill_reg1_ddlVillage"))))
-                villages_to_process = [opt.text for opt in village_dropdown.options if "--Select" not in opt.text]
+                village_dropdown = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_UC_panch_vill_reg1_ddlVillage")))
+                villages_to_process = [opt.text for opt in dropdowns.read_options(driver, village_dropdown) if "--Select" not in opt.text]
                 self.app.log_message(self.log_display, f"Found {len(villages_to_process)} villages.")
             else:
                 villages_to_process.append(inputs['village'])
@@ -250,89 +264,81 @@ class JobcardVerifyTab(BaseAutomationTab):
             self.app.after(0, self.update_status, "Finished"); self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.app.set_status, "Automation Finished")
     
+    def _snapshot_page(self, driver):
+        """Work plan of the page in one call: one dict per grid row, in control-ID order."""
+        rows = driver.execute_script(_PAGE_ROWS_JS) or []
+        return [{"id_base": base, "job_card": jc, "has_account": has_ac, "upload_link": link, "verified": verified}
+                for base, jc, has_ac, link, verified in rows]
+
     def _process_jobcards_for_current_page(self, driver, wait, verify_account_only):
-        row_index = 2 
-        while not self.app.stop_events[self.automation_key].is_set():
-            row_id_base = f"ctl00_ContentPlaceHolder1_grdData_ctl{row_index:02d}"
-            
-            # FAST FAIL: Check if row exists without waiting 20s
-            driver.implicitly_wait(0) 
-            row_check = driver.find_elements(By.ID, f"{row_id_base}_hidd_reg")
-            driver.implicitly_wait(20) 
-            
-            if not row_check:
-                break # End of this page
-            
-            jobcard_no = row_check[0].get_attribute("value")
-            
-            should_skip = False
-            if verify_account_only:
-                try:
-                    ac_element = driver.find_elements(By.ID, f"{row_id_base}_lblAc")
-                    if not ac_element or not ac_element[0].text.strip():
-                        self.app.log_message(self.log_display, f"   - Skipping Jobcard {jobcard_no} (No Account Number)", "info")
-                        should_skip = True
-                except Exception: should_skip = True
-
-            if should_skip:
-                row_index += 1
+        processed = self._processed_jobcards
+        rows = self._snapshot_page(driver)
+        while rows and not self.app.stop_events[self.automation_key].is_set():
+            row = rows.pop(0)
+            jobcard_no = row["job_card"]
+            if jobcard_no in processed: continue
+            processed.add(jobcard_no)
+
+            if row["verified"]:
+                self.app.log_message(self.log_display, f"   - Skipping Jobcard {jobcard_no} (Already verified)", "info")
+                continue
+            if verify_account_only and not row["has_account"]:
+                self.app.log_message(self.log_display, f"   - Skipping Jobcard {jobcard_no} (No Account Number)", "info")
                 continue
 
-            self.app.log_message(self.log_display, f"   - Verifying Jobcard: {jobcard_no}")
-            photo_to_upload = self._get_photo_for_jobcard(jobcard_no)
-            
-            upload_link = None
-            try:
-                links = driver.find_elements(By.ID, f"{row_id_base}_link_img_F")
-                if not links: links = driver.find_elements(By.ID, f"{row_id_base}_link_img_W")
-                if links: upload_link = links[0]
-            except: pass
+            self._process_single_jobcard(driver, wait, row)
+            # Save posts back: read the grid again and go straight to the next unprocessed row
+            rows = [r for r in self._snapshot_page(driver) if r["job_card"] not in processed]
 
-            if upload_link and photo_to_upload:
-                try:
-                    main_handle = driver.current_window_handle
-                    driver.execute_script("arguments[0].click();", upload_link)
-                    wait.until(EC.number_of_windows_to_be(2))
-                    popup = [h for h in driver.window_handles if h != main_handle][0]
-                    driver.switch_to.window(popup)
-                    WebDriverWait(driver, 5).until(lambda d: "UploadPhoto" in d.current_url)
-                    
-                    file_input = driver.find_element(By.CSS_SELECTOR, 'input[type="file"]')
-                    file_input.send_keys(photo_to_upload)
-                    driver.find_element(By.CSS_SELECTOR, 'input[type="submit"]').click()
-                    wait.until(EC.alert_is_present()).accept()
-                    self.app.log_message(self.log_display, "     - Photo uploaded successfully.", "success")
-                except Exception as ex:
-                     self.app.log_message(self.log_display, f"     - Upload failed: {str(ex)}", "error")
-                finally:
-                    if len(driver.window_handles) > 1: driver.close()
-                    driver.switch_to.window(main_handle)
-            
+    def _process_single_jobcard(self, driver, wait, row):
+        row_id_base, jobcard_no = row["id_base"], row["job_card"]
+        self.app.log_message(self.log_display, f"   - Verifying Jobcard: {jobcard_no}")
+        photo_to_upload = self._get_photo_for_jobcard(jobcard_no)
+
+        if row["upload_link"] and photo_to_upload:
+            main_handle = driver.current_window_handle
             try:
-                rblDmd = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_rblDmd_0")))
-                driver.execute_script("arguments[0].click();", rblDmd)
+                upload_link = driver.find_element(By.ID, f"{row_id_base}_link_img_{row['upload_link']}")
+                driver.execute_script("arguments[0].click();", upload_link)
+                wait.until(EC.number_of_windows_to_be(2))
+                popup = [h for h in driver.window_handles if h != main_handle][0]
+                driver.switch_to.window(popup)
+                WebDriverWait(driver, 5).until(lambda d: "UploadPhoto" in d.current_url)
                 
-                html_element = driver.find_element(By.TAG_NAME, "html")
-                rblJCVer = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_rblJCVer_0")))
-                driver.execute_script("arguments[0].click();", rblJCVer)
-                wait.until(EC.staleness_of(html_element))
-                
-                date_input = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_txt_DtrblJCVer")))
-                driver.execute_script("arguments[0].value = arguments[1];", date_input, datetime.now().strftime("%d/%m/%Y"))
-                
-                update_btn = driver.find_element(By.ID, f"{row_id_base}_BtnUpdate")
-                driver.execute_script("arguments[0].click();", update_btn)
-                
-                final_alert = wait.until(EC.alert_is_present())
-                self.app.log_message(self.log_display, f"     - Saved: {final_alert.text}", "success")
-                final_alert.accept()
-                
-                time.sleep(1)
-                wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_UC_panch_vill_reg1_ddlpnch")))
-                row_index = 2
-            except Exception as e:
-                self.app.log_message(self.log_display, f"     - Error saving row: {e}", "error")
-                row_index += 1
+                file_input = driver.find_element(By.CSS_SELECTOR, 'input[type="file"]')
+                file_input.send_keys(photo_to_upload)
+                driver.find_element(By.CSS_SELECTOR, 'input[type="submit"]').click()
+                wait.until(EC.alert_is_present()).accept()
+                self.app.log_message(self.log_display, "     - Photo uploaded successfully.", "success")
+            except Exception as ex:
+                 self.app.log_message(self.log_display, f"     - Upload failed: {str(ex)}", "error")
+            finally:
+                if len(driver.window_handles) > 1: driver.close()
+                driver.switch_to.window(main_handle)
+        
+        try:
+            rblDmd = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_rblDmd_0")))
+            driver.execute_script("arguments[0].click();", rblDmd)
+            
+            html_element = driver.find_element(By.TAG_NAME, "html")
+            rblJCVer = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_rblJCVer_0")))
+            driver.execute_script("arguments[0].click();", rblJCVer)
+            wait.until(EC.staleness_of(html_element))
+            
+            date_input = wait.until(EC.presence_of_element_located((By.ID, f"{row_id_base}_txt_DtrblJCVer")))
+            driver.execute_script("arguments[0].value = arguments[1];", date_input, datetime.now().strftime("%d/%m/%Y"))
+            
+            update_btn = driver.find_element(By.ID, f"{row_id_base}_BtnUpdate")
+            driver.execute_script("arguments[0].click();", update_btn)
+            
+            final_alert = wait.until(EC.alert_is_present())
+            self.app.log_message(self.log_display, f"     - Saved: {final_alert.text}", "success")
+            final_alert.accept()
+            
+            wait.until(EC.staleness_of(update_btn)) # Postback done, instead of a fixed sleep
+            wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_UC_panch_vill_reg1_ddlpnch")))
+        except Exception as e:
+            self.app.log_message(self.log_display, f"     - Error saving row: {e}", "error")
 
     def _handle_pagination(self, driver, wait, current_page_num):
         """Attempts to find and click the next page button using Link Text (Numbers) or '...'"""
@@ -6,11 +6,61 @@ import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException
 from .base_tab import BaseAutomationTab
+import config
+import dropdowns
+
+# --- Login page navigation (also used by session_guard.py to re-login mid-run) ---
+def load_location_prefs(path):
+    """Saved Financial Year / District / Block, or {}."""
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, 'r') as f: return json.load(f)
+    except: return {}
+
+
+def _safe_select(driver, wait, xpath, text, wait_for_options=False):
+    for _ in range(3):
+        try:
+            elem = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+            if wait_for_options:
+                WebDriverWait(driver, 5).until(lambda d: dropdowns.option_count(d, d.find_element(By.XPATH, xpath)) > 1)
+                elem = driver.find_element(By.XPATH, xpath)
+            # Exact text pehle, phir case/space-insensitive
+            options = dropdowns.read_options(driver, elem)
+            match = next((o for o in options if o.text == text), None) or dropdowns.find_option(options, text)
+            if not match: raise Exception(f"Option '{text}' not found")
+            dropdowns.select_option(driver, elem, value=match.value, options=options)
+            return
+        except StaleElementReferenceException:
+            time.sleep(1)
+    raise Exception(f"Failed to select '{text}' after retries")
+
+
+def open_login_page(driver, fin_year, district, block, on_status=None):
+    """Opens the NREGA login page and selects Financial Year, District and Block. User ID & Password stay manual."""
+    on_status = on_status or (lambda text: None)
+    driver.get(config.SESSION_GUARD_CONFIG["login_url"])
+    wait = WebDriverWait(driver, 25)
+    
+    # --- 1. Select Dropdowns ---
+    on_status("Status: Selecting Financial Year...")
+    _safe_select(driver, wait, "//select[contains(@id, 'ddl_FinYr')]", fin_year)
+    
+    on_status(f"Status: Finding District '{district}'...")
+    _safe_select(driver, wait, "//select[contains(@id, 'ddl_District')]", district, wait_for_options=True)
+
+    on_status(f"Status: Finding Block '{block}'...")
+    _safe_select(driver, wait, "//select[contains(@id, 'ddl_Block')]", block, wait_for_options=True)
+
+    # --- Wait for Page Refresh ---
+    on_status("Status: Waiting for page refresh...")
+    # Block select karne ke baad page reload hota hai, uska wait karein
+    time.sleep(3)
+
 
 class LoginAutomationTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
@@ -84,15 +134,11 @@ class LoginAutomationTab(BaseAutomationTab):
         except Exception as e: messagebox.showerror("Error", f"Could not save: {str(e)}")
 
     def load_credentials(self):
-        path = self.get_creds_path()
-        if os.path.exists(path):
-            try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    self.fin_year_input.set(data.get("fin_year", ""))
-                    self.district_input.delete(0, tk.END); self.district_input.insert(0, data.get("district", ""))
-                    self.block_input.delete(0, tk.END); self.block_input.insert(0, data.get("block", ""))
-            except: pass
+        data = load_location_prefs(self.get_creds_path())
+        if data:
+            self.fin_year_input.set(data.get("fin_year", ""))
+            self.district_input.delete(0, tk.END); self.district_input.insert(0, data.get("district", ""))
+            self.block_input.delete(0, tk.END); self.block_input.insert(0, data.get("block", ""))
 
     def run_login_thread(self):
         t = threading.Thread(target=self.run_login_automation)
@@ -113,24 +159,7 @@ class LoginAutomationTab(BaseAutomationTab):
             if not driver:
                 self.update_status("Status: No Browser Found"); return
 
-            url = "https://nregade4.nic.in/netnrega/Login.aspx?&level=HomePO&state_code=34"
-            driver.get(url)
-            wait = WebDriverWait(driver, 25)
-            
-            # --- 1. Select Dropdowns ---
-            self.update_status("Status: Selecting Financial Year...")
-            self._safe_select(wait, "//select[contains(@id, 'ddl_FinYr')]", fin_year)
-            
-            self.update_status(f"Status: Finding District '{district}'...")
-            self._safe_select(wait, "//select[contains(@id, 'ddl_District')]", district, wait_for_options=True)
-
-            self.update_status(f"Status: Finding Block '{block}'...")
-            self._safe_select(wait, "//select[contains(@id, 'ddl_Block')]", block, wait_for_options=True)
-
-            # --- Wait for Page Refresh ---
-            self.update_status("Status: Waiting for page refresh...")
-            # Block select karne ke baad page reload hota hai, uska wait karein
-            time.sleep(3) 
+            open_login_page(driver, fin_year, district, block, on_status=self.update_status)
 
             # --- Process Complete ---
             # Yahan se Maine Toast Notifications hata diye hain taaki koi crash na ho.
@@ -141,26 +170,6 @@ class LoginAutomationTab(BaseAutomationTab):
             self.update_status("Status: Error occurred")
             messagebox.showerror("Automation Error", f"Error: {str(e)}")
 
-    def _safe_select(self, wait, xpath, text, wait_for_options=False):
-        for _ in range(3):
-            try:
-                elem = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-                sel = Select(elem)
-                if wait_for_options:
-                    WebDriverWait(self.app.get_driver(), 5).until(lambda d: len(Select(d.find_element(By.XPATH, xpath)).options) > 1)
-                    sel = Select(self.app.get_driver().find_element(By.XPATH, xpath))
-                try: sel.select_by_visible_text(text)
-                except:
-                    found = False
-                    for opt in sel.options:
-                        if opt.text.strip().lower() == text.lower():
-                            sel.select_by_visible_text(opt.text); found = True; break
-                    if not found: raise Exception(f"Option '{text}' not found")
-                return
-            except StaleElementReferenceException:
-                time.sleep(1)
-        raise Exception(f"Failed to select '{text}' after retries")
-
     def update_status(self, text):
         # 1. Update Local Label
         self.status_label.configure(text=text)
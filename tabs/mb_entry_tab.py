@@ -1,8 +1,8 @@
 # tabs/mb_entry_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
-import time, os, json, sys, subprocess, random
+import os, json, sys, subprocess, random
 import re
 from datetime import datetime, date
 
@@ -12,7 +12,6 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     UnexpectedAlertPresentException, 
-    NoSuchElementException, 
     TimeoutException
 )
 
@@ -33,9 +32,43 @@ except ImportError:
     HAS_REPORTLAB = False
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
+# --- eMB page scripts: one call per postback boundary ---
+_SEARCH_JS = """
+var set = function (id, v) { document.getElementById(id).value = v; };
+set('ctl00_ContentPlaceHolder1_txtMBNo', arguments[0]);
+set('ctl00_ContentPlaceHolder1_txtpageno', arguments[1]);
+set('ctl00_ContentPlaceHolder1_txtWrkCode', arguments[2]);
+var old = document.getElementById('ctl00_ContentPlaceHolder1_ddlSelWrk');
+document.getElementById('ctl00_ContentPlaceHolder1_imgButtonSearch').click();
+return old;
+"""
+# Falsy until person days are filled in
+_READ_MB_PAGE_JS = """
+var pd = document.getElementById('ctl00_ContentPlaceHolder1_lbl_person_days');
+if (!pd || pd.value === '') return null;
+var msr = document.getElementById('ctl00_ContentPlaceHolder1_lbl_msr'), row = null;
+for (var i = 1; i <= 60; i++) {
+    var act = document.getElementById('ctl00_ContentPlaceHolder1_activity_ctl' + (i < 10 ? '0' : '') + i + '_act_name');
+    if (act && act.innerText.toLowerCase().indexOf('earth work') >= 0) { row = i; break; }
+}
+return {person_days: pd.value, msr: msr ? msr.innerText : '', activity_row: row};
+"""
+_FILL_MB_JS = """
+var p = arguments[0], byName = function (n) { return document.getElementsByName(p + '$' + n)[0]; };
+byName('qty').value = arguments[1];
+byName('unitcost').value = arguments[2];
+if (typeof check === 'function') { check(); }
+byName('labcomp').value = arguments[3];
+if (typeof checkLabCom === 'function') { checkLabCom(); }
+var pit = document.getElementById('ctl00_ContentPlaceHolder1_txtpit');
+if (pit) pit.value = arguments[4];
+document.getElementById('ctl00_ContentPlaceHolder1_txt_mat_name').value = arguments[5];
+"""
+
 class MbEntryTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         """Initializes the eMB Entry tab."""
@@ -218,8 +251,9 @@ class MbEntryTab(BaseAutomationTab):
         return entry
 
     # --- Panchayat-dependent mate name logic ---
-    def _get_current_mate_key(self):
-        panchayat_name = self.panchayat_entry.get().strip().lower()
+    def _get_current_mate_key(self, panchayat_name=None):
+        if panchayat_name is None: panchayat_name = self.panchayat_entry.get()
+        panchayat_name = panchayat_name.strip().lower()
         panchayat_safe_name = "".join(c for c in panchayat_name if c.isalnum() or c == '_').rstrip()
         if not panchayat_safe_name: return "mate_name_default"
         return f"mate_name_{panchayat_safe_name}"
@@ -277,7 +311,7 @@ class MbEntryTab(BaseAutomationTab):
             self.mb_no_entry.configure(state="disabled")
 
     def reset_ui(self):
-        if messagebox.askokcancel("Reset Form?", "Clear all inputs and logs?"):
+        if self.dialogs.askokcancel("Reset Form?", "Clear all inputs and logs?"):
             self._load_inputs()
             self.config_vars['panchayat_name'].set("") 
             self.work_codes_text.configure(state="normal")
@@ -292,18 +326,19 @@ class MbEntryTab(BaseAutomationTab):
     def start_automation(self):
         cfg = {key: var.get().strip() for key, var in self.config_vars.items()}
         if not self.auto_mb_no_var.get() and not cfg.get("measurement_book_no"):
-            messagebox.showwarning("Input Error", "MB No. field is required when 'Auto' is unchecked.")
+            self.dialogs.showwarning("Input Error", "MB No. field is required when 'Auto' is unchecked.")
             return
         required_fields = ["panchayat_name", "page_no", "unit_cost", "default_pit_count", "mate_name"]
         if any(not cfg.get(key) for key in required_fields):
-            messagebox.showwarning("Input Error", "All configuration fields must be filled out.")
+            self.dialogs.showwarning("Input Error", "All configuration fields must be filled out.")
             return
         work_codes_raw = [line.strip() for line in self.work_codes_text.get("1.0", tkinter.END).strip().splitlines() if line.strip()]
         if not work_codes_raw:
-            messagebox.showwarning("Input Required", "Please paste at least one work code.")
+            self.dialogs.showwarning("Input Required", "Please paste at least one work code.")
             return
         self._save_mapping_pair(cfg['panchayat_name'], cfg['mate_name'])
         self._save_inputs(cfg)
+        cfg["auto_mb_no"] = self.auto_mb_no_var.get()
         self.app.start_automation_thread(self.automation_key, self.run_automation_logic, args=(cfg, work_codes_raw))
     
     def _save_inputs(self, cfg):
@@ -335,12 +370,12 @@ class MbEntryTab(BaseAutomationTab):
 
             mate_names_list = [name.strip() for name in cfg["mate_name"].split(',') if name.strip()]
             if not mate_names_list:
-                messagebox.showerror("Input Error", "Please provide at least one Mate Name.")
+                self.dialogs.showerror("Input Error", "Please provide at least one Mate Name.")
                 return
 
             if not self.app.stop_events[self.automation_key].is_set():
                 self.app.update_history("panchayat_name", cfg['panchayat_name'])
-                mate_key = self._get_current_mate_key()
+                mate_key = self._get_current_mate_key(cfg['panchayat_name'])
                 for mate in mate_names_list: self.app.update_history(mate_key, mate)
             
             processed_codes = set()
@@ -363,11 +398,11 @@ class MbEntryTab(BaseAutomationTab):
             final_msg = "Automation finished." if not self.app.stop_events[self.automation_key].is_set() else "Stopped."
             self.app.after(0, self.update_status, final_msg, 1.0)
             if not self.app.stop_events[self.automation_key].is_set(): 
-                messagebox.showinfo("Complete", "e-MB Entry process has finished.")
+                self.dialogs.showinfo("Complete", "e-MB Entry process has finished.")
         
         except Exception as e:
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", "error")
-            messagebox.showerror("Automation Error", f"An error occurred:\n\n{e}")
+            self.dialogs.showerror("Automation Error", f"An error occurred:\n\n{e}")
         finally:
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.app.set_status, "Automation Finished")
@@ -399,82 +434,65 @@ class MbEntryTab(BaseAutomationTab):
             wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_txtMBNo')))
 
             mb_no_to_use = cfg["measurement_book_no"]
-            if self.auto_mb_no_var.get() and len(work_code) >= 4: mb_no_to_use = work_code[-4:] 
+            if cfg.get("auto_mb_no") and len(work_code) >= 4: mb_no_to_use = work_code[-4:] 
 
             self.app.after(0, self.app.set_status, f"Searching {work_code}...")
-            driver.execute_script(f"document.getElementById('ctl00_ContentPlaceHolder1_txtMBNo').value = '{mb_no_to_use}';")
-            driver.execute_script(f"document.getElementById('ctl00_ContentPlaceHolder1_txtpageno').value = '{cfg['page_no']}';")
-            driver.execute_script(f"document.getElementById('ctl00_ContentPlaceHolder1_txtWrkCode').value = '{work_code}';")
-            
-            work_dropdown_old = driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_ddlSelWrk')
-            search_btn = driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_imgButtonSearch')
-            driver.execute_script("arguments[0].click();", search_btn)
+            # MB no, page no and work code written and Search clicked in one call
+            work_dropdown_old = driver.execute_script(_SEARCH_JS, mb_no_to_use, cfg['page_no'], work_code)
             
             self.app.after(0, self.app.set_status, "Waiting for search results...")
             try: wait.until(EC.staleness_of(work_dropdown_old))
             except TimeoutException: pass
 
             self.app.after(0, self.app.set_status, f"Selecting work details...")
-            select_work_elem = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_ddlSelWrk')))
-            select_work = Select(select_work_elem)
-            found_work = False; target_index = 1 
-            clean_search_code = str(work_code).strip()
-            
-            for index, option in enumerate(select_work.options):
-                if (clean_search_code in option.get_attribute("value")) or (clean_search_code in option.text):
-                    target_index = index; found_work = True; break
-            
-            try: extracted_work_name = re.findall(r'\((.*?)\)', select_work.options[target_index].text)[-1]
+            wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_ddlSelWrk')))
+            # Matching option found in one read and selected (falls back to the first work, as before)
+            element_to_go_stale = driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_ddlSelWrk')
+            work_options, code = dropdowns.read_options(driver, element_to_go_stale), str(work_code).strip()
+            work_option = next((o for o in work_options if code in o.value or code in o.text), work_options[1] if len(work_options) > 1 else None)
+            option_text = work_option.text if work_option else ""
+            if work_option: dropdowns.select_option(driver, element_to_go_stale, index=work_options.index(work_option), options=work_options, force=True)
+            try: extracted_work_name = re.findall(r'\((.*?)\)', option_text)[-1]
             except: extracted_work_name = "Unknown"
-
-            element_to_go_stale = select_work_elem 
-            select_work.select_by_index(target_index)
             try: wait.until(EC.staleness_of(element_to_go_stale))
             except TimeoutException: pass
 
             self.app.log_message(self.log_display, "🔘 Clicking Radio Button...")
             radio_btn = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_rddist_0")))
+            old_period = driver.execute_script("return document.getElementById('ctl00_ContentPlaceHolder1_ddlSelMPeriod');")
             driver.execute_script("arguments[0].click();", radio_btn)
-            time.sleep(1) 
+            # Wait for the radio's postback itself (radio or old period list replaced / period list filled), not a fixed sleep
+            period_ready = EC.staleness_of(old_period) if old_period else (lambda d: dropdowns.option_count(d, 'ctl00_ContentPlaceHolder1_ddlSelMPeriod') > 1)
+            try: WebDriverWait(driver, 10).until(EC.any_of(EC.staleness_of(radio_btn), period_ready))
+            except TimeoutException: pass
 
             self.app.log_message(self.log_display, "⏳ Waiting for Period Dropdown...")
-            period_dropdown_elem = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlSelMPeriod")))
-            period_dropdown = Select(period_dropdown_elem)
-            if len(period_dropdown.options) <= 1: raise ValueError("No measurement period found.")
-            extracted_mr_period = period_dropdown.options[1].text
-            period_element_to_stale = period_dropdown_elem
-            period_dropdown.select_by_index(1)
+            wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlSelMPeriod")))
+            period_element_to_stale = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlSelMPeriod")
+            period_options = dropdowns.read_options(driver, period_element_to_stale)
+            if len(period_options) <= 1: raise ValueError("No measurement period found.")
+            extracted_mr_period = dropdowns.select_option(driver, period_element_to_stale, index=1, options=period_options, force=True).text
             
             self.app.log_message(self.log_display, "⏳ Waiting for Refresh...")
             try: wait.until(EC.staleness_of(period_element_to_stale))
             except TimeoutException: pass
 
             wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_lbl_person_days')))
-            wait.until(lambda d: d.find_element(By.ID, 'ctl00_ContentPlaceHolder1_lbl_person_days').get_attribute('value') != '')
-
-            try: extracted_mr_no = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_lbl_msr").text
-            except: extracted_mr_no = "-"
-
-            pd_elem = driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_lbl_person_days')
-            total_persondays = int(pd_elem.get_attribute('value') or 0)
+            # Person days filled in, plus MSR no. and the 'Earth work' activity row, read together
+            page_info = wait.until(lambda d: d.execute_script(_READ_MB_PAGE_JS))
+            extracted_mr_no = page_info["msr"] or "-"
+            total_persondays = int(page_info["person_days"] or 0)
             if total_persondays == 0: raise ValueError("0 Persondays / eMB already Booked")
 
             self.app.after(0, self.app.set_status, f"Filling activity details...")
-            prefix = self._find_activity_prefix(driver) 
+            prefix = self._find_activity_prefix(driver, page_info["activity_row"])
             total_cost = total_persondays * int(cfg["unit_cost"])
-            
-            driver.execute_script(f"document.getElementsByName('{prefix}$qty')[0].value = '{total_persondays}';")
-            driver.execute_script(f"document.getElementsByName('{prefix}$unitcost')[0].value = '{cfg['unit_cost']}';")
-            self.app.log_message(self.log_display, "⚙️ Triggering Auto-Calculation (check)...")
-            driver.execute_script("if(typeof check === 'function') { check(); }")
-            driver.execute_script(f"document.getElementsByName('{prefix}$labcomp')[0].value = '{total_cost}';")
-            self.app.log_message(self.log_display, "⚙️ Triggering Validation (checkLabCom)...")
-            driver.execute_script("if(typeof checkLabCom === 'function') { checkLabCom(); }")
-            
-            try: driver.execute_script(f"document.getElementById('ctl00_ContentPlaceHolder1_txtpit').value = '{cfg['default_pit_count']}';")
-            except: pass 
             random_mate = random.choice(mate_names_list)
-            driver.execute_script(f"document.getElementById('ctl00_ContentPlaceHolder1_txt_mat_name').value = '{random_mate}';")
+            
+            # All fields and the page's check() / checkLabCom() in one call, in the same order as typed by hand
+            self.app.log_message(self.log_display, "⚙️ Filling activity and triggering auto-calculation (check, checkLabCom)...")
+            driver.execute_script(_FILL_MB_JS, prefix, str(total_persondays), str(cfg['unit_cost']), str(total_cost),
+                                  str(cfg['default_pit_count']), random_mate)
 
             self.app.after(0, self.app.set_status, f"Saving...")
             save_btn = driver.find_element(By.XPATH, '//input[@value="Save"]')
@@ -494,17 +512,10 @@ class MbEntryTab(BaseAutomationTab):
             self.app.log_message(self.log_display, f"Error on {work_code}: {err_msg}", "error")
             self._log_result(cfg, work_code, "Failed", "Script Error", extracted_work_name, extracted_mr_no, extracted_mr_period)
 
-    def _find_activity_prefix(self, driver):
-        self.app.log_message(self.log_display, "Searching for 'Earth work' activity...")
-        for i in range(1, 61): 
-            try:
-                activity_id = f"ctl00_ContentPlaceHolder1_activity_ctl{str(i).zfill(2)}_act_name"
-                element = driver.find_element(By.ID, activity_id)
-                text = element.get_attribute("innerText").lower()
-                if "earth work" in text:
-                    self.app.log_message(self.log_display, f"✅ Found 'Earth work' in row #{i}.", "success")
-                    return f"ctl00$ContentPlaceHolder1$activity$ctl{str(i).zfill(2)}"
-            except NoSuchElementException: continue 
+    def _find_activity_prefix(self, driver, row_no=None):
+        if row_no:
+            self.app.log_message(self.log_display, f"✅ Found 'Earth work' in row #{row_no}.", "success")
+            return f"ctl00$ContentPlaceHolder1$activity$ctl{str(row_no).zfill(2)}"
         self.app.log_message(self.log_display, "⚠️ 'Earth work' not found, defaulting to first row (ctl01).", "warning")
         return "ctl00$ContentPlaceHolder1$activity$ctl01"
     
@@ -523,11 +534,11 @@ class MbEntryTab(BaseAutomationTab):
         """Generates a professional Excel report similar to eKYC Report."""
         all_items = self.results_tree.get_children()
         if not all_items:
-            messagebox.showinfo("No Data", "No records to export."); return
+            self.dialogs.showinfo("No Data", "No records to export."); return
 
         panchayat = self.panchayat_entry.get().strip()
         if not panchayat:
-            messagebox.showwarning("Required", "Panchayat Name missing."); return
+            self.dialogs.showwarning("Required", "Panchayat Name missing."); return
 
         # --- Filter Data ---
         filter_mode = self.export_filter_menu.get()
@@ -551,7 +562,7 @@ class MbEntryTab(BaseAutomationTab):
             elif filter_mode == "Failed Only" and "SUCCESS" not in status: data_export.append(vals)
 
         if not data_export:
-            messagebox.showinfo("Empty", "No data matches the selected filter."); return
+            self.dialogs.showinfo("Empty", "No data matches the selected filter."); return
 
         # --- Setup Path (Downloads/NregaBot/MB Reports {Year}/{Panchayat}) ---
         year = date.today().year
@@ -675,29 +686,29 @@ class MbEntryTab(BaseAutomationTab):
             ws.column_dimensions['G'].width = 30
 
             wb.save(filename)
-            messagebox.showinfo("Success", f"Professional Report Saved!\n{filename}")
+            self.dialogs.showinfo("Success", f"Professional Report Saved!\n{filename}")
             try:
                 if os.name == 'nt': os.startfile(filename)
                 else: subprocess.call(['open', filename])
             except: pass
 
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to save Excel: {e}")
+            self.dialogs.showerror("Export Error", f"Failed to save Excel: {e}")
 
     def export_professional_pdf(self):
         """Generates a professional PDF report with Hindi font support."""
         # --- Check if Library Exists ---
         if not HAS_REPORTLAB:
-            messagebox.showerror("Missing Library", "PDF generation requires 'reportlab'.\nPlease run in terminal: pip install reportlab")
+            self.dialogs.showerror("Missing Library", "PDF generation requires 'reportlab'.\nPlease run in terminal: pip install reportlab")
             return
 
         all_items = self.results_tree.get_children()
         if not all_items:
-            messagebox.showinfo("No Data", "No records to export."); return
+            self.dialogs.showinfo("No Data", "No records to export."); return
 
         panchayat = self.panchayat_entry.get().strip()
         if not panchayat:
-            messagebox.showwarning("Required", "Panchayat Name missing."); return
+            self.dialogs.showwarning("Required", "Panchayat Name missing."); return
 
         # --- Filter Data ---
         filter_mode = self.export_filter_menu.get()
@@ -720,7 +731,7 @@ class MbEntryTab(BaseAutomationTab):
             elif filter_mode == "Failed Only" and "SUCCESS" not in status: data_to_export.append(vals)
 
         if not data_to_export:
-            messagebox.showinfo("Empty", "No data matches the selected filter."); return
+            self.dialogs.showinfo("Empty", "No data matches the selected filter."); return
 
         # --- Path Setup ---
         year = date.today().year
@@ -849,14 +860,14 @@ class MbEntryTab(BaseAutomationTab):
             elements.append(main_table)
             doc.build(elements)
             
-            messagebox.showinfo("Success", f"Professional PDF Saved!\n{filename}")
+            self.dialogs.showinfo("Success", f"Professional PDF Saved!\n{filename}")
             try:
                 if os.name == 'nt': os.startfile(filename)
                 else: subprocess.call(['open', filename])
             except: pass
 
         except Exception as e:
-            messagebox.showerror("PDF Error", f"Failed to generate PDF: {e}")
+            self.dialogs.showerror("PDF Error", f"Failed to generate PDF: {e}")
     
     def load_data_from_mr_tracking(self, workcodes: str, panchayat_name: str):
         self.panchayat_entry.delete(0, tkinter.END)
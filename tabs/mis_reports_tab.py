@@ -22,6 +22,75 @@ from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 import config
 
+
+def read_report_table(page_source):
+    """
+    Parses the last table of a MIS report page into a DataFrame.
+    Returns (report_df, notes) where notes are warnings worth logging.
+    """
+    notes = []
+    try:
+        df_list = pd.read_html(StringIO(page_source), header=[0, 1])
+        report_df = df_list[-1]
+        report_df.columns = [col[1] for col in report_df.columns]
+        if not report_df.empty and str(report_df.iloc[0, 0]).strip() == '1' and str(report_df.iloc[0, 1]).strip().startswith('2'):
+            notes.append("Detected and removed junk numeric header row from data.")
+            report_df = report_df.iloc[1:].reset_index(drop=True)
+    except ValueError:
+        notes.append("Could not parse multi-level header. Trying single header.")
+        df_list = pd.read_html(StringIO(page_source), header=0)
+        report_df = df_list[-1]
+    return report_df, notes
+
+
+def format_report_sheet(worksheet, report_name, report_df):
+    """Print setup, title, bold header/total rows and column widths for one report sheet."""
+    # --- START: FINAL EXCEL FORMATTING ---
+    # 1. Page Setup for Printing (A4, Dynamic Orientation)
+    worksheet.page_setup.orientation = worksheet.ORIENTATION_LANDSCAPE if worksheet.max_column > 7 else worksheet.ORIENTATION_PORTRAIT
+    worksheet.page_setup.paperSize = worksheet.PAPERSIZE_A4
+    worksheet.page_setup.fitToWidth = 1
+    worksheet.page_setup.fitToHeight = 0 
+    worksheet.page_margins = PageMargins(left=0.5, right=0.5, top=0.5, bottom=0.5)
+
+    # 2. Define Styles
+    title_font = Font(bold=True, size=14)
+    header_font = Font(bold=True)
+    total_font = Font(bold=True)
+    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+    # 3. Format Title (Row 1)
+    worksheet['A1'] = report_name
+    worksheet['A1'].font = title_font
+    worksheet['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    if not report_df.empty:
+        worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=worksheet.max_column)
+
+    # 4. Format Header, Data, and Total Rows
+    for row_idx, row in enumerate(worksheet.iter_rows(min_row=2), start=2):
+        is_total_row = row[0].value and 'total' in str(row[0].value).lower()
+        for cell in row:
+            if row_idx == 2: # Header row
+                cell.font = header_font
+            elif is_total_row: # Total row
+                cell.font = total_font
+            cell.alignment = center_align
+
+    # 5. Auto-adjust column widths
+    for col_idx in range(1, worksheet.max_column + 1):
+        column_letter = get_column_letter(col_idx)
+        max_length = 0
+        for cell in worksheet[column_letter]:
+            if cell.row == 1: continue
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except: pass
+        adjusted_width = min((max_length + 2), 50)
+        worksheet.column_dimensions[column_letter].width = adjusted_width
+    # --- END: FINAL EXCEL FORMATTING ---
+
+
 class MisReportsTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="mis_reports")
@@ -248,66 +317,12 @@ class MisReportsTab(BaseAutomationTab):
                         self.app.log_message(self.log_display, "Final page reached. Reading table...")
                         time.sleep(2)
                         
-                        try:
-                            df_list = pd.read_html(StringIO(driver.page_source), header=[0, 1])
-                            report_df = df_list[-1]
-                            report_df.columns = [col[1] for col in report_df.columns]
-                            if not report_df.empty and str(report_df.iloc[0, 0]).strip() == '1' and str(report_df.iloc[0, 1]).strip().startswith('2'):
-                                self.app.log_message(self.log_display, "Detected and removed junk numeric header row from data.", "warning")
-                                report_df = report_df.iloc[1:].reset_index(drop=True)
-                        except ValueError:
-                            self.app.log_message(self.log_display, "Could not parse multi-level header. Trying single header.", "warning")
-                            df_list = pd.read_html(StringIO(driver.page_source), header=0)
-                            report_df = df_list[-1]
+                        report_df, notes = read_report_table(driver.page_source)
+                        for note in notes: self.app.log_message(self.log_display, note, "warning")
 
                         sheet_name = re.sub(r'[\\/*?:\[\]]', '', report_name)[:30]
                         report_df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=1)
-                        worksheet = writer.sheets[sheet_name]
-
-                        # --- START: FINAL EXCEL FORMATTING ---
-                        # 1. Page Setup for Printing (A4, Dynamic Orientation)
-                        worksheet.page_setup.orientation = worksheet.ORIENTATION_LANDSCAPE if worksheet.max_column > 7 else worksheet.ORIENTATION_PORTRAIT
-                        worksheet.page_setup.paperSize = worksheet.PAPERSIZE_A4
-                        worksheet.page_setup.fitToWidth = 1
-                        worksheet.page_setup.fitToHeight = 0 
-                        worksheet.page_margins = PageMargins(left=0.5, right=0.5, top=0.5, bottom=0.5)
-
-                        # 2. Define Styles
-                        title_font = Font(bold=True, size=14)
-                        header_font = Font(bold=True)
-                        total_font = Font(bold=True)
-                        center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-
-                        # 3. Format Title (Row 1)
-                        worksheet['A1'] = report_name
-                        worksheet['A1'].font = title_font
-                        worksheet['A1'].alignment = Alignment(horizontal='center', vertical='center')
-                        if not report_df.empty:
-                            worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=worksheet.max_column)
-
-                        # 4. Format Header, Data, and Total Rows
-                        for row_idx, row in enumerate(worksheet.iter_rows(min_row=2), start=2):
-                            is_total_row = row[0].value and 'total' in str(row[0].value).lower()
-                            for cell in row:
-                                if row_idx == 2: # Header row
-                                    cell.font = header_font
-                                elif is_total_row: # Total row
-                                    cell.font = total_font
-                                cell.alignment = center_align
-
-                        # 5. Auto-adjust column widths
-                        for col_idx in range(1, worksheet.max_column + 1):
-                            column_letter = get_column_letter(col_idx)
-                            max_length = 0
-                            for cell in worksheet[column_letter]:
-                                if cell.row == 1: continue
-                                try:
-                                    if len(str(cell.value)) > max_length:
-                                        max_length = len(str(cell.value))
-                                except: pass
-                            adjusted_width = min((max_length + 2), 50)
-                            worksheet.column_dimensions[column_letter].width = adjusted_width
-                        # --- END: FINAL EXCEL FORMATTING ---
+                        format_report_sheet(writer.sheets[sheet_name], report_name, report_df)
                         
                         details = f"Saved to sheet: {sheet_name}"
                         self.app.log_message(self.log_display, f"Successfully saved and formatted '{report_name}' to sheet '{sheet_name}'.", "success")
@@ -1,15 +1,16 @@
 # tabs/mr_fill_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
 import os, random, time, sys, subprocess, re, json
 from datetime import datetime
 from fpdf import FPDF
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, TimeoutException, NoAlertPresentException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -194,7 +195,7 @@ class MrFillTab(BaseAutomationTab):
 
     def reset_ui(self):
         """Resets the form to its default state."""
-        if messagebox.askokcancel("Reset Form?", "Clear all inputs, results, and logs?"):
+        if self.dialogs.askokcancel("Reset Form?", "Clear all inputs, results, and logs?"):
             self._load_inputs() # Load saved inputs
             # Clear text boxes and results
             self.work_key_text.configure(state="normal"); self.work_key_text.delete("1.0", tkinter.END); self.work_key_text.configure(state="disabled")
@@ -219,7 +220,7 @@ class MrFillTab(BaseAutomationTab):
         self.work_key_text.configure(state="disabled") # Disable again
 
         if not work_keys: 
-            messagebox.showerror("Input Error", "No work keys (Search Key) provided."); 
+            self.dialogs.showerror("Input Error", "No work keys (Search Key) provided."); 
             return
             
         self._save_inputs(cfg) # Save the current inputs
@@ -250,32 +251,27 @@ class MrFillTab(BaseAutomationTab):
             # --- MODIFICATION: Navigate to the URL before trying to select Panchayat ---
             driver.get(config.MR_FILL_CONFIG["url"])
             
-            # --- 3. Panchayat Selection Logic (with 2 attempts) ---
+            # --- 3. Panchayat Selection Logic (2 attempts with backoff, see retry_policy.py) ---
             panchayat_selected = False
-            for attempt in range(2):
-                if self.app.stop_events[self.automation_key].is_set(): break
-                try:
-                    # Try to find dropdown with a 3-second wait
-                    panchayat_select_element = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, "ddlPanchayat")))
-                    
-                    if not panchayat_name: 
-                        messagebox.showerror("Input Error", "Panchayat name is required for Block Login."); 
-                        self.app.after(0, self.set_ui_state, False); return
+            try:
+                # Try to find dropdown with a 3-second wait
+                panchayat_select_element = self.app.retry_policy.call(
+                    lambda: WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, "ddlPanchayat"))),
+                    attempts=2, stop_event=self.app.stop_events[self.automation_key])
+                
+                if not panchayat_name: 
+                    self.dialogs.showerror("Input Error", "Panchayat name is required for Block Login."); 
+                    self.app.after(0, self.set_ui_state, False); return
 
-                    panchayat_select = Select(panchayat_select_element)
-                    match = next((opt.text for opt in panchayat_select.options if panchayat_name.strip().lower() in opt.text.lower()), None)
-                    if not match: raise ValueError(f"Panchayat '{panchayat_name}' not found.")
-                    
-                    panchayat_select.select_by_visible_text(match)
-                    self.app.update_history("panchayat_name", panchayat_name) # Save to autocomplete history
-                    self.app.log_message(self.log_display, f"Successfully selected Panchayat: {match}", "success")
-                    time.sleep(2) # Wait for page to reload
-                    panchayat_selected = True
-                    break # Exit loop on success
+                option = dropdowns.find_option(dropdowns.read_options(driver, panchayat_select_element), panchayat_name, match="contains")
+                if not option: raise ValueError(f"Panchayat '{panchayat_name}' not found.")
                 
-                except TimeoutException:
-                    self.app.log_message(self.log_display, f"Panchayat dropdown not found (Attempt {attempt + 1}/2).", "info")
-                    time.sleep(1) # Wait before retrying
+                match = dropdowns.select_option(driver, panchayat_select_element, value=option.value).text
+                self.app.update_history("panchayat_name", panchayat_name) # Save to autocomplete history
+                self.app.log_message(self.log_display, f"Successfully selected Panchayat: {match}", "success")
+                time.sleep(2) # Wait for page to reload
+                panchayat_selected = True
+            except TimeoutException: pass
                 
             if not panchayat_selected and not self.app.stop_events[self.automation_key].is_set():
                 self.app.log_message(self.log_display, "Panchayat selection not found/required (GP Login). Proceeding...", "info")
@@ -292,11 +288,11 @@ class MrFillTab(BaseAutomationTab):
                 self._process_single_work_code(driver, wait, work_key, holiday_cols, is_manual_mode)
                 
             if not self.app.stop_events[self.automation_key].is_set(): 
-                messagebox.showinfo("Completed", "Automation finished! Check the 'Results' tab for details.")
+                self.dialogs.showinfo("Completed", "Automation finished! Check the 'Results' tab for details.")
         
         except Exception as e:
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", "error")
-            messagebox.showerror("MR Fill Error", f"An error occurred: {e}")
+            self.dialogs.showerror("MR Fill Error", f"An error occurred: {e}")
         
         finally:
             self.app.after(0, self.set_ui_state, False)
@@ -309,6 +305,7 @@ class MrFillTab(BaseAutomationTab):
         BACKGROUND-SAFE UPDATE: Uses JS for inputs/clicks to support Minimized Browser.
         """
         current_mr_no = "N/A"
+        save_clicked = False # After this a timeout may hide a save that went through, so it is never retried
         try:
             # Dismiss any previous alerts
             try: driver.switch_to.alert.accept()
@@ -344,20 +341,19 @@ class MrFillTab(BaseAutomationTab):
 
             # --- 2. Work Code Select ---
             self.app.after(0, self.app.set_status, f"Selecting Work Code...")
-            work_code_select = Select(wait.until(EC.presence_of_element_located((By.ID, "ddlWorkCode"))))
-            if len(work_code_select.options) <= 1: 
+            work_code_options = dropdowns.read_options(driver, wait.until(EC.presence_of_element_located((By.ID, "ddlWorkCode"))))
+            if len(work_code_options) <= 1: 
                 raise IndexError("Work code not found after search.")
-            work_code_select.select_by_index(1) # Select the first work code
+            dropdowns.select_option(driver, "ddlWorkCode", index=1, options=work_code_options) # Select the first work code
             time.sleep(1.5) # Wait for MR list to load
 
             # --- 3. MR No. Select ---
             self.app.after(0, self.app.set_status, f"Selecting MR No...")
-            msr_select = Select(wait.until(EC.presence_of_element_located((By.ID, "ddlMsrNo"))))
-            if len(msr_select.options) <= 1: 
+            msr_options = dropdowns.read_options(driver, wait.until(EC.presence_of_element_located((By.ID, "ddlMsrNo"))))
+            if len(msr_options) <= 1: 
                 raise IndexError("Muster Roll (MR) not found for this work code.")
             
-            current_mr_no = msr_select.options[1].text # Store the first MR No.
-            msr_select.select_by_index(1)
+            current_mr_no = dropdowns.select_option(driver, "ddlMsrNo", index=1, options=msr_options).text # Store the first MR No.
             self.app.log_message(self.log_display, f"Processing Work Key: {work_key}, MR No: {current_mr_no}")
             
             # Wait for table (Check for Save button presence)
@@ -398,6 +394,7 @@ class MrFillTab(BaseAutomationTab):
                 self.app.log_message(self.log_display, f"Manual Mode: Pausing for MR: {current_mr_no}. Please mark absentees and click 'Save'.", "info")
                 try:
                     alert = WebDriverWait(driver, 600).until(EC.alert_is_present())
+                    save_clicked = True
                     alert_text = alert.text 
                     alert.accept()
                     self.app.log_message(self.log_display, f"User action detected. Bot handled first alert: '{alert_text}'", "info")
@@ -412,6 +409,7 @@ class MrFillTab(BaseAutomationTab):
                 # JS Click for Save
                 save_btn = driver.find_element(By.ID, "btnsave")
                 driver.execute_script("arguments[0].click();", save_btn)
+                save_clicked = True
                 
                 # Handle first confirmation alert
                 WebDriverWait(driver, 10).until(EC.alert_is_present()).accept()
@@ -428,33 +426,34 @@ class MrFillTab(BaseAutomationTab):
                     if "Muster Roll Saved Successfully" in final_alert_text or "Muster Roll has been saved" in final_alert_text:
                         self._log_result(work_key, current_mr_no, "Success", final_alert_text)
                     else:
-                        self._log_result(work_key, current_mr_no, "Failed", f"Unknown Alert: {final_alert_text}")
+                        self._log_result(work_key, current_mr_no, "Failed", self._after_save(f"Unknown Alert: {final_alert_text}", save_clicked))
                     
                     outcome_found = True; break
                 except NoAlertPresentException:
                     time.sleep(1)
             
             if not outcome_found: 
-                self._log_result(work_key, current_mr_no, "Failed", "No final confirmation alert found (Timeout).")
+                self._log_result(work_key, current_mr_no, "Failed", self._after_save("No final confirmation alert found (Timeout).", save_clicked))
 
         except ValueError as e:
             error_message = str(e)
-            self._log_result(work_key, current_mr_no, "Failed", error_message)
+            self._log_result(work_key, current_mr_no, "Failed", self._after_save(error_message, save_clicked))
         
         except (IndexError, NoSuchElementException) as e:
             display_msg = str(e)
             if "Muster Roll (MR) not found" in display_msg: details = "MR not found (or not available)."
             elif "Work code not found" in display_msg: details = "Work Code not found."
             else: details = f"Element not found: {e}"
-            self._log_result(work_key, current_mr_no, "Failed", details)
+            self._log_result(work_key, current_mr_no, "Failed", self._after_save(details, save_clicked))
 
         except TimeoutException as e:
             self.app.log_message(self.log_display, f"Timeout processing {work_key}: {e}", "error")
-            self._log_result(work_key, current_mr_no, "Failed", "Page timed out or element not found.")
+            details = "Page timed out after Save (it may have saved). Check the MR." if save_clicked else "Page timed out or element not found."
+            self._log_result(work_key, current_mr_no, "Failed", details)
         
         except Exception as e:
             self.app.log_message(self.log_display, f"Critical error processing {work_key}: {e}", "error")
-            self._log_result(work_key, current_mr_no, "Failed", f"CRITICAL ERROR: {type(e).__name__}")
+            self._log_result(work_key, current_mr_no, "Failed", self._after_save(f"CRITICAL ERROR: {type(e).__name__}", save_clicked))
         
     # ... inside MrFillTab class ...
 
@@ -486,7 +485,7 @@ class MrFillTab(BaseAutomationTab):
         panchayat_name = self.panchayat_var.get() # Get from variable
 
         if not panchayat_name:
-            messagebox.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.", parent=self)
+            self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.", parent=self)
             return
 
         if "CSV" in export_format:
@@ -505,9 +504,9 @@ class MrFillTab(BaseAutomationTab):
     def _get_filtered_data_and_filepath(self, export_format):
         """Filters data based on UI selection and gets a save file path from the user."""
         all_items = self.results_tree.get_children()
-        if not all_items: messagebox.showinfo("No Data", "There are no results to export."); return None, None
+        if not all_items: self.dialogs.showinfo("No Data", "There are no results to export."); return None, None
         panchayat_name = self.panchayat_var.get() # Get from variable
-        if not panchayat_name: messagebox.showwarning("Input Needed", "Please enter a Panchayat Name for the report title."); return None, None
+        if not panchayat_name: self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name for the report title."); return None, None
 
         filter_option = self.export_filter_menu.get()
         data_to_export = []
@@ -517,7 +516,7 @@ class MrFillTab(BaseAutomationTab):
             if filter_option == "Export All": data_to_export.append(row_values)
             elif filter_option == "Success Only" and "SUCCESS" in status: data_to_export.append(row_values)
             elif filter_option == "Failed Only" and "SUCCESS" not in status: data_to_export.append(row_values)
-        if not data_to_export: messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
+        if not data_to_export: self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
 
         safe_name = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -543,11 +542,11 @@ class MrFillTab(BaseAutomationTab):
             success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
             
             if success:
-                if messagebox.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
+                if self.dialogs.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
                     if sys.platform == "win32":
                         os.startfile(file_path)
                     else:
                         subprocess.call(['open', file_path])
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
+            self.dialogs.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
 
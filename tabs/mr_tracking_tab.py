@@ -29,6 +29,59 @@ from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 import config  # <-- Make sure config is imported
 
+
+# Regex to find number of days
+# Matches: "since 5 days", "since 1 day", "since 5 Day" (Case Insensitive)
+PENDENCY_DAYS_PATTERN = re.compile(r'since\s+(\d+)\s*(?:days|day)', re.IGNORECASE)
+
+
+def summarize_pendency(rows):
+    """
+    Counts days pending per Panchayat from results-tree rows.
+    Constraints:
+    1. Look for 'since X days' in text.
+    2. Unique MR per Panchayat (don't count same MR twice).
+    """
+    summary = {} # { "PanchayatName": {T0:0, T1:0... seen_mrs: set()} }
+
+    for values in rows:
+        if not values: continue
+        
+        # Extract relevant columns
+        # Index 1: Panchayat, Index 2: MR No
+        # Index 7: Status, Index 12: 1st Sign, Index 13: 2nd Sign
+        panchayat = values[1]
+        mr_no = values[2]
+        
+        # Combine text fields to search
+        full_text = f"{values[7]} {values[12]} {values[13]}"
+        
+        match = PENDENCY_DAYS_PATTERN.search(full_text)
+        if not match:
+            continue # Skip if no "since X days" found
+            
+        days_pending = int(match.group(1))
+        
+        # Initialize Panchayat Data
+        if panchayat not in summary:
+            summary[panchayat] = {f"T{i}": 0 for i in range(9)}
+            summary[panchayat]["seen_mrs"] = set()
+        
+        # Check Duplicate MR (Constraint: Same MR count 1 hi hoga)
+        if mr_no in summary[panchayat]["seen_mrs"]:
+            continue
+        
+        # Add to seen
+        summary[panchayat]["seen_mrs"].add(mr_no)
+        
+        # Bucket Allocation
+        if days_pending >= 8:
+            summary[panchayat]["T8"] += 1
+        else:
+            summary[panchayat][f"T{days_pending}"] += 1
+            
+    return summary
+
 class MrTrackingTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="mr_tracking")
@@ -146,6 +199,13 @@ class MrTrackingTab(BaseAutomationTab):
                                                     hover_color="#0E95BA")
         self.run_emb_entry_button.pack_forget() 
 
+        self.run_pipeline_button = ctk.CTkButton(copy_frame,
+                                                 text="Run as Pipeline",
+                                                 command=self._run_pipeline,
+                                                 fg_color="#6D28D9",
+                                                 hover_color="#5B21B6")
+        self.run_pipeline_button.pack_forget()
+
         self.run_zero_mr_button = ctk.CTkButton(copy_frame,
                                                   text="Forward to Zero MR",
                                                   command=self._run_zero_mr,
@@ -256,6 +316,7 @@ class MrTrackingTab(BaseAutomationTab):
         
         self.run_mr_payment_button.configure(state=state)
         self.run_emb_entry_button.configure(state=state)
+        self.run_pipeline_button.configure(state=state)
         self.run_zero_mr_button.configure(state=state)
         self.generate_pendency_btn.configure(state=state) # Control new button state
         
@@ -310,6 +371,7 @@ class MrTrackingTab(BaseAutomationTab):
     def start_automation(self):
         self.run_mr_payment_button.pack_forget() 
         self.run_emb_entry_button.pack_forget() 
+        self.run_pipeline_button.pack_forget()
         self.run_zero_mr_button.pack_forget() 
         
         for item in self.results_tree.get_children(): self.results_tree.delete(item)
@@ -612,6 +674,7 @@ class MrTrackingTab(BaseAutomationTab):
                 else:
                     self.app.after(0, lambda: self.run_mr_payment_button.pack(side="left", padx=(10, 0)))
                     self.app.after(0, lambda: self.run_emb_entry_button.pack(side="left", padx=(10, 0)))
+                    self.app.after(0, lambda: self.run_pipeline_button.pack(side="left", padx=(10, 0)))
 
     def _search_wagelist_for_pending_abps(self, driver, wait, inputs, wagelist_no, mr_list, main_window_handle):
         try:
@@ -774,56 +837,8 @@ class MrTrackingTab(BaseAutomationTab):
         self.style_treeview(tree)
 
     def _process_pendency_data(self, tree_items):
-        """
-        Parses tree items to count days pending.
-        Constraints:
-        1. Look for 'since X days' in text.
-        2. Unique MR per Panchayat (don't count same MR twice).
-        """
-        summary = {} # { "PanchayatName": {T0:0, T1:0... seen_mrs: set()} }
-        
-        # Regex to find number of days
-        # Matches: "since 5 days", "since 1 day", "since 5 Day" (Case Insensitive)
-        regex = re.compile(r'since\s+(\d+)\s*(?:days|day)', re.IGNORECASE)
-
-        for item_id in tree_items:
-            values = self.results_tree.item(item_id, 'values')
-            if not values: continue
-            
-            # Extract relevant columns
-            # Index 1: Panchayat, Index 2: MR No
-            # Index 7: Status, Index 12: 1st Sign, Index 13: 2nd Sign
-            panchayat = values[1]
-            mr_no = values[2]
-            
-            # Combine text fields to search
-            full_text = f"{values[7]} {values[12]} {values[13]}"
-            
-            match = regex.search(full_text)
-            if not match:
-                continue # Skip if no "since X days" found
-                
-            days_pending = int(match.group(1))
-            
-            # Initialize Panchayat Data
-            if panchayat not in summary:
-                summary[panchayat] = {f"T{i}": 0 for i in range(9)}
-                summary[panchayat]["seen_mrs"] = set()
-            
-            # Check Duplicate MR (Constraint: Same MR count 1 hi hoga)
-            if mr_no in summary[panchayat]["seen_mrs"]:
-                continue
-            
-            # Add to seen
-            summary[panchayat]["seen_mrs"].add(mr_no)
-            
-            # Bucket Allocation
-            if days_pending >= 8:
-                summary[panchayat]["T8"] += 1
-            else:
-                summary[panchayat][f"T{days_pending}"] += 1
-                
-        return summary
+        """Parses tree items to count days pending (see summarize_pendency)."""
+        return summarize_pendency(self.results_tree.item(item_id, 'values') for item_id in tree_items)
 
     def _export_pendency_excel(self, summary_data):
         if not summary_data: return
@@ -994,6 +1009,22 @@ class MrTrackingTab(BaseAutomationTab):
 
         self.app.switch_to_emb_entry_with_data(final_workcodes, panchayat_name)
 
+    def _run_pipeline(self):
+        """Called when the 'Run as Pipeline' button is clicked (MR Payment -> eMB Entry together)."""
+        workcodes_raw = self.workcode_textbox.get("1.0", tkinter.END).strip()
+        panchayat_name = self.panchayat_entry.get().strip()
+
+        if not workcodes_raw:
+            messagebox.showwarning("No Data", "There are no workcodes to run in the pipeline.", parent=self)
+            return
+        if not panchayat_name or panchayat_name.upper() == "ALL":
+            messagebox.showwarning("Invalid Panchayat", "A specific Panchayat name must be selected to run the pipeline.", parent=self)
+            return
+
+        # Same last-6-digit keys as MR Payment / eMB Entry
+        short_codes = [code.strip().split('/')[-1][-6:] for code in workcodes_raw.splitlines() if code.strip()]
+        self.app.start_pipeline("\n".join(short_codes), panchayat_name)
+
     def _run_zero_mr(self):
         """Called when the 'Forward to Zero MR' button is clicked."""
         if not hasattr(self, 'zero_mr_data') or not self.zero_mr_data:
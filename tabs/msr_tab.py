@@ -1,15 +1,16 @@
 # tabs/msr_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
-import os, random, time, sys, subprocess
+import os, time, sys, subprocess
 from datetime import datetime
 from fpdf import FPDF
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, TimeoutException, NoAlertPresentException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -129,10 +130,21 @@ class MsrTab(BaseAutomationTab):
 
     # ... (start_automation, reset_ui, run_automation_logic, etc., are unchanged)
     def start_automation(self):
-        self.app.start_automation_thread(self.automation_key, self.run_automation_logic)
+        panchayat_name = self.panchayat_entry.get().strip()
+        verify_amount_str = self.verify_amount_entry.get().strip()
+        
+        self.work_key_text.configure(state="normal") # Enable to read
+        work_keys = [line.strip() for line in self.work_key_text.get("1.0", tkinter.END).strip().splitlines() if line.strip()]
+        self.work_key_text.configure(state="disabled") # Disable again
+
+        if not work_keys: self.dialogs.showerror("Input Error", "No work keys provided."); return
+        try: verify_amount = float(verify_amount_str)
+        except ValueError: self.dialogs.showerror("Input Error", "Verify Amount must be a valid number."); return
+
+        self.app.start_automation_thread(self.automation_key, self.run_automation_logic, args=(panchayat_name, verify_amount, work_keys))
         
     def reset_ui(self):
-        if messagebox.askokcancel("Reset Form?", "Clear all inputs, results, and logs?"):
+        if self.dialogs.askokcancel("Reset Form?", "Clear all inputs, results, and logs?"):
             self.panchayat_entry.delete(0, tkinter.END)
             self.verify_amount_entry.delete(0, tkinter.END); self.verify_amount_entry.insert(0, "282")
             self.work_key_text.configure(state="normal"); self.work_key_text.delete("1.0", tkinter.END); self.work_key_text.configure(state="disabled")
@@ -142,23 +154,12 @@ class MsrTab(BaseAutomationTab):
             self.app.log_message(self.log_display, "Form has been reset.")
             self.app.after(0, self.app.set_status, "Ready")
             
-    def run_automation_logic(self):
+    def run_automation_logic(self, panchayat_name, verify_amount, work_keys):
         self.app.after(0, self.set_ui_state, True)
         self.app.after(0, lambda: [self.results_tree.delete(item) for item in self.results_tree.get_children()])
         self.app.clear_log(self.log_display)
         self.app.log_message(self.log_display, "Starting MSR processing...")
         self.app.after(0, self.app.set_status, "Running MSR Payment...")
-        
-        panchayat_name = self.panchayat_entry.get().strip()
-        verify_amount_str = self.verify_amount_entry.get().strip()
-        
-        self.work_key_text.configure(state="normal") # Enable to read
-        work_keys = [line.strip() for line in self.work_key_text.get("1.0", tkinter.END).strip().splitlines() if line.strip()]
-        self.work_key_text.configure(state="disabled") # Disable again
-
-        if not work_keys: messagebox.showerror("Input Error", "No work keys provided."); self.app.after(0, self.set_ui_state, False); return
-        try: verify_amount = float(verify_amount_str)
-        except ValueError: messagebox.showerror("Input Error", "Verify Amount must be a valid number."); self.app.after(0, self.set_ui_state, False); return
 
         try:
             driver = self.app.get_driver()
@@ -169,11 +170,10 @@ class MsrTab(BaseAutomationTab):
             
             try:
                 panchayat_select_element = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.NAME, "ddlPanchayat")))
-                if not panchayat_name: messagebox.showerror("Input Error", "Panchayat name is required for Block Login."); self.app.after(0, self.set_ui_state, False); return
-                panchayat_select = Select(panchayat_select_element)
-                match = next((opt.text for opt in panchayat_select.options if panchayat_name.strip().lower() in opt.text.lower()), None)
-                if not match: raise ValueError(f"Panchayat '{panchayat_name}' not found.")
-                panchayat_select.select_by_visible_text(match)
+                if not panchayat_name: self.dialogs.showerror("Input Error", "Panchayat name is required for Block Login."); self.app.after(0, self.set_ui_state, False); return
+                option = dropdowns.find_option(dropdowns.read_options(driver, panchayat_select_element), panchayat_name, match="contains")
+                if not option: raise ValueError(f"Panchayat '{panchayat_name}' not found.")
+                match = dropdowns.select_option(driver, panchayat_select_element, value=option.value).text
                 self.app.update_history("panchayat_name", panchayat_name)
                 self.app.log_message(self.log_display, f"Successfully selected Panchayat: {match}", "success"); time.sleep(2)
             except TimeoutException: self.app.log_message(self.log_display, "Panchayat selection not found/required (GP Login). Proceeding...", "info")
@@ -189,10 +189,10 @@ class MsrTab(BaseAutomationTab):
                 # --- END MODIFICATION ---
                 self._process_single_work_code(driver, wait, work_key, verify_amount)
                 
-            if not self.app.stop_events[self.automation_key].is_set(): messagebox.showinfo("Completed", "Automation finished! Check the 'Results' tab for details.")
+            if not self.app.stop_events[self.automation_key].is_set(): self.dialogs.showinfo("Completed", "Automation finished! Check the 'Results' tab for details.")
         except Exception as e:
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", "error")
-            messagebox.showerror("MSR Error", f"An error occurred: {e}")
+            self.dialogs.showerror("MSR Error", f"An error occurred: {e}")
         finally:
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.update_status, "Automation Finished.", 1.0)
@@ -203,6 +203,8 @@ class MsrTab(BaseAutomationTab):
         Processes a single work code for MSR payment.
         BACKGROUND-SAFE UPDATE: Uses JS for inputs/clicks and Presence checks.
         """
+        server_ok = True # False if the portal (not the data) was the problem - slows the next items down
+        save_clicked = False # After this a timeout may hide a save that went through, so it is never retried
         try:
             # Dismiss alert if present
             try: driver.switch_to.alert.accept()
@@ -229,13 +231,13 @@ class MsrTab(BaseAutomationTab):
             except NoSuchElementException: pass
 
             # --- 3. Select Lists (Safe) ---
-            work_code_select = Select(wait.until(EC.presence_of_element_located((By.ID, "ddlWorkCode"))))
-            if len(work_code_select.options) <= config.MSR_CONFIG["work_code_index"]: raise IndexError("Work code not found.")
-            work_code_select.select_by_index(config.MSR_CONFIG["work_code_index"]); time.sleep(1.5)
+            work_code_select = wait.until(EC.presence_of_element_located((By.ID, "ddlWorkCode")))
+            if dropdowns.option_count(driver, work_code_select) <= config.MSR_CONFIG["work_code_index"]: raise IndexError("Work code not found.")
+            dropdowns.select_option(driver, work_code_select, index=config.MSR_CONFIG["work_code_index"]); time.sleep(1.5)
             
-            msr_select = Select(wait.until(EC.presence_of_element_located((By.ID, "ddlMsrNo"))))
-            if len(msr_select.options) <= config.MSR_CONFIG["muster_roll_index"]: raise IndexError("Muster Roll (MSR) not found.")
-            msr_select.select_by_index(config.MSR_CONFIG["muster_roll_index"]); time.sleep(1.5)
+            msr_select = wait.until(EC.presence_of_element_located((By.ID, "ddlMsrNo")))
+            if dropdowns.option_count(driver, msr_select) <= config.MSR_CONFIG["muster_roll_index"]: raise IndexError("Muster Roll (MSR) not found.")
+            dropdowns.select_option(driver, msr_select, index=config.MSR_CONFIG["muster_roll_index"]); time.sleep(1.5)
 
             # --- 4. Verify Amount ---
             wage_inputs = driver.find_elements(By.XPATH, "//input[starts-with(@name, 'wage_per_day')]")
@@ -254,6 +256,7 @@ class MsrTab(BaseAutomationTab):
             # JS Click for Save
             save_btn = wait.until(EC.presence_of_element_located((By.ID, "btnSave")))
             driver.execute_script("arguments[0].click();", save_btn)
+            save_clicked = True
             
             # Handle Alert
             WebDriverWait(driver, 10).until(EC.alert_is_present()).accept()
@@ -264,23 +267,23 @@ class MsrTab(BaseAutomationTab):
                     final_alert = driver.switch_to.alert; final_alert_text = final_alert.text.strip(); final_alert.accept()
                     if "Muster Roll Payment has been saved" in final_alert_text: self._log_result("Success", work_key, final_alert_text)
                     elif "and hence it is not saved" in final_alert_text: self._log_result("Success", work_key, "Saved (ignorable attendance error)")
-                    else: self._log_result("Failed", work_key, f"Unknown Alert: {final_alert_text}")
+                    else: self._log_result("Failed", work_key, self._after_save(f"Unknown Alert: {final_alert_text}", save_clicked))
                     outcome_found = True; break
                 except NoAlertPresentException:
                     if "Expenditure on unskilled labours exceeds sanction amount" in driver.page_source: 
-                        self._log_result("Failed", work_key, "Exceeds Labour Payment"); outcome_found = True; break
+                        self._log_result("Failed", work_key, self._after_save("Exceeds Labour Payment", save_clicked)); outcome_found = True; break
                     time.sleep(1)
             
-            if not outcome_found: self._log_result("Failed", work_key, "No final confirmation found (Timeout).")
-            
-            delay = random.uniform(config.MSR_CONFIG["min_delay"], config.MSR_CONFIG["max_delay"])
-            self.app.after(0, self.update_status, f"Waiting {delay:.1f}s...")
-            time.sleep(delay)
+            if not outcome_found: server_ok = False; self._log_result("Failed", work_key, self._after_save("No final confirmation found (Timeout).", save_clicked))
 
         except (ValueError, IndexError, NoSuchElementException, TimeoutException) as e:
-            display_msg = "MR not Filled yet." if isinstance(e, IndexError) else "Page timed out or element not found." if isinstance(e, TimeoutException) else str(e)
-            self._log_result("Failed", work_key, display_msg)
-        except Exception as e: self._log_result("Failed", work_key, f"CRITICAL ERROR: {type(e).__name__}")
+            server_ok = isinstance(e, (ValueError, IndexError))
+            display_msg = "MR not Filled yet." if isinstance(e, IndexError) else ("Page timed out after Save (it may have saved). Check the MR." if save_clicked else "Page timed out or element not found.") if isinstance(e, TimeoutException) else str(e)
+            self._log_result("Failed", work_key, self._after_save(display_msg, save_clicked))
+        except Exception as e: server_ok = False; self._log_result("Failed", work_key, self._after_save(f"CRITICAL ERROR: {type(e).__name__}", save_clicked))
+        finally:
+            self.app.rate_controller.pace(self.automation_key, driver, server_ok, self.app.stop_events[self.automation_key],
+                                          on_wait=lambda d: self.app.after(0, self.update_status, f"Waiting {d:.1f}s..."))
         
     def _log_result(self, status, work_key, msg):
         level = "success" if status.lower() == "success" else "error"
@@ -300,7 +303,7 @@ class MsrTab(BaseAutomationTab):
 
         # Ensure Panchayat name is provided for the filename
         if not panchayat_name:
-            messagebox.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.", parent=self)
+            self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name to include in the report filename.", parent=self)
             return
 
         if "CSV" in export_format:
@@ -318,9 +321,9 @@ class MsrTab(BaseAutomationTab):
 
     def _get_filtered_data_and_filepath(self, export_format):
         all_items = self.results_tree.get_children()
-        if not all_items: messagebox.showinfo("No Data", "There are no results to export."); return None, None
+        if not all_items: self.dialogs.showinfo("No Data", "There are no results to export."); return None, None
         panchayat_name = self.panchayat_entry.get().strip()
-        if not panchayat_name: messagebox.showwarning("Input Needed", "Please enter a Panchayat Name for the report title."); return None, None
+        if not panchayat_name: self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name for the report title."); return None, None
 
         filter_option = self.export_filter_menu.get()
         data_to_export = []
@@ -330,7 +333,7 @@ class MsrTab(BaseAutomationTab):
             if filter_option == "Export All": data_to_export.append(row_values)
             elif filter_option == "Success Only" and "SUCCESS" in status: data_to_export.append(row_values)
             elif filter_option == "Failed Only" and "SUCCESS" not in status: data_to_export.append(row_values)
-        if not data_to_export: messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
+        if not data_to_export: self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
 
         safe_name = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -360,10 +363,10 @@ class MsrTab(BaseAutomationTab):
             success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
             
             if success:
-                if messagebox.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
+                if self.dialogs.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
                     if sys.platform == "win32":
                         os.startfile(file_path)
                     else:
                         subprocess.call(['open', file_path])
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
\ No newline at end of file
+            self.dialogs.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
\ No newline at end of file
@@ -1,10 +1,9 @@
 # tabs/musterroll_gen_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
-import os, json, time, base64, sys, subprocess, requests, re, threading
+import os, json, time, sys, subprocess, requests, re
 from datetime import datetime
-from pypdf import PdfWriter # <-- IMPORT ADD KIYA GAYA
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -15,6 +14,8 @@ from selenium.common.exceptions import (
     UnexpectedAlertPresentException
 )
 import config
+import dropdowns
+from pdf_pipeline import capture_pdf, PdfSaveQueue
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -146,6 +147,9 @@ class MusterrollGenTab(BaseAutomationTab):
         # --- MERGE BUTTON ADDED ---
         self.merge_pdfs_button = ctk.CTkButton(results_action_frame, text="Merge Saved PDFs", command=self.merge_saved_pdfs)
         self.merge_pdfs_button.pack(side='left', padx=(0, 10))
+        self.split_merge_var = tkinter.BooleanVar(value=True)
+        self.split_merge_checkbox = ctk.CTkCheckBox(results_action_frame, text=f"Split every {config.PDF_MERGE_CONFIG['mr_volume_pages']} pages", variable=self.split_merge_var)
+        self.split_merge_checkbox.pack(side='left', padx=(0, 10))
         # --- END ---
 
         export_controls_frame = ctk.CTkFrame(results_action_frame, fg_color="transparent")
@@ -196,6 +200,7 @@ class MusterrollGenTab(BaseAutomationTab):
         self.export_format_menu.configure(state=state)
         self.export_filter_menu.configure(state=state)
         self.merge_pdfs_button.configure(state=state) # <-- ADDED
+        self.split_merge_checkbox.configure(state=state)
         if state == "normal": self._on_format_change(self.export_format_menu.get())
 
     def _load_mapping_data(self):
@@ -262,7 +267,7 @@ class MusterrollGenTab(BaseAutomationTab):
         }
 
         if not all(inputs[k] for k in ['panchayat', 'start_date', 'end_date', 'designation', 'staff']):
-            messagebox.showwarning("Input Error", "All fields are required (except Work Search Keys).")
+            self.dialogs.showwarning("Input Error", "All fields are required (except Work Search Keys).")
             return
         self._save_mapping_pair(inputs['panchayat'], inputs['staff'])
         inputs['work_codes'] = [line.strip() for line in inputs['work_codes_raw'].split('\n') if line.strip()]
@@ -287,11 +292,11 @@ class MusterrollGenTab(BaseAutomationTab):
                 failed_items.append(work_code)
         
         if not failed_items:
-            messagebox.showinfo("Retry", "No failed items found to retry.")
+            self.dialogs.showinfo("Retry", "No failed items found to retry.")
             return
 
         # 2. Confirm karo
-        if not messagebox.askyesno("Retry Failed", f"Found {len(failed_items)} failed/skipped items.\nLoad them and retry?"):
+        if not self.dialogs.askyesno("Retry Failed", f"Found {len(failed_items)} failed/skipped items.\nLoad them and retry?"):
             return
 
         # 3. Input Box Update karo
@@ -312,7 +317,7 @@ class MusterrollGenTab(BaseAutomationTab):
         self.start_automation()
         
     def reset_ui(self):
-        if messagebox.askokcancel("Reset Form?", "Clear all inputs and logs?"):
+        if self.dialogs.askokcancel("Reset Form?", "Clear all inputs and logs?"):
             self.panchayat_entry.delete(0, tkinter.END)
             self.start_date_entry.clear(); self.end_date_entry.clear()
             self.staff_entry.delete(0, tkinter.END)
@@ -372,7 +377,7 @@ class MusterrollGenTab(BaseAutomationTab):
         except Exception as e:
             error_msg = f"An unexpected error occurred while printing: {e}"
             self.app.log_message(self.log_display, error_msg, "error")
-            self.app.after(0, lambda: messagebox.showwarning("Print Error", error_msg))
+            self.app.after(0, lambda: self.dialogs.showwarning("Print Error", error_msg))
 
     # --- NEW HELPER METHOD ---
     def _get_output_dir(self, panchayat_name):
@@ -399,7 +404,7 @@ class MusterrollGenTab(BaseAutomationTab):
             return output_dir
         except Exception as e:
             self.app.log_message(self.log_display, f"Error creating output directory: {e}", "error")
-            messagebox.showerror("Directory Error", f"Could not create output directory: {e}")
+            self.dialogs.showerror("Directory Error", f"Could not create output directory: {e}")
             return None
 
     def run_automation_logic(self, inputs):
@@ -408,6 +413,9 @@ class MusterrollGenTab(BaseAutomationTab):
         self.app.log_message(self.log_display, f"Starting MR generation for: {inputs['panchayat']}")
         self.app.after(0, self.app.set_status, "Running MR Generation...")
         
+        self.pdf_queue = PdfSaveQueue()
+        self.pending_saves = []
+
         # --- PATH LOGIC UPDATED ---
         self.output_dir = self._get_output_dir(inputs['panchayat'])
         if not self.output_dir:
@@ -448,9 +456,14 @@ class MusterrollGenTab(BaseAutomationTab):
         except Exception as e:
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", "error")
             if "in str" not in str(e): 
-                messagebox.showerror("Critical Error", f"An unexpected error stopped the automation. Please check the logs for details.\n\nError: {e}")
+                self.dialogs.showerror("Critical Error", f"An unexpected error stopped the automation. Please check the logs for details.\n\nError: {e}")
         
         finally:
+            if self.pending_saves:
+                self.app.after(0, self.update_status, "Finishing PDF saves/uploads...", 1.0)
+            self.pdf_queue.close()
+            # Kept in processing order (not completion order) so merges follow the run
+            self.current_session_files.extend(path for path in (f.result() for f in self.pending_saves) if path)
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.update_status, "Automation Finished.", 1.0)
             # --- Uses self.output_dir now ---
@@ -460,19 +473,19 @@ class MusterrollGenTab(BaseAutomationTab):
     def _show_completion_dialog(self, output_dir):
         summary = f"Automation complete.\n\nSuccess: {self.success_count}\nSkipped/Failed: {self.skipped_count}"
         if self.success_count > 0 and output_dir and os.path.exists(output_dir):
-            if messagebox.askyesno("Task Finished", f"{summary}\n\nDo you want to open the output folder?"):
+            if self.dialogs.askyesno("Task Finished", f"{summary}\n\nDo you want to open the output folder?"):
                 self.app.open_folder(output_dir)
         else:
-            messagebox.showinfo("Task Finished", summary)
+            self.dialogs.showinfo("Task Finished", summary)
 
     def _validate_panchayat(self, driver, wait, panchayat_name):
         try:
             self.app.log_message(self.log_display, "Validating Panchayat name...")
             driver.get(config.MUSTER_ROLL_CONFIG["base_url"])
-            panchayat_dropdown = Select(wait.until(EC.presence_of_element_located((By.ID, "exe_agency"))))
+            panchayat_dropdown = wait.until(EC.presence_of_element_located((By.ID, "exe_agency")))
             target_panchayat = config.AGENCY_PREFIX + panchayat_name
-            if target_panchayat not in [opt.text for opt in panchayat_dropdown.options]:
-                messagebox.showerror("Validation Error", f"Panchayat name '{panchayat_name}' not found on the website. Please check for spelling mistakes.")
+            if target_panchayat not in [opt.text for opt in dropdowns.read_options(driver, panchayat_dropdown)]:
+                self.dialogs.showerror("Validation Error", f"Panchayat name '{panchayat_name}' not found on the website. Please check for spelling mistakes.")
                 return False
             self.app.log_message(self.log_display, "Panchayat name is valid.", "success")
             return True
@@ -485,8 +498,7 @@ class MusterrollGenTab(BaseAutomationTab):
             self.app.log_message(self.log_display, "Auto Mode: Fetching available work codes...")
             try:
                 Select(driver.find_element(By.ID, "exe_agency")).select_by_visible_text(config.AGENCY_PREFIX + inputs['panchayat'])
-                wait.until(lambda d: len(Select(d.find_element(By.ID, "ddlWorkCode")).options) > 1)
-                items = [opt.text for opt in Select(driver.find_element(By.ID, "ddlWorkCode")).options if opt.get_attribute("value")]
+                items = [opt.text for opt in dropdowns.wait_for_options(driver, "ddlWorkCode") if opt.value]
                 self.app.log_message(self.log_display, f"Found {len(items)} available work codes.")
                 return items
             except Exception as e:
@@ -529,17 +541,12 @@ class MusterrollGenTab(BaseAutomationTab):
             # Explicit wait for options to load
             wait.until(EC.presence_of_element_located((By.XPATH, "//select[@id='ddlstaff']/option[position()>1]")))
             
-            staff_dropdown = Select(driver.find_element(By.ID, "ddlstaff"))
-            
             # Case-insensitive match for staff
-            staff_found = False
-            for opt in staff_dropdown.options:
-                if inputs['staff'].lower() == opt.text.lower():
-                    staff_dropdown.select_by_visible_text(opt.text)
-                    staff_found = True
-                    break
+            staff_options = dropdowns.read_options(driver, "ddlstaff")
+            staff_option = next((opt for opt in staff_options if inputs['staff'].lower() == opt.text.lower()), None)
+            if staff_option: dropdowns.select_option(driver, "ddlstaff", value=staff_option.value, options=staff_options)
             
-            if not staff_found:
+            if not staff_option:
                 raise ValueError(f"Staff name '{inputs['staff']}' not found. Check spelling.")
             
             self.app.log_message(self.log_display, "   - Submitting form...")
@@ -571,23 +578,16 @@ class MusterrollGenTab(BaseAutomationTab):
                 return
             
             self.app.log_message(self.log_display, "   - Muster Roll is valid. Generating output...")
-            pdf_path = self._save_mr_as_pdf(driver, full_work_code_text, output_dir, inputs['orientation'], inputs['scale'])
-            
-            log_detail = f"Saved as {os.path.basename(pdf_path)}" if pdf_path else "PDF Save Failed"
-            
-            if pdf_path:
-                self.current_session_files.append(pdf_path)
-                if inputs.get('save_to_cloud'):
-                    self.app.log_message(self.log_display, "   - Uploading to cloud...")
-                    if self._upload_to_cloud(pdf_path, inputs['panchayat']):
-                        log_detail += " & Cloud Uploaded"
-                    else:
-                        log_detail += " (Cloud Failed)"
-
-            if inputs['output_action'] == "Print" and pdf_path:
-                self._print_file(pdf_path)
-
-            self._log_result(item, "Success" if pdf_path else "Failed", log_detail)
+            # Decode/write/upload happen on the save queue; the next work code starts right away
+            # Re-runs print a new PDF (new timestamp, new file name), so the roll itself is the ledger key
+            roll_key = f"mr:{inputs['panchayat']}:{full_work_code_text}:{inputs['start_date']}:{inputs['end_date']}"
+            upload = (lambda path: self._upload_to_cloud(path, inputs['panchayat'], roll_key)) if inputs.get('save_to_cloud') else None
+            future = self._save_mr_as_pdf(driver, full_work_code_text, output_dir, inputs['orientation'], inputs['scale'],
+                                          lambda path, extra: self._on_mr_saved(item, inputs, path, extra), upload)
+            if future:
+                self.pending_saves.append(future)
+            else:
+                self._log_result(item, "Failed", "PDF Save Failed")
             session_skip_list.add(full_work_code_text)
 
         except Exception as e:
@@ -596,23 +596,35 @@ class MusterrollGenTab(BaseAutomationTab):
             self._log_result(item, "Failed", error_msg)
 
 
-    def _save_mr_as_pdf(self, driver, full_work_code, output_dir, orientation, scale):
-        try:
-            safe_work_code = full_work_code.split('/')[-1][-6:]
-            base_filename = safe_work_code
-            extension = ".pdf"
-            counter = 1
-            pdf_filename = f"{base_filename}{extension}"
-            save_path = os.path.join(output_dir, pdf_filename)
+    def _on_mr_saved(self, item, inputs, pdf_path, upload_result):
+        """Save-queue callback: reports the finished PDF (and its upload) in the results tree."""
+        if not pdf_path:
+            self.app.log_message(self.log_display, f"Error saving PDF for '{item}': {upload_result}", "error")
+            self._log_result(item, "Failed", "PDF Save Failed")
+            return
 
-            while os.path.exists(save_path):
-                pdf_filename = f"{base_filename} ({counter}){extension}"
-                save_path = os.path.join(output_dir, pdf_filename)
-                counter += 1
+        log_detail = f"Saved as {os.path.basename(pdf_path)}"
+        if inputs.get('save_to_cloud'):
+            if upload_result == "duplicate":
+                self.app.log_message(self.log_display, f"   - {os.path.basename(pdf_path)}: this muster roll is already in the cloud, upload skipped.")
+                log_detail += " & Already in Cloud"
+            elif upload_result:
+                log_detail += " & Cloud Uploaded"
+            else:
+                log_detail += " (Cloud Failed)"
+
+        if inputs['output_action'] == "Print":
+            self._print_file(pdf_path)
+
+        self._log_result(item, "Success", log_detail)
 
+    def _save_mr_as_pdf(self, driver, full_work_code, output_dir, orientation, scale, callback, after_save=None):
+        """Prints the MR and queues it for saving. Returns the save Future, or None if printing failed."""
+        try:
+            safe_work_code = full_work_code.split('/')[-1][-6:]
             is_landscape = (orientation == "Landscape")
             pdf_scale = scale / 100.0
-            pdf_data_base64 = None
+            pdf_chunks = None
 
             # --- CSS for Orientation ---
             if is_landscape:
@@ -646,7 +658,7 @@ class MusterrollGenTab(BaseAutomationTab):
 
                 self.app.log_message(self.log_display, "   - Using Firefox's print command...")
                 self.app.log_message(self.log_display, "   - Note: PDF Scale setting is ignored for Firefox.", "warning")
-                pdf_data_base64 = driver.print_page()
+                pdf_chunks = capture_pdf(driver, 'firefox')
 
             elif self.app.active_browser == 'chrome':
                 self.app.log_message(self.log_display, "   - Using Chrome's advanced print command (CDP)...")
@@ -669,14 +681,10 @@ class MusterrollGenTab(BaseAutomationTab):
                     "marginBottom": 0.5,               # <-- Increased slightly to fit footer
                     "marginLeft": 0.4, "marginRight": 0.4
                 }
-                result = driver.execute_cdp_cmd("Page.printToPDF", print_options)
-                pdf_data_base64 = result['data']
-
-            if pdf_data_base64:
-                pdf_data = base64.b64decode(pdf_data_base64)
-                with open(save_path, 'wb') as f:
-                    f.write(pdf_data)
-                return save_path
+                pdf_chunks = capture_pdf(driver, 'chrome', print_options)
+
+            if pdf_chunks:
+                return self.pdf_queue.submit(pdf_chunks, output_dir, safe_work_code, callback, after_save)
             else:
                 self.app.log_message(self.log_display, "Error: PDF data was not generated by the browser.", "error")
                 return None
@@ -699,16 +707,14 @@ class MusterrollGenTab(BaseAutomationTab):
             if is_auto_mode:
                 # Auto Mode: Wait for dropdown presence (not visibility) and options
                 wait.until(EC.presence_of_element_located(work_code_dropdown_locator))
-                wait.until(lambda d: len(Select(d.find_element(*work_code_dropdown_locator)).options) > 1)
-                
-                work_code_dropdown = Select(driver.find_element(*work_code_dropdown_locator))
+                work_options = dropdowns.wait_for_options(driver, "ddlWorkCode")
                 
-                # Iterate to find matching text
-                found_option = next((opt for opt in work_code_dropdown.options if opt.text == item and opt.get_attribute("value")), None)
+                # Matching text, found locally in one read of the list
+                found_option = next((opt for opt in work_options if opt.text == item and opt.value), None)
 
                 if found_option:
                     full_work_code_text = found_option.text
-                    work_code_dropdown.select_by_visible_text(full_work_code_text)
+                    dropdowns.select_option(driver, "ddlWorkCode", value=found_option.value, options=work_options)
                     self.app.log_message(self.log_display, f"   - Found and selected: {full_work_code_text}")
                     return full_work_code_text
                 else:
@@ -738,15 +744,13 @@ class MusterrollGenTab(BaseAutomationTab):
                 
                 # Ab naye dropdown ke aane ka wait karein
                 wait.until(EC.presence_of_element_located(work_code_dropdown_locator))
-                wait.until(lambda d: len(Select(d.find_element(*work_code_dropdown_locator)).options) > 1)
+                work_options = dropdowns.wait_for_options(driver, "ddlWorkCode")
                 # --- SLOW NET FIX END ---
                 
-                work_code_dropdown = Select(driver.find_element(*work_code_dropdown_locator))
-                
-                found_option = next((opt for opt in work_code_dropdown.options if search_key in opt.text and opt.get_attribute("value")), None)
+                found_option = next((opt for opt in work_options if search_key in opt.text and opt.value), None)
                 if found_option:
                     full_work_code_text = found_option.text
-                    work_code_dropdown.select_by_visible_text(full_work_code_text)
+                    dropdowns.select_option(driver, "ddlWorkCode", value=found_option.value, options=work_options)
                     self.app.log_message(self.log_display, f"   - Found and selected: {full_work_code_text}")
                     return full_work_code_text
                 else:
@@ -792,43 +796,34 @@ class MusterrollGenTab(BaseAutomationTab):
         
         self.app.after(0, lambda: self.results_tree.insert("", "end", values=values, tags=tags))
 
-    def _upload_to_cloud(self, file_path, panchayat_name):
-        """Uploads a given file to the user's cloud storage via the API."""
+    def _upload_to_cloud(self, file_path, panchayat_name, ledger_key=None):
+        """
+        Uploads a given file to the user's cloud storage via the API.
+        Returns "uploaded", "duplicate" (this roll was uploaded before) or None on failure.
+        """
         if not self.app.license_info.get('key'):
             self.app.log_message(self.log_display, "   - Cloud Upload Skipped: No license key found.", "warning")
-            return False
+            return None
             
         headers = {'Authorization': f"Bearer {self.app.license_info['key']}"}
-        url = f"{config.LICENSE_SERVER_URL}/files/api/upload"
         filename = os.path.basename(file_path)
 
         try:
-            with open(file_path, 'rb') as f:
-                files = {'file': (filename, f, 'application/pdf')}
-                
-                date_folder = datetime.now().strftime('%Y-%m-%d')
-                safe_panchayat_name = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
-                
-                relative_path = f'Muster_Rolls/{date_folder}/{safe_panchayat_name}/{filename}'
-                
-                data = {
-                    'parent_id': '', 
-                    'relative_path': relative_path
-                }
-                
-                response = requests.post(url, headers=headers, files=files, data=data, timeout=120)
+            date_folder = datetime.now().strftime('%Y-%m-%d')
+            safe_panchayat_name = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
+            relative_path = f'Muster_Rolls/{date_folder}/{safe_panchayat_name}/{filename}'
 
-            if response.status_code == 201:
-                return True
-            else:
-                self.app.log_message(self.log_display, f"   - Cloud upload failed with status {response.status_code}: {response.text}", "error")
-                return False
+            with self.app.perf_monitor.span("upload", self.automation_key):
+                return self.app.transfer_manager.upload_file(file_path, relative_path, '', headers, content_type='application/pdf', ledger_key=ledger_key)
+        except requests.exceptions.HTTPError as e:
+            self.app.log_message(self.log_display, f"   - Cloud upload failed: {e}", "error")
+            return None
         except requests.exceptions.RequestException as e:
             self.app.log_message(self.log_display, f"   - A connection error occurred during cloud upload: {e}", "error")
-            return False
+            return None
         except Exception as e:
             self.app.log_message(self.log_display, f"   - An unexpected error occurred during cloud upload: {e}", "error")
-            return False
+            return None
 
     def export_report(self):
         export_format = self.export_format_menu.get()
@@ -847,9 +842,9 @@ class MusterrollGenTab(BaseAutomationTab):
             self._handle_pdf_export(report_data, report_headers, col_widths, file_path)
 
     def _get_filtered_data_and_filepath(self, export_format):
-        if not self.results_tree.get_children(): messagebox.showinfo("No Data", "No results to export."); return None, None
+        if not self.results_tree.get_children(): self.dialogs.showinfo("No Data", "No results to export."); return None, None
         panchayat_name = self.panchayat_entry.get().strip()
-        if not panchayat_name: messagebox.showwarning("Input Needed", "Panchayat Name is required for report title."); return None, None
+        if not panchayat_name: self.dialogs.showwarning("Input Needed", "Panchayat Name is required for report title."); return None, None
         
         filter_option = self.export_filter_menu.get()
         data_to_export = []
@@ -859,7 +854,7 @@ class MusterrollGenTab(BaseAutomationTab):
             if filter_option == "Export All": data_to_export.append(row_values)
             elif filter_option == "Success Only" and "SUCCESS" in status: data_to_export.append(row_values)
             elif filter_option == "Failed Only" and "SUCCESS" not in status: data_to_export.append(row_values)
-        if not data_to_export: messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
+        if not data_to_export: self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
 
         safe_name = "".join(c for c in panchayat_name if c.isalnum() or c in (' ', '_')).rstrip()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -872,7 +867,7 @@ class MusterrollGenTab(BaseAutomationTab):
         title = f"Muster Roll Generation Report: {self.panchayat_entry.get().strip()}"
         report_date = datetime.now().strftime('%d %b %Y')
         success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
-        if success and messagebox.askyesno("Success", f"PDF Report saved to:\n{file_path}\n\nDo you want to open it?"):
+        if success and self.dialogs.askyesno("Success", f"PDF Report saved to:\n{file_path}\n\nDo you want to open it?"):
             if sys.platform == "win32": os.startfile(file_path)
             else: subprocess.call(['open', file_path])
 
@@ -885,7 +880,7 @@ class MusterrollGenTab(BaseAutomationTab):
         
         if not pdf_files:
             self.app.log_message(self.log_display, "No PDFs generated in this session to merge.", "warning")
-            messagebox.showinfo("No Files", "No MRs have been successfully generated in this cycle yet.\nRun the automation first.", parent=self)
+            self.dialogs.showinfo("No Files", "No MRs have been successfully generated in this cycle yet.\nRun the automation first.", parent=self)
             return
             
         self.app.log_message(self.log_display, f"Merging {len(pdf_files)} files generated in this session.")
@@ -913,42 +908,40 @@ class MusterrollGenTab(BaseAutomationTab):
                 output_path = os.path.join(merge_output_dir, file_name)
                 count += 1
         except Exception as e:
-            messagebox.showerror("Path Error", f"Could not create merge output path: {e}", parent=self)
+            self.dialogs.showerror("Path Error", f"Could not create merge output path: {e}", parent=self)
             return
 
         # Run merge in a separate thread
         self.app.start_automation_thread(
             "pdf_merger_mr", 
             self._run_merge_logic, 
-            args=(pdf_files, output_path)
+            args=(pdf_files, output_path, config.PDF_MERGE_CONFIG["mr_volume_pages"] if self.split_merge_var.get() else 0)
         )
 
-    def _run_merge_logic(self, file_list, output_path):
+    def _run_merge_logic(self, file_list, output_path, max_pages=0):
         """The actual PDF merging logic that runs in a thread."""
         self.app.after(0, self.set_ui_state, True)
         self.app.log_message(self.log_display, f"Merging {len(file_list)} files...")
         self.app.after(0, self.app.set_status, "Merging PDFs...")
         try:
-            merger = PdfWriter()
-            for pdf_path in file_list:
-                if self.app.stop_events.get("pdf_merger_mr", threading.Event()).is_set():
-                    self.app.log_message(self.log_display, "Merge cancelled.", "warning")
-                    merger.close()
-                    return
-                merger.append(pdf_path)
-            
-            with open(output_path, "wb") as f_out:
-                merger.write(f_out)
-            merger.close()
+            outputs = self.run_pdf_merge(file_list, output_path, stop_key="pdf_merger_mr", max_pages=max_pages)
+            if outputs is None:
+                self.app.log_message(self.log_display, "Merge cancelled.", "warning")
+                return
             
+            for path in outputs:
+                self.app.log_message(self.log_display, f"Written: {path}")
             self.app.log_message(self.log_display, "Merge complete!", "success")
-            messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{output_path}", parent=self)
-            if messagebox.askyesno("Open Location?", "Open the Merged PDFs folder?", parent=self):
+            if len(outputs) == 1:
+                self.dialogs.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{outputs[0]}", parent=self)
+            else:
+                self.dialogs.showinfo("Success", f"Successfully merged {len(file_list)} files into {len(outputs)} parts:\n{os.path.dirname(output_path)}", parent=self)
+            if self.dialogs.askyesno("Open Location?", "Open the Merged PDFs folder?", parent=self):
                 self.app.open_folder(os.path.dirname(output_path))
                 
         except Exception as e:
             self.app.log_message(self.log_display, f"Error during merge: {e}", "error")
-            messagebox.showerror("Merge Error", f"An error occurred: {e}", parent=self)
+            self.dialogs.showerror("Merge Error", f"An error occurred: {e}", parent=self)
         finally:
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.app.set_status, "Ready")
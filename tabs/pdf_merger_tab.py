@@ -3,7 +3,6 @@ import tkinter
 from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
 import os
-from pypdf import PdfWriter
 from datetime import datetime  # <-- ADD THIS IMPORT
 
 from .base_tab import BaseAutomationTab
@@ -90,6 +89,16 @@ class PdfMergerTab(BaseAutomationTab):
         self.file_name_entry.grid(row=0, column=1, sticky="ew", padx=(0, 15), pady=10)
         # --- END NEW ---
 
+        # --- Optional split of large outputs (blank = single file) ---
+        split_frame = ctk.CTkFrame(output_name_frame, fg_color="transparent")
+        split_frame.grid(row=1, column=0, columnspan=2, sticky="w", padx=15, pady=(0, 10))
+        ctk.CTkLabel(split_frame, text="Split every (pages):").pack(side="left")
+        self.max_pages_entry = ctk.CTkEntry(split_frame, width=80, placeholder_text="e.g., 500")
+        self.max_pages_entry.pack(side="left", padx=(5, 15))
+        ctk.CTkLabel(split_frame, text="Max size per file (MB):").pack(side="left")
+        self.max_mb_entry = ctk.CTkEntry(split_frame, width=80, placeholder_text="e.g., 25")
+        self.max_mb_entry.pack(side="left", padx=5)
+
         # --- Action Buttons ---
         action_frame = self._create_action_buttons(parent_frame=self)
         action_frame.grid(row=3, column=0, sticky="ew", pady=10, padx=10) # <-- UPDATED: row=3
@@ -101,8 +110,6 @@ class PdfMergerTab(BaseAutomationTab):
         notebook = ctk.CTkTabview(self)
         notebook.grid(row=4, column=0, sticky="nsew", padx=10, pady=(0, 10)) # <-- UPDATED: row=4
         self._create_log_and_status_area(parent_notebook=notebook)
-        # We don't need the progress bar for this fast task
-        self.progress_bar.pack_forget()
 
     def set_ui_state(self, running: bool):
         # Use the base class method to handle Start, Stop, Reset
@@ -115,6 +122,8 @@ class PdfMergerTab(BaseAutomationTab):
         self.remove_button.configure(state=state)
         self.file_listbox.configure(state=state)
         self.file_name_entry.configure(state=state) # <-- ADD THIS
+        self.max_pages_entry.configure(state=state)
+        self.max_mb_entry.configure(state=state)
 
     def select_files(self):
         files = filedialog.askopenfilenames(
@@ -171,6 +180,8 @@ class PdfMergerTab(BaseAutomationTab):
             self.selected_files.clear()
             self.update_listbox()
             self.file_name_entry.delete(0, tkinter.END) # <-- ADD THIS
+            self.max_pages_entry.delete(0, tkinter.END)
+            self.max_mb_entry.delete(0, tkinter.END)
             self.app.clear_log(self.log_display)
             self.update_status("Ready", 0.0)
             self.app.log_message(self.log_display, "File list and name cleared.")
@@ -216,6 +227,13 @@ class PdfMergerTab(BaseAutomationTab):
             messagebox.showwarning("Input Required", "Please enter an output file name (e.g., Kasraydih).", parent=self)
             return
 
+        try:
+            max_pages = int(self.max_pages_entry.get().strip() or 0)
+            max_mb = float(self.max_mb_entry.get().strip() or 0)
+        except ValueError:
+            messagebox.showwarning("Invalid Split", "Split pages and max size must be numbers (leave blank for a single file).", parent=self)
+            return
+
         # --- UPDATED: Generate path automatically ---
         output_path = self._get_output_path(base_name)
         
@@ -226,38 +244,29 @@ class PdfMergerTab(BaseAutomationTab):
         self.app.start_automation_thread(
             self.automation_key, 
             self.run_automation_logic, 
-            args=(self.selected_files.copy(), output_path)
+            args=(self.selected_files.copy(), output_path, max_pages, max_mb)
         )
         
-    def run_automation_logic(self, file_list, output_path):
+    def run_automation_logic(self, file_list, output_path, max_pages=0, max_mb=0):
         self.app.after(0, self.set_ui_state, True)
         self.app.clear_log(self.log_display)
         self.app.log_message(self.log_display, f"Starting merge of {len(file_list)} files...")
         self.app.after(0, self.app.set_status, "Merging PDFs...")
 
         try:
-            merger = PdfWriter()
-            
-            for i, pdf_path in enumerate(file_list):
-                if self.app.stop_events[self.automation_key].is_set():
-                    self.app.log_message(self.log_display, "Merge cancelled.", "warning")
-                    merger.close()
-                    return
+            outputs = self.run_pdf_merge(file_list, output_path, max_pages=max_pages, max_mb=max_mb)
+            if outputs is None:
+                self.app.log_message(self.log_display, "Merge cancelled.", "warning")
+                return
 
-                self.app.log_message(self.log_display, f"Adding file {i+1}/{len(file_list)}: {os.path.basename(pdf_path)}")
-                self.app.after(0, self.update_status, f"Adding file {i+1}/{len(file_list)}")
-                merger.append(pdf_path)
-            
-            if self.app.stop_events[self.automation_key].is_set(): return
-
-            self.app.log_message(self.log_display, f"Writing to output file: {output_path}")
-            with open(output_path, "wb") as f_out:
-                merger.write(f_out)
-            
-            merger.close()
-            
+            for path in outputs:
+                self.app.log_message(self.log_display, f"Written: {path}")
             self.app.log_message(self.log_display, "Merge complete!", "success")
-            messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{output_path}", parent=self)
+            self.app.after(0, self.update_status, "Merge complete", 1.0)
+            if len(outputs) == 1:
+                messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into:\n{outputs[0]}", parent=self)
+            else:
+                messagebox.showinfo("Success", f"Successfully merged {len(file_list)} files into {len(outputs)} parts:\n{os.path.dirname(output_path)}", parent=self)
             
             if messagebox.askyesno("Open Location?", "Do you want to open the folder containing the merged file?", parent=self):
                 self.app.open_folder(os.path.dirname(output_path))
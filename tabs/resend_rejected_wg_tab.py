@@ -10,6 +10,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -141,8 +142,7 @@ class ResendRejectedWgTab(BaseAutomationTab):
             self.app.log_message(self.log_display, "Waiting for Panchayat list to populate...")
             wait.until(EC.presence_of_element_located((By.XPATH, "//select[@id='ctl00_ContentPlaceHolder1_ddlpanch']/option[position()>1]")))
 
-            panchayat_dropdown_element = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlpanch")
-            panchayat_options = [opt.text for opt in Select(panchayat_dropdown_element).options if '--Select' not in opt.text]
+            panchayat_options = [opt.text for opt in dropdowns.read_options(driver, "ctl00_ContentPlaceHolder1_ddlpanch") if '--Select' not in opt.text]
             
             panchayats_to_process = []
             if inputs['process_all']:
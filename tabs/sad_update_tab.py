@@ -7,9 +7,10 @@ import os, time, csv, re
 import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
+import dropdowns
 from .base_tab import BaseAutomationTab
 
 class SADUpdateStatusTab(BaseAutomationTab):
@@ -382,15 +383,10 @@ class SADUpdateStatusTab(BaseAutomationTab):
                         select_elem = short_wait.until(EC.presence_of_element_located((By.TAG_NAME, "select")))
                         
                         # Dropdown found -> Select value
-                        select_obj = Select(select_elem)
+                        options = dropdowns.read_options(driver, select_elem)
                         
-                        option_found = False
-                        for opt in select_obj.options:
-                            if opt.get_attribute("value") == action_val:
-                                option_found = True; break
-                        
-                        if option_found:
-                            select_obj.select_by_value(action_val)
+                        if any(opt.value == action_val for opt in options):
+                            dropdowns.select_option(driver, select_elem, value=action_val, options=options)
                         else:
                             self.log(f"--> Action Unavailable (Val: {action_val})")
                             self.add_result(search_term, "Skipped", "Option missing")
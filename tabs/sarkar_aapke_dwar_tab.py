@@ -10,6 +10,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+import dropdowns
 from .base_tab import BaseAutomationTab
 
 class SarkarAapkeDwarTab(BaseAutomationTab):
@@ -423,14 +424,12 @@ class SarkarAapkeDwarTab(BaseAutomationTab):
                     continue
 
                 try:
-                    svc_select = Select(wait.until(EC.presence_of_element_located((By.NAME, "schemeService"))))
+                    svc_el = wait.until(EC.presence_of_element_located((By.NAME, "schemeService"))); svc_select = Select(svc_el)
                     try: svc_select.select_by_visible_text(inputs['service'])
                     except:
-                        found = False
-                        for opt in svc_select.options:
-                            if inputs['service'].lower() in opt.text.lower():
-                                svc_select.select_by_visible_text(opt.text); found = True; break
-                        if not found:
+                        opt = dropdowns.find_option(dropdowns.read_options(driver, svc_el), inputs['service'], match="contains")
+                        if opt: svc_select.select_by_visible_text(opt.text)
+                        else:
                             self._log_result(applicant_name, final_scheme_remark, "Failed", "Service Error")
                             continue
                 except: pass
@@ -521,18 +520,17 @@ class SarkarAapkeDwarTab(BaseAutomationTab):
                         except: time.sleep(2); continue
 
                         time.sleep(1)
-                        svc_select = Select(driver.find_element(By.NAME, "schemeService"))
+                        svc_el = driver.find_element(By.NAME, "schemeService"); svc_select = Select(svc_el)
                         
                         for _ in range(10):
-                            if len(svc_select.options) > 1: break
+                            if dropdowns.option_count(driver, svc_el) > 1: break
                             time.sleep(0.5)
                         
                         try:
                             try: svc_select.select_by_visible_text(inputs['service'])
                             except:
-                                for opt in svc_select.options:
-                                    if inputs['service'].lower() in opt.text.lower():
-                                        svc_select.select_by_visible_text(opt.text); break
+                                opt = dropdowns.find_option(dropdowns.read_options(driver, svc_el), inputs['service'], match="contains")
+                                if opt: svc_select.select_by_visible_text(opt.text)
                         except: pass
                         
                         if inputs['scheme_remarks']: self._safe_send_keys(driver, "schemeRemarks", inputs['scheme_remarks'])
@@ -16,6 +16,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -362,14 +363,10 @@ class SchemeClosingTab(BaseAutomationTab):
             wait.until(EC.staleness_of(wc_input))
 
             work_dropdown_element = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_ddlworkcode")))
-            work_dropdown = Select(work_dropdown_element)
-            option_found = False
-            for option in work_dropdown.options:
-                if work_code in option.get_attribute("value"):
-                    work_dropdown.select_by_value(option.get_attribute("value"))
-                    option_found = True
-                    break
-            if not option_found: return "Failed", f"Work code {work_code} not found."
+            work_options = dropdowns.read_options(driver, work_dropdown_element)
+            option = next((o for o in work_options if work_code in o.value), None)
+            if not option: return "Failed", f"Work code {work_code} not found."
+            dropdowns.select_option(driver, work_dropdown_element, value=option.value, options=work_options)
             wait.until(EC.staleness_of(work_dropdown_element))
             
             self.app.log_message(self.log_display, "   - Page 1: Filling completion details...")
@@ -4,11 +4,12 @@ from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
 import time, csv, sys, os, subprocess, re  # <-- ADD 're'
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException
 from datetime import datetime
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 
 class UpdateEstimateTab(BaseAutomationTab):
@@ -174,8 +175,7 @@ class UpdateEstimateTab(BaseAutomationTab):
             driver.execute_script("arguments[0].onchange();", search_box)
             
             work_dropdown_element = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlworkName")))
-            wait.until(lambda d: len(Select(d.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlworkName")).options) > 1)
-            Select(work_dropdown_element).select_by_index(1)
+            dropdowns.select_option(driver, work_dropdown_element, index=1, options=dropdowns.wait_for_options(driver, "ctl00_ContentPlaceHolder1_ddlworkName"))
 
             outcome_box = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_Txtest_outcome")))
             outcome_box.clear()
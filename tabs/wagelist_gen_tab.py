@@ -1,22 +1,45 @@
 # tabs/wagelist_gen_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
-import time, os, sys, subprocess
+import os, sys, subprocess
 import re  # <-- IMPORT ADDED
-import base64 # <-- IMPORT ADDED
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.print_page_options import PrintOptions
 import sentry_sdk  # <-- IMPORT ADDED
 import config
+import dropdowns
+from pdf_pipeline import capture_pdf, PdfSaveQueue
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
+# Work code (3rd column), checkbox and row key of every pending row, read in one round trip.
+# The key is the work code and the cells after it (MSR no., dates), one per MSR row: the serial
+# number in front is renumbered and the checkbox ids shift whenever generated rows drop off the list
+_PENDING_ROWS_JS = """
+var t = document.getElementById('ctl00_ContentPlaceHolder1_wagelist_msr');
+if (!t) return null;
+var out = [];
+t.querySelectorAll('tr').forEach(function (tr) {
+    var tds = tr.querySelectorAll('td'), cb = tr.querySelector('input[type=checkbox]');
+    if (tds.length < 3 || !cb) return;
+    var key = Array.prototype.slice.call(tds, 2).filter(function (td) { return !td.querySelector('input'); })
+        .map(function (td) { return td.innerText.trim(); }).join('|');
+    out.push([tds[2].innerText.trim(), cb, key]);
+});
+return out;
+"""
+# Clicks (not .checked) so the page's own handlers run
+_SELECT_ROWS_JS = """
+arguments[0].forEach(function (cb) { if (!cb.checked) cb.click(); });
+arguments[1].forEach(function (cb) { if (cb.checked) cb.click(); });
+"""
+
 class WagelistGenTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="gen")
@@ -103,7 +126,7 @@ class WagelistGenTab(BaseAutomationTab):
         if state == "normal": self._on_format_change(self.export_format_menu.get())
 
     def reset_ui(self):
-        if messagebox.askokcancel("Reset Form?", "Are you sure?"):
+        if self.dialogs.askokcancel("Reset Form?", "Are you sure?"):
             self.agency_entry.delete(0, tkinter.END)
             self.save_pdf_var.set("off") # <-- ADDED
             self.send_to_sender_var.set("on")
@@ -115,11 +138,12 @@ class WagelistGenTab(BaseAutomationTab):
 
     def start_automation(self):
         agency_name_part = self.agency_entry.get().strip()
-        if not agency_name_part: messagebox.showwarning("Input Error", "Please enter an Agency name."); return
+        if not agency_name_part: self.dialogs.showwarning("Input Error", "Please enter an Agency name."); return
         self.app.update_history("panchayat_name", agency_name_part)
-        self.app.start_automation_thread(self.automation_key, self.run_automation_logic, args=(agency_name_part,))
+        self.app.start_automation_thread(self.automation_key, self.run_automation_logic,
+                                         args=(agency_name_part, self.save_pdf_var.get() == "on", self.send_to_sender_var.get() == "on"))
 
-    def run_automation_logic(self, agency_name_part):
+    def run_automation_logic(self, agency_name_part, save_pdf=False, send_to_sender=False):
         """Runs the wagelist generation logic (Background Safe)."""
         self.app.after(0, self.set_ui_state, True)
         self.app.clear_log(self.log_display)
@@ -127,7 +151,8 @@ class WagelistGenTab(BaseAutomationTab):
         self.app.log_message(self.log_display, f"Starting wagelist generation for: {agency_name_part}")
         self.app.after(0, self.app.set_status, "Running Wagelist Generation...")
         
-        generated_wagelists = [] 
+        generated_wagelists = self._generated_wagelists = []
+        self.pdf_queue = PdfSaveQueue()
 
         try:
             driver = self.app.get_driver()
@@ -135,7 +160,7 @@ class WagelistGenTab(BaseAutomationTab):
             wait = WebDriverWait(driver, 20)
             
             output_dir = None
-            if self.save_pdf_var.get() == "on":
+            if save_pdf:
                 try:
                     safe_agency_name = "".join(c for c in agency_name_part if c.isalnum() or c in (' ', '_')).rstrip()
                     folder_name = config.WAGELIST_GEN_CONFIG.get('output_folder_name', 'NREGABot_WL_Output')
@@ -146,126 +171,74 @@ class WagelistGenTab(BaseAutomationTab):
                     self.app.after(0, lambda: self.save_pdf_var.set("off"))
                     output_dir = None
 
-            total_errors_to_skip = 0
+            # Rows that failed this run, never retried (generated rows leave the pending list by themselves)
+            failed_rows, generated_count, failed_count = set(), 0, 0
+            batch_size = max(1, int(config.WAGELIST_GEN_CONFIG.get("batch_size", 1)))
+            total, on_list_page = None, False
             while not self.app.stop_events[self.automation_key].is_set():
-                status_msg = "Navigating and selecting agency..."
-                self.app.after(0, self.app.set_status, status_msg)
-                
-                driver.get(config.WAGELIST_GEN_CONFIG["base_url"])
-                agency_select_element = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_exe_agency')))
-                select = Select(agency_select_element)
-                full_agency_name = config.AGENCY_PREFIX + agency_name_part
-                
-                match_text = next((opt.text for opt in select.options if opt.text.strip() == full_agency_name), None)
-                if not match_text:
-                    self.app.log_message(self.log_display, f"No pending wagelists found for '{full_agency_name}'. Process complete.", "info")
-                    break
-                
-                select.select_by_visible_text(match_text)
-                self.app.log_message(self.log_display, f"Selected agency: {match_text}", "success"); time.sleep(1)
-                
-                # --- FIX: JS Click for Proceed Button ---
-                proceed_button = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_go')))
-                driver.execute_script("arguments[0].click();", proceed_button)
-                
-                try:
-                    wagelist_table = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_wagelist_msr")))
-                    rows = wagelist_table.find_elements(By.XPATH, ".//tr[td]")
-                    if not rows or total_errors_to_skip >= len(rows): 
-                        self.app.log_message(self.log_display, "No more wagelists to process.", "info")
-                        break
-                        
-                    row_to_process = rows[total_errors_to_skip]
-                    
-                    try: 
-                        checkbox = row_to_process.find_element(By.XPATH, ".//input[@type='checkbox']")
-                        # Use innerText for background reading
-                        tds = row_to_process.find_elements(By.TAG_NAME, "td")
-                        if len(tds) < 3:
-                            total_errors_to_skip += 1
-                            continue
-                        work_code = tds[2].get_attribute("innerText").strip()
-                    except NoSuchElementException: 
-                        break
-
-                    status_msg = f"Processing {total_errors_to_skip + 1}/{len(rows)}: {work_code}"
-                    self.app.after(0, self.app.set_status, status_msg)
-                    self.app.log_message(self.log_display, f"Processing row {total_errors_to_skip + 1} (Work Code: {work_code})")
-                    
-                    # --- FIX: JS Click for Checkbox ---
-                    if not checkbox.is_selected(): 
-                        driver.execute_script("arguments[0].click();", checkbox)
-                    
-                    try:
-                        # --- FIX: JS Click for Generate Button ---
-                        gen_btn = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_btn_go')))
-                        driver.execute_script("arguments[0].click();", gen_btn)
-                        
-                        wait.until(EC.any_of(
-                            EC.url_changes(config.WAGELIST_GEN_CONFIG["base_url"]), 
-                            EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_lblmsg"))
-                        ))
-                        
-                        if "view_wagelist.aspx" in driver.current_url:
-                            parsed_url = urlparse(driver.current_url); query_params = parse_qs(parsed_url.query)
-                            wagelist_no = query_params.get('Wage_Listno', ['N/A'])[0]
-                            
-                            if wagelist_no != 'N/A': generated_wagelists.append(wagelist_no)
-                            
-                            pdf_save_detail = ""
-                            if output_dir and wagelist_no != 'N/A':
-                                pdf_path = self._save_page_as_pdf(driver, wagelist_no, work_code, output_dir)
-                                pdf_save_detail = f" (Saved as PDF)" if pdf_path else " (PDF Failed)"
-
-                            self.app.log_message(self.log_display, f"SUCCESS: Wagelist {wagelist_no} generated.{pdf_save_detail}", "success")
-                            self._log_result(work_code, "Success", wagelist_no, "", "")
-                        
-                        else:
-                            error_elem = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_lblmsg")
-                            error_text = error_elem.get_attribute("innerText").strip()
-                            self.app.log_message(self.log_display, f"ERROR on {work_code}: {error_text}", "error")
-                            
-                            # Handle Unfrozen Accounts check
-                            try:
-                                job_cards, applicant_names = [], []
-                                unfrozen_table = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_GridView1")
-                                for u_row in unfrozen_table.find_elements(By.XPATH, ".//tr[td]"):
-                                    u_cells = u_row.find_elements(By.TAG_NAME, "td")
-                                    if len(u_cells) > 3: 
-                                        job_cards.append(u_cells[1].get_attribute("innerText").strip())
-                                        applicant_names.append(u_cells[3].get_attribute("innerText").strip())
-                                self._log_result(work_code, "Unfrozen Account", "N/A", ", ".join(job_cards), ", ".join(applicant_names))
-                            except NoSuchElementException: 
-                                self._log_result(work_code, f"Failed ({error_text or 'Unknown'})", "N/A", "", "")
-
-                            total_errors_to_skip += 1
-
-                    except TimeoutException:
-                        self.app.log_message(self.log_display, f"ERROR on {work_code}: Timeout. Skipping.", "error")
-                        self._log_result(work_code, "Failed (Page Timeout)", "N/A", "", "")
-                        total_errors_to_skip += 1
-
-                except TimeoutException: 
+                fresh = not on_list_page
+                if fresh:
+                    self.app.after(0, self.app.set_status, "Navigating and selecting agency...")
+                    if not self._open_agency_list(driver, wait, agency_name_part): break
+                    on_list_page = True
+
+                pending = self._read_pending_rows(driver)
+                if pending is None and not fresh:
+                    on_list_page = False; continue # Post-back didn't come back to the list; open it once more
+                if pending is None:
                     self.app.log_message(self.log_display, "No wagelist table found. Assuming process complete.", "info")
                     break
-                    
+                if total is None:
+                    total = len(pending) # Snapshot of the pending list, for progress
+                    self.app.log_message(self.log_display, f"{total} pending muster roll(s) found.")
+                todo = [row for row in pending if row[0] and row[2] not in failed_rows]
+                if not todo:
+                    self.app.log_message(self.log_display, "No more wagelists to process.", "info")
+                    break
+
+                batch = todo[:batch_size]
+                codes = [code for code, _, _ in batch]
+                done = generated_count + failed_count
+                self.app.after(0, self.app.set_status, f"Processing {done + 1}/{max(total, done + len(todo))}: {codes[0]}" + (f" (+{len(codes) - 1})" if len(codes) > 1 else ""))
+                self.app.log_message(self.log_display, f"Processing {', '.join(codes)}")
+                outcome = self._generate(driver, wait, batch, [cb for _, cb, _ in pending], output_dir)
+
+                if outcome == "success":
+                    generated_count += len(codes)
+                    on_list_page = False # Result page; the list has to be opened again
+                elif outcome == "timeout":
+                    # Generate may have gone through; never click it again for these rows
+                    failed_rows.update(key for _, _, key in batch); failed_count += len(batch)
+                    on_list_page = False
+                elif len(batch) > 1:
+                    # Portal refused the combined generate: carry on one row at a time on the same page
+                    batch_size = 1
+                    self.app.log_message(self.log_display, "Combined generation was not accepted. Continuing one muster roll at a time.", "warning")
+                    on_list_page = outcome == "error"
+                else:
+                    failed_rows.add(batch[0][2]); failed_count += 1
+                    on_list_page = True # Error message shows on the list itself; reuse it
+
                 if self.app.stop_events[self.automation_key].is_set(): break
+            self.app.log_message(self.log_display, f"Generated for {generated_count} muster roll(s), {failed_count} failed.", "info")
             
+            self.pdf_queue.close() # Let queued PDFs land before checking the folder
             if not self.app.stop_events[self.automation_key].is_set():
                 if output_dir and os.path.exists(output_dir) and any(os.scandir(output_dir)):
-                    if messagebox.askyesno("Complete", "Wagelist generation finished.\nOpen output folder?"):
+                    if self.dialogs.askyesno("Complete", "Wagelist generation finished.\nOpen output folder?"):
                         self.app.open_folder(output_dir)
                 else:
-                    messagebox.showinfo("Complete", "Wagelist generation finished.")
+                    self.dialogs.showinfo("Complete", "Wagelist generation finished.")
 
         except Exception as e: 
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", level="error")
             if config.SENTRY_DSN: sentry_sdk.capture_exception(e)
         finally:
+            self.pdf_queue.close()
             self.app.after(0, self.set_ui_state, False)
             self.app.after(0, self.app.set_status, "Automation Finished")
             
-            if self.send_to_sender_var.get() == "on" and not self.app.stop_events[self.automation_key].is_set():
+            if send_to_sender and not self.app.stop_events[self.automation_key].is_set():
                 self.app.after(0, self.app.set_status, "Finished. Sending data to next tab...")
                 def _send_data():
                     if generated_wagelists:
@@ -276,25 +249,91 @@ class WagelistGenTab(BaseAutomationTab):
             else:
                 self.app.after(5000, lambda: self.app.set_status("Ready"))
                 
+    def _open_agency_list(self, driver, wait, agency_name_part):
+        """Opens the pending list for the agency. False when the agency has nothing pending."""
+        driver.get(config.WAGELIST_GEN_CONFIG["base_url"])
+        agency_select_element = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_exe_agency')))
+        full_agency_name = config.AGENCY_PREFIX + agency_name_part
+        match = next((opt for opt in dropdowns.read_options(driver, agency_select_element) if opt.text.strip() == full_agency_name), None)
+        if not match:
+            self.app.log_message(self.log_display, f"No pending wagelists found for '{full_agency_name}'. Process complete.", "info")
+            return False
+        match_text = dropdowns.select_option(driver, agency_select_element, value=match.value).text
+        self.app.log_message(self.log_display, f"Selected agency: {match_text}", "success")
+        # Agency change may post back; wait for it (briefly) instead of a fixed sleep
+        try: WebDriverWait(driver, 1).until(EC.staleness_of(agency_select_element))
+        except TimeoutException: pass
+        proceed_button = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_go')))
+        driver.execute_script("arguments[0].click();", proceed_button)
+        try: wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_wagelist_msr")))
+        except TimeoutException: pass # _read_pending_rows reports the missing table
+        return True
+
+    def _read_pending_rows(self, driver):
+        """[(work_code, checkbox, row_text)] of the pending table in one call, or None if there is no table."""
+        rows = driver.execute_script(_PENDING_ROWS_JS)
+        return None if rows is None else [tuple(row) for row in rows]
+
+    def _generate(self, driver, wait, batch, all_checkboxes, output_dir):
+        """Ticks only the batch's rows and generates. Returns 'success', 'error' (still on the list) or 'timeout'."""
+        codes = [code for code, _, _ in batch]
+        selected = [cb for _, cb, _ in batch]
+        driver.execute_script(_SELECT_ROWS_JS, selected, [cb for cb in all_checkboxes if cb not in selected])
+        try:
+            gen_btn = wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_btn_go')))
+            driver.execute_script("arguments[0].click();", gen_btn)
+            wait.until(EC.any_of(
+                EC.url_changes(driver.current_url),
+                EC.staleness_of(gen_btn)
+            ))
+            wait.until(EC.any_of(
+                EC.url_contains("view_wagelist.aspx"),
+                EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_lblmsg"))
+            ))
+        except TimeoutException:
+            self.app.log_message(self.log_display, f"ERROR on {', '.join(codes)}: Timeout. Skipping.", "error")
+            for code in codes: self._log_result(code, "Failed (Page timed out after Generate, check if it was generated)", "N/A", "", "")
+            return "timeout"
+
+        if "view_wagelist.aspx" in driver.current_url:
+            query_params = parse_qs(urlparse(driver.current_url).query)
+            wagelist_no = query_params.get('Wage_Listno', ['N/A'])[0]
+            if wagelist_no != 'N/A': self._generated_wagelists.append(wagelist_no)
+            pdf_save_detail = ""
+            if output_dir and wagelist_no != 'N/A':
+                queued = self._save_page_as_pdf(driver, wagelist_no, codes[0], output_dir)
+                pdf_save_detail = " (Saving PDF...)" if queued else " (PDF Failed)"
+            self.app.log_message(self.log_display, f"SUCCESS: Wagelist {wagelist_no} generated for {len(codes)} muster roll(s).{pdf_save_detail}", "success")
+            for code in codes: self._log_result(code, "Success", wagelist_no, "", "")
+            return "success"
+
+        error_text = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_lblmsg").get_attribute("innerText").strip()
+        self.app.log_message(self.log_display, f"ERROR on {', '.join(codes)}: {error_text}", "error")
+        if len(batch) > 1: return "error" # Retried one by one, so each row gets its own result
+
+        # Handle Unfrozen Accounts check
+        try:
+            job_cards, applicant_names = [], []
+            unfrozen_table = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_GridView1")
+            for u_row in unfrozen_table.find_elements(By.XPATH, ".//tr[td]"):
+                u_cells = u_row.find_elements(By.TAG_NAME, "td")
+                if len(u_cells) > 3:
+                    job_cards.append(u_cells[1].get_attribute("innerText").strip())
+                    applicant_names.append(u_cells[3].get_attribute("innerText").strip())
+            self._log_result(codes[0], "Unfrozen Account", "N/A", ", ".join(job_cards), ", ".join(applicant_names))
+        except NoSuchElementException:
+            self._log_result(codes[0], f"Failed ({error_text or 'Unknown'})", "N/A", "", "")
+        return "error"
+
     # --- NEW METHOD: Save Page as PDF ---
     def _save_page_as_pdf(self, driver, wagelist_no, work_code, output_dir):
-        """Saves the current page as a PDF."""
+        """Prints the current page and queues it for saving. Returns False if printing failed."""
         try:
-            # Create a safe filename
+            # Create a safe filename (made unique by the save queue)
             safe_work_code = work_code.split('/')[-1][-6:] if '/' in work_code else work_code[-6:]
             base_filename = f"WL_{wagelist_no.replace('/', '-')}_{safe_work_code}"
-            extension = ".pdf"
-            counter = 1
-            pdf_filename = f"{base_filename}{extension}"
-            save_path = os.path.join(output_dir, pdf_filename)
-
-            # Ensure filename is unique
-            while os.path.exists(save_path):
-                pdf_filename = f"{base_filename} ({counter}){extension}"
-                save_path = os.path.join(output_dir, pdf_filename)
-                counter += 1
-
-            pdf_data_base64 = None
+
+            pdf_chunks = None
             
             # Use browser-specific commands to print to PDF
             if self.app.active_browser == 'firefox':
@@ -303,7 +342,7 @@ class WagelistGenTab(BaseAutomationTab):
                 print_options = PrintOptions()
                 print_options.orientation = "landscape"
                 print_options.scale = 0.7
-                pdf_data_base64 = driver.print_page(print_options)
+                pdf_chunks = capture_pdf(driver, 'firefox', print_options=print_options)
                 # --- END MODIFICATION ---
 
             elif self.app.active_browser == 'chrome':
@@ -319,21 +358,21 @@ class WagelistGenTab(BaseAutomationTab):
                     "paperWidth": 8.27, # A4 width in inches
                     "paperHeight": 11.69 # A4 height in inches
                 }
-                result = driver.execute_cdp_cmd("Page.printToPDF", print_options)
-                pdf_data_base64 = result['data']
-
-            if pdf_data_base64:
-                pdf_data = base64.b64decode(pdf_data_base64)
-                with open(save_path, 'wb') as f:
-                    f.write(pdf_data)
-                return save_path
+                pdf_chunks = capture_pdf(driver, 'chrome', print_options)
+
+            if pdf_chunks:
+                def _on_saved(path, error):
+                    if path: self.app.log_message(self.log_display, f"   - Wagelist {wagelist_no} saved as {os.path.basename(path)}")
+                    else: self.app.log_message(self.log_display, f"Error saving PDF for {wagelist_no}: {error}", "error")
+                self.pdf_queue.submit(pdf_chunks, output_dir, base_filename, _on_saved)
+                return True
             else:
                 self.app.log_message(self.log_display, f"Error: PDF data was not generated for {wagelist_no}.", "error")
-                return None
+                return False
 
         except Exception as e:
             self.app.log_message(self.log_display, f"Error saving PDF for {wagelist_no}: {e}", "error")
-            return None
+            return False
     # --- END NEW METHOD ---
 
     def _log_result(self, work_code, status, wagelist_no, job_card, applicant_name):
@@ -359,9 +398,9 @@ class WagelistGenTab(BaseAutomationTab):
 
     def _get_filtered_data_and_filepath(self, export_format):
         all_items = self.results_tree.get_children()
-        if not all_items: messagebox.showinfo("No Data", "There are no results to export."); return None, None
+        if not all_items: self.dialogs.showinfo("No Data", "There are no results to export."); return None, None
         agency_name = self.agency_entry.get().strip()
-        if not agency_name: messagebox.showwarning("Input Needed", "Please enter an Agency Name for the report title."); return None, None
+        if not agency_name: self.dialogs.showwarning("Input Needed", "Please enter an Agency Name for the report title."); return None, None
 
         filter_option = self.export_filter_menu.get()
         data_to_export = []
@@ -371,7 +410,7 @@ class WagelistGenTab(BaseAutomationTab):
             if filter_option == "Export All": data_to_export.append(row_values)
             elif filter_option == "Success Only" and "SUCCESS" in status: data_to_export.append(row_values)
             elif filter_option == "Failed Only" and "SUCCESS" not in status: data_to_export.append(row_values)
-        if not data_to_export: messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
+        if not data_to_export: self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
 
         safe_name = "".join(c for c in agency_name if c.isalnum() or c in (' ', '_')).rstrip()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -399,6 +438,6 @@ class WagelistGenTab(BaseAutomationTab):
         report_date = datetime.now().strftime('%d %b %Y')
         success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
         if success:
-            if messagebox.askyesno("Success", f"PDF Report saved to:\n{file_path}\n\nDo you want to open it?"):
+            if self.dialogs.askyesno("Success", f"PDF Report saved to:\n{file_path}\n\nDo you want to open it?"):
                 if sys.platform == "win32": os.startfile(file_path)
                 else: subprocess.call(['open', file_path])
\ No newline at end of file
@@ -1,16 +1,31 @@
 # tabs/wagelist_send_tab.py
 import tkinter
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import customtkinter as ctk
-import time
+import time, queue, threading
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 
+RESULTS_FLUSH_MS = 300 # Result rows are added to the table in batches
+
+_SELECT_EFMS_JS = """
+const radios = document.querySelectorAll("input[id$='_rdbPayment_2']");
+let clickedCount = 0;
+radios.forEach(radio => {
+    if (!radio.disabled && !radio.checked) {
+        radio.checked = true;
+        clickedCount++;
+    }
+});
+return clickedCount;
+"""
+
 class WagelistSendTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
         super().__init__(parent, app_instance, automation_key="send")
@@ -47,6 +62,11 @@ class WagelistSendTab(BaseAutomationTab):
 
         ctk.CTkLabel(settings_container, text="ℹ️ Leave both fields blank to process all wagelists for the selected year.", text_color="gray50").grid(row=3, column=0, columnspan=2, padx=15, pady=(5, 10))
 
+        ctk.CTkLabel(settings_container, text="Parallel Tabs:").grid(row=4, column=0, padx=(15, 5), pady=(0, 10), sticky="w")
+        self.parallel_tabs_menu = ctk.CTkOptionMenu(settings_container, width=80, values=["1", "2", "3", "4"])
+        self.parallel_tabs_menu.set(str(config.WAGELIST_SEND_CONFIG.get("parallel_tabs", 1)))
+        self.parallel_tabs_menu.grid(row=4, column=1, padx=(0, 15), pady=(0, 10), sticky="w")
+
 
         # Action Buttons
         action_frame = self._create_action_buttons(parent_frame=self)
@@ -70,7 +90,7 @@ class WagelistSendTab(BaseAutomationTab):
         )
         self.export_csv_button.pack(side="left")
 
-        cols = ("Wagelist No.", "Status", "Timestamp")
+        cols = ("Wagelist No.", "Status", "Timestamp", "Details")
         self.results_tree = ttk.Treeview(results_frame, columns=cols, show='headings')
         for col in cols: self.results_tree.heading(col, text=col)
         self.results_tree.grid(row=1, column=0, sticky='nsew')
@@ -84,9 +104,10 @@ class WagelistSendTab(BaseAutomationTab):
         self.fin_year_combobox.configure(state=state)
         self.start_wagelist_entry.configure(state=state)
         self.end_wagelist_entry.configure(state=state)
+        self.parallel_tabs_menu.configure(state=state)
 
     def reset_ui(self):
-        if messagebox.askokcancel("Reset Form?", "Are you sure?"):
+        if self.dialogs.askokcancel("Reset Form?", "Are you sure?"):
             self.start_wagelist_entry.delete(0, tkinter.END)
             self.end_wagelist_entry.delete(0, tkinter.END)
             for item in self.results_tree.get_children():
@@ -99,13 +120,13 @@ class WagelistSendTab(BaseAutomationTab):
     def start_automation(self):
         fin_year = self.fin_year_combobox.get()
         if not fin_year:
-            messagebox.showerror("Input Error", "Please select a Financial Year.")
+            self.dialogs.showerror("Input Error", "Please select a Financial Year.")
             return
             
         start_wl = self.start_wagelist_entry.get().strip()
         end_wl = self.end_wagelist_entry.get().strip()
 
-        self.app.start_automation_thread(self.automation_key, self.run_automation_logic, args=(fin_year, start_wl, end_wl))
+        self.app.start_automation_thread(self.automation_key, self.run_automation_logic, args=(fin_year, start_wl, end_wl, int(self.parallel_tabs_menu.get())))
 
     def populate_wagelist_data(self, start_wagelist, end_wagelist):
         """Receives data from another tab and updates the input fields."""
@@ -119,34 +140,28 @@ class WagelistSendTab(BaseAutomationTab):
         self.app.log_message(self.log_display, f"Received Wagelist range: {start_wagelist} to {end_wagelist}")
         self.app.set_status("Ready to send wagelists")
 
-    def run_automation_logic(self, fin_year, start_wl, end_wl):
+    def run_automation_logic(self, fin_year, start_wl, end_wl, parallel_tabs=None):
         self.app.after(0, self.set_ui_state, True)
         self.app.after(0, lambda: [self.results_tree.delete(item) for item in self.results_tree.get_children()])
         self.app.clear_log(self.log_display)
         self.app.log_message(self.log_display, "Starting automation...")
         self.app.after(0, self.app.set_status, "Running Wagelist Send...")
         self.app.after(0, self.update_status, "Initializing...", 0.0) # <-- UPDATED
+        self._results_lock, self._pending_rows, self._flush_scheduled = threading.Lock(), [], False
         
         automation_failed = False # Track errors
+        workers = []
         
         try:
             driver = self.app.get_driver()
             if not driver: return
             wait = WebDriverWait(driver, 15)
 
-            driver.get(config.WAGELIST_SEND_CONFIG["url"])
-            
             self.app.log_message(self.log_display, f"Selecting Financial Year: {fin_year}")
-            Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlfin")))).select_by_value(fin_year)
-            
-            self.app.log_message(self.log_display, "Waiting for wagelists to load...")
-            wait.until(EC.element_to_be_clickable((By.XPATH, "//select[@id='ctl00_ContentPlaceHolder1_ddl_sel']/option[position()>1]")))
-            time.sleep(1)
-
-            all_wagelists = [o.get_attribute("value") for o in Select(driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddl_sel")).options if o.get_attribute("value") != "select"]
+            all_wagelists = self._open_send_page(driver, wait, fin_year)
             if not all_wagelists:
                 self.app.log_message(self.log_display, "No wagelists found for the selected year.", "warning")
-                messagebox.showwarning("No Wagelists", f"No wagelists were found for the financial year {fin_year}.")
+                self.dialogs.showwarning("No Wagelists", f"No wagelists were found for the financial year {fin_year}.")
                 return
             
             # --- NEW: Filter wagelists based on user-provided range ---
@@ -158,34 +173,33 @@ class WagelistSendTab(BaseAutomationTab):
                     end_index = all_wagelists.index(end_wl) if end_wl else len(all_wagelists) - 1
 
                     if start_index > end_index:
-                        messagebox.showerror("Input Error", "Start Wagelist must appear before End Wagelist in the dropdown.")
+                        self.dialogs.showerror("Input Error", "Start Wagelist must appear before End Wagelist in the dropdown.")
                         return
                     
                     wagelists_to_process = all_wagelists[start_index : end_index + 1]
                 except ValueError:
-                    messagebox.showerror("Input Error", "The specified Start or End Wagelist was not found in the list for this financial year.")
+                    self.dialogs.showerror("Input Error", "The specified Start or End Wagelist was not found in the list for this financial year.")
                     return
             
             self.app.log_message(self.log_display, f"Found {len(wagelists_to_process)} wagelists to process.")
-            total = len(wagelists_to_process)
-            for idx, wagelist in enumerate(wagelists_to_process, 1):
-                if self.app.stop_events[self.automation_key].is_set():
-                    break
-                
-                # --- UPDATED: Set both tab and app status ---
-                status_msg = f"Processing {idx}/{total}: {wagelist}"
-                self.app.after(0, self.update_status, status_msg, idx / total)
-                self.app.after(0, self.app.set_status, status_msg)
-                
-                success = self._process_single_wagelist(driver, wait, wagelist, fin_year)
-                self.app.after(0, lambda w=wagelist, s="Success" if success else "Failed", t=datetime.now().strftime("%H:%M:%S"): self.results_tree.insert("", tkinter.END, values=(w, s, t)))
-                time.sleep(1)
+            # Tabs take the next wagelist from a shared queue, so a slow or failed tab never holds up the others
+            work = queue.Queue()
+            for wagelist in wagelists_to_process: work.put(wagelist)
+            progress = {"done": 0, "total": len(wagelists_to_process), "lock": threading.Lock()}
+            tabs = max(1, min(int(parallel_tabs or config.WAGELIST_SEND_CONFIG.get("parallel_tabs", 1)), len(wagelists_to_process)))
+            for n in range(2, tabs + 1):
+                worker = threading.Thread(target=self._extra_tab_worker, args=(n, fin_year, work, progress), daemon=True)
+                worker.start(); workers.append(worker)
+            self._send_from_queue(driver, wait, fin_year, work, progress)
+            for worker in workers: worker.join()
 
         except Exception as e:
             automation_failed = True # Track errors
             self.app.log_message(self.log_display, f"A critical error occurred: {e}", "error")
-            messagebox.showerror("Automation Error", f"An error occurred: {e}")
+            self.dialogs.showerror("Automation Error", f"An error occurred: {e}")
         finally:
+            if automation_failed: self.app.stop_events[self.automation_key].set() # Extra tabs stop too
+            for worker in workers: worker.join()
             stopped = self.app.stop_events[self.automation_key].is_set()
 
             # --- UPDATED: More robust final status logic ---
@@ -205,57 +219,115 @@ class WagelistSendTab(BaseAutomationTab):
             self.app.after(0, self.set_ui_state, False)
             
             if not stopped and not automation_failed:
-                self.app.after(0, lambda: messagebox.showinfo("Automation Complete", "Wagelist sending process finished."))
+                self.app.after(0, lambda: self.dialogs.showinfo("Automation Complete", "Wagelist sending process finished."))
             
             # Add delayed reset, like in mr_tracking_tab
             self.app.after(5000, lambda: self.app.set_status("Ready"))
             self.app.after(5000, lambda: self.update_status("Ready", 0.0))
 
+    def _open_send_page(self, driver, wait, fin_year):
+        """Loads the send page for the year; returns the wagelists in the dropdown (unsent ones)."""
+        driver.get(config.WAGELIST_SEND_CONFIG["url"])
+        Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlfin")))).select_by_value(fin_year)
+        self.app.log_message(self.log_display, "Waiting for wagelists to load...")
+        wait.until(EC.element_to_be_clickable((By.XPATH, "//select[@id='ctl00_ContentPlaceHolder1_ddl_sel']/option[position()>1]")))
+        return self._dropdown_wagelists(driver)
+
+    def _dropdown_wagelists(self, driver):
+        """Values of the wagelist dropdown (only wagelists not yet sent are listed)."""
+        return [o.value for o in dropdowns.read_options(driver, "ctl00_ContentPlaceHolder1_ddl_sel") if not dropdowns.is_placeholder(o)]
+
+    def _send_from_queue(self, driver, wait, fin_year, work, progress):
+        stop = self.app.stop_events[self.automation_key]
+        while not stop.is_set():
+            try: wagelist = work.get_nowait()
+            except queue.Empty: return
+            with progress["lock"]: progress["done"] += 1; idx = progress["done"]
+            # --- UPDATED: Set both tab and app status ---
+            status_msg = f"Processing {idx}/{progress['total']}: {wagelist}"
+            self.app.after(0, self.update_status, status_msg, idx / progress["total"])
+            self.app.after(0, self.app.set_status, status_msg)
+
+            success = self._process_single_wagelist(driver, wait, wagelist, fin_year)
+            self.app.rate_controller.pace(self.automation_key, driver, success, stop)
+
+    def _extra_tab_worker(self, n, fin_year, work, progress):
+        """A second (third...) tab of the same browser, with its own driver, sending from the shared queue."""
+        driver = None
+        try:
+            driver = self._attach_extra_tab()
+            if not driver: return
+            wait = WebDriverWait(driver, 15)
+            driver.switch_to.new_window("tab")
+            if not self._open_send_page(driver, wait, fin_year):
+                self.app.log_message(self.log_display, f"Tab {n}: the year's wagelists did not load here, leaving the work to the other tabs.", "warning")
+                return
+            self.app.log_message(self.log_display, f"Tab {n}: sending in parallel.")
+            self._send_from_queue(driver, wait, fin_year, work, progress)
+        except Exception as e:
+            self.app.log_message(self.log_display, f"Tab {n} stopped ({type(e).__name__}); the other tabs carry on.", "warning")
+        finally:
+            if driver:
+                try: driver.close()
+                except Exception: pass
+
     def _process_single_wagelist(self, driver, wait, wagelist, fin_year):
-        """Processes a single wagelist (Background Safe)."""
-        for attempt in range(2):
-            if self.app.stop_events[self.automation_key].is_set(): return False
-            try:
-                # Select Wagelist (Presence check)
-                wl_dropdown = wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_sel")))
-                Select(wl_dropdown).select_by_value(wagelist)
-                
-                wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_GridView1")))
-                
-                self.app.log_message(self.log_display, f"Selecting all EFMS options for {wagelist}...")
-                
-                # JS Script checks checkboxes (Already good in previous code, kept same)
-                js_script = """
-                    const radios = document.querySelectorAll("input[id$='_rdbPayment_2']");
-                    let clickedCount = 0;
-                    radios.forEach(radio => {
-                        if (!radio.disabled && !radio.checked) {
-                            radio.checked = true;
-                            clickedCount++;
-                        }
-                    });
-                    return clickedCount;
-                """
-                clicked_count = driver.execute_script(js_script)
-                self.app.log_message(self.log_display, f"   - Instantly selected {clicked_count} EFMS options.")
-                
-                if self.app.stop_events[self.automation_key].is_set(): return False
-                
-                # --- FIX: JS Click for Submit Button (Background Safe) ---
-                submit_btn = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_btnsubmit")
-                driver.execute_script("arguments[0].click();", submit_btn)
-                
-                WebDriverWait(driver, 5).until(EC.alert_is_present()).accept()
-                
-                self.app.log_message(self.log_display, f"✅ {wagelist} submitted successfully.", "success")
+        """Processes a single wagelist (Background Safe). Retries come from the app's retry policy."""
+        if self.app.stop_events[self.automation_key].is_set(): return False
+        started = time.perf_counter()
+        try:
+            # Already sent (by another tab, another run or by hand) drops out of the dropdown. The dropdown
+            # on screen may be from before the last postback, so only a fresh load of the page decides
+            if wagelist not in self._dropdown_wagelists(driver) and wagelist not in self._open_send_page(driver, wait, fin_year):
+                self.app.log_message(self.log_display, f"{wagelist} is no longer pending, skipping.")
+                self._log_result(wagelist, "Skipped (Already Sent)")
                 return True
-            except Exception as e:
-                self.app.log_message(self.log_display, f"[WARN] Attempt {attempt+1} failed for {wagelist}: {type(e).__name__}", "warning")
-                if (attempt == 0):
-                    driver.refresh()
-                    wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddlfin")))
-                    Select(driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddlfin")).select_by_value(fin_year)
-                    wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_ddl_sel")))
-
-        self.app.log_message(self.log_display, f"❌ {wagelist} failed after multiple attempts.", "error")
-        return False
\ No newline at end of file
+
+            # Select Wagelist and wait for its postback to finish (old dropdown replaced, grid present)
+            wl_dropdown = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_ddl_sel")
+            Select(wl_dropdown).select_by_value(wagelist)
+            wait.until(EC.staleness_of(wl_dropdown))
+            wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_GridView1")))
+            loaded = time.perf_counter()
+            
+            # JS Script checks checkboxes (Already good in previous code, kept same)
+            clicked_count = driver.execute_script(_SELECT_EFMS_JS)
+            self.app.log_message(self.log_display, f"   - {wagelist}: selected {clicked_count} EFMS options.")
+            
+            if self.app.stop_events[self.automation_key].is_set(): return False
+            
+            # --- FIX: JS Click for Submit Button (Background Safe) ---
+            submit_btn = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_btnsubmit")
+            driver.execute_script("arguments[0].click();", submit_btn)
+            
+            WebDriverWait(driver, 5).until(EC.alert_is_present()).accept()
+            try: WebDriverWait(driver, 5).until(EC.staleness_of(submit_btn)) # Page comes back with the refreshed dropdown
+            except TimeoutException:
+                # Postback not back yet; start the next wagelist from a fresh page, not a stale dropdown
+                try: self._open_send_page(driver, wait, fin_year)
+                except Exception: pass # The next wagelist's pending check loads the page again
+            timing = f"Load {loaded - started:.1f}s | Submit {time.perf_counter() - loaded:.1f}s"
+            
+            self.app.log_message(self.log_display, f"✅ {wagelist} submitted successfully ({timing}).", "success")
+            self._log_result(wagelist, "Success", timing)
+            return True
+        except Exception as e:
+            self.app.log_message(self.log_display, f"[WARN] {wagelist} failed: {type(e).__name__}", "warning")
+            try: self._open_send_page(driver, wait, fin_year) # Clean page for the next attempt / wagelist
+            except Exception: pass
+            self._log_result(wagelist, f"Failed ({type(e).__name__})", f"After {time.perf_counter() - started:.1f}s")
+            return False
+
+    def _log_result(self, wagelist, status, details=""):
+        """Rows are collected and added to the results table together, not one UI callback per wagelist."""
+        with self._results_lock:
+            self._pending_rows.append((wagelist, status, datetime.now().strftime("%H:%M:%S"), details))
+            if self._flush_scheduled: return
+            self._flush_scheduled = True
+        self.app.after(RESULTS_FLUSH_MS, self._flush_results)
+
+    def _flush_results(self):
+        with self._results_lock:
+            rows, self._pending_rows, self._flush_scheduled = self._pending_rows, [], False
+        for values in rows:
+            self.results_tree.insert("", tkinter.END, values=values, tags=('failed',) if values[1].startswith("Failed") else ('skipped',) if values[1].startswith("Skipped") else ())
@@ -2,7 +2,7 @@
 import tkinter
 from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
-import os, csv, time, pyperclip, sys, threading, json, webbrowser, requests
+import os, csv, pyperclip, sys, threading, json, webbrowser, requests
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 from collections import defaultdict
@@ -12,10 +12,65 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .date_entry_widget import DateEntry
 from .autocomplete_widget import AutocompleteEntry
 from .demand_tab import CloudFilePicker 
+from .login_automation_tab import load_location_prefs
+
+# Category dropdowns of the form, parent to child; choosing one reloads the next
+CATEGORY_CASCADE = [
+    ("master_category", "ContentPlaceHolder1_ddlMastercategory"),
+    ("work_category", "ContentPlaceHolder1_ddlproposed_work_category"),
+    ("beneficiary_type", "ContentPlaceHolder1_ddlbeneficiary_type"),
+    ("activity_type", "ContentPlaceHolder1_ddlactivity_type"),
+    ("work_type", "ContentPlaceHolder1_ddlproposed_work_type"),
+    ("pro_status", "ContentPlaceHolder1_ddlprostatus"),
+]
+
+
+class CategoryCache:
+    """
+    WC form category tree per login context (see WcGenTab._cache_context), kept on disk:
+    the top-level lists and, for every category path chosen so far, the options of the
+    next dropdown.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f: self.data = json.load(f)
+        except (OSError, ValueError): self.data = {}
+
+    def _portal(self, context):
+        return self.data.setdefault(context, {"roots": {}, "children": {}})
+
+    def roots(self, context, key):
+        with self._lock: return [t for t, _ in self.data.get(context, {}).get("roots", {}).get(key, [])] or None
+
+    def children(self, context, path):
+        with self._lock: options = self.data.get(context, {}).get("children", {}).get(" > ".join(path))
+        return None if options is None else [t for t, _ in options]
+
+    def set_roots(self, context, key, options):
+        with self._lock: self._portal(context)["roots"][key] = options
+        self.save()
+
+    def set_children(self, context, path, options):
+        with self._lock: self._portal(context)["children"][" > ".join(path)] = options
+        self.save()
+
+    def clear(self, context):
+        with self._lock: self.data.pop(context, None)
+        self.save()
+
+    def save(self):
+        with self._lock: snapshot = json.dumps(self.data, indent=2)
+        try:
+            with open(self.path, 'w') as f: f.write(snapshot)
+        except OSError as e: print(f"Error saving category cache: {e}")
+
 
 class WcGenTab(BaseAutomationTab):
     def __init__(self, parent, app_instance):
@@ -27,6 +82,7 @@ class WcGenTab(BaseAutomationTab):
         self.profile_file = self.app.get_data_path("wc_gen_profiles.json")
         self.saved_config = {}
         self.successful_wcs_data = [] 
+        self.category_cache = CategoryCache(self.app.get_data_path("wc_category_cache.json"))
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -82,7 +138,10 @@ class WcGenTab(BaseAutomationTab):
         )
         self.panchayat_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         self.load_button = ctk.CTkButton(panchayat_frame, text="Load Categories from Website", command=self._start_category_loading_thread)
-        self.load_button.grid(row=1, column=0, columnspan=2, padx=5, pady=(5,10), sticky="ew")
+        self.load_button.grid(row=1, column=0, columnspan=2, padx=5, pady=(5,0), sticky="ew")
+        self.refresh_categories_button = ctk.CTkButton(panchayat_frame, text="↻ Re-read categories from website", height=22, fg_color="transparent",
+                                                       text_color=("gray30", "gray70"), command=lambda: self._start_category_loading_thread(refresh=True))
+        self.refresh_categories_button.grid(row=2, column=0, columnspan=2, padx=5, pady=(0,10), sticky="e")
 
         action_frame = self._create_action_buttons(parent_frame=settings_container)
         action_frame.grid(row=1, column=0, sticky="ew", padx=0, pady=10)
@@ -391,16 +450,28 @@ class WcGenTab(BaseAutomationTab):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete profile: {e}")
 
-    def _start_category_loading_thread(self):
+    def _start_category_loading_thread(self, refresh=False):
         panchayat = self.panchayat_entry.get().strip()
         if not panchayat:
             messagebox.showwarning("Input Required", "Please enter a Panchayat Name first.")
             return
         self.app.update_history("panchayat_name", panchayat)
+        context = self._cache_context(panchayat)
+        if refresh: self.category_cache.clear(context)
+        master_cat_options, agency_options = self.category_cache.roots(context, "master_category"), self.category_cache.roots(context, "executing_agency")
+        if master_cat_options and agency_options:
+            self.app.log_message(self.log_display, f"Categories loaded from cache ({context}). Use 'Re-read' if the portal has changed.")
+            self._update_ui_after_load(master_cat_options, agency_options)
+            return
         self.load_button.configure(state="disabled", text="Loading...")
-        threading.Thread(target=self._load_initial_categories, daemon=True).start()
+        threading.Thread(target=self._load_initial_categories, args=(context,), daemon=True).start()
+
+    def _cache_context(self, panchayat):
+        """Category cache key: signed-in district / block (Login Automation) + panchayat. Every state uses the same portal host."""
+        prefs = load_location_prefs(self.app.get_data_path('user_location_pref.json'))
+        return " / ".join(p for p in (prefs.get("district", ""), prefs.get("block", ""), panchayat.strip()) if p).lower()
 
-    def _load_initial_categories(self):
+    def _load_initial_categories(self, context):
         try:
             driver = self.app.get_driver()
             if not driver:
@@ -426,10 +497,12 @@ class WcGenTab(BaseAutomationTab):
                 else:
                     raise Exception(f"Element not found (Timeout).\nCurrent URL: {current_url}\nCheck if the page loaded correctly.")
 
-            master_cat_options = self._get_options(driver, "ContentPlaceHolder1_ddlMastercategory")
-            agency_options = self._get_options(driver, "ContentPlaceHolder1_ddlExeAgency")
+            master_cat_options = self._read_options(driver, "ContentPlaceHolder1_ddlMastercategory")
+            agency_options = self._read_options(driver, "ContentPlaceHolder1_ddlExeAgency")
+            self.category_cache.set_roots(context, "master_category", master_cat_options)
+            self.category_cache.set_roots(context, "executing_agency", agency_options)
             
-            self.app.after(0, self._update_ui_after_load, master_cat_options, agency_options)
+            self.app.after(0, self._update_ui_after_load, [t for t, _ in master_cat_options], [t for t, _ in agency_options])
             
         except Exception as e:
             # Full error message capture karein
@@ -474,63 +547,66 @@ class WcGenTab(BaseAutomationTab):
     def _on_dropdown_select(self, dropdown_key, selection):
         if not selection:
             return
+        keys = [key for key, _ in CATEGORY_CASCADE]
+        if dropdown_key not in keys[:-1]:
+            return
+        path = [self.ui_fields[key].get() for key in keys[:keys.index(dropdown_key) + 1]]
+        next_key = keys[keys.index(dropdown_key) + 1]
+        context = self._cache_context(self.panchayat_entry.get())
+        cached = self.category_cache.children(context, path)
+        if cached is not None:
+            self._update_next_combobox(next_key, cached, keys) # Known path: no browser round trip
+            return
         self.app.log_message(self.log_display, f"Selected {dropdown_key}: '{selection}'. Fetching next options...")
-        threading.Thread(target=self._update_dependent_dropdown, args=(dropdown_key, selection), daemon=True).start()
+        threading.Thread(target=self._update_dependent_dropdown, args=(path, next_key, keys, context), daemon=True).start()
     
-    def _update_dependent_dropdown(self, dropdown_key, selection):
-        dependency_map = {
-            'master_category': {'next': 'work_category', 'id': 'ContentPlaceHolder1_ddlMastercategory', 'next_id': 'ContentPlaceHolder1_ddlproposed_work_category'},
-            'work_category': {'next': 'beneficiary_type', 'id': 'ContentPlaceHolder1_ddlproposed_work_category', 'next_id': 'ContentPlaceHolder1_ddlbeneficiary_type'},
-            'beneficiary_type': {'next': 'activity_type', 'id': 'ContentPlaceHolder1_ddlbeneficiary_type', 'next_id': 'ContentPlaceHolder1_ddlactivity_type'},
-            'activity_type': {'next': 'work_type', 'id': 'ContentPlaceHolder1_ddlactivity_type', 'next_id': 'ContentPlaceHolder1_ddlproposed_work_type'},
-            'work_type': {'next': 'pro_status', 'id': 'ContentPlaceHolder1_ddlproposed_work_type', 'next_id': 'ContentPlaceHolder1_ddlprostatus'}
-        }
-        if dropdown_key not in dependency_map:
-            return
-        current = dependency_map[dropdown_key]
+    def _update_dependent_dropdown(self, path, next_key, all_keys, context):
         try:
             driver = self.app.get_driver()
             if not driver:
                 self.app.after(0, lambda: self.app.log_message(self.log_display, "Browser not available for dropdown update.", "warning"))
                 return
             wait = WebDriverWait(driver, 20)
-            
-            # Find the element to select
-            select_element = wait.until(EC.element_to_be_clickable((By.ID, current['id'])))
-            
-            # Capture the element that is expected to change (the NEXT dropdown)
-            # This is crucial for AJAX handling
-            try:
-                next_element_ref = driver.find_element(By.ID, current['next_id'])
-            except:
-                next_element_ref = None
-
-            # Make the selection
-            Select(select_element).select_by_visible_text(selection)
-            
-            # --- FIX FOR AJAX UPDATES ---
-            # Instead of waiting for body staleness (which fails on partial updates),
-            # we wait for the NEXT dropdown element to go stale (be removed/replaced).
-            if next_element_ref:
-                try:
-                    wait.until(EC.staleness_of(next_element_ref))
-                except TimeoutException:
-                    # Sometimes update is instant or handled differently, proceed carefully
-                    pass
-            else:
-                # If next element wasn't there yet, just wait a bit for AJAX to start
-                time.sleep(1)
-
-            # Wait for the next element to be present and interactable again
-            wait.until(EC.presence_of_element_located((By.ID, current['next_id'])))
-            time.sleep(0.5) # Small buffer for options to populate
-            
-            new_options = self._get_options(driver, current['next_id'])
-            self.app.after(0, self._update_next_combobox, current['next'], new_options, list(dependency_map.keys()))
+            if "work_entry.aspx" not in driver.current_url.lower(): # Categories came from the cache; the form isn't open yet
+                driver.get(config.WC_GEN_CONFIG["url"])
+                wait.until(EC.presence_of_element_located((By.ID, CATEGORY_CASCADE[0][1])))
+            new_options = self._select_category_path(driver, wait, path, context)
+            self.app.after(0, self._update_next_combobox, next_key, new_options, all_keys)
         except Exception as e:
             error_message = str(e).splitlines()[0]
             self.app.after(0, lambda msg=error_message: self.app.log_message(self.log_display, f"Error updating dropdown: {msg}", "error"))
 
+    def _select_category_path(self, driver, wait, path, context, log=False):
+        """
+        Brings the form's category dropdowns to `path` (texts, parent first) and returns the
+        options of the next dropdown. Levels already showing the right text are not selected
+        again; every option list seen is stored in the category cache.
+        """
+        ids = [element_id for _, element_id in CATEGORY_CASCADE]
+        current = dropdowns.selected_texts(driver, ids[:len(path)])
+        changed = False
+        for level, value in enumerate(path):
+            next_id = ids[level + 1] if level + 1 < len(ids) else None
+            if not changed and current[level] == value: continue # Form left open by a row that did not save: no postback
+            changed = True
+            if log: self.app.log_message(self.log_display, f"  > Selecting '{value}'...")
+            html_element = driver.find_element(By.TAG_NAME, 'html')
+            next_element_ref = driver.find_elements(By.ID, next_id) if next_id else []
+            Select(wait.until(EC.presence_of_element_located((By.ID, ids[level])))).select_by_visible_text(value)
+            if next_element_ref:
+                # Partial (AJAX) update replaces the next dropdown; a full postback replaces the page
+                try: wait.until(EC.any_of(EC.staleness_of(next_element_ref[0]), EC.staleness_of(html_element)))
+                except TimeoutException: pass
+            else:
+                wait.until(EC.staleness_of(html_element))
+            if next_id:
+                wait.until(EC.presence_of_element_located((By.ID, next_id)))
+                self.category_cache.set_children(context, path[:level + 1], self._read_options(driver, next_id, wait_for_options=True))
+        if log and not changed: self.app.log_message(self.log_display, "  > Categories already selected, kept.")
+        if len(path) >= len(ids): return []
+        options = self.category_cache.children(context, path)
+        return options if options is not None else self._get_options(driver, ids[len(path)])
+
     def _update_next_combobox(self, next_key, options, all_keys):
         self.ui_fields[next_key].configure(values=options, state="normal")
         
@@ -560,10 +636,16 @@ class WcGenTab(BaseAutomationTab):
             if key == next_key:
                 start_resetting = True
     
+    def _read_options(self, driver, element_id, wait_for_options=False):
+        """[[text, value]] of a dropdown in one script call (placeholders filtered out)."""
+        real = lambda d: [[o.text, o.value] for o in dropdowns.read_options(d, element_id) if not dropdowns.is_placeholder(o)]
+        if wait_for_options:
+            try: return WebDriverWait(driver, 3).until(real)
+            except TimeoutException: pass # Dropdown really has no options
+        return real(driver)
+
     def _get_options(self, driver, element_id):
-        # Update: Filter out empty strings "" along with "00" and "0"
-        select_element = Select(driver.find_element(By.ID, element_id))
-        return [option.text for option in select_element.options if option.get_attribute("value") not in ["00", "0", ""]]
+        return [text for text, _ in self._read_options(driver, element_id)]
 
     def _process_single_row(self, driver, form_config, row_data):
         try:
@@ -572,11 +654,17 @@ class WcGenTab(BaseAutomationTab):
             self.app.log_message(self.log_display, "ERROR: CSV row has incorrect number of columns. Expected 11.", "error")
             return None
 
-        driver.get(config.WC_GEN_CONFIG["url"])
         wait = WebDriverWait(driver, 25)
+        # A row that did not save stays on the form: reuse it (categories stay selected). A saved row
+        # moves on to ifedit.aspx, so the row after it starts on a fresh form and selects everything again
+        if "work_entry.aspx" not in driver.current_url.lower():
+            driver.get(config.WC_GEN_CONFIG["url"])
 
         # Helper function to handle AJAX loading dropdowns
         def select_and_wait(element_id, value):
+            # Reused form: already selected means no postback would come, so nothing to wait for
+            if dropdowns.selected_texts(driver, [element_id])[0] == value:
+                self.app.log_message(self.log_display, f"  > '{value}' already selected."); return
             self.app.log_message(self.log_display, f"  > Selecting '{value}'...")
             html_element = driver.find_element(By.TAG_NAME, 'html')
             # Use Presence Check (Safe for minimized windows)
@@ -586,12 +674,9 @@ class WcGenTab(BaseAutomationTab):
 
         # --- Step 1: Selecting Categories ---
         self.app.log_message(self.log_display, "Step 1: Selecting Categories...")
-        select_and_wait("ContentPlaceHolder1_ddlMastercategory", form_config['master_category'])
-        select_and_wait("ContentPlaceHolder1_ddlproposed_work_category", form_config['work_category'])
-        select_and_wait("ContentPlaceHolder1_ddlbeneficiary_type", form_config['beneficiary_type'])
-        select_and_wait("ContentPlaceHolder1_ddlactivity_type", form_config['activity_type'])
-        select_and_wait("ContentPlaceHolder1_ddlproposed_work_type", form_config['work_type'])
-        select_and_wait("ContentPlaceHolder1_ddlprostatus", form_config['pro_status'])
+        wait.until(EC.presence_of_element_located((By.ID, CATEGORY_CASCADE[0][1])))
+        self._select_category_path(driver, wait, [form_config[key] for key, _ in CATEGORY_CASCADE],
+                                   self._cache_context(form_config['panchayat_name']), log=True)
 
         # --- Step 2: Filling Dynamic Fields (JS Safe) ---
         self.app.log_message(self.log_display, "Step 2: Filling Dynamic Fields...")
@@ -602,12 +687,15 @@ class WcGenTab(BaseAutomationTab):
             "ContentPlaceHolder1_txtJSA_Inst_unit": total_saplings
         }
         for field_id, value in dynamic_fields.items():
-            if value.strip():
-                try:
-                    # Use JS to set value for reliability
-                    field = wait.until(EC.presence_of_element_located((By.ID, field_id)))
-                    driver.execute_script("arguments[0].value = arguments[1];", field, value)
-                except (NoSuchElementException, TimeoutException): pass 
+            if not value.strip():
+                # Clears what a failed earlier row left in a reused form (no wait if the field isn't there)
+                driver.execute_script("var e = document.getElementById(arguments[0]); if (e) e.value = '';", field_id)
+                continue
+            try:
+                # Use JS to set value for reliability
+                field = wait.until(EC.presence_of_element_located((By.ID, field_id)))
+                driver.execute_script("arguments[0].value = arguments[1];", field, value)
+            except (NoSuchElementException, TimeoutException): pass 
         
         # --- Step 3: Selecting Location ---
         self.app.log_message(self.log_display, "Step 3: Selecting Location...")
@@ -676,7 +764,6 @@ class WcGenTab(BaseAutomationTab):
         # Copy-Paste fails in background. This is much more robust.
         work_name_field = driver.find_element(By.ID, "ContentPlaceHolder1_txtworkname")
         driver.execute_script("arguments[0].value = arguments[1];", work_name_field, work_name)
-        time.sleep(0.5)
 
         # --- Step 5: Selecting Agency and Saving ---
         self.app.log_message(self.log_display, "Step 5: Selecting Agency and Saving...")
@@ -787,6 +874,7 @@ class WcGenTab(BaseAutomationTab):
         self.cloud_csv_button.configure(state=state)
         self.panchayat_entry.configure(state=state)
         self.load_button.configure(state=state)
+        self.refresh_categories_button.configure(state=state)
         self.save_profile_button.configure(state=state)
         self.delete_profile_button.configure(state=state)
         self.profile_combobox.configure(state=state)
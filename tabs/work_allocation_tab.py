@@ -12,6 +12,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException, StaleElementReferenceException
 
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -336,6 +337,7 @@ class WorkAllocationTab(BaseAutomationTab):
     # --- FUNCTION MODIFIED (from last time) ---
     def _process_single_work_key(self, driver, wait, work_key): # 'wait' is 'long_wait'
         selected_work_code_text = "N/A"
+        save_clicked = False # After this a failure may hide an allocation that went through, so it is never retried
         try:
             self.app.log_message(self.log_display, f"   - Processing Key: {work_key}")
             
@@ -350,14 +352,10 @@ class WorkAllocationTab(BaseAutomationTab):
             
             # --- Step 4: Select Matching Work Code ---
             work_code_select_element = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_ddlWork_code")))
-            work_code_select = Select(work_code_select_element)
+            work_code_options = dropdowns.read_options(driver, work_code_select_element)
             
             # Find the option that contains the work key
-            matching_option = None
-            for option in work_code_select.options:
-                if work_key in option.text:
-                    matching_option = option
-                    break
+            matching_option = next((option for option in work_code_options if work_key in option.text), None)
             
             # --- START: MODIFICATION (User Request) ---
             if not matching_option:
@@ -371,7 +369,7 @@ class WorkAllocationTab(BaseAutomationTab):
             # --- END: MODIFICATION ---
             
             selected_work_code_text = matching_option.text
-            work_code_select.select_by_visible_text(selected_work_code_text)
+            dropdowns.select_option(driver, work_code_select_element, value=matching_option.value, options=work_code_options)
             self.app.log_message(self.log_display, f"   - Selected work code: {selected_work_code_text}")
             
             self._wait_for_settle(driver, wait, "Work Code Selection")
@@ -390,6 +388,7 @@ class WorkAllocationTab(BaseAutomationTab):
             self.app.log_message(self.log_display, "   - Clicking 'Save'...")
             save_button = wait.until(EC.element_to_be_clickable((By.ID, "ctl00_ContentPlaceHolder1_cmdSave")))
             save_button.click()
+            save_clicked = True
             
             # --- Step 7: Handle Alert ---
             self.app.log_message(self.log_display, "   - Waiting for confirmation alert...")
@@ -405,7 +404,7 @@ class WorkAllocationTab(BaseAutomationTab):
 
         except (TimeoutException, NoAlertPresentException, StaleElementReferenceException) as e:
             # Note: NoSuchElementException is removed because we handle it above
-            error_msg = f"An unexpected page error occurred: {str(e).splitlines()[0]}"
+            error_msg = self._after_save(f"An unexpected page error occurred: {str(e).splitlines()[0]}", save_clicked)
             self.app.log_message(self.log_display, f"   - FAILED: {error_msg}", "error")
             self._log_result(work_key, selected_work_code_text, "Failed", error_msg)
             
@@ -447,7 +446,7 @@ class WorkAllocationTab(BaseAutomationTab):
                 # --- END: MODIFICATION ---
         
         except Exception as e:
-            error_msg = f"A critical unexpected error occurred: {e}"
+            error_msg = self._after_save(f"A critical unexpected error occurred: {e}", save_clicked)
             self.app.log_message(self.log_display, f"   - FAILED: {error_msg}", "error")
             self._log_result(work_key, selected_work_code_text, "Failed", error_msg)
 
@@ -4,6 +4,40 @@ import customtkinter as ctk
 import re
 import webbrowser
 
+WORK_CODE_PATTERN = re.compile(r'\b(34\d{8}(?:/\w+)+/\d+)\b')
+WAGELIST_PATTERN = re.compile(r'\b\d+WL\d+\b', re.IGNORECASE)
+
+
+def extract_codes(text, wagelists=False, date_filter="", full_code=False, remove_duplicates=True):
+    """
+    Pulls work codes (or wagelist IDs when wagelists=True) out of pasted text.
+    Short work codes are the last 6 characters of the final segment.
+    Kept free of widgets so it can be benchmarked headlessly.
+    """
+    results = []
+
+    # If wagelist extraction is requested, return only wagelist IDs (skip work codes)
+    if wagelists:
+        # Build wagelist list by scanning lines; apply optional date filter if provided
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if date_filter and date_filter not in line:
+                continue
+            # normalize to upper-case and keep as-is
+            results.extend(m.upper() for m in WAGELIST_PATTERN.findall(line))
+    else:
+        for code in WORK_CODE_PATTERN.findall(text):
+            if full_code:
+                results.append(code)
+            else:
+                last_part = code.split('/')[-1]
+                results.append(last_part[-6:] if len(last_part) > 7 else last_part)
+
+    # Remove duplicates while preserving order if requested
+    return list(dict.fromkeys(results)) if remove_duplicates else results
+
+
 class WorkcodeExtractorTab(ctk.CTkFrame):
     def __init__(self, parent, app_instance):
         super().__init__(parent, fg_color="transparent")
@@ -93,56 +127,20 @@ class WorkcodeExtractorTab(ctk.CTkFrame):
         if not input_content.strip():
             return
 
-        work_code_pattern = re.compile(r'\b(34\d{8}(?:/\w+)+/\d+)\b')
-        wagelist_pattern = re.compile(r'\b\d+WL\d+\b', re.IGNORECASE)
-
-        found_work_codes = work_code_pattern.findall(input_content)
-
-        # Build wagelist list by scanning lines; apply optional date filter if provided
-        found_wagelists = []
+        date_filter = ""
         if self.extract_wagelist_checkbox.get():
-            date_filter = ""
             try:
                 date_filter = self.wagelist_date_entry.get().strip()
             except Exception:
                 date_filter = ""
-            for line in input_content.splitlines():
-                if not line.strip():
-                    continue
-                if date_filter and date_filter not in line:
-                    continue
-                matches = wagelist_pattern.findall(line)
-                if matches:
-                    # normalize to upper-case and keep as-is
-                    found_wagelists.extend([m.upper() for m in matches])
-
-        # Build primary results
-        results = []
-
-        # If wagelist extraction is requested, return only wagelist IDs (skip work codes)
-        if self.extract_wagelist_checkbox.get():
-            results = found_wagelists
-        else:
-            extract_full_code = self.extract_full_code_checkbox.get()
-            for code in found_work_codes:
-                if extract_full_code:
-                    results.append(code)
-                else:
-                    last_part = code.split('/')[-1]
-                    if len(last_part) > 7:
-                        results.append(last_part[-6:])
-                    else:
-                        results.append(last_part)
-
-            # Optionally include wagelist IDs only when wagelist checkbox is checked (kept behaviour)
-            # (No change here: wagelists are only appended when checkbox is checked, and above branch
-            # prevents workcodes when that checkbox is true.)
-
-        # Remove duplicates while preserving order if requested
-        if self.remove_duplicates_checkbox.get():
-            final_results = list(dict.fromkeys(results))
-        else:
-            final_results = results
+
+        final_results = extract_codes(
+            input_content,
+            wagelists=bool(self.extract_wagelist_checkbox.get()),
+            date_filter=date_filter,
+            full_code=bool(self.extract_full_code_checkbox.get()),
+            remove_duplicates=bool(self.remove_duplicates_checkbox.get())
+        )
 
         # Display results
         self.output_text.configure(state="normal")
@@ -1,6 +1,6 @@
 # tabs/zero_mr_tab.py
 import tkinter
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, filedialog
 import customtkinter as ctk
 import json
 import os, sys, subprocess, time
@@ -10,6 +10,7 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException, StaleElementReferenceException
 import config
+import dropdowns
 from .base_tab import BaseAutomationTab
 from .autocomplete_widget import AutocompleteEntry
 
@@ -138,7 +139,7 @@ class ZeroMrTab(BaseAutomationTab):
         }
 
         if not inputs['panchayat_name'] or not inputs['work_list_raw']:
-            messagebox.showwarning("Input Error", "Panchayat Name and Work List are required.")
+            self.dialogs.showwarning("Input Error", "Panchayat Name and Work List are required.")
             return
 
         # Parse the work list
@@ -157,11 +158,11 @@ class ZeroMrTab(BaseAutomationTab):
                     raise ValueError(f"Line {i+1} has missing data.")
                 work_items.append((work_key, msr_no))
         except Exception as e:
-            messagebox.showerror("Input Error", f"Failed to parse Work List:\n{e}")
+            self.dialogs.showerror("Input Error", f"Failed to parse Work List:\n{e}")
             return
 
         if not work_items:
-            messagebox.showwarning("Input Error", "No valid items found in the Work List.")
+            self.dialogs.showwarning("Input Error", "No valid items found in the Work List.")
             return
 
         inputs['work_items'] = work_items
@@ -209,13 +210,13 @@ class ZeroMrTab(BaseAutomationTab):
 
             self.app.after(0, self.app.set_status, "Setting Panchayat...")
             self.app.log_message(self.log_display, f"Selecting Panchayat: {inputs['panchayat_name']}")
-            panchayat_select = Select(wait.until(EC.element_to_be_clickable((By.ID, "ddlpanch"))))
-            match = next((opt.text for opt in panchayat_select.options if inputs['panchayat_name'].strip().lower() in opt.text.lower()), None)
+            panchayat_select = wait.until(EC.element_to_be_clickable((By.ID, "ddlpanch")))
+            match = dropdowns.find_option(dropdowns.read_options(driver, panchayat_select), inputs['panchayat_name'], match="contains")
             if not match:
                 raise ValueError(f"Panchayat '{inputs['panchayat_name']}' not found in dropdown.")
             
-            if panchayat_select.first_selected_option.text != match:
-                panchayat_select.select_by_visible_text(match)
+            if not match.selected:
+                dropdowns.select_option(driver, panchayat_select, value=match.value)
                 self.app.log_message(self.log_display, "Waiting for Panchayat postback...")
                 time.sleep(2) # Wait for postback
             
@@ -237,7 +238,7 @@ class ZeroMrTab(BaseAutomationTab):
         except Exception as e:
             error_msg = f"A critical error occurred: {e}"
             self.app.log_message(self.log_display, error_msg, "error")
-            messagebox.showerror("Critical Error", error_msg)
+            self.dialogs.showerror("Critical Error", error_msg)
             self.app.after(0, self.app.set_status, "Error")
         finally:
             self.app.after(0, self.set_ui_state, False)
@@ -246,9 +247,10 @@ class ZeroMrTab(BaseAutomationTab):
                 final_status = "Automation Stopped"
             self.app.after(0, self.app.set_status, final_status)
             self.app.after(0, self.update_status, final_status, 1.0)
-            self.app.after(100, lambda: messagebox.showinfo("Complete", f"{final_status}. Check results."))
+            self.app.after(100, lambda: self.dialogs.showinfo("Complete", f"{final_status}. Check results."))
 
     def _process_single_item(self, driver, wait, work_key, msr_no):
+        save_clicked = False # After this a timeout may hide a save that went through, so it is never retried
         try:
             self.app.log_message(self.log_display, f"   - Processing Key: {work_key}, MSR: {msr_no}")
             
@@ -272,18 +274,13 @@ class ZeroMrTab(BaseAutomationTab):
             
             # 3. Select Work Code
             wait.until(EC.presence_of_element_located((By.XPATH, "//select[@id='ddlworkcode']/option[position()>1]")))
-            work_code_select = Select(driver.find_element(By.ID, "ddlworkcode"))
-            
-            found_option_text = None
-            for option in work_code_select.options:
-                if work_key in option.text:
-                    found_option_text = option.text
-                    break
-            
-            if not found_option_text:
+            work_options = dropdowns.read_options(driver, "ddlworkcode")
+            found_option = next((o for o in work_options if work_key in o.text), None)
+            if not found_option:
                 raise NoSuchElementException(f"Could not find a work code matching '{work_key}' in the dropdown.")
 
-            work_code_select.select_by_visible_text(found_option_text)
+            dropdowns.select_option(driver, "ddlworkcode", value=found_option.value, options=work_options)
+            found_option_text = found_option.text
             self.app.log_message(self.log_display, f"   - Selected work code: {found_option_text}")
             
             # --- CRITICAL WAIT: Wait for MSR list update ---
@@ -292,24 +289,19 @@ class ZeroMrTab(BaseAutomationTab):
 
             # 4. Select MSR No (Modified for Partial Matching)
             wait.until(EC.presence_of_element_located((By.ID, "ddlmustroll")))
-            msr_select = Select(driver.find_element(By.ID, "ddlmustroll"))
+            msr_options = dropdowns.read_options(driver, "ddlmustroll")
             
             target_msr = msr_no.strip()
-            found_msr_text = None
 
-            # Iterate options to find partial match (e.g. "32845" inside "32845 (01/04-07/04)")
-            for option in msr_select.options:
-                if "Select" in option.text: continue
-                if target_msr in option.text:
-                    found_msr_text = option.text
-                    break
+            # Partial match (e.g. "32845" inside "32845 (01/04-07/04)")
+            found_msr = next((o for o in msr_options if "Select" not in o.text and target_msr in o.text), None)
             
-            if found_msr_text:
-                msr_select.select_by_visible_text(found_msr_text)
+            if found_msr:
+                found_msr_text = dropdowns.select_option(driver, "ddlmustroll", value=found_msr.value, options=msr_options).text
                 self.app.log_message(self.log_display, f"   - MSR selected: {found_msr_text}. Clicking save.")
             else:
                 # Debug info: What options were actually available?
-                options_preview = [o.text for o in msr_select.options if "Select" not in o.text][:3]
+                options_preview = [o.text for o in msr_options if "Select" not in o.text][:3]
                 error_msg = f"MSR '{target_msr}' not found in dropdown. Available: {options_preview}..."
                 self.app.log_message(self.log_display, f"   - FAILED: {error_msg}", "error")
                 self._log_result(work_key, msr_no, "Failed", error_msg)
@@ -318,6 +310,7 @@ class ZeroMrTab(BaseAutomationTab):
             # 5. Click Save
             save_btn = wait.until(EC.element_to_be_clickable((By.ID, "btnSave")))
             save_btn.click()
+            save_clicked = True
             
             # 6. Handle on-page message
             self.app.log_message(self.log_display, "   - Waiting for result message...")
@@ -337,12 +330,12 @@ class ZeroMrTab(BaseAutomationTab):
                 self._log_result(work_key, msr_no, "Success", message_text)
             else:
                 self.app.log_message(self.log_display, f"   - Failed: {message_text}", "error")
-                self._log_result(work_key, msr_no, "Failed", message_text)
+                self._log_result(work_key, msr_no, "Failed", self._after_save(message_text, save_clicked))
             
             time.sleep(1)
 
         except (TimeoutException, NoSuchElementException) as e:
-            error_msg = f"Element not found/timeout. {str(e).splitlines()[0]}"
+            error_msg = "Page timed out after Save (it may have saved). Check the MR." if save_clicked else f"Element not found/timeout. {str(e).splitlines()[0]}"
             self.app.log_message(self.log_display, f"   - FAILED: {error_msg}", "error")
             self._log_result(work_key, msr_no, "Failed", error_msg)
         except Exception as e:
@@ -350,6 +343,7 @@ class ZeroMrTab(BaseAutomationTab):
                 error_msg = "Page refreshed unexpectedly."
             else:
                 error_msg = f"Unexpected error: {e}"
+            error_msg = self._after_save(error_msg, save_clicked)
             self.app.log_message(self.log_display, f"   - FAILED: {error_msg}", "error")
             self._log_result(work_key, msr_no, "Failed", error_msg)
 
@@ -364,7 +358,7 @@ class ZeroMrTab(BaseAutomationTab):
         panchayat_name = self.panchayat_entry.get().strip()
 
         if not panchayat_name:
-            messagebox.showwarning("Input Needed", "Please enter a Panchayat Name for the report filename.", parent=self)
+            self.dialogs.showwarning("Input Needed", "Please enter a Panchayat Name for the report filename.", parent=self)
             return
 
         if "CSV" in export_format:
@@ -382,7 +376,7 @@ class ZeroMrTab(BaseAutomationTab):
 
     def _get_filtered_data_and_filepath(self, export_format):
         all_items = self.results_tree.get_children()
-        if not all_items: messagebox.showinfo("No Data", "There are no results to export."); return None, None
+        if not all_items: self.dialogs.showinfo("No Data", "There are no results to export."); return None, None
         
         filter_option = self.export_filter_menu.get()
         data_to_export = []
@@ -392,7 +386,7 @@ class ZeroMrTab(BaseAutomationTab):
             if filter_option == "Export All": data_to_export.append(row_values)
             elif filter_option == "Success Only" and "SUCCESS" in status: data_to_export.append(row_values)
             elif filter_option == "Failed Only" and "SUCCESS" not in status: data_to_export.append(row_values)
-        if not data_to_export: messagebox.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
+        if not data_to_export: self.dialogs.showinfo("No Data", f"No records found for filter '{filter_option}'."); return None, None
 
         safe_name = "".join(c for c in self.panchayat_entry.get().strip() if c.isalnum() or c in (' ', '_')).rstrip()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -414,13 +408,13 @@ class ZeroMrTab(BaseAutomationTab):
             success = self.generate_report_pdf(data, headers, col_widths, title, report_date, file_path)
             
             if success:
-                if messagebox.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
+                if self.dialogs.askyesno("Success", f"PDF Report exported to:\n{file_path}\n\nDo you want to open the file?"):
                     if sys.platform == "win32":
                         os.startfile(file_path)
                     else:
                         subprocess.call(['open', file_path])
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
+            self.dialogs.showerror("Export Error", f"Failed to create PDF file.\n\nError: {e}")
 
     def load_data_from_mr_tracking(self, data_list: list):
         """
@@ -430,7 +424,7 @@ class ZeroMrTab(BaseAutomationTab):
         and notify the user.
         """
         if not data_list:
-            messagebox.showwarning("No Data", "No data was received from the MR Tracking tab.", parent=self)
+            self.dialogs.showwarning("No Data", "No data was received from the MR Tracking tab.", parent=self)
             return
 
         self.app.log_message(self.log_display, f"Received {len(data_list)} items from MR Tracking.")
@@ -444,7 +438,7 @@ class ZeroMrTab(BaseAutomationTab):
         # Get the first panchayat from the list
         target_panchayat = data_list[0].get("panchayat")
         if not target_panchayat:
-            messagebox.showerror("Data Error", "Received data is missing Panchayat name.", parent=self)
+            self.dialogs.showerror("Data Error", "Received data is missing Panchayat name.", parent=self)
             return
             
         self.panchayat_entry.insert(0, target_panchayat)
@@ -480,7 +474,7 @@ class ZeroMrTab(BaseAutomationTab):
             if len(other_panchayats_found) > 3:
                 skipped_panchayats_str += ", ..."
             
-            messagebox.showwarning(
+            self.dialogs.showwarning(
                 "Partial Data Loaded",
                 f"Successfully loaded {len(work_list_entries)} items for Panchayat:\n{target_panchayat}\n\n"
                 f"Data for other panchayats ({skipped_panchayats_str}) was found but not loaded. "
@@ -0,0 +1,298 @@
+# transfer_manager.py
+# Shared engine for cloud file transfers (File Manager uploads/downloads).
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
+
+import config
+
+
+UPLOADED = "uploaded"
+DUPLICATE = "duplicate"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Streams a file through SHA-256 so large PDFs are never loaded into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TransferProgress:
+    """
+    Thread-safe aggregate progress for a batch of transfers.
+    Workers report absolute byte counts per file (so retries and resumes never
+    double count) and the UI callback is throttled to a few updates per second.
+    """
+    def __init__(self, total_files, total_bytes, callback=None, interval=0.25):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.interval = interval
+
+        self.files_done = 0
+        self.done_bytes = 0
+        self.current_name = ""
+        self._per_file = {}
+        self._last_emit = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, key, file_bytes, file_size=None):
+        with self.lock:
+            if file_size: file_bytes = min(file_bytes, file_size)
+            self.done_bytes += file_bytes - self._per_file.get(key, 0)
+            self._per_file[key] = file_bytes
+            self.current_name = os.path.basename(key)
+        self.emit()
+
+    def file_done(self):
+        with self.lock:
+            self.files_done += 1
+        self.emit()
+
+    @property
+    def fraction(self):
+        if self.total_bytes > 0:
+            return min(1.0, self.done_bytes / self.total_bytes)
+        return self.files_done / self.total_files if self.total_files else 1.0
+
+    def emit(self, force=False):
+        if not self.callback: return
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self._last_emit < self.interval: return
+            self._last_emit = now
+            snapshot = (self.fraction, self.files_done, self.total_files, self.current_name)
+        self.callback(*snapshot)
+
+
+class TransferManager:
+    """
+    Pooled HTTP session plus a bounded worker pool for the cloud file API.
+    - Folder trees are listed concurrently (one request per folder, in parallel).
+    - Downloads stream in 1 MB chunks into a '.part' file and resume with an
+      HTTP Range request if a previous attempt was interrupted.
+    - Uploads run in parallel once each new remote folder has been created, and
+      content already recorded in the local upload ledger is not sent again.
+    """
+    MAX_WORKERS = 6
+    LIST_WORKERS = 8
+    MAX_ATTEMPTS = 3
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, app):
+        self.app = app
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Lazily creates one keep-alive session shared by every transfer thread."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.MAX_WORKERS + self.LIST_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _api_url(self, path):
+        return f"{config.LICENSE_SERVER_URL}/files/api/{path}"
+
+    # --- LISTING ---
+    def list_folder(self, folder_id, headers):
+        url = self._api_url("list") + (f"/{folder_id}" if folder_id else "")
+        response = self.session.get(url, headers=headers, timeout=15)
+        response.raise_for_status()
+        return response.json()
+
+    def walk_folder(self, folder_id, root_path, headers):
+        """
+        Recursively lists a remote folder, fetching all sibling folders at once.
+        Returns (files, folders) where paths are relative to root_path's parent.
+        """
+        files, folders = [], [root_path]
+        with ThreadPoolExecutor(max_workers=self.LIST_WORKERS) as pool:
+            pending = {pool.submit(self.list_folder, folder_id, headers): root_path}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current_path = pending.pop(future)
+                    for item in future.result().get('files', []):
+                        item_path = os.path.join(current_path, item['filename'])
+                        if item['is_folder']:
+                            folders.append(item_path)
+                            pending[pool.submit(self.list_folder, item['id'], headers)] = item_path
+                        else:
+                            files.append({'id': item['id'], 'path': item_path, 'size': item.get('filesize') or 0})
+        return files, folders
+
+    # --- DOWNLOADS ---
+    def download_file(self, file_id, local_path, headers, expected_size=0, progress=None):
+        """
+        Downloads one file. A leftover '<name>.part' is resumed instead of restarted.
+        An existing local_path is always replaced (Save As -> overwrite).
+        """
+        part_path = local_path + ".part"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if expected_size and offset == expected_size:
+            # Our own earlier attempt got every byte; only the final rename is missing
+            os.replace(part_path, local_path)
+            if progress: progress.update(local_path, offset)
+            return
+        request_headers = dict(headers)
+        if offset:
+            request_headers['Range'] = f"bytes={offset}-"
+
+        with self.session.get(self._api_url(f"download/{file_id}"), headers=request_headers, stream=True, timeout=(10, 300)) as r:
+            if r.status_code == 416 and offset:
+                # Range starts at end of file: the previous attempt already finished
+                os.replace(part_path, local_path)
+                if progress: progress.update(local_path, offset)
+                return
+            r.raise_for_status()
+            if offset and r.status_code != 206:
+                offset = 0 # Server ignored the Range header, start over
+
+            written = offset
+            if progress: progress.update(local_path, written, expected_size)
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if not chunk: continue
+                    f.write(chunk)
+                    written += len(chunk)
+                    if progress: progress.update(local_path, written, expected_size)
+
+        os.replace(part_path, local_path)
+
+    def download_many(self, files, save_root, headers, on_progress=None):
+        """Downloads a list of {'id', 'path', 'size'} dicts concurrently. Returns the failed ones."""
+        progress = TransferProgress(len(files), sum(f['size'] for f in files), on_progress)
+        failed = []
+
+        def _job(info):
+            local_path = os.path.join(save_root, info['path'])
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    self.download_file(info['id'], local_path, headers, info['size'], progress)
+                    return True
+                except (requests.exceptions.RequestException, OSError) as e:
+                    print(f"Download error ({info['path']}, attempt {attempt + 1}): {e}")
+                    time.sleep(attempt + 1)
+            return False
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            futures = {pool.submit(_job, info): info for info in files}
+            for future in as_completed(futures):
+                if not future.result(): failed.append(futures[future])
+                progress.file_done()
+
+        progress.emit(force=True)
+        return failed
+
+    # --- UPLOADS ---
+    def upload_file(self, local_path, relative_path, parent_id, headers, progress=None,
+                    content_type='application/octet-stream', remote_path=None, force=False, ledger_key=None):
+        """
+        Uploads one file as multipart form data.
+        Returns UPLOADED, or DUPLICATE when the local upload ledger already has it (or the
+        server answered 409). The ledger is keyed by ledger_key, a stable name for what the
+        file is (e.g. one muster roll), else by content hash + cloud path.
+        force=True skips the ledger check (e.g. the cloud copy was deleted elsewhere).
+        Raises requests.HTTPError for any other non-201 response.
+        """
+        file_size = os.path.getsize(local_path)
+        remote_path = (remote_path or relative_path or os.path.basename(local_path)).replace(os.sep, '/')
+        ledger = self.app.history_manager
+
+        content_hash = file_sha256(local_path)
+        ledger_key = ledger_key or f"{content_hash}:{remote_path}"
+        if not force and ledger.get_uploaded_file(ledger_key):
+            if progress: progress.update(local_path, file_size)
+            return DUPLICATE
+
+        with open(local_path, 'rb') as f:
+            encoder = MultipartEncoder(fields={
+                'parent_id': str(parent_id or ''),
+                'relative_path': relative_path,
+                'file': (os.path.basename(local_path), f, content_type)
+            })
+            callback = (lambda m: progress.update(local_path, m.bytes_read, file_size)) if progress else None
+            monitor = MultipartEncoderMonitor(encoder, callback)
+            response = self.session.post(
+                self._api_url("upload"),
+                headers={**headers, 'Content-Type': monitor.content_type},
+                data=monitor,
+                timeout=(10, 300)
+            )
+
+        if response.status_code == 409:
+            return DUPLICATE
+        if response.status_code != 201:
+            raise requests.exceptions.HTTPError(f"Upload failed with status {response.status_code}: {response.text[:200]}", response=response)
+
+        try: remote_id = response.json().get('id')
+        except ValueError: remote_id = None
+        ledger.record_upload(ledger_key, content_hash, file_size, remote_path, remote_id)
+        return UPLOADED
+
+    def upload_many(self, items, parent_id, headers, on_progress=None, parent_path="", force=False):
+        """
+        Uploads a list of {'local_path', 'relative_path'} dicts.
+        Returns (failed_items, duplicate_items); force=True uploads even what the ledger has seen.
+        The first file of every new remote folder goes up alone so the server
+        creates that folder once; the rest are then sent in parallel.
+        """
+        sizes = {item['local_path']: os.path.getsize(item['local_path']) for item in items if os.path.exists(item['local_path'])}
+        progress = TransferProgress(len(items), sum(sizes.values()), on_progress)
+        failed, duplicates = [], []
+
+        def _job(item):
+            name = item['relative_path'] or os.path.basename(item['local_path'])
+            remote_path = f"{parent_path.rstrip('/')}/{name}" if parent_path else name
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    result = self.upload_file(item['local_path'], item['relative_path'], parent_id, headers, progress, remote_path=remote_path, force=force)
+                    if result == DUPLICATE: duplicates.append(item)
+                    return True
+                except requests.exceptions.HTTPError as e:
+                    print(f"Upload error ({item['local_path']}): {e}")
+                    if e.response is not None and e.response.status_code < 500: return False # Quota/validation errors won't fix themselves
+                except (requests.exceptions.RequestException, OSError) as e:
+                    print(f"Upload error ({item['local_path']}, attempt {attempt + 1}): {e}")
+                progress.update(item['local_path'], 0)
+                time.sleep(attempt + 1)
+            return False
+
+        seed, rest, seen_dirs = [], [], set()
+        for item in items:
+            remote_dir = os.path.dirname(item['relative_path'])
+            if remote_dir and remote_dir not in seen_dirs:
+                seen_dirs.add(remote_dir)
+                seed.append(item)
+            else:
+                rest.append(item)
+        seed.sort(key=lambda i: i['relative_path'].count(os.sep))
+
+        for item in seed:
+            if not _job(item): failed.append(item)
+            progress.file_done()
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            futures = {pool.submit(_job, item): item for item in rest}
+            for future in as_completed(futures):
+                if not future.result(): failed.append(futures[future])
+                progress.file_done()
+
+        progress.emit(force=True)
+        return failed, duplicates
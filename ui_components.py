@@ -7,6 +7,15 @@ import re
 from PIL import Image
 from utils import resource_path
 
+
+def _schedule_frame(widget, base_ms, callback):
+    """Next animation frame through the app's UI governor (paused while minimized/unfocused). Returns the delay or None."""
+    governor = getattr(widget.winfo_toplevel(), "ui_governor", None)
+    delay = governor.frame(base_ms) if governor else base_ms
+    if delay is None: governor.on_resume(callback); return None
+    widget.after(delay, callback)
+    return delay
+
 # --- 1. COLLAPSIBLE FRAME (Sidebar Categories) ---
 class CollapsibleFrame(ctk.CTkFrame):
     def __init__(self, parent, title=""):
@@ -187,7 +196,7 @@ class SkeletonLoader(ctk.CTkFrame):
                     p.configure(fg_color=final_color)
             except: pass
             
-        self.after(600, self._animate) # Thoda fast animation (600ms)
+        _schedule_frame(self, 600, self._animate) # Thoda fast animation (600ms)
 
     def stop(self):
         self.animating = False
@@ -215,6 +224,7 @@ class MarqueeLabel(ctk.CTkFrame):
         self.total_width = 0
         self.canvas_width = 1
         self.is_running = True 
+        self.step = speed # Pixels per frame; grows when frames are slowed down so the text keeps its pace
         
         self.bind("<Configure>", self._on_resize)
         self.bind("<Destroy>", self._on_destroy)
@@ -314,7 +324,7 @@ class MarqueeLabel(ctk.CTkFrame):
             return
 
         if not self.items:
-            self.after(100, self._animate)
+            _schedule_frame(self, 100, self._animate)
             return
 
         try:
@@ -326,7 +336,7 @@ class MarqueeLabel(ctk.CTkFrame):
             last_coords = self.canvas.coords(last_item['id'])
             
             if not last_coords: 
-                self.after(20, self._animate)
+                self._next_frame()
                 return
 
             if last_coords[0] + last_item['width'] < 0:
@@ -337,12 +347,16 @@ class MarqueeLabel(ctk.CTkFrame):
                     current_x_reset += item['width']
             else:
                 for item in self.items:
-                    self.canvas.move(item['id'], -self.speed, 0)
+                    self.canvas.move(item['id'], -self.step, 0)
 
-            self.after(20, self._animate)
+            self._next_frame()
         except Exception:
             self.is_running = False
 
+    def _next_frame(self):
+        delay = _schedule_frame(self, 20, self._animate)
+        if delay: self.step = self.speed * delay / 20
+
 # --- 5. TOAST NOTIFICATION (Popup) ---
 class ToastNotification(ctk.CTkToplevel):
     def __init__(self, parent, message, kind="success", duration=3000):
@@ -0,0 +1,124 @@
+# ui_governor.py
+"""
+Keeps the UI from spending CPU on things nobody is looking at.
+
+- Cosmetic animations (skeleton pulse, announcement ticker, status spinner) ask
+  frame(base_ms) for the delay before their next frame. While the main window is
+  minimized or withdrawn they get None and park their callback with on_resume();
+  nothing is scheduled until the window is back. A window that is on screen but
+  not focused (e.g. beside the browser during a run) keeps animating,
+  unfocused_factor x slower. While automations run (tab runs or queued jobs)
+  frames are also busy_factor x slower.
+- Periodic background checks (server ping, app config) share one poller thread.
+  A check that fails (returns False or raises) backs off: its interval doubles up
+  to its max_interval, and resets after the next success. While the window is
+  hidden every interval is hidden_factor x longer, while unfocused unfocused_factor x.
+
+Settings: UI_GOVERNOR_CONFIG in config.py.
+"""
+import time
+import tkinter
+import threading
+
+import config
+
+
+class _Poller:
+    def __init__(self, name, func, interval, max_interval, next_run):
+        self.name, self.func = name, func
+        self.interval, self.max_interval = interval, max(interval, max_interval or interval)
+        self.next_run = next_run
+        self.failures = 0
+
+    def delay(self, hidden_factor):
+        return min(self.max_interval, self.interval * 2 ** self.failures) * hidden_factor
+
+
+class UIGovernor:
+    def __init__(self, app):
+        self.app = app
+        self.cfg = config.UI_GOVERNOR_CONFIG
+        self.visible = True # Not minimized / withdrawn
+        self.focused = True
+        self._parked = [] # (callback, args) waiting for the window to come back
+        self._refresh_pending = False
+        self._pollers = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+    # --- Window state (main thread) ---
+    def attach(self):
+        """Follows the main window's state. Call once the window exists."""
+        for sequence in ("<Map>", "<Unmap>", "<FocusIn>", "<FocusOut>"):
+            self.app.bind(sequence, self._on_window_event, add="+")
+        self._refresh()
+
+    def _on_window_event(self, event=None):
+        # Focus moving between our own widgets also fires FocusOut/FocusIn; check once it has settled
+        if self._refresh_pending: return
+        self._refresh_pending = True
+        self.app.after(100, self._refresh)
+
+    def _refresh(self):
+        self._refresh_pending = False
+        try: visible, focused = self.app.state() not in ("iconic", "withdrawn"), bool(self.app.tk.call("focus"))
+        except tkinter.TclError: return
+        slower = self.slowdown
+        self.visible, self.focused = visible, focused
+        if visible:
+            parked, self._parked = self._parked, []
+            for callback, args in parked: callback(*args)
+        if self.slowdown < slower: self._wake_pollers()
+
+    @property
+    def slowdown(self):
+        """How much longer poller intervals are for the window's state: 1, unfocused_factor or hidden_factor."""
+        if not self.visible: return self.cfg["hidden_factor"]
+        return 1 if self.focused else self.cfg["unfocused_factor"]
+
+    @property
+    def busy(self):
+        return bool(self.app.active_automations) or self.app.job_scheduler.open_jobs() > 0
+
+    # --- Cosmetic animations (main thread) ---
+    def frame(self, base_ms):
+        """Delay in ms before an animation's next frame, or None when it should park with on_resume()."""
+        if not self.visible: return None
+        factor = (self.cfg["busy_factor"] if self.busy else 1) * (1 if self.focused else self.cfg["unfocused_factor"])
+        return int(base_ms * factor)
+
+    def on_resume(self, callback, *args):
+        """Runs callback(*args) when the window is visible again (once per callback)."""
+        if not any(c == callback for c, _ in self._parked): self._parked.append((callback, args))
+
+    # --- Background pollers ---
+    def add_poller(self, name, func, interval, max_interval=None, delay=0):
+        """Runs func on the poller thread every `interval` seconds, first after `delay`. False / an exception backs it off."""
+        with self._cond:
+            self._pollers = [p for p in self._pollers if p.name != name] # Registering again replaces it
+            self._pollers.append(_Poller(name, func, interval, max_interval, time.monotonic() + delay))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, daemon=True, name="ui-pollers")
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _wake_pollers(self):
+        """Window is back / focused again: no check waits longer than its base interval, even one that is backing off."""
+        with self._cond:
+            now = time.monotonic()
+            for p in self._pollers: p.next_run = min(p.next_run, now + p.interval)
+            self._cond.notify_all()
+
+    def _poll_loop(self):
+        while True:
+            with self._cond:
+                due = min(self._pollers, key=lambda p: p.next_run)
+                wait = due.next_run - time.monotonic()
+                if wait > 0: self._cond.wait(wait); continue
+                due.next_run = float("inf") # Not picked again while it runs
+            try: ok = due.func() is not False
+            except Exception as e:
+                print(f"{due.name} check failed: {e}"); ok = False
+            with self._cond:
+                due.failures = 0 if ok else min(due.failures + 1, 16)
+                due.next_run = time.monotonic() + due.delay(self.slowdown)
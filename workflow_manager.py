@@ -1,4 +1,5 @@
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+import customtkinter as ctk
 
 class WorkflowManager:
     def __init__(self, app):
@@ -81,4 +82,89 @@ class WorkflowManager:
         self.app.show_frame("Send Wagelist")
         def _action():
             self.app.tab_instances["Send Wagelist"].populate_wagelist_data(start, end)
-        self._wait_and_execute("Send Wagelist", _action)
\ No newline at end of file
+        self._wait_and_execute("Send Wagelist", _action)
+    # --- Pipeline mode: stages run together, each item moves on as soon as it succeeds ---
+    def start_pipeline(self, workcodes, panchayat_name):
+        from stage_pipeline import STAGES, PIPELINE_KEY, StagePipeline, build_params
+        app = self.app
+        if app.automation_threads.get(PIPELINE_KEY) and app.automation_threads[PIPELINE_KEY].is_alive():
+            if getattr(self, "_pipeline_win", None) and self._pipeline_win.winfo_exists(): self._pipeline_win.lift()
+            else: messagebox.showwarning("Busy", "A pipeline is already running.")
+            return
+        items = [w.strip() for w in workcodes.splitlines() if w.strip()]
+
+        win = self._pipeline_win = ctk.CTkToplevel(app)
+        win.title(f"Pipeline - {panchayat_name}")
+        win.geometry("820x600")
+        win.grid_columnconfigure(0, weight=1)
+        win.grid_rowconfigure(2, weight=1)
+
+        # Stage selection + options
+        options = ctk.CTkFrame(win)
+        options.grid(row=0, column=0, sticky="ew", padx=15, pady=(15, 5))
+        ctk.CTkLabel(options, text=f"{len(items)} workcodes  |  Panchayat: {panchayat_name}", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, columnspan=5, sticky="w", padx=10, pady=(8, 4))
+        stage_vars = {}
+        for col, stage in enumerate(STAGES):
+            stage_vars[stage.key] = ctk.BooleanVar(value=stage.key != "mr_fill")
+            ctk.CTkCheckBox(options, text=stage.name, variable=stage_vars[stage.key]).grid(row=1, column=col, sticky="w", padx=10, pady=4)
+        wagelist_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(options, text="Generate & send wagelist at the end", variable=wagelist_var).grid(row=1, column=len(STAGES), sticky="w", padx=10, pady=4)
+        ctk.CTkLabel(options, text="Verify Amount:").grid(row=2, column=0, sticky="w", padx=10, pady=(4, 8))
+        verify_entry = ctk.CTkEntry(options, width=80)
+        verify_entry.insert(0, "282")
+        verify_entry.grid(row=2, column=1, sticky="w", pady=(4, 8))
+        profile_menu = ctk.CTkOptionMenu(options, values=["Next free browser"] + [p.name for p in app.profile_manager.running()], width=150)
+        profile_menu.grid(row=2, column=2, padx=5, pady=(4, 8))
+        start_btn = ctk.CTkButton(options, text="▶ Start Pipeline", width=130, fg_color="#2E8B57", hover_color="#1F5E39")
+        start_btn.grid(row=2, column=3, padx=5, pady=(4, 8))
+        stop_btn = ctk.CTkButton(options, text="■ Stop", width=80, fg_color="#C53030", hover_color="#9B2C2C", state="disabled")
+        stop_btn.grid(row=2, column=4, padx=5, pady=(4, 8))
+
+        # Per-stage counters
+        counts_label = ctk.CTkLabel(win, text="Select stages and start.", justify="left", font=("Consolas", 12))
+        counts_label.grid(row=1, column=0, sticky="w", padx=20, pady=5)
+
+        tabs = ctk.CTkTabview(win)
+        tabs.grid(row=2, column=0, sticky="nsew", padx=15, pady=(0, 15))
+        cols = ("Time", "Stage", "Work Key", "Status", "Details")
+        tree = ttk.Treeview(tabs.add("Results"), columns=cols, show="headings")
+        for col, width in zip(cols, (70, 100, 110, 80, 380)):
+            tree.heading(col, text=col); tree.column(col, width=width, anchor="w")
+        tree.pack(expand=True, fill="both")
+        app.style_treeview(tree)
+        log_box = ctk.CTkTextbox(tabs.add("Log"), font=("Consolas", 11))
+        log_box.pack(expand=True, fill="both")
+
+        def refresh(pipeline, shown_rows=0):
+            if not win.winfo_exists(): return
+            state = pipeline.snapshot()
+            lines = []
+            for name, counts in state["results"].items():
+                waiting = state["waiting"].get(name)
+                summary = ", ".join(f"{k} {v}" for k, v in sorted(counts.items())) or "-"
+                lines.append(f"{name:<14}{'' if waiting is None else f'waiting {waiting:<3}'}  {summary}")
+            counts_label.configure(text="\n".join(lines))
+            for row in state["rows"][shown_rows:]:
+                tree.insert("", "end", values=row, tags=() if row[3] == "Success" else ("failed",))
+            log_text = "\n".join(state["log"])
+            if log_box.get("1.0", "end-1c") != log_text:
+                log_box.configure(state="normal"); log_box.delete("1.0", "end"); log_box.insert("1.0", log_text)
+                log_box.see("end"); log_box.configure(state="disabled")
+            if state["finished"]:
+                stop_btn.configure(state="disabled")
+                counts_label.configure(text=counts_label.cget("text") + "\n\nPipeline finished.")
+                return
+            win.after(1000, refresh, pipeline, len(state["rows"]))
+
+        def start():
+            stage_keys = [k for k, v in stage_vars.items() if v.get()]
+            if not stage_keys: messagebox.showwarning("No Stages", "Select at least one stage.", parent=win); return
+            try: params = build_params(app, stage_keys, panchayat_name, verify_entry.get().strip())
+            except ValueError as e: messagebox.showwarning("Input Error", str(e), parent=win); return
+            profile = None if profile_menu.get() == "Next free browser" else profile_menu.get()
+            pipeline = StagePipeline(app, stage_keys, items, params, wagelist_var.get(), profile)
+            start_btn.configure(state="disabled"); stop_btn.configure(state="normal", command=pipeline.stop)
+            app.start_automation_thread(PIPELINE_KEY, pipeline.run)
+            refresh(pipeline)
+
+        start_btn.configure(command=start)